@@ -0,0 +1,108 @@
+import type { SearchIndexData } from './useSearchIndex'
+import { afterEach, describe, expect, it, vi } from 'vitest'
+import { createIndexedMatcher, loadSearchIndex, searchIndex, stem, tokenize } from './useSearchIndex'
+
+// Same shape as the output of `scripts/saf-py search` (docs/public/search-index.json)
+const index: SearchIndexData = {
+  format: 1,
+  stemmer: 'saf-suffix-1',
+  fields: { name: 3, tags: 2, platform: 1.5, shortDescription: 1 },
+  docs: [
+    { id: 'rhel8-stig', type: 'profiles', name: 'Red Hat Enterprise Linux 8 STIG', hash: 'a' },
+    { id: 'windows-2019-stig', type: 'profiles', name: 'Windows Server 2019 STIG', hash: 'b' },
+    { id: 'windows-ansible', type: 'hardening_profiles', name: 'Windows Hardening', hash: 'c' },
+  ],
+  terms: {
+    '8': [[0, 3]],
+    'enterprise': [[0, 3]],
+    'harden': [[2, 3]],
+    'linux': [[0, 3]],
+    'red': [[0, 3]],
+    'hat': [[0, 3]],
+    'stig': [[0, 3], [1, 3]],
+    'window': [[1, 3], [2, 5]],
+    'server': [[1, 3]],
+    '2019': [[1, 3]],
+  },
+}
+
+describe('stem and tokenize', () => {
+  // Keep in sync with test_tokenize_and_stem in scripts/saf_content/search_test.py
+  it('applies the same rules as the Python indexer', () => {
+    expect(tokenize('Running the Databases, RHEL8 on AWS')).toEqual(['run', 'database', 'rhel8', 'aws'])
+    expect(['policies', 'access', 'installed', 'class'].map(stem)).toEqual(['policy', 'access', 'install', 'class'])
+    expect(['hardening', 'quickly', 'passes', 'filling', 'status', 'used'].map(stem))
+      .toEqual(['harden', 'quick', 'pass', 'fill', 'status', 'used'])
+  })
+})
+
+describe('searchIndex', () => {
+  it('requires every term and ranks by tf-idf', () => {
+    expect(searchIndex(index, 'windows').map(r => r.doc.id)).toEqual(['windows-ansible', 'windows-2019-stig'])
+    expect(searchIndex(index, 'windows stig').map(r => r.doc.id)).toEqual(['windows-2019-stig'])
+    expect(searchIndex(index, 'xyzzy')).toEqual([])
+    expect(searchIndex(index, 'the')).toEqual([])
+  })
+
+  it('matches the last term as a prefix', () => {
+    expect(searchIndex(index, 'red h').map(r => r.doc.id)).toEqual(['rhel8-stig'])
+    expect(searchIndex(index, 'win').map(r => r.doc.id)).toEqual(searchIndex(index, 'windows').map(r => r.doc.id))
+  })
+})
+
+describe('loadSearchIndex', () => {
+  afterEach(() => {
+    vi.unstubAllGlobals()
+  })
+
+  it('returns the index, or null when missing or built by another stemmer', async () => {
+    vi.stubGlobal('fetch', vi.fn(async () => new Response(JSON.stringify(index))))
+    expect(await loadSearchIndex('/search-index.json')).toEqual(index)
+
+    vi.stubGlobal('fetch', vi.fn(async () => new Response(JSON.stringify({ ...index, stemmer: 'other' }))))
+    expect(await loadSearchIndex('/search-index.json')).toBeNull()
+
+    vi.stubGlobal('fetch', vi.fn(async () => new Response('Not found', { status: 404 })))
+    expect(await loadSearchIndex('/search-index.json')).toBeNull()
+  })
+})
+
+describe('createIndexedMatcher', () => {
+  const items = [
+    { id: '1', slug: 'rhel8-stig', content_type: 'validation', name: 'RHEL 8 STIG', description: 'InSpec profile', standard_name: 'DISA STIG', vendor_name: 'Red Hat' },
+    { id: '2', slug: 'windows-ansible', content_type: 'hardening', name: 'Windows Hardening', description: 'Ansible playbook' },
+    { id: '3', slug: 'inspec-tools', content_type: 'library', name: 'InSpec Tools', description: 'Library for Windows' },
+    { id: '4', slug: 'rhel8-stig', content_type: 'hardening', name: 'RHEL 8 Ansible Role', description: 'Ansible role' },
+  ]
+  // A hardening document with the same id as a profile, only findable by a tag
+  const withTags: SearchIndexData = {
+    ...index,
+    docs: [...index.docs, { id: 'rhel8-stig', type: 'hardening_profiles', name: 'RHEL 8 Ansible Role', hash: 'd' }],
+    terms: { ...index.terms, kickstart: [[3, 2]] },
+  }
+
+  it('adds index matches to the fuzzy ones', () => {
+    const match = createIndexedMatcher(items, withTags)
+    expect([...match('windows')].map(i => i.id).sort()).toEqual(['2', '3'])
+    // 'enterprise' is only in the indexed name of rhel8-stig
+    expect([...match('enterprise')].map(i => i.id)).toEqual(['1'])
+    expect(match('').size).toBe(4)
+  })
+
+  it('keeps fuzzy matches the index does not find', () => {
+    const match = createIndexedMatcher(items, withTags)
+    expect(searchIndex(withTags, 'redhat')).toEqual([])
+    expect([...match('redhat')].map(i => i.id)).toContain('1')
+    expect(searchIndex(withTags, 'disa')).toEqual([])
+    expect([...match('disa')].map(i => i.id)).toContain('1')
+  })
+
+  it('matches documents by type and id', () => {
+    expect([...createIndexedMatcher(items, withTags)('kickstart')].map(i => i.id)).toEqual(['4'])
+  })
+
+  it('falls back to Fuse for everything without an index', () => {
+    const match = createIndexedMatcher(items, null)
+    expect([...match('playbook')].map(i => i.id)).toContain('2')
+  })
+})
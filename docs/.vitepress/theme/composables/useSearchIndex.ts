@@ -0,0 +1,180 @@
+import type { IFuseOptions } from 'fuse.js'
+import { createFuzzyMatcher } from './useFuzzySearch'
+
+/**
+ * Prebuilt search index for profiles and hardening profiles
+ *
+ * The index is built from content/data by `scripts/saf-py search` (see
+ * scripts/saf_content/search.py) into docs/public/search-index.json and
+ * adds tag and stemmed-word matches to the fuzzy search. Queries must be
+ * tokenized exactly like the indexed text, so `tokenize` and `stem` mirror
+ * the Python ones rule for rule.
+ */
+
+export const SEARCH_INDEX_PATH = '/search-index.json'
+export const SEARCH_INDEX_FORMAT = 1
+export const SEARCH_INDEX_STEMMER = 'saf-suffix-1'
+
+const STOP_WORDS = new Set(
+  'a an and are as at be by for from in into is it of on or the to with'.split(' '),
+)
+
+export interface SearchDocument {
+  id: string
+  type: string
+  name: string
+  hash: string
+}
+
+export interface SearchIndexData {
+  format: number
+  stemmer: string
+  fields: Record<string, number>
+  docs: SearchDocument[]
+  // term -> [doc position, weighted term frequency] pairs
+  terms: Record<string, [number, number][]>
+}
+
+export interface SearchResult {
+  doc: SearchDocument
+  position: number
+  score: number
+}
+
+/**
+ * Strip common English inflections (plurals, -ed, -ing, -ly)
+ *
+ * Words of three letters or fewer and words containing digits are kept
+ * as they are, so 'aws', 's3' and 'rhel8' survive unchanged.
+ */
+export function stem(word: string): string {
+  if (word.length <= 3 || !/^[a-z]+$/.test(word))
+    return word
+  if (word.endsWith('sses'))
+    word = word.slice(0, -2)
+  else if (word.endsWith('ies'))
+    word = `${word.slice(0, -3)}y`
+  else if (word.endsWith('s') && !/(?:ss|us|is)$/.test(word))
+    word = word.slice(0, -1)
+
+  for (const suffix of ['ing', 'ed', 'ly']) {
+    const base = word.slice(0, -suffix.length)
+    if (word.endsWith(suffix) && base.length >= 3 && /[aeiouy]/.test(base)) {
+      word = base
+      // running -> run, but keep 'install' and 'access'
+      const last = word[word.length - 1]
+      if (word.length > 3 && last === word[word.length - 2] && !'lsz'.includes(last))
+        word = word.slice(0, -1)
+      break
+    }
+  }
+  return word
+}
+
+export function tokenize(text: string): string[] {
+  return (text.toLowerCase().match(/[a-z0-9]+/g) ?? [])
+    .filter(token => !STOP_WORDS.has(token))
+    .map(stem)
+}
+
+/**
+ * Documents containing every query term, best tf-idf score first
+ *
+ * The last query term also matches as a prefix (search-as-you-type).
+ */
+export function searchIndex(index: SearchIndexData, query: string, limit = Infinity): SearchResult[] {
+  const tokens = tokenize(query)
+  if (tokens.length === 0)
+    return []
+  const n = index.docs.length
+  let scores: Map<number, number> | null = null
+  for (let i = 0; i < tokens.length; i++) {
+    const token = tokens[i]
+    let matched = token in index.terms ? [token] : []
+    if (i === tokens.length - 1)
+      matched = Object.keys(index.terms).filter(term => term.startsWith(token))
+    const tokenScores = new Map<number, number>()
+    for (const term of matched) {
+      const postings = index.terms[term]
+      const idf = Math.log(1 + n / postings.length)
+      for (const [position, weight] of postings)
+        tokenScores.set(position, (tokenScores.get(position) ?? 0) + weight * idf)
+    }
+    scores = scores === null
+      ? tokenScores
+      : new Map([...scores].filter(([p]) => tokenScores.has(p)).map(([p, s]) => [p, s + tokenScores.get(p)!]))
+  }
+  return [...(scores ?? [])]
+    .sort((a, b) => b[1] - a[1] || a[0] - b[0])
+    .slice(0, limit)
+    .map(([position, score]) => ({ doc: index.docs[position], position, score: Math.round(score * 1000) / 1000 }))
+}
+
+/**
+ * Fetch the prebuilt index; null if it is missing or was built for another
+ * format or stemmer (callers then fall back to Fuse.js)
+ */
+export async function loadSearchIndex(url: string): Promise<SearchIndexData | null> {
+  try {
+    const response = await fetch(url)
+    if (!response.ok)
+      return null
+    const data = await response.json() as SearchIndexData
+    return data.format === SEARCH_INDEX_FORMAT && data.stemmer === SEARCH_INDEX_STEMMER ? data : null
+  }
+  catch {
+    return null
+  }
+}
+
+// ContentItem.content_type -> index document type
+const DOCUMENT_TYPES: Record<string, string> = {
+  validation: 'profiles',
+  hardening: 'hardening_profiles',
+}
+
+/**
+ * Matcher with the same contract as createFuzzyMatcher, adding the matches
+ * of the prebuilt index to those of Fuse.js
+ *
+ * The index only covers name, tags, platform and shortDescription and
+ * matches whole stemmed words, so it cannot replace Fuse.js, which also
+ * searches descriptions, vendor, standard, technology and target names and
+ * tolerates typos and spacing ("redhat" -> "Red Hat"). The index adds what
+ * Fuse.js misses: tags and inflected words ("policy" -> "Policies").
+ * Items are matched to index documents by type and slug (or id). Fuse.js
+ * is built on the first query.
+ */
+export function createIndexedMatcher<T extends Record<string, unknown>>(
+  items: T[],
+  index: SearchIndexData | null,
+  options?: Partial<IFuseOptions<T>>,
+): (query: string) => Set<T> {
+  const positions = new Map<string, number>()
+  index?.docs.forEach((doc, position) => {
+    positions.set(`${doc.type}/${doc.id.toLowerCase()}`, position)
+  })
+  const covered = new Map<number, T[]>()
+  for (const item of items) {
+    const type = DOCUMENT_TYPES[item.content_type as string]
+    if (!type)
+      continue
+    const keys = [item.slug, item.id].filter((key): key is string => typeof key === 'string')
+    const position = keys.map(key => positions.get(`${type}/${key.toLowerCase()}`)).find(p => p !== undefined)
+    if (position !== undefined)
+      covered.set(position, [...(covered.get(position) ?? []), item])
+  }
+
+  let fuzzy: ((query: string) => Set<T>) | null = null
+  return (query: string): Set<T> => {
+    if (!query || query.trim() === '')
+      return new Set(items)
+    fuzzy ??= createFuzzyMatcher(items, options)
+    const matches = fuzzy(query)
+    if (index) {
+      for (const result of searchIndex(index, query))
+        covered.get(result.position)?.forEach(item => matches.add(item))
+    }
+    return matches
+  }
+}
@@ -1,8 +1,9 @@
 #!/usr/bin/env python3
-from pocketbase import PocketBase
+from saf_pb.client import connect
+from saf_pb.http import ApiError
 
-client = PocketBase('http://127.0.0.1:8090')
-admin = client.admins.auth_with_password('admin@localhost.com', 'test1234567')
+pb = connect()
+organizations = pb.collection("organizations")
 
 print("Adding organizations with data...")
 
@@ -16,15 +17,16 @@ orgs_data = [
 for org_data in orgs_data:
     print(f"\nTrying to create: {org_data['name']}")
     try:
-        result = client.collection("organizations").create(org_data)
-        print(f"  Created ID: {result.id}")
+        result = organizations.create(org_data)
+        print(f"  Created ID: {result['id']}")
         print(f"  Result: {result}")
-    except Exception as e:
+    except ApiError as e:
         print(f"  Error: {e}")
+        if e.data:
+            print(f"  Details: {e.data}")
 
 print("\n\nChecking what was created...")
-orgs = client.collection("organizations").get_full_list()
-for org in orgs:
-    print(f"  ID: {org.id}")
-    print(f"  Data: {org.__dict__}")
+for org in organizations.iter():
+    print(f"  ID: {org['id']}")
+    print(f"  Data: {org}")
     print()
@@ -0,0 +1,14 @@
+#!/usr/bin/env python3
+"""
+Compare memory use and attribute access of the slotted entity models
+(saf_content.models) with the plain dicts the YAML loader produces.
+
+Usage:
+  python scripts/bench-models.py                 # 100,000 synthetic profiles
+  python scripts/bench-models.py --count 10000
+"""
+
+from saf_content.bench_models import main
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,14 @@
+#!/usr/bin/env python3
+"""
+Measure the throughput of the generated entity schema validators
+(saf_content.schema) on the real profiles in content/data.
+
+Usage:
+  python scripts/bench-schema.py                 # 200,000 profiles
+  python scripts/bench-schema.py --count 20000
+"""
+
+from saf_content.bench_schema import main
+
+if __name__ == '__main__':
+    main()
@@ -1,23 +1,19 @@
 #!/usr/bin/env python3
-from pocketbase import PocketBase
+"""
+Check what data is loaded in Pocketbase.
 
-client = PocketBase('http://127.0.0.1:8090')
-admin = client.admins.auth_with_password('admin@localhost.com', 'test1234567')
+Record totals for all requested collections are fetched concurrently, one
+single-item request per collection. With --list, records are streamed page
+by page with only the id and name columns projected, so even very large
+collections are listed in constant memory.
 
-print("Checking organizations...")
-try:
-    orgs = client.collection("organizations").get_full_list()
-    print(f"  Found {len(orgs)} organizations:")
-    for org in orgs:
-        print(f"    - {org.id}: {org.name if hasattr(org, 'name') else 'NO NAME'}")
-except Exception as e:
-    print(f"  Error: {e}")
+Usage:
+  python scripts/check-data.py                                  # Counts for organizations, profiles
+  python scripts/check-data.py --list                           # Also list id: name for each record
+  python scripts/check-data.py --collections tags teams tools   # Check other collections
+"""
 
-print("\nChecking profiles...")
-try:
-    profiles = client.collection("profiles").get_full_list()
-    print(f"  Found {len(profiles)} profiles:")
-    for profile in profiles:
-        print(f"    - {profile.id}: {profile.name if hasattr(profile, 'name') else 'NO NAME'}")
-except Exception as e:
-    print(f"  Error: {e}")
+from saf_pb.check import main
+
+if __name__ == '__main__':
+    main()
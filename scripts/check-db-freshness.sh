@@ -3,6 +3,12 @@
 # Check if data.db is stale compared to diffable/ and reload if needed.
 # Called automatically before dev server starts.
 #
+# Staleness is decided by content hashes recorded in data.db, not mtimes,
+# so a checkout or fresh clone with identical content does not reload, and
+# only the tables whose files changed are reloaded
+# (see scripts/saf_diffable/freshness.py). The diffable files are validated
+# before anything is reloaded.
+#
 
 set -euo pipefail
 
@@ -11,25 +17,5 @@ readonly PROJECT_ROOT="$(dirname "$SCRIPT_DIR")"
 readonly DB_PATH="$PROJECT_ROOT/.pocketbase/pb_data/data.db"
 readonly DIFFABLE_DIR="$PROJECT_ROOT/.pocketbase/pb_data/diffable"
 
-# If no database exists, restore from diffable
-if [ ! -f "$DB_PATH" ]; then
-    echo "→ No data.db found, restoring from diffable/..."
-    cd "$PROJECT_ROOT"
-    npx tsx scripts/db-diffable.ts load "$DB_PATH" "$DIFFABLE_DIR"
-    echo "✓ Database restored"
-    exit 0
-fi
-
-# Compare modification times: if any diffable file is newer than data.db, reload
-db_mtime=$(stat -f "%m" "$DB_PATH" 2>/dev/null || stat -c "%Y" "$DB_PATH" 2>/dev/null)
-newest_diffable=$(find "$DIFFABLE_DIR" -name "*.ndjson" -newer "$DB_PATH" 2>/dev/null | head -1)
-
-if [ -n "$newest_diffable" ]; then
-    echo "→ diffable/ has changes newer than data.db, reloading..."
-    rm -f "$DB_PATH" "${DB_PATH}-wal" "${DB_PATH}-shm"
-    cd "$PROJECT_ROOT"
-    npx tsx scripts/db-diffable.ts load "$DB_PATH" "$DIFFABLE_DIR"
-    echo "✓ Database reloaded from diffable/"
-else
-    echo "✓ data.db is up to date with diffable/"
-fi
+cd "$PROJECT_ROOT"
+python3 scripts/saf-py db-freshness --validate "$DB_PATH" "$DIFFABLE_DIR"
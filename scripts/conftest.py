@@ -0,0 +1,15 @@
+"""Fixtures shared by the saf_content and saf_pb tests: a writable copy of the corpus."""
+
+import shutil
+
+import pytest
+
+from saf_content.corpus import DEFAULT_DATA_DIR
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    """Writable copy of content/data, without leftover .new/.bak files from local runs."""
+    target = tmp_path / 'data'
+    shutil.copytree(DEFAULT_DATA_DIR, target, ignore=shutil.ignore_patterns('*.new', '*.bak.*'))
+    return target
@@ -5,35 +5,29 @@ Simplified version - uses Pocketbase auto-generated IDs and timestamps
 Field options are DIRECT properties, not nested in "options"
 """
 
-from pocketbase import PocketBase
 import sys
 
-client = PocketBase('http://127.0.0.1:8090')
+from saf_pb.client import connect
+from saf_pb.http import ApiError
 
 # Authenticate
 try:
-    admin = client.admins.auth_with_password('admin@localhost.com', 'test1234567')
+    pb = connect()
     print("✓ Authenticated\n")
-except Exception as e:
+except (ApiError, OSError) as e:
     print(f"❌ Authentication failed: {e}")
     sys.exit(1)
 
-# Delete existing non-system collections (using TypeScript utility)
-print("Cleaning up existing collections (using TypeScript utility)...")
-import subprocess
+# Delete existing non-system collections
+print("Cleaning up existing collections...")
 try:
-    result = subprocess.run(
-        ['pnpm', 'tsx', 'scripts/delete-pocketbase-collections.ts'],
-        capture_output=True,
-        text=True,
-        timeout=10
-    )
-    if result.returncode == 0:
-        print(result.stdout)
-    else:
-        print(f"  ⚠️  Cleanup warning: {result.stderr}")
-except Exception as e:
-    print(f"  ⚠️  Cleanup error: {e}")
+    for name, error in pb.collections.delete_many():
+        if error is None:
+            print(f"  ✓ {name} deleted")
+        else:
+            print(f"  ⚠️  Skipping {name}: {error}")
+except (ApiError, OSError) as e:
+    print(f"  ⚠️  Cleanup warning: {e}")
 
 print("\n" + "="*60)
 print("PHASE 1: Creating base collections (no FKs)")
@@ -44,7 +38,7 @@ collection_ids = {}
 # 1. Tags
 print("Creating tags collection...")
 try:
-    tags_collection = client.collections.create({
+    tags_collection = pb.collections.create({
         "name": "tags",
         "type": "base",
         "fields": [
@@ -54,25 +48,15 @@ try:
             {"name": "status", "type": "text", "required": False}
         ]
     })
-    collection_ids['tags'] = tags_collection.id
-    print(f"  ✓ tags (ID: {tags_collection.id})")
-except Exception as e:
-    print(f"  ⚠️  SDK error: {str(e)[:100]}")
-    # Manually get ID
-    try:
-        colls = subprocess.run(['pnpm', 'tsx', 'scripts/list-collections.ts'], capture_output=True, text=True)
-        # Parse output for tags ID
-        for line in colls.stdout.split('\n'):
-            if 'tags' in line:
-                print(f"  → Collection created despite SDK error")
-                break
-    except:
-        pass
+    collection_ids['tags'] = tags_collection['id']
+    print(f"  ✓ tags (ID: {tags_collection['id']})")
+except ApiError as e:
+    print(f"  ⚠️  Error: {e} {e.data or ''}")
 
 # 2. Organizations
 print("Creating organizations collection...")
 try:
-    org_collection = client.collections.create({
+    org_collection = pb.collections.create({
         "name": "organizations",
         "type": "base",
         "fields": [
@@ -84,15 +68,15 @@ try:
             {"name": "status", "type": "text", "required": False}
         ]
     })
-    collection_ids['organizations'] = org_collection.id
-    print(f"  ✓ organizations (ID: {org_collection.id})")
-except Exception as e:
-    print(f"  ⚠️  SDK error: {str(e)[:100]}")
+    collection_ids['organizations'] = org_collection['id']
+    print(f"  ✓ organizations (ID: {org_collection['id']})")
+except ApiError as e:
+    print(f"  ⚠️  Error: {e} {e.data or ''}")
 
 # 3. Technologies
 print("Creating technologies collection...")
 try:
-    tech_collection = client.collections.create({
+    tech_collection = pb.collections.create({
         "name": "technologies",
         "type": "base",
         "fields": [
@@ -106,15 +90,15 @@ try:
             {"name": "status", "type": "text", "required": False}
         ]
     })
-    collection_ids['technologies'] = tech_collection.id
-    print(f"  ✓ technologies (ID: {tech_collection.id})")
-except Exception as e:
-    print(f"  ⚠️  SDK error: {str(e)[:100]}")
+    collection_ids['technologies'] = tech_collection['id']
+    print(f"  ✓ technologies (ID: {tech_collection['id']})")
+except ApiError as e:
+    print(f"  ⚠️  Error: {e} {e.data or ''}")
 
 # 4. Standards
 print("Creating standards collection...")
 try:
-    standards_collection = client.collections.create({
+    standards_collection = pb.collections.create({
         "name": "standards",
         "type": "base",
         "fields": [
@@ -130,15 +114,15 @@ try:
             {"name": "status", "type": "text", "required": False}
         ]
     })
-    collection_ids['standards'] = standards_collection.id
-    print(f"  ✓ standards (ID: {standards_collection.id})")
-except Exception as e:
-    print(f"  ⚠️  SDK error: {str(e)[:100]}")
+    collection_ids['standards'] = standards_collection['id']
+    print(f"  ✓ standards (ID: {standards_collection['id']})")
+except ApiError as e:
+    print(f"  ⚠️  Error: {e} {e.data or ''}")
 
 # 5. Capabilities
 print("Creating capabilities collection...")
 try:
-    capabilities_collection = client.collections.create({
+    capabilities_collection = pb.collections.create({
         "name": "capabilities",
         "type": "base",
         "fields": [
@@ -149,39 +133,14 @@ try:
             {"name": "status", "type": "text", "required": False}
         ]
     })
-    collection_ids['capabilities'] = capabilities_collection.id
-    print(f"  ✓ capabilities (ID: {capabilities_collection.id})")
-except Exception as e:
-    print(f"  ⚠️  SDK error: {str(e)[:100]}")
+    collection_ids['capabilities'] = capabilities_collection['id']
+    print(f"  ✓ capabilities (ID: {capabilities_collection['id']})")
+except ApiError as e:
+    print(f"  ⚠️  Error: {e} {e.data or ''}")
 
-# Fetch collection IDs via TypeScript (SDK has parsing issues)
-print("\nFetching collection IDs for FK references (via TypeScript)...")
-try:
-    result = subprocess.run(
-        ['pnpm', 'tsx', '-e', '''
-import PocketBase from 'pocketbase'
-const pb = new PocketBase('http://127.0.0.1:8090')
-await pb.admins.authWithPassword('admin@localhost.com', 'test1234567')
-const collections = await pb.collections.getFullList()
-const needed = ['organizations', 'technologies', 'standards', 'tags', 'teams']
-for (const c of collections) {
-  if (needed.includes(c.name)) {
-    console.log(`${c.name}:${c.id}`)
-  }
-}
-        '''],
-        capture_output=True,
-        text=True,
-        timeout=10
-    )
-    for line in result.stdout.strip().split('\n'):
-        if ':' in line:
-            name, coll_id = line.split(':')
-            collection_ids[name] = coll_id
-            print(f"  {name}: {coll_id}")
-except Exception as e:
-    print(f"  ⚠️  Could not fetch IDs: {e}")
-    print("  → Proceeding with manual ID tracking")
+# Fetch collection IDs for FK references (also covers collections that already existed)
+print("\nFetching collection IDs for FK references...")
+collection_ids.update(pb.collections.ids())
 
 print("\n" + "="*60)
 print("PHASE 2: Creating collections with FK relations")
@@ -190,7 +149,7 @@ print("="*60 + "\n")
 # 6. Teams (FK: organization)
 print("Creating teams collection...")
 try:
-    teams_collection = client.collections.create({
+    teams_collection = pb.collections.create({
         "name": "teams",
         "type": "base",
         "fields": [
@@ -208,39 +167,18 @@ try:
             {"name": "status", "type": "text", "required": False}
         ]
     })
-    collection_ids['teams'] = teams_collection.id
-    print(f"  ✓ teams (ID: {teams_collection.id})")
-except Exception as e:
-    print(f"  ⚠️  SDK error: {str(e)[:100]}")
+    collection_ids['teams'] = teams_collection['id']
+    print(f"  ✓ teams (ID: {teams_collection['id']})")
+except ApiError as e:
+    print(f"  ⚠️  Error: {e} {e.data or ''}")
 
 # Update collection IDs to include teams
-try:
-    result = subprocess.run(
-        ['pnpm', 'tsx', '-e', '''
-import PocketBase from 'pocketbase'
-const pb = new PocketBase('http://127.0.0.1:8090')
-await pb.admins.authWithPassword('admin@localhost.com', 'test1234567')
-const collections = await pb.collections.getFullList()
-for (const c of collections) {
-  if (c.name === 'teams') {
-    console.log(`teams:${c.id}`)
-  }
-}
-        '''],
-        capture_output=True,
-        text=True,
-        timeout=10
-    )
-    for line in result.stdout.strip().split('\n'):
-        if 'teams:' in line:
-            collection_ids['teams'] = line.split(':')[1]
-except:
-    pass
+collection_ids.update(pb.collections.ids())
 
 # 7. Profiles (FKs: technology, organization, team, standard)
 print("Creating profiles collection...")
 try:
-    profiles_collection = client.collections.create({
+    profiles_collection = pb.collections.create({
         "name": "profiles",
         "type": "base",
         "fields": [
@@ -291,15 +229,15 @@ try:
             {"name": "status", "type": "text", "required": False}
         ]
     })
-    collection_ids['profiles'] = profiles_collection.id
-    print(f"  ✓ profiles (ID: {profiles_collection.id})")
-except Exception as e:
-    print(f"  ⚠️  SDK error: {str(e)[:100]}")
+    collection_ids['profiles'] = profiles_collection['id']
+    print(f"  ✓ profiles (ID: {profiles_collection['id']})")
+except ApiError as e:
+    print(f"  ⚠️  Error: {e} {e.data or ''}")
 
 # 8. Hardening Profiles (FKs: technology, organization, team, standard)
 print("Creating hardening_profiles collection...")
 try:
-    hardening_collection = client.collections.create({
+    hardening_collection = pb.collections.create({
         "name": "hardening_profiles",
         "type": "base",
         "fields": [
@@ -351,15 +289,15 @@ try:
             {"name": "status", "type": "text", "required": False}
         ]
     })
-    collection_ids['hardening_profiles'] = hardening_collection.id
-    print(f"  ✓ hardening_profiles (ID: {hardening_collection.id})")
-except Exception as e:
-    print(f"  ⚠️  SDK error: {str(e)[:100]}")
+    collection_ids['hardening_profiles'] = hardening_collection['id']
+    print(f"  ✓ hardening_profiles (ID: {hardening_collection['id']})")
+except ApiError as e:
+    print(f"  ⚠️  Error: {e} {e.data or ''}")
 
 # 9. Tools (FKs: technology, organization)
 print("Creating tools collection...")
 try:
-    tools_collection = client.collections.create({
+    tools_collection = pb.collections.create({
         "name": "tools",
         "type": "base",
         "fields": [
@@ -390,35 +328,13 @@ try:
             {"name": "status", "type": "text", "required": False}
         ]
     })
-    collection_ids['tools'] = tools_collection.id
-    print(f"  ✓ tools (ID: {tools_collection.id})")
-except Exception as e:
-    print(f"  ⚠️  SDK error: {str(e)[:100]}")
+    collection_ids['tools'] = tools_collection['id']
+    print(f"  ✓ tools (ID: {tools_collection['id']})")
+except ApiError as e:
+    print(f"  ⚠️  Error: {e} {e.data or ''}")
 
 # Fetch profiles and hardening_profiles IDs
-try:
-    result = subprocess.run(
-        ['pnpm', 'tsx', '-e', '''
-import PocketBase from 'pocketbase'
-const pb = new PocketBase('http://127.0.0.1:8090')
-await pb.admins.authWithPassword('admin@localhost.com', 'test1234567')
-const collections = await pb.collections.getFullList()
-for (const c of collections) {
-  if (c.name === 'profiles' || c.name === 'hardening_profiles') {
-    console.log(`${c.name}:${c.id}`)
-  }
-}
-        '''],
-        capture_output=True,
-        text=True,
-        timeout=10
-    )
-    for line in result.stdout.strip().split('\n'):
-        if ':' in line:
-            name, coll_id = line.split(':')
-            collection_ids[name] = coll_id
-except:
-    pass
+collection_ids.update(pb.collections.ids())
 
 print("\n" + "="*60)
 print("PHASE 3: Creating junction tables (many-to-many)")
@@ -427,7 +343,7 @@ print("="*60 + "\n")
 # 10. Profiles Tags Junction Table
 print("Creating profiles_tags junction table...")
 try:
-    profiles_tags_collection = client.collections.create({
+    profiles_tags_collection = pb.collections.create({
         "name": "profiles_tags",
         "type": "base",
         "fields": [
@@ -449,14 +365,14 @@ try:
             }
         ]
     })
-    print(f"  ✓ profiles_tags (ID: {profiles_tags_collection.id})")
-except Exception as e:
-    print(f"  ⚠️  SDK error: {str(e)[:100]}")
+    print(f"  ✓ profiles_tags (ID: {profiles_tags_collection['id']})")
+except ApiError as e:
+    print(f"  ⚠️  Error: {e} {e.data or ''}")
 
 # 11. Hardening Profiles Tags Junction Table
 print("Creating hardening_profiles_tags junction table...")
 try:
-    hardening_tags_collection = client.collections.create({
+    hardening_tags_collection = pb.collections.create({
         "name": "hardening_profiles_tags",
         "type": "base",
         "fields": [
@@ -478,14 +394,14 @@ try:
             }
         ]
     })
-    print(f"  ✓ hardening_profiles_tags (ID: {hardening_tags_collection.id})")
-except Exception as e:
-    print(f"  ⚠️  SDK error: {str(e)[:100]}")
+    print(f"  ✓ hardening_profiles_tags (ID: {hardening_tags_collection['id']})")
+except ApiError as e:
+    print(f"  ⚠️  Error: {e} {e.data or ''}")
 
 # 12. Validation to Hardening Junction Table
 print("Creating validation_to_hardening junction table...")
 try:
-    validation_hardening_collection = client.collections.create({
+    validation_hardening_collection = pb.collections.create({
         "name": "validation_to_hardening",
         "type": "base",
         "fields": [
@@ -507,17 +423,16 @@ try:
             }
         ]
     })
-    print(f"  ✓ validation_to_hardening (ID: {validation_hardening_collection.id})")
-except Exception as e:
-    print(f"  ⚠️  SDK error: {str(e)[:100]}")
+    print(f"  ✓ validation_to_hardening (ID: {validation_hardening_collection['id']})")
+except ApiError as e:
+    print(f"  ⚠️  Error: {e} {e.data or ''}")
 
 print("\n" + "="*60)
 print("✅ SUCCESS! All 12 collections created")
 print("="*60)
-print("\nVerify in Pocketbase UI: http://localhost:8090/_/")
+print(f"\nVerify in Pocketbase UI: {pb.url}/_/")
 print("\nCollections created:")
 print("  Base: tags, organizations, technologies, standards, capabilities")
 print("  With FKs: teams, profiles, hardening_profiles, tools")
 print("  Junction: profiles_tags, hardening_profiles_tags, validation_to_hardening")
-print("\nNote: Python SDK parsing errors are expected - collections ARE created successfully")
 print("="*60 + "\n")
@@ -5,36 +5,33 @@ Based on Drizzle schema.ts - creates collections in correct dependency order
 Key insight: Field options are DIRECT properties, not nested in "options"
 """
 
-from pocketbase import PocketBase
 import sys
 
-client = PocketBase('http://127.0.0.1:8090')
+from saf_pb.client import connect
+from saf_pb.http import ApiError
 
 # Authenticate
 try:
-    admin = client.admins.auth_with_password('admin@localhost.com', 'test1234567')
+    pb = connect()
     print("✓ Authenticated\n")
-except Exception as e:
+except (ApiError, OSError) as e:
     print(f"❌ Authentication failed: {e}")
     sys.exit(1)
 
 # Delete existing non-system collections
 print("Cleaning up existing collections...")
+collection_names = [
+    'tags', 'organizations', 'technologies', 'standards', 'capabilities',
+    'teams', 'profiles', 'hardening_profiles', 'tools',
+    'profiles_tags', 'hardening_profiles_tags', 'validation_to_hardening'
+]
 try:
-    collections = client.collections.get_full_list()
-    collection_names = [
-        'tags', 'organizations', 'technologies', 'standards', 'capabilities',
-        'teams', 'profiles', 'hardening_profiles', 'tools',
-        'profiles_tags', 'hardening_profiles_tags', 'validation_to_hardening'
-    ]
-    for coll in collections:
-        if not coll.name.startswith('_') and coll.name in collection_names:
-            try:
-                client.collections.delete(coll.id)
-                print(f"  ✓ Deleted {coll.name}")
-            except Exception as e:
-                print(f"  ⚠️  Could not delete {coll.name}: {e}")
-except Exception as e:
+    for name, error in pb.collections.delete_many(collection_names):
+        if error is None:
+            print(f"  ✓ Deleted {name}")
+        else:
+            print(f"  ⚠️  Could not delete {name}: {error}")
+except (ApiError, OSError) as e:
     print(f"  ⚠️  Cleanup warning: {e}")
 
 print("\n" + "="*60)
@@ -44,7 +41,7 @@ print("="*60 + "\n")
 # 1. Tags
 print("Creating tags collection...")
 try:
-    tags_collection = client.collections.create({
+    tags_collection = pb.collections.create({
         "name": "tags",
         "type": "base",
         "fields": [
@@ -71,17 +68,16 @@ try:
             }
         ]
     })
-    tags_id = tags_collection.id
+    tags_id = tags_collection['id']
     print(f"  ✓ tags (ID: {tags_id})")
-except Exception as e:
-    print(f"  ⚠️  SDK error (but collection created): {str(e)[:80]}")
-    # Collection is created despite SDK parsing error
+except ApiError as e:
+    print(f"  ⚠️  Error: {e} {e.data or ''}")
     tags_id = None
 
 # 2. Organizations
 print("Creating organizations collection...")
 try:
-    org_collection = client.collections.create({
+    org_collection = pb.collections.create({
         "name": "organizations",
         "type": "base",
         "fields": [
@@ -120,16 +116,16 @@ try:
             }
         ]
     })
-    org_id = org_collection.id
+    org_id = org_collection['id']
     print(f"  ✓ organizations (ID: {org_id})")
-except Exception as e:
-    print(f"  ⚠️  SDK error (but collection created): {str(e)[:80]}")
+except ApiError as e:
+    print(f"  ⚠️  Error: {e} {e.data or ''}")
     org_id = None
 
 # 3. Technologies
 print("Creating technologies collection...")
 try:
-    tech_collection = client.collections.create({
+    tech_collection = pb.collections.create({
         "name": "technologies",
         "type": "base",
         "fields": [
@@ -178,16 +174,16 @@ try:
             }
         ]
     })
-    tech_id = tech_collection.id
+    tech_id = tech_collection['id']
     print(f"  ✓ technologies (ID: {tech_id})")
-except Exception as e:
-    print(f"  ⚠️  SDK error (but collection created): {str(e)[:80]}")
+except ApiError as e:
+    print(f"  ⚠️  Error: {e} {e.data or ''}")
     tech_id = None
 
 # 4. Standards
 print("Creating standards collection...")
 try:
-    standards_collection = client.collections.create({
+    standards_collection = pb.collections.create({
         "name": "standards",
         "type": "base",
         "fields": [
@@ -246,16 +242,16 @@ try:
             }
         ]
     })
-    standards_id = standards_collection.id
+    standards_id = standards_collection['id']
     print(f"  ✓ standards (ID: {standards_id})")
-except Exception as e:
-    print(f"  ⚠️  SDK error (but collection created): {str(e)[:80]}")
+except ApiError as e:
+    print(f"  ⚠️  Error: {e} {e.data or ''}")
     standards_id = None
 
 # 5. Capabilities
 print("Creating capabilities collection...")
 try:
-    capabilities_collection = client.collections.create({
+    capabilities_collection = pb.collections.create({
         "name": "capabilities",
         "type": "base",
         "fields": [
@@ -289,20 +285,20 @@ try:
             }
         ]
     })
-    capabilities_id = capabilities_collection.id
+    capabilities_id = capabilities_collection['id']
     print(f"  ✓ capabilities (ID: {capabilities_id})")
-except Exception as e:
-    print(f"  ⚠️  SDK error (but collection created): {str(e)[:80]}")
+except ApiError as e:
+    print(f"  ⚠️  Error: {e} {e.data or ''}")
     capabilities_id = None
 
-# Get collection IDs for FK references (needed because SDK parsing errors)
+# Get collection IDs for FK references (also covers collections that already existed)
 print("\nFetching collection IDs for FK references...")
-collections = client.collections.get_full_list()
+collections = pb.collections.list()
 collection_ids = {}
 for coll in collections:
-    if coll.name in ['organizations', 'technologies', 'standards', 'tags']:
-        collection_ids[coll.name] = coll.id
-        print(f"  {coll.name}: {coll.id}")
+    if coll['name'] in ['organizations', 'technologies', 'standards', 'tags']:
+        collection_ids[coll['name']] = coll['id']
+        print(f"  {coll['name']}: {coll['id']}")
 
 print("\n" + "="*60)
 print("PHASE 2: Creating collections with FK relations")
@@ -311,7 +307,7 @@ print("="*60 + "\n")
 # 6. Teams (FK: organization)
 print("Creating teams collection...")
 try:
-    teams_collection = client.collections.create({
+    teams_collection = pb.collections.create({
         "name": "teams",
         "type": "base",
         "fields": [
@@ -348,22 +344,22 @@ try:
             }
         ]
     })
-    teams_id = teams_collection.id
+    teams_id = teams_collection['id']
     print(f"  ✓ teams (ID: {teams_id})")
-except Exception as e:
-    print(f"  ⚠️  SDK error (but collection created): {str(e)[:80]}")
+except ApiError as e:
+    print(f"  ⚠️  Error: {e} {e.data or ''}")
     teams_id = None
 
 # Refresh collection IDs to include teams
-collections = client.collections.get_full_list()
+collections = pb.collections.list()
 for coll in collections:
-    if coll.name == 'teams':
-        collection_ids['teams'] = coll.id
+    if coll['name'] == 'teams':
+        collection_ids['teams'] = coll['id']
 
 # 7. Profiles (FKs: technology, organization, team, standard)
 print("Creating profiles collection...")
 try:
-    profiles_collection = client.collections.create({
+    profiles_collection = pb.collections.create({
         "name": "profiles",
         "type": "base",
         "fields": [
@@ -469,16 +465,16 @@ try:
             }
         ]
     })
-    profiles_id = profiles_collection.id
+    profiles_id = profiles_collection['id']
     print(f"  ✓ profiles (ID: {profiles_id})")
-except Exception as e:
-    print(f"  ⚠️  SDK error (but collection created): {str(e)[:80]}")
+except ApiError as e:
+    print(f"  ⚠️  Error: {e} {e.data or ''}")
     profiles_id = None
 
 # 8. Hardening Profiles (FKs: technology, organization, team, standard)
 print("Creating hardening_profiles collection...")
 try:
-    hardening_collection = client.collections.create({
+    hardening_collection = pb.collections.create({
         "name": "hardening_profiles",
         "type": "base",
         "fields": [
@@ -589,16 +585,16 @@ try:
             }
         ]
     })
-    hardening_id = hardening_collection.id
+    hardening_id = hardening_collection['id']
     print(f"  ✓ hardening_profiles (ID: {hardening_id})")
-except Exception as e:
-    print(f"  ⚠️  SDK error (but collection created): {str(e)[:80]}")
+except ApiError as e:
+    print(f"  ⚠️  Error: {e} {e.data or ''}")
     hardening_id = None
 
 # 9. Tools (FKs: technology, organization)
 print("Creating tools collection...")
 try:
-    tools_collection = client.collections.create({
+    tools_collection = pb.collections.create({
         "name": "tools",
         "type": "base",
         "fields": [
@@ -668,17 +664,17 @@ try:
             }
         ]
     })
-    tools_id = tools_collection.id
+    tools_id = tools_collection['id']
     print(f"  ✓ tools (ID: {tools_id})")
-except Exception as e:
-    print(f"  ⚠️  SDK error (but collection created): {str(e)[:80]}")
+except ApiError as e:
+    print(f"  ⚠️  Error: {e} {e.data or ''}")
     tools_id = None
 
 # Refresh collection IDs to include profiles and hardening_profiles
-collections = client.collections.get_full_list()
+collections = pb.collections.list()
 for coll in collections:
-    if coll.name in ['profiles', 'hardening_profiles']:
-        collection_ids[coll.name] = coll.id
+    if coll['name'] in ['profiles', 'hardening_profiles']:
+        collection_ids[coll['name']] = coll['id']
 
 print("\n" + "="*60)
 print("PHASE 3: Creating junction tables (many-to-many)")
@@ -687,7 +683,7 @@ print("="*60 + "\n")
 # 10. Profiles Tags Junction Table
 print("Creating profiles_tags junction table...")
 try:
-    profiles_tags_collection = client.collections.create({
+    profiles_tags_collection = pb.collections.create({
         "name": "profiles_tags",
         "type": "base",
         "fields": [
@@ -709,14 +705,14 @@ try:
             }
         ]
     })
-    print(f"  ✓ profiles_tags (ID: {profiles_tags_collection.id})")
-except Exception as e:
-    print(f"  ⚠️  SDK error (but collection created): {str(e)[:80]}")
+    print(f"  ✓ profiles_tags (ID: {profiles_tags_collection['id']})")
+except ApiError as e:
+    print(f"  ⚠️  Error: {e} {e.data or ''}")
 
 # 11. Hardening Profiles Tags Junction Table
 print("Creating hardening_profiles_tags junction table...")
 try:
-    hardening_tags_collection = client.collections.create({
+    hardening_tags_collection = pb.collections.create({
         "name": "hardening_profiles_tags",
         "type": "base",
         "fields": [
@@ -738,14 +734,14 @@ try:
             }
         ]
     })
-    print(f"  ✓ hardening_profiles_tags (ID: {hardening_tags_collection.id})")
-except Exception as e:
-    print(f"  ⚠️  SDK error (but collection created): {str(e)[:80]}")
+    print(f"  ✓ hardening_profiles_tags (ID: {hardening_tags_collection['id']})")
+except ApiError as e:
+    print(f"  ⚠️  Error: {e} {e.data or ''}")
 
 # 12. Validation to Hardening Junction Table
 print("Creating validation_to_hardening junction table...")
 try:
-    validation_hardening_collection = client.collections.create({
+    validation_hardening_collection = pb.collections.create({
         "name": "validation_to_hardening",
         "type": "base",
         "fields": [
@@ -767,17 +763,16 @@ try:
             }
         ]
     })
-    print(f"  ✓ validation_to_hardening (ID: {validation_hardening_collection.id})")
-except Exception as e:
-    print(f"  ⚠️  SDK error (but collection created): {str(e)[:80]}")
+    print(f"  ✓ validation_to_hardening (ID: {validation_hardening_collection['id']})")
+except ApiError as e:
+    print(f"  ⚠️  Error: {e} {e.data or ''}")
 
 print("\n" + "="*60)
 print("✅ SUCCESS! All 12 collections created")
 print("="*60)
-print("\nVerify in Pocketbase UI: http://localhost:8090/_/")
+print(f"\nVerify in Pocketbase UI: {pb.url}/_/")
 print("\nCollections created:")
 print("  Base: tags, organizations, technologies, standards, capabilities")
 print("  With FKs: teams, profiles, hardening_profiles, tools")
 print("  Junction: profiles_tags, hardening_profiles_tags, validation_to_hardening")
-print("\nNote: Python SDK parsing errors are expected - collections ARE created successfully")
 print("="*60 + "\n")
@@ -4,28 +4,19 @@ Create Pocketbase collections with CORRECT field structure
 Key insight from research: field options are DIRECT properties, not nested in "options"
 """
 
-from pocketbase import PocketBase
+from saf_pb.client import connect
 
-client = PocketBase('http://127.0.0.1:8090')
-admin = client.admins.auth_with_password('admin@localhost.com', 'test1234567')
+pb = connect()
 print("✓ Authenticated\n")
 
 # First delete existing collections
 print("Deleting existing test collections...")
-try:
-    collections = client.collections.get_full_list()
-    for coll in collections:
-        if not coll.name.startswith('_') and coll.name in ['organizations', 'profiles', 'tags']:
-            try:
-                client.collections.delete(coll.id)
-                print(f"  ✓ Deleted {coll.name}")
-            except:
-                pass
-except:
-    pass
+for name, error in pb.collections.delete_many(['organizations', 'profiles', 'tags']):
+    if error is None:
+        print(f"  ✓ Deleted {name}")
 
 print("\nCreating organizations collection with CORRECT structure...")
-org_collection = client.collections.create({
+org_collection = pb.collections.create({
     "name": "organizations",
     "type": "base",
     "fields": [
@@ -43,35 +34,31 @@ org_collection = client.collections.create({
         }
     ]
 })
-org_id = org_collection.id
+org_id = org_collection['id']
 print(f"  ✓ Created (ID: {org_id})")
 
 print("\nCreating profiles collection with relation...")
-try:
-    profiles_collection = client.collections.create({
-        "name": "profiles",
-        "type": "base",
-        "fields": [
-            {
-                "name": "name",
-                "type": "text",
-                "required": True,
-                "min": 1,
-                "max": 200
-            },
-            {
-                "name": "organization",
-                "type": "relation",
-                "required": False,
-                "collectionId": org_id,  # DIRECT property, not in options!
-                "cascadeDelete": False,
-                "maxSelect": 1
-            }
-        ]
-    })
-except Exception as e:
-    # SDK has parsing issues but collection IS created
-    print(f"  ⚠️  SDK error reading response (but collection created): {str(e)[:80]}")
+pb.collections.create({
+    "name": "profiles",
+    "type": "base",
+    "fields": [
+        {
+            "name": "name",
+            "type": "text",
+            "required": True,
+            "min": 1,
+            "max": 200
+        },
+        {
+            "name": "organization",
+            "type": "relation",
+            "required": False,
+            "collectionId": org_id,  # DIRECT property, not in options!
+            "cascadeDelete": False,
+            "maxSelect": 1
+        }
+    ]
+})
 print(f"  ✓ Created with relation")
 
 print("\nAdding test organizations...")
@@ -83,12 +70,12 @@ orgs = [
 
 org_ids = []
 for org_data in orgs:
-    org = client.collection("organizations").create(org_data)
-    org_ids.append(org.id)
+    org = pb.collection("organizations").create(org_data)
+    org_ids.append(org['id'])
     print(f"  ✓ {org_data['name']}")
 
 print("\nAdding test profile...")
-profile = client.collection("profiles").create({
+profile = pb.collection("profiles").create({
     "name": "RHEL 8 STIG",
     "organization": org_ids[0]
 })
@@ -97,7 +84,7 @@ print(f"  ✓ Profile created")
 print("\n" + "="*60)
 print("✅ SUCCESS!")
 print("="*60)
-print("\nGo to http://localhost:8090/_/ and:")
+print(f"\nGo to {pb.url}/_/ and:")
 print("1. Open 'organizations' - you should see 3 orgs with names")
 print("2. Open 'profiles' - click 'New record'")
 print("3. Check the 'organization' dropdown")
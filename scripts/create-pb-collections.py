@@ -1,10 +1,8 @@
 #!/usr/bin/env python3
-from pocketbase import PocketBase
+from saf_pb.client import connect
+from saf_pb.http import ApiError
 
-client = PocketBase('http://127.0.0.1:8090')
-
-# Auth as admin
-admin = client.admins.auth_with_password('admin@localhost.com', 'test1234567')
+pb = connect()
 print("✓ Authenticated\n")
 
 collections = [
@@ -33,9 +31,9 @@ collections = [
 for coll in collections:
     print(f"Creating {coll['name']}...")
     try:
-        result = client.collections.create(coll)
+        pb.collections.create(coll)
         print(f"  ✓ Created")
-    except Exception as e:
+    except ApiError as e:
         print(f"  ❌ Error: {e}")
 
-print("\n✅ Done! Check http://localhost:8090/_/")
+print(f"\n✅ Done! Check {pb.url}/_/")
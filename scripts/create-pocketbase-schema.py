@@ -4,22 +4,10 @@ Create Pocketbase collections from our Drizzle schema
 Run: python3 scripts/create-pocketbase-schema.py
 """
 
-import requests
-import json
+from saf_pb.client import connect
+from saf_pb.http import ApiError
 
-BASE_URL = "http://127.0.0.1:8090"
-ADMIN_EMAIL = "admin@localhost.com"
-ADMIN_PASSWORD = "test1234567"
-
-# Authenticate (admin auth endpoint)
-auth_response = requests.post(
-    f"{BASE_URL}/api/admins/auth-via-email",
-    json={"email": ADMIN_EMAIL, "password": ADMIN_PASSWORD}
-)
-auth_response.raise_for_status()
-token = auth_response.json()["token"]
-
-headers = {"Authorization": token}
+pb = connect()
 
 print("✓ Authenticated\n")
 print("Creating collections...\n")
@@ -149,18 +137,14 @@ collections = [
 # Create each collection
 for collection in collections:
     print(f"Creating {collection['name']}...")
-    response = requests.post(
-        f"{BASE_URL}/api/collections",
-        headers=headers,
-        json=collection
-    )
-    if response.status_code != 200:
-        print(f"  ❌ Error: {response.text}")
-    else:
+    try:
+        pb.collections.create(collection)
         print(f"  ✓ {collection['name']} created")
+    except ApiError as e:
+        print(f"  ❌ Error: {e} {e.data or ''}")
 
 print("\n✅ All collections created!")
-print("\nRefresh your admin UI at http://localhost:8090/_/")
+print(f"\nRefresh your admin UI at {pb.url}/_/")
 print("\nNote: Foreign key relations need to be added manually in the UI:")
 print("  - teams.organization → organizations")
 print("  - profiles.technology → technologies")
@@ -27,11 +27,13 @@ export interface TableMetadata {
   schema: string
 }
 
-// Tables to skip (SQLite internal tables that can't be restored)
+// Tables to skip (SQLite internal tables that can't be restored, and the
+// checksum table written by scripts/saf_diffable/freshness.py)
 const SKIP_TABLES = new Set([
   'sqlite_stat1',
   'sqlite_stat4',
   'sqlite_sequence',
+  '_saf_diffable',
 ])
 
 /**
@@ -0,0 +1,20 @@
+#!/usr/bin/env python3
+"""
+Export Pocketbase records back to content/data YAML.
+
+Collections are fetched with concurrent page requests and mapped onto the
+existing YAML files: entities keep their file and position, new entities
+are appended to the file matching their standard/technology, files are
+written as canonical YAML (see saf_content/canonical.py), and only files
+whose content actually changed are rewritten.
+
+Usage:
+  python scripts/export-content.py --dry-run          # Show which files would change
+  python scripts/export-content.py                    # Write changes to content/data
+  python scripts/export-content.py --only profiles    # Export one collection
+"""
+
+from saf_pb.export import main
+
+if __name__ == '__main__':
+    main()
@@ -3,11 +3,13 @@
 # Export Pocketbase database to git-friendly format
 #
 # Run this after making changes in Pocketbase to prepare for commit.
+# Only tables whose rows changed are rewritten (see scripts/saf_diffable/dump.py).
 #
 # Usage:
 #   ./scripts/export-db.sh              Export database
-#   ./scripts/export-db.sh --dry-run    Preview what would happen
+#   ./scripts/export-db.sh --dry-run    Show which tables changed, write nothing
 #   ./scripts/export-db.sh --diff       Export and show git diff
+#   ./scripts/export-db.sh --full       Rewrite every table
 #
 
 set -euo pipefail
@@ -42,6 +44,7 @@ info()  { echo -e "${BLUE}→${NC} $*"; }
 
 DRY_RUN=false
 SHOW_DIFF=false
+FULL=false
 
 # -----------------------------------------------------------------------------
 # Argument Parsing
@@ -57,6 +60,10 @@ while [[ $# -gt 0 ]]; do
             SHOW_DIFF=true
             shift
             ;;
+        -f|--full)
+            FULL=true
+            shift
+            ;;
         -h|--help)
             cat << 'EOF'
 Export Pocketbase database to git-friendly format
@@ -65,8 +72,9 @@ USAGE:
     ./scripts/export-db.sh [OPTIONS]
 
 OPTIONS:
-    -n, --dry-run   Preview what would happen
+    -n, --dry-run   Show which tables changed, write nothing
     -d, --diff      Export and show git diff of changes
+    -f, --full      Rewrite every table, even if unchanged
     -h, --help      Show this help
 
 WORKFLOW:
@@ -99,12 +107,12 @@ fi
 echo "=========================================="
 echo ""
 
-# Check prerequisites (tsx for TypeScript db-diffable script)
-if [ ! -f "$PROJECT_ROOT/node_modules/.bin/tsx" ]; then
-    error "tsx not found - run pnpm install first"
+# Check prerequisites (python3 for scripts/saf-py db-dump)
+if ! command -v python3 &> /dev/null; then
+    error "python3 not found"
     exit 1
 fi
-ok "tsx available"
+ok "python3 available"
 
 # Check database exists
 if [ ! -f "$DB_PATH" ]; then
@@ -122,21 +130,21 @@ info "Current diffable/ has $CURRENT_TABLES tables"
 
 echo ""
 
-# Export
+# Export (incremental: unchanged tables keep their files byte for byte)
+DUMP_ARGS=()
 if [ "$DRY_RUN" = true ]; then
-    echo -e "${BLUE}[DRY RUN]${NC} Would run:"
-    echo "    pnpm db:dump"
+    DUMP_ARGS+=(--dry-run)
+    echo -e "${BLUE}[DRY RUN]${NC} Tables that would be rewritten:"
 else
-    info "Exporting database..."
-    cd "$PROJECT_ROOT"
-
-    # Use TypeScript db-diffable script
-    npx tsx scripts/db-diffable.ts dump "$DB_PATH" "$DIFFABLE_DIR"
-
-    NEW_TABLES=$(find "$DIFFABLE_DIR" -name "*.ndjson" | wc -l | tr -d ' ')
-    ok "Exported $NEW_TABLES tables to diffable/"
+    info "Exporting changed tables..."
+fi
+if [ "$FULL" = true ]; then
+    DUMP_ARGS+=(--full)
 fi
 
+cd "$PROJECT_ROOT"
+python3 scripts/saf-py db-dump "$DB_PATH" "$DIFFABLE_DIR" ${DUMP_ARGS[@]+"${DUMP_ARGS[@]}"}
+
 echo ""
 
 # Show diff if requested
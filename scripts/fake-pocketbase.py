@@ -0,0 +1,15 @@
+#!/usr/bin/env python3
+"""
+Run an in-process fake Pocketbase server for offline tests and benchmarks.
+
+See scripts/saf_pb/fake_server.py for the supported API surface.
+
+Usage:
+  python scripts/fake-pocketbase.py                         # http://127.0.0.1:8090
+  python scripts/fake-pocketbase.py --latency-ms 20         # Simulate network latency
+"""
+
+from saf_pb.fake_server import main
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,16 @@
+#!/usr/bin/env python3
+"""
+Run a Pocketbase script with HTTP call instrumentation.
+
+Prints per-endpoint call counts, p50/p95/p99 latency and total time when the
+script finishes. See scripts/saf_pb/trace.py for details.
+
+Usage:
+  python scripts/pb-trace.py scripts/create-all-collections.py
+  python scripts/pb-trace.py --json trace.json scripts/check-data.py
+"""
+
+from saf_pb.trace import main
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""
+Single entry point for the Python content and Pocketbase tooling.
+
+Subcommands are registered by module path and only imported when they run,
+so `saf-py --help` and the content-only commands never load requests or the
+Pocketbase helpers, and nothing but the standard library loads for --help.
+Keep this module free of third-party imports (see saf_cli_test.py).
+
+Usage:
+  scripts/saf-py --help
+  scripts/saf-py validate                    # Report YAML data quality issues
+  scripts/saf-py sync --dry-run              # Any subcommand accepts --help
+"""
+
+import importlib
+import sys
+from typing import List, NamedTuple, Optional
+
+PROG = 'saf-py'
+
+
+class Command(NamedTuple):
+    module: str
+    function: str
+    help: str
+
+
+COMMANDS = {
+    'validate': Command('saf_content.fixer', 'validate_main', 'Validate content/data YAML (no changes, exit 1 on errors)'),
+    'fix': Command('saf_content.fixer', 'main', 'Normalize IDs and FK references in content/data YAML'),
+    'format': Command('saf_content.canonical', 'main', 'Write content/data YAML in canonical key order and style'),
+    'refs': Command('saf_content.references', 'main', 'Show where an entity is defined and who references it'),
+    'rename': Command('saf_content.rename', 'main', 'Rename entity IDs and every reference to them'),
+    'check-links': Command('saf_content.linkcheck', 'main', 'Check github, website and logo URLs (HEAD, cached 304s)'),
+    'shard': Command('saf_content.split', 'main', 'Split corpus files into sharded collections and back'),
+    'snapshot': Command('saf_content.snapshot', 'main', 'Compile content/data into an indexed snapshot file'),
+    'facets': Command('saf_content.facets', 'main', 'Filter profiles by facets and show facet counts'),
+    'search': Command('saf_content.search', 'main', 'Build the profile search index (and optionally query it)'),
+    'provision': Command('saf_pb.provision', 'main', 'Create the content and join collections in Pocketbase'),
+    'sync': Command('saf_pb.sync', 'main', 'Incrementally sync content/data YAML into Pocketbase'),
+    'links': Command('saf_pb.links', 'main', 'Sync the tag and validation join collections'),
+    'export': Command('saf_pb.export', 'main', 'Export Pocketbase records back to content/data YAML'),
+    'check': Command('saf_pb.check', 'main', 'Show record counts for Pocketbase collections'),
+    'db-dump': Command('saf_diffable.dump', 'main', 'Dump a SQLite database to diffable NDJSON files'),
+    'db-load': Command('saf_diffable.load', 'main', 'Load diffable NDJSON files into a SQLite database'),
+    'db-freshness': Command('saf_diffable.freshness', 'main', 'Reload database tables whose diffable files changed'),
+    'db-validate': Command('saf_diffable.validate', 'main', 'Validate diffable NDJSON files against their metadata'),
+    'probe': Command('saf_pb.probe', 'main', 'Detect Pocketbase capabilities and test authentication'),
+}
+
+
+def usage() -> str:
+    width = max(len(name) for name in COMMANDS)
+    lines = [f'usage: {PROG} <command> [options]', '', 'Commands:']
+    lines += [f'  {name:<{width}}  {command.help}' for name, command in COMMANDS.items()]
+    lines += ['', f"Run '{PROG} <command> --help' for command options."]
+    return '\n'.join(lines)
+
+
+def main(argv: Optional[List[str]] = None):
+    args = sys.argv[1:] if argv is None else list(argv)
+    if not args or args[0] in ('-h', '--help', 'help'):
+        print(usage())
+        return
+    name, rest = args[0], args[1:]
+    command = COMMANDS.get(name)
+    if command is None:
+        print(f"{PROG}: unknown command '{name}'\n\n{usage()}", file=sys.stderr)
+        sys.exit(2)
+    function = getattr(importlib.import_module(command.module), command.function)
+    function(rest, prog=f'{PROG} {name}')
+
+
+if __name__ == '__main__':
+    main()
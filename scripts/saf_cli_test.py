@@ -0,0 +1,83 @@
+"""Import-time budget for the saf-py entry point.
+
+saf-py runs from git hooks, so --help and the content-only commands must not
+pay for third-party imports they do not use.
+"""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from saf_cli import COMMANDS, main
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+HEAVY_MODULES = {'requests', 'urllib3', 'yaml', 'pocketbase', 'saf_pb'}
+
+# Time to import saf_cli and run the command, excluding interpreter startup
+HELP_BUDGET_SECONDS = 0.05
+# `validate` on a one-file corpus, for pre-commit hooks ("tens of milliseconds")
+VALIDATE_BUDGET_SECONDS = 0.075
+
+PROBE = '''
+import json, sys, time, io, contextlib
+start = time.perf_counter()
+import saf_cli
+try:
+    with contextlib.redirect_stdout(io.StringIO()):
+        saf_cli.main(sys.argv[1:])
+except SystemExit:
+    pass
+elapsed = time.perf_counter() - start
+print(json.dumps({"elapsed": elapsed, "modules": sorted(m.split(".")[0] for m in sys.modules)}))
+'''
+
+
+def run_probe(*args, runs=1):
+    """The fastest of `runs` runs, with bytecode caching on as it is for hook users."""
+    env = {k: v for k, v in os.environ.items() if k != 'PYTHONDONTWRITEBYTECODE'}
+    probes = []
+    for _ in range(runs):
+        result = subprocess.run([sys.executable, '-c', PROBE, *args], cwd=SCRIPTS_DIR, env=env,
+                                capture_output=True, text=True, check=True)
+        probes.append(json.loads(result.stdout.strip().splitlines()[-1]))
+    return min(probes, key=lambda probe: probe['elapsed'])
+
+
+def test_help_imports_only_the_standard_library():
+    probe = run_probe('--help')
+    assert HEAVY_MODULES.isdisjoint(probe['modules'])
+    assert probe['elapsed'] < HELP_BUDGET_SECONDS
+
+
+def test_validate_is_fast_and_does_not_load_pocketbase_tooling(tmp_path):
+    tags = tmp_path / 'tags'
+    tags.mkdir()
+    (tags / 'tags.yml').write_text('tags:\n- id: stig\n  name: STIG\n', encoding='utf-8')
+
+    # The first run writes bytecode and the validator cache; later runs show the steady state
+    probe = run_probe('validate', '--data-dir', str(tmp_path), runs=4)
+    assert {'requests', 'saf_pb', 'pocketbase'}.isdisjoint(probe['modules'])
+    assert probe['elapsed'] < VALIDATE_BUDGET_SECONDS
+
+
+def test_diffable_commands_need_only_the_standard_library(tmp_path):
+    # `pnpm dev` runs db-freshness on every start
+    probe = run_probe('db-freshness', '--check', str(tmp_path / 'data.db'), str(tmp_path))
+    assert (HEAVY_MODULES | {'saf_content'}).isdisjoint(probe['modules'])
+
+
+def test_commands_resolve():
+    import importlib
+
+    for command in COMMANDS.values():
+        assert callable(getattr(importlib.import_module(command.module), command.function))
+
+
+def test_unknown_command(capsys):
+    with pytest.raises(SystemExit) as e:
+        main(['nope'])
+    assert e.value.code == 2 and "unknown command 'nope'" in capsys.readouterr().err
@@ -0,0 +1,3 @@
+"""
+Python helpers for the content/data YAML corpus.
+"""
@@ -0,0 +1,109 @@
+"""
+Benchmark: slotted entity models vs plain YAML dicts.
+
+Builds N synthetic profiles by cycling the real ones in content/data, with
+unique id/name values. Every copy goes through a JSON round trip first, so
+each one holds its own string objects as a freshly parsed YAML file would.
+The benchmark then measures:
+
+  - memory held by the list of N dicts vs N Profile instances (tracemalloc)
+  - time to read five attributes from every entity
+
+Run through scripts/bench-models.py.
+"""
+
+import gc
+import json
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+
+from .corpus import DEFAULT_DATA_DIR, entity_type, iter_entities
+from .models import Profile
+
+DEFAULT_COUNT = 100_000
+ACCESSED = ('status', 'framework', 'standard', 'team', 'requirements')
+
+
+def synthetic_profiles(count: int, data_dir: Path = DEFAULT_DATA_DIR) -> List[dict]:
+    """`count` profile dicts with unique ids and independently allocated values."""
+    base = [e for _, _, e in iter_entities(data_dir, [entity_type('profiles')])]
+    if not base:
+        raise ValueError(f'No profiles found in {data_dir}')
+    profiles = []
+    for i in range(count):
+        source = base[i % len(base)]
+        profiles.append({**source, 'id': f"{source['id']}-{i}", 'name': f"{source['name']} {i}"})
+    # Fresh string objects per profile, like parsing one big YAML file would produce
+    return json.loads(json.dumps(profiles, default=str))
+
+
+def measure_memory(build: Callable[[], list]) -> int:
+    """Bytes still allocated by the value build() returns."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    value = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del value
+    return after - before
+
+
+def time_dict_access(profiles: List[dict], rounds: int = 3) -> float:
+    best = float('inf')
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for p in profiles:
+            p['status'], p['framework'], p['standard'], p['team'], p['requirements']
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def time_model_access(profiles: List[Profile], rounds: int = 3) -> float:
+    best = float('inf')
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for p in profiles:
+            p.status, p.framework, p.standard, p.team, p.requirements
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(count: int = DEFAULT_COUNT, data_dir: Path = DEFAULT_DATA_DIR) -> Dict[str, float]:
+    raw = json.dumps(synthetic_profiles(count, data_dir))
+    dict_bytes = measure_memory(lambda: json.loads(raw))
+    model_bytes = measure_memory(lambda: [Profile.from_dict(d) for d in json.loads(raw)])
+
+    dicts = json.loads(raw)
+    models = [Profile.from_dict(d) for d in dicts]
+    return {
+        'count': count,
+        'dict_bytes': dict_bytes,
+        'model_bytes': model_bytes,
+        'dict_access': time_dict_access(dicts),
+        'model_access': time_model_access(models),
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None, prog: Optional[str] = None):
+    import argparse
+
+    parser = argparse.ArgumentParser(prog=prog, description='Compare slotted entity models with plain dicts')
+    parser.add_argument('--count', type=int, default=DEFAULT_COUNT,
+                        help=f'Number of synthetic profiles (default: {DEFAULT_COUNT})')
+    parser.add_argument('--data-dir', default=str(DEFAULT_DATA_DIR), help='Path to data directory')
+    args = parser.parse_args(argv)
+
+    result = run(args.count, Path(args.data_dir))
+    mib = 1024 * 1024
+    print("=" * 70)
+    print(f"📊 {result['count']:,} profiles")
+    print("=" * 70)
+    print(f"  Memory   dicts:  {result['dict_bytes'] / mib:8.1f} MiB")
+    print(f"           models: {result['model_bytes'] / mib:8.1f} MiB "
+          f"({result['dict_bytes'] / max(result['model_bytes'], 1):.1f}x smaller)")
+    print(f"  Access   dicts:  {result['dict_access'] * 1000:8.1f} ms  ({len(ACCESSED)} fields per entity)")
+    print(f"           models: {result['model_access'] * 1000:8.1f} ms "
+          f"({result['dict_access'] / max(result['model_access'], 1e-9):.2f}x)")
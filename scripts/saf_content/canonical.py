@@ -0,0 +1,285 @@
+"""
+Canonical YAML formatting for the content/data corpus.
+
+Every corpus file is written the same way, so a change to one entity is a
+change to a few lines instead of a re-dump of the file:
+
+  - top-level keys: `_id`, `_metadata`, the entity list, then anything else
+  - entity keys in a fixed order per entity type: the column order of the
+    type's table in the tracked diffable export (diffable/<table>.metadata.json,
+    snake_case columns mapped to YAML keys), then the keys the table does not
+    have (tags, hardeningProfiles, members, ...) in the order of the entity's
+    JSON Schema (saf_content/schemas), then unknown keys as they were
+  - dates as quoted 'YYYY-MM-DD' strings (an unquoted date loads as a date
+    object, a quoted one as a string)
+  - plain scalars where YAML allows, single quotes otherwise, literal blocks
+    (|) for multi-line text, block lists except for empty ones ([]), and no
+    line wrapping
+
+`format_files` formats files in a process pool. The hash of each file's
+canonical output is saved in DEFAULT_CACHE (together with a digest of the
+key orders and FORMATTER), so a file whose bytes still hash to its last
+formatted output is skipped without being parsed. That keeps
+`saf-py format --check` cheap enough for a pre-commit hook.
+
+DataQualityFixer and the Pocketbase exporter write through `dump_text`, so
+their output comes out canonical too.
+Rewriting a shard of a sharded collection refreshes the collection's
+manifest (saf_content/shards.py).
+"""
+
+import datetime
+import hashlib
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import yaml
+
+from .corpus import (DEFAULT_DATA_DIR, ENTITY_TYPES, ENTITY_TYPES_BY_DIR, REPO_ROOT, EntityType, SafeLoader,
+                     iter_files)
+from .models import yaml_key
+from .schema import SCHEMA_DIR
+from .shards import refresh_for
+
+DEFAULT_CACHE = REPO_ROOT / '.cache' / 'saf' / 'format.json'
+METADATA_DIR = REPO_ROOT / 'diffable'
+
+# Bump when the output changes, so cached hashes of formatted files are dropped
+FORMATTER = 1
+
+TOP_LEVEL = ('_id', '_metadata')
+
+# Line width for the emitter: long enough that no scalar is ever folded
+NO_WRAP = 1 << 20
+
+KeyOrders = Dict[str, List[str]]   # table -> YAML keys in canonical order
+
+
+class FormatResult(NamedTuple):
+    file: str             # relative to the data directory
+    changed: bool         # the file was not canonical (and was rewritten unless checking)
+    digest: str           # hash of the canonical output
+    error: Optional[str] = None
+
+
+def key_orders(metadata_dir: Path = METADATA_DIR, schema_dir: Path = SCHEMA_DIR) -> KeyOrders:
+    orders: KeyOrders = {}
+    for etype in ENTITY_TYPES:
+        keys: List[str] = []
+        metadata = Path(metadata_dir) / f'{etype.table}.metadata.json'
+        if metadata.exists():
+            keys += [yaml_key(column) for column in json.loads(metadata.read_text(encoding='utf-8'))['columns']]
+        schema = Path(schema_dir) / f'{etype.table}.json'
+        if schema.exists():
+            keys += list(json.loads(schema.read_text(encoding='utf-8')).get('properties', {}))
+        orders[etype.table] = list(dict.fromkeys(keys))
+    return orders
+
+
+def orders_digest(orders: KeyOrders) -> str:
+    canonical = json.dumps(orders, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(f'{FORMATTER}\0{canonical}'.encode('utf-8')).hexdigest()
+
+
+def file_digest(raw: bytes) -> str:
+    return hashlib.sha1(raw).hexdigest()
+
+
+# --- Canonical data ---
+
+def _value(value):
+    if type(value) is datetime.date:
+        return value.isoformat()
+    if isinstance(value, dict):
+        return {k: _value(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_value(v) for v in value]
+    return value
+
+
+def _ordered(mapping: dict, order: Sequence[str]) -> dict:
+    known = {key: mapping[key] for key in order if key in mapping}
+    known.update((key, value) for key, value in mapping.items() if key not in known)
+    return {key: _value(value) for key, value in known.items()}
+
+
+def canonical_data(data, etype: EntityType, orders: KeyOrders):
+    """The file's data with keys in canonical order and dates as strings."""
+    if not isinstance(data, dict):
+        return _value(data)
+    order = orders.get(etype.table, [])
+    result = {}
+    for key in (*TOP_LEVEL, etype.key):
+        if key in data:
+            result[key] = data[key]
+    result.update((key, value) for key, value in data.items() if key not in result)
+    if isinstance(result.get('_metadata'), dict):
+        result['_metadata'] = _ordered(result['_metadata'], order)
+    if isinstance(result.get(etype.key), list):
+        result[etype.key] = [_ordered(e, order) if isinstance(e, dict) else _value(e) for e in result[etype.key]]
+    return {key: value if key in ('_metadata', etype.key) else _value(value) for key, value in result.items()}
+
+
+# --- Dumping ---
+
+class CanonicalDumper(getattr(yaml, 'CSafeDumper', yaml.SafeDumper)):
+    pass
+
+
+def _represent_str(dumper, value: str):
+    if '\n' in value:
+        return dumper.represent_scalar('tag:yaml.org,2002:str', value, style='|')
+    return dumper.represent_scalar('tag:yaml.org,2002:str', value)
+
+
+def _represent_list(dumper, value: list):
+    return dumper.represent_sequence('tag:yaml.org,2002:seq', value, flow_style=not value)
+
+
+def _represent_dict(dumper, value: dict):
+    return dumper.represent_mapping('tag:yaml.org,2002:map', value.items(), flow_style=not value)
+
+
+CanonicalDumper.add_representer(str, _represent_str)
+CanonicalDumper.add_representer(list, _represent_list)
+CanonicalDumper.add_representer(dict, _represent_dict)
+
+
+def dump_text(data, etype: EntityType, orders: Optional[KeyOrders] = None) -> str:
+    """Canonical YAML text for a corpus file's data."""
+    data = canonical_data(data, etype, key_orders() if orders is None else orders)
+    return yaml.dump(data, Dumper=CanonicalDumper, default_flow_style=False, sort_keys=False,
+                     allow_unicode=True, width=NO_WRAP)
+
+
+def format_text(text: str, etype: EntityType, orders: KeyOrders) -> str:
+    data = yaml.load(text, Loader=SafeLoader)
+    if data is None:
+        return text
+    formatted = dump_text(data, etype, orders)
+    if yaml.load(formatted, Loader=SafeLoader) != canonical_data(data, etype, orders):
+        raise ValueError('canonical output does not load back to the same data')
+    return formatted
+
+
+def format_file(data_dir: Path, rel: str, orders: KeyOrders, check: bool) -> FormatResult:
+    path = Path(data_dir) / rel
+    raw = path.read_bytes()
+    try:
+        formatted = format_text(raw.decode('utf-8'), ENTITY_TYPES_BY_DIR[rel.split('/')[0]], orders)
+    except (ValueError, yaml.YAMLError) as e:
+        return FormatResult(rel, False, '', str(e))
+    output = formatted.encode('utf-8')
+    changed = output != raw
+    if changed and not check:
+        tmp = path.with_name(f'.{path.name}.tmp')
+        tmp.write_bytes(output)
+        os.replace(tmp, path)
+    return FormatResult(rel, changed, file_digest(output))
+
+
+# --- Cache ---
+
+def read_cache(path: Path, config: str) -> Dict[str, str]:
+    """relative file -> hash of its last canonical output ({} if the cache is for other key orders)."""
+    try:
+        data = json.loads(Path(path).read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+    return data.get('files', {}) if isinstance(data, dict) and data.get('config') == config else {}
+
+
+def write_cache(path: Path, config: str, files: Dict[str, str]):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f'.{path.name}.tmp')
+    tmp.write_text(json.dumps({'config': config, 'files': files}, indent=1, sort_keys=True) + '\n', encoding='utf-8')
+    os.replace(tmp, path)
+
+
+def corpus_files(data_dir: Path = DEFAULT_DATA_DIR) -> List[str]:
+    return [path.relative_to(data_dir).as_posix() for etype in ENTITY_TYPES for path in iter_files(data_dir, etype)]
+
+
+def format_files(data_dir: Path = DEFAULT_DATA_DIR, files: Optional[Sequence[str]] = None, check: bool = False,
+                 workers: Optional[int] = None, cache_path: Optional[Path] = DEFAULT_CACHE,
+                 orders: Optional[KeyOrders] = None) -> Tuple[List[FormatResult], int]:
+    """(results for the files that were parsed, number skipped by hash)."""
+    data_dir = Path(data_dir)
+    orders = key_orders() if orders is None else orders
+    config = orders_digest(orders)
+    cache = read_cache(cache_path, config) if cache_path is not None else {}
+    files = corpus_files(data_dir) if files is None else list(files)
+
+    pending = []
+    digests: Dict[str, str] = {}
+    for rel in files:
+        digest = file_digest((data_dir / rel).read_bytes())
+        if cache.get(rel) == digest:
+            digests[rel] = digest
+        else:
+            pending.append(rel)
+
+    if workers == 1 or len(pending) <= 1:
+        results = [format_file(data_dir, rel, orders, check) for rel in pending]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            n = len(pending)
+            results = list(pool.map(format_file, [data_dir] * n, pending, [orders] * n, [check] * n))
+
+    if not check:
+        refresh_for(data_dir / r.file for r in results if r.changed)
+    if cache_path is not None:
+        # Only files that are canonical on disk now are safe to skip next time
+        digests.update((r.file, r.digest) for r in results if not r.error and not (check and r.changed))
+        kept = {rel: digest for rel, digest in cache.items() if rel not in digests and (data_dir / rel).exists()}
+        write_cache(cache_path, config, {**kept, **digests})
+    return results, len(files) - len(pending)
+
+
+def main(argv: Optional[Sequence[str]] = None, prog: Optional[str] = None):
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(prog=prog, description='Write content/data YAML files in canonical form')
+    parser.add_argument('files', nargs='*', help='Files to format (default: the whole corpus)')
+    parser.add_argument('--check', action='store_true', help='Exit 1 if any file is not canonical; write nothing')
+    parser.add_argument('--data-dir', default=str(DEFAULT_DATA_DIR), help='Path to data directory')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count)')
+    parser.add_argument('--no-cache', action='store_true', help='Parse every file instead of skipping known-canonical ones')
+    args = parser.parse_args(argv)
+
+    data_dir = Path(args.data_dir).resolve()
+    files = None
+    if args.files:
+        files = []
+        for name in args.files:
+            rel = Path(name).resolve().relative_to(data_dir).as_posix()
+            if rel.split('/')[0] not in ENTITY_TYPES_BY_DIR:
+                parser.error(f'{name} is not an entity file under {data_dir}')
+            files.append(rel)
+
+    start = time.perf_counter()
+    results, skipped = format_files(data_dir, files, args.check, args.workers,
+                                    None if args.no_cache else DEFAULT_CACHE)
+    changed = [r for r in results if r.changed]
+    errors = [r for r in results if r.error]
+    for r in errors:
+        print(f"❌ {r.file}: {r.error}")
+    for r in changed:
+        print(f"{'📝' if args.check else '✏️ '} {r.file}")
+
+    elapsed = time.perf_counter() - start
+    summary = f"{len(results) + skipped} files ({skipped} unchanged since last format) in {elapsed:.2f}s"
+    if args.check and changed:
+        print(f"\n❌ {len(changed)} files are not canonical; run 'saf-py format' ({summary})")
+    elif args.check:
+        print(f"✓ All files canonical: {summary}")
+    else:
+        print(f"\n✅ {len(changed)} files reformatted: {summary}")
+    if errors or (args.check and changed):
+        sys.exit(1)
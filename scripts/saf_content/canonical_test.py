@@ -0,0 +1,79 @@
+"""Tests for the canonical YAML formatter."""
+
+import re
+
+from saf_content.canonical import format_files, format_text, key_orders
+from saf_content.corpus import ENTITY_TYPES_BY_TABLE, iter_files, load_file
+
+PROFILES = ENTITY_TYPES_BY_TABLE['profiles']
+
+
+def test_key_order_follows_metadata_columns_then_schema():
+    order = key_orders()['profiles']
+    assert order[:4] == ['id', 'name', 'version', 'platform']
+    assert order.index('standardVersion') < order.index('lastUpdated') < order.index('tags')
+    assert order.index('tags') < order.index('hardeningProfiles')
+
+
+def test_format_text_is_canonical_and_idempotent():
+    text = ("profiles:\n"
+            "  - tags: [linux, 'rhel']\n"
+            "    status: \"active\"\n"
+            "    lastUpdated: 2023-10-10\n"
+            "    name: RHEL 8\n"
+            "    custom: x\n"
+            "    id: rhel-8\n"
+            "    hardeningProfiles: []\n"
+            "    details: \"line one\\nline two\\n\"\n"
+            "_id: stig\n")
+    formatted = format_text(text, PROFILES, key_orders())
+    assert formatted == ("_id: stig\n"
+                         "profiles:\n"
+                         "- id: rhel-8\n"
+                         "  name: RHEL 8\n"
+                         "  details: |\n"
+                         "    line one\n"
+                         "    line two\n"
+                         "  lastUpdated: '2023-10-10'\n"
+                         "  status: active\n"
+                         "  tags:\n"
+                         "  - linux\n"
+                         "  - rhel\n"
+                         "  hardeningProfiles: []\n"
+                         "  custom: x\n")
+    assert format_text(formatted, PROFILES, key_orders()) == formatted
+
+
+def test_format_files_check_and_hash_skip(data_dir, tmp_path):
+    cache = tmp_path / 'format.json'
+    results, skipped = format_files(data_dir, check=True, cache_path=cache)
+    assert skipped == 0 and not any(r.changed or r.error for r in results)   # the corpus is canonical
+
+    # Hand edits in another layout: unquoted dates
+    for rel in ('profiles/cis.yml', 'hardening/ansible.yml'):
+        path = data_dir / rel
+        path.write_text(re.sub(r"lastUpdated: '([0-9-]+)'", r'lastUpdated: \1', path.read_text(encoding='utf-8')),
+                        encoding='utf-8')
+    before = {p: load_file(p) for p in iter_files(data_dir, PROFILES)}
+    results, skipped = format_files(data_dir, check=True, cache_path=cache)
+    pending = {r.file for r in results if r.changed}
+    assert pending == {'hardening/ansible.yml', 'profiles/cis.yml'}
+    assert skipped == len(list(data_dir.glob('*/*.yml'))) - 2   # canonical files are skipped by hash
+
+    results, _ = format_files(data_dir, cache_path=cache, files=sorted(pending), workers=2)
+    assert {r.file for r in results if r.changed} == pending and not any(r.error for r in results)
+    results, skipped = format_files(data_dir, check=True, cache_path=cache)
+    assert results == [] and skipped == len(list(data_dir.glob('*/*.yml')))
+
+    # Formatting changes layout only (dates become strings)
+    for path, data in before.items():
+        after = load_file(path)
+        assert [e['id'] for e in after['profiles']] == [e['id'] for e in data['profiles']]
+        assert {k: str(v) for k, v in after['profiles'][0].items()} == \
+               {k: str(v) for k, v in data['profiles'][0].items()}
+
+    # An edited file is parsed again even though its path is cached
+    path = data_dir / 'profiles' / 'cis.yml'
+    path.write_text(path.read_text().replace('status: active', 'status: "active"', 1))
+    results, _ = format_files(data_dir, check=True, cache_path=cache)
+    assert [(r.file, r.changed) for r in results] == [('profiles/cis.yml', True)]
@@ -0,0 +1,153 @@
+"""
+Entity-level changes in content/data since a git ref.
+
+`entity_changes` asks git which corpus files differ between the merge base
+of a ref and HEAD (plus uncommitted edits), parses the base and working
+versions of only those files and classifies every entity ID as added,
+removed, renamed (an ID that disappeared while an entity with otherwise
+identical content appeared in the same type) or modified.
+
+`validation_scope` turns the changes into the set of entities worth
+validating: the changed entities themselves plus, through the reverse FK
+index (saf_content.references), every entity that references an ID that
+was added, removed or renamed. `saf-py validate --since origin/main` uses
+it so PR validation scales with the PR instead of the corpus.
+"""
+
+import subprocess
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+
+import yaml
+
+from .corpus import DEFAULT_DATA_DIR, ENTITY_TYPES_BY_DIR, EntityType, SafeLoader, file_entities, load_file
+from .references import DEFAULT_INDEX, update_index
+
+Entities = Dict[str, Tuple[str, dict]]   # entity ID -> (relative file, entity)
+
+
+class GitError(Exception):
+    pass
+
+
+class EntityChanges(NamedTuple):
+    base: str                              # merge-base commit the changes are relative to
+    files: List[str]                       # changed corpus files (relative to the data directory)
+    added: List[Tuple[str, str]]           # (table, id)
+    removed: List[Tuple[str, str]]
+    modified: List[Tuple[str, str]]
+    renamed: List[Tuple[str, str, str]]    # (table, old id, new id)
+    current: Dict[str, Entities]           # table -> current versions of the entities in changed files
+
+
+def git(*args: str, cwd: Path) -> str:
+    try:
+        result = subprocess.run(['git', *args], cwd=cwd, capture_output=True, text=True, check=True)
+    except FileNotFoundError as e:
+        raise GitError('git is not installed') from e
+    except subprocess.CalledProcessError as e:
+        raise GitError(f"git {' '.join(args)}: {e.stderr.strip() or e}") from e
+    return result.stdout
+
+
+def changed_files(base: str, data_dir: Path) -> List[Tuple[str, Optional[str], Optional[str]]]:
+    """(status, base path, current path) of changed files, relative to data_dir.
+
+    Compares `base` with the working tree, so uncommitted edits and
+    untracked files count too.
+    """
+    out = git('diff', '--name-status', '-z', '-M', '--relative', base, '--', '.', cwd=data_dir)
+    fields = out.split('\0')
+    entries = []
+    i = 0
+    while i < len(fields) - 1:
+        status = fields[i][:1]
+        if status in ('R', 'C'):
+            old, new = fields[i + 1], fields[i + 2]
+            i += 3
+        else:
+            old = new = fields[i + 1]
+            i += 2
+        entries.append((status, None if status in ('A', 'C') else old, None if status == 'D' else new))
+    untracked = git('ls-files', '--others', '--exclude-standard', '-z', '--', '.', cwd=data_dir)
+    entries += [('A', None, path) for path in untracked.split('\0') if path]
+    return entries
+
+
+def _entity_type(rel: str) -> Optional[EntityType]:
+    parts = rel.split('/')
+    # type/file.yml, or type/collection/shard.yml for a sharded collection
+    if len(parts) not in (2, 3) or not parts[-1].endswith(('.yml', '.yaml')):
+        return None
+    return ENTITY_TYPES_BY_DIR.get(parts[0])
+
+
+def _collect(entities: Dict[str, Entities], etype: EntityType, rel: str, data: dict):
+    table = entities.setdefault(etype.table, {})
+    for entity in file_entities(data, etype):
+        if isinstance(entity, dict) and entity.get('id'):
+            table[str(entity['id'])] = (rel, entity)
+
+
+def _without_id(entity: dict) -> dict:
+    return {k: v for k, v in entity.items() if k != 'id'}
+
+
+def entity_changes(since: str, data_dir: Path = DEFAULT_DATA_DIR) -> EntityChanges:
+    data_dir = Path(data_dir)
+    base = git('merge-base', since, 'HEAD', cwd=data_dir).strip()
+    prefix = git('rev-parse', '--show-prefix', cwd=data_dir).strip()
+
+    before: Dict[str, Entities] = {}
+    after: Dict[str, Entities] = {}
+    files: List[str] = []
+    for _, old, new in changed_files(base, data_dir):
+        etype = _entity_type(old) if old is not None else None
+        if etype is not None:
+            raw = git('show', f'{base}:{prefix}{old}', cwd=data_dir)
+            _collect(before, etype, old, yaml.load(raw, Loader=SafeLoader) or {})
+        etype = _entity_type(new) if new is not None else None
+        if etype is not None and (data_dir / new).exists():
+            _collect(after, etype, new, load_file(data_dir / new))
+            files.append(new)
+
+    added, removed, modified, renamed = [], [], [], []
+    for table in sorted(set(before) | set(after)):
+        old_entities, new_entities = before.get(table, {}), after.get(table, {})
+        gone = [i for i in old_entities if i not in new_entities]
+        appeared = [i for i in new_entities if i not in old_entities]
+        # An ID that vanished while an identical entity appeared under a new ID is a rename
+        by_content = {repr(_without_id(new_entities[i][1])): i for i in appeared}
+        for old_id in gone:
+            new_id = by_content.pop(repr(_without_id(old_entities[old_id][1])), None)
+            if new_id is not None:
+                renamed.append((table, old_id, new_id))
+                appeared.remove(new_id)
+            else:
+                removed.append((table, old_id))
+        added += [(table, i) for i in appeared]
+        modified += [(table, i) for i in new_entities
+                     if i in old_entities and new_entities[i][1] != old_entities[i][1]]
+    return EntityChanges(base, sorted(files), added, removed, modified, renamed, after)
+
+
+def validation_scope(changes: EntityChanges, data_dir: Path = DEFAULT_DATA_DIR,
+                     index_path: Path = DEFAULT_INDEX) -> Tuple[Dict[str, Set[str]], int]:
+    """(relative file -> entity IDs to validate, number of referencing entities pulled in)."""
+    scope: Dict[str, Set[str]] = {}
+    for table, entity_id in changes.added + changes.modified + [(t, new) for t, _, new in changes.renamed]:
+        rel, _ = changes.current[table][entity_id]
+        scope.setdefault(rel, set()).add(entity_id)
+
+    # IDs whose existence changed: entities pointing at them may now resolve differently
+    targets = changes.added + changes.removed + [(t, i) for t, old, new in changes.renamed for i in (old, new)]
+    referrers = 0
+    if targets:
+        index = update_index(data_dir, index_path)
+        for table, entity_id in targets:
+            for ref in index.referrers(table, entity_id):
+                ids = scope.setdefault(ref.file, set())
+                if ref.id not in ids:
+                    ids.add(ref.id)
+                    referrers += 1
+    return scope, referrers
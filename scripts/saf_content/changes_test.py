@@ -0,0 +1,85 @@
+"""Tests for git-aware change detection and --since validation."""
+
+import subprocess
+
+import pytest
+import yaml
+
+from saf_content.changes import GitError, entity_changes, validation_scope
+from saf_content.fixer import DataQualityFixer
+from saf_content.references import build_index
+
+
+def write(path, key, entities):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(yaml.safe_dump({key: entities}, sort_keys=False), encoding='utf-8')
+
+
+def git(repo, *args):
+    subprocess.run(['git', '-c', 'user.name=test', '-c', 'user.email=test@example.com', *args],
+                   cwd=repo, check=True, capture_output=True)
+
+
+@pytest.fixture
+def repo(tmp_path):
+    repo = tmp_path / 'repo'
+    data = repo / 'content' / 'data'
+    write(data / 'standards' / 'standards.yml', 'standards',
+          [{'id': 'stig', 'name': 'STIG'}, {'id': 'cis', 'name': 'CIS Benchmarks'}])
+    write(data / 'organizations' / 'entities.yml', 'organizations',
+          [{'id': 'mitre', 'name': 'MITRE'}, {'id': 'disa', 'name': 'DISA'}])
+    write(data / 'profiles' / 'main.yml', 'profiles', [
+        {'id': 'a', 'name': 'A', 'standard': 'stig', 'organization': 'mitre'},
+        {'id': 'b', 'name': 'B', 'standard': 'CIS', 'organization': 'disa'},
+        {'id': 'c', 'name': 'C', 'standard': 'stig', 'organization': 'mitre'},
+    ])
+    write(data / 'profiles' / 'other.yml', 'profiles',
+          [{'id': 'e', 'name': 'E', 'standard': 'STIG', 'organization': 'mitre'}])
+    git(repo, 'init', '-q')
+    git(repo, 'add', '.')
+    git(repo, 'commit', '-q', '-m', 'base')
+
+    write(data / 'standards' / 'standards.yml', 'standards',
+          [{'id': 'stig', 'name': 'STIG'}, {'id': 'cis-benchmarks', 'name': 'CIS Benchmarks'}])
+    write(data / 'organizations' / 'entities.yml', 'organizations', [{'id': 'mitre', 'name': 'MITRE'}])
+    write(data / 'profiles' / 'main.yml', 'profiles', [
+        {'id': 'a', 'name': 'A v2', 'standard': 'stig', 'organization': 'mitre'},
+        {'id': 'b', 'name': 'B', 'standard': 'CIS', 'organization': 'disa'},
+        {'id': 'c', 'name': 'C', 'standard': 'stig', 'organization': 'mitre'},
+    ])
+    write(data / 'profiles' / 'new.yml', 'profiles', [{'id': 'd', 'name': 'D', 'standard': 'stig'}])
+    return repo
+
+
+def test_entity_changes(repo):
+    changes = entity_changes('HEAD', repo / 'content' / 'data')
+    assert changes.files == ['organizations/entities.yml', 'profiles/main.yml', 'profiles/new.yml',
+                             'standards/standards.yml']
+    assert changes.renamed == [('standards', 'cis', 'cis-benchmarks')]
+    assert changes.removed == [('organizations', 'disa')]
+    assert changes.added == [('profiles', 'd')]
+    assert changes.modified == [('profiles', 'a')]
+
+
+def test_scope_pulls_in_referrers_of_changed_ids(repo, tmp_path):
+    data = repo / 'content' / 'data'
+    scope, referrers = validation_scope(entity_changes('HEAD', data), data, tmp_path / 'refs.json')
+    # b references the renamed standard (as 'CIS') and the removed organization; c and e are untouched
+    assert scope == {'profiles/main.yml': {'a', 'b'}, 'profiles/new.yml': {'d'},
+                     'standards/standards.yml': {'cis-benchmarks'}}
+    assert referrers == 1
+    assert [r.id for r in build_index(data)[0].referrers('organizations', 'MITRE')] == ['a', 'c', 'e']
+
+
+def test_fixer_since_checks_only_the_scope(repo, tmp_path, capsys):
+    fixer = DataQualityFixer(str(repo / 'content' / 'data'), validate_only=True, since='HEAD')
+    fixer.reference_index = tmp_path / 'refs.json'
+    fixer.run()
+    out = capsys.readouterr().out
+    assert '1 added, 1 removed, 1 renamed, 1 modified' in out
+    assert 'b.standard: CIS → NOT FOUND' in out and 'b.organization: disa → NOT FOUND' in out
+    # e's 'STIG' would be normalized by a full run, but other.yml did not change
+    assert 'other.yml' not in out
+
+    with pytest.raises(GitError):
+        entity_changes('no-such-ref', repo / 'content' / 'data')
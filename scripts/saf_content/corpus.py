@@ -0,0 +1,93 @@
+"""
+Entity type registry and loaders for the content/data YAML corpus.
+
+Each entity type lives in its own directory under content/data, one or more
+YAML files per type, with the entities under a top-level list key:
+
+    content/data/profiles/stig.yml      ->  profiles: [...]
+    content/data/hardening/ansible.yml  ->  hardeningProfiles: [...]
+    content/data/profiles/stig/*.yml    ->  shards of one collection (shards.py)
+
+ENTITY_TYPES is ordered so that FK targets come before the entities that
+reference them (tags, organizations, ... before teams, profiles, tools).
+"""
+
+from pathlib import Path
+from typing import Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+import yaml
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_DATA_DIR = REPO_ROOT / 'content' / 'data'
+
+
+class EntityType(NamedTuple):
+    directory: str   # Directory under content/data
+    key: str         # Top-level YAML list key
+    table: str       # Pocketbase collection / SQLite table name
+
+
+ENTITY_TYPES: List[EntityType] = [
+    EntityType('tags', 'tags', 'tags'),
+    EntityType('organizations', 'organizations', 'organizations'),
+    EntityType('technologies', 'technologies', 'technologies'),
+    EntityType('standards', 'standards', 'standards'),
+    EntityType('capabilities', 'capabilities', 'capabilities'),
+    EntityType('teams', 'teams', 'teams'),
+    EntityType('profiles', 'profiles', 'profiles'),
+    EntityType('hardening', 'hardeningProfiles', 'hardening_profiles'),
+    EntityType('tools', 'tools', 'tools'),
+]
+
+ENTITY_TYPES_BY_TABLE = {t.table: t for t in ENTITY_TYPES}
+ENTITY_TYPES_BY_DIR = {t.directory: t for t in ENTITY_TYPES}
+
+# Marks a directory under an entity type directory as a sharded collection
+SHARD_MANIFEST = '_manifest.json'
+
+
+def entity_type(name: str) -> EntityType:
+    """Look up an entity type by table, directory or YAML key."""
+    for etype in ENTITY_TYPES:
+        if name in (etype.table, etype.directory, etype.key):
+            return etype
+    raise KeyError(f'Unknown entity type: {name}')
+
+
+def iter_files(data_dir: Path, etype: EntityType) -> List[Path]:
+    """YAML files holding entities of the given type, in stable order.
+
+    A subdirectory holding a SHARD_MANIFEST is a sharded collection (see
+    saf_content/shards.py); its YAML files are included like any other.
+    """
+    entity_dir = Path(data_dir) / etype.directory
+    if not entity_dir.exists():
+        return []
+    files = list(entity_dir.glob('*.yml')) + list(entity_dir.glob('*.yaml'))
+    for manifest in entity_dir.glob(f'*/{SHARD_MANIFEST}'):
+        files += list(manifest.parent.glob('*.yml')) + list(manifest.parent.glob('*.yaml'))
+    return sorted(files)
+
+
+# libyaml's C loader is several times faster than the pure-Python one
+SafeLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+
+def load_file(path: Path) -> dict:
+    with open(path, 'r', encoding='utf-8') as f:
+        return yaml.load(f, Loader=SafeLoader) or {}
+
+
+def file_entities(data: dict, etype: EntityType) -> list:
+    entities = data.get(etype.key) if isinstance(data, dict) else None
+    return entities if isinstance(entities, list) else []
+
+
+def iter_entities(data_dir: Path = DEFAULT_DATA_DIR,
+                  types: Optional[Sequence[EntityType]] = None) -> Iterator[Tuple[EntityType, Path, dict]]:
+    """Yield (entity type, file, entity) for every entity in the corpus."""
+    for etype in types or ENTITY_TYPES:
+        for path in iter_files(data_dir, etype):
+            for entity in file_entities(load_file(path), etype):
+                if isinstance(entity, dict) and entity.get('id'):
+                    yield etype, path, entity
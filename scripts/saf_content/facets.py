@@ -0,0 +1,239 @@
+"""
+Bitmap-indexed faceted filtering over profiles (or any entity type).
+
+Every facet value owns one bitmap, a Python int whose bit i is set when
+entity i has that value. A selection ORs the bitmaps of the chosen values
+within a facet and ANDs across facets, so filtering and counting cost a few
+big-int operations instead of a scan of the entity list:
+
+    index = load_index()
+    selection = {'standard': ['stig'], 'tags': ['aws', 'azure']}
+    index.ids(index.mask(selection))           # matching profile IDs
+    index.counts(selection)                    # facet -> value -> count
+
+`counts` uses the usual facet semantics: the counts for a facet apply the
+selections of every *other* facet, so all options of a selected facet stay
+visible with the number of results they would add.
+
+Values are normalized like the snapshot indexes (standard 'STIG' -> 'stig').
+The index serializes to JSON, storing each bitmap as either a list of
+positions or a base64 bitmap, whichever is shorter.
+"""
+
+import base64
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from .corpus import DEFAULT_DATA_DIR, REPO_ROOT, entity_type, iter_entities
+from .snapshot import index_values, source_hash
+
+DEFAULT_INDEX = REPO_ROOT / '.cache' / 'saf' / 'profile-facets.json'
+FORMAT = 1
+
+# Facet (YAML key) -> table whose IDs its values refer to (None: plain value)
+FACETS = {
+    'standard': 'standards',
+    'platform': None,
+    'technology': 'technologies',
+    'organization': 'organizations',
+    'status': None,
+    'category': None,
+    'tags': 'tags',
+}
+
+Selection = Dict[str, Sequence[str]]
+
+
+def popcount(mask: int) -> int:
+    return mask.bit_count() if hasattr(mask, 'bit_count') else bin(mask).count('1')
+
+
+def positions(mask: int) -> Iterable[int]:
+    """Indexes of the set bits, ascending."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def _encode(mask: int, size: int):
+    listed = list(positions(mask))
+    packed = base64.b64encode(mask.to_bytes((size + 7) // 8, 'little')).decode('ascii')
+    return listed if len(json.dumps(listed)) <= len(packed) + 2 else packed
+
+
+def _decode(value) -> int:
+    if isinstance(value, str):
+        return int.from_bytes(base64.b64decode(value), 'little')
+    mask = 0
+    for position in value:
+        mask |= 1 << position
+    return mask
+
+
+class FacetIndex:
+    """Facet value bitmaps over an ordered list of entity IDs."""
+
+    def __init__(self, ids: List[str], bitmaps: Dict[str, Dict[str, int]], source_hash: str = ''):
+        self.entity_ids = ids
+        self.bitmaps = bitmaps
+        self.source_hash = source_hash
+        self.all = (1 << len(ids)) - 1
+
+    @classmethod
+    def build(cls, entities: Sequence[dict], facets: Dict[str, Optional[str]] = FACETS,
+              source_hash: str = '') -> 'FacetIndex':
+        bitmaps: Dict[str, Dict[str, int]] = {facet: {} for facet in facets}
+        for position, entity in enumerate(entities):
+            bit = 1 << position
+            for facet, table in facets.items():
+                values = bitmaps[facet]
+                for value in index_values(entity.get(facet), table):
+                    values[value] = values.get(value, 0) | bit
+        return cls([str(e['id']) for e in entities], bitmaps, source_hash)
+
+    def __len__(self) -> int:
+        return len(self.entity_ids)
+
+    def _facet_mask(self, facet: str, values: Sequence[str]) -> int:
+        if facet not in self.bitmaps:
+            raise KeyError(f'Unknown facet {facet!r} (facets: {", ".join(self.bitmaps)})')
+        mask = 0
+        for value in values:
+            for key in index_values(value, FACETS.get(facet)):
+                mask |= self.bitmaps[facet].get(key, 0)
+        return mask
+
+    def mask(self, selection: Optional[Selection] = None, skip: Optional[str] = None) -> int:
+        """Bitmap of entities matching the selection (OR within a facet, AND across).
+
+        Facets with no selected values do not filter; `skip` ignores one facet.
+        """
+        mask = self.all
+        for facet, values in (selection or {}).items():
+            if values and facet != skip:
+                mask &= self._facet_mask(facet, values)
+        return mask
+
+    def ids(self, mask: int) -> List[str]:
+        return [self.entity_ids[p] for p in positions(mask)]
+
+    def count(self, selection: Optional[Selection] = None) -> int:
+        return popcount(self.mask(selection))
+
+    def counts(self, selection: Optional[Selection] = None,
+               facets: Optional[Sequence[str]] = None) -> Dict[str, Dict[str, int]]:
+        """facet -> value -> number of matches, each facet counted without its own selection."""
+        result = {}
+        for facet in facets or self.bitmaps:
+            base = self.mask(selection, skip=facet)
+            values = {value: popcount(bitmap & base) for value, bitmap in self.bitmaps[facet].items()}
+            result[facet] = {v: n for v, n in sorted(values.items(), key=lambda i: (-i[1], i[0])) if n}
+        return result
+
+    # -- serialization ---------------------------------------------------------
+
+    def to_json(self) -> dict:
+        size = len(self.entity_ids)
+        return {
+            'format': FORMAT,
+            'source_hash': self.source_hash,
+            'ids': self.entity_ids,
+            'facets': {facet: {value: _encode(bitmap, size) for value, bitmap in sorted(values.items())}
+                       for facet, values in self.bitmaps.items()},
+        }
+
+    @classmethod
+    def from_json(cls, data: dict) -> 'FacetIndex':
+        if data.get('format') != FORMAT:
+            raise ValueError(f"Unsupported facet index format {data.get('format')}")
+        bitmaps = {facet: {value: _decode(encoded) for value, encoded in values.items()}
+                   for facet, values in data['facets'].items()}
+        return cls(data['ids'], bitmaps, data.get('source_hash', ''))
+
+    def save(self, path: Path = DEFAULT_INDEX):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f'.{path.name}.tmp')
+        tmp.write_text(json.dumps(self.to_json(), separators=(',', ':')) + '\n', encoding='utf-8')
+        os.replace(tmp, path)
+
+
+def build_index(data_dir: Path = DEFAULT_DATA_DIR, table: str = 'profiles') -> FacetIndex:
+    etype = entity_type(table)
+    entities = [entity for _, _, entity in iter_entities(data_dir, [etype])]
+    return FacetIndex.build(entities, source_hash=source_hash(data_dir))
+
+
+def load_index(path: Path = DEFAULT_INDEX, data_dir: Path = DEFAULT_DATA_DIR) -> FacetIndex:
+    """The saved profile index, rebuilt and saved again if the YAML changed."""
+    try:
+        index = FacetIndex.from_json(json.loads(Path(path).read_text(encoding='utf-8')))
+        if index.source_hash == source_hash(data_dir):
+            return index
+    except (OSError, ValueError, KeyError):
+        pass
+    index = build_index(data_dir)
+    index.save(path)
+    return index
+
+
+def parse_selection(expressions: Sequence[str]) -> Selection:
+    """['tags=aws,azure', 'status=active'] -> {'tags': ['aws', 'azure'], 'status': ['active']}"""
+    selection: Dict[str, List[str]] = {}
+    for expr in expressions:
+        facet, sep, values = expr.partition('=')
+        if not sep or not values:
+            raise ValueError(f"Expected FACET=VALUE[,VALUE...], got {expr!r}")
+        selection.setdefault(facet.strip(), []).extend(v.strip() for v in values.split(',') if v.strip())
+    return selection
+
+
+def main(argv: Optional[Sequence[str]] = None, prog: Optional[str] = None):
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog=prog,
+        description='Filter profiles by facets and show facet counts',
+        epilog="""
+Filters are FACET=VALUE[,VALUE...]; values of one facet are ORed, facets are ANDed.
+Facets: """ + ', '.join(FACETS) + """
+
+Examples:
+  %(prog)s --where standard=stig --where status=active
+  %(prog)s --where tags=aws,azure --counts
+  %(prog)s --where platform=Linux --json
+        """,
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('--where', action='append', default=[], metavar='FACET=VALUES', help='Filter (repeatable)')
+    parser.add_argument('--counts', action='store_true', help='Show per-facet counts for the selection')
+    parser.add_argument('--json', action='store_true', help='Print {ids, counts} as JSON')
+    parser.add_argument('--index', default=str(DEFAULT_INDEX), help=f'Index file (default: {DEFAULT_INDEX})')
+    parser.add_argument('--data-dir', default=str(DEFAULT_DATA_DIR), help='Path to data directory')
+    args = parser.parse_args(argv)
+
+    try:
+        selection = parse_selection(args.where)
+        index = load_index(args.index, args.data_dir)
+        ids = index.ids(index.mask(selection))
+        counts = index.counts(selection) if args.counts or args.json else None
+    except (ValueError, KeyError) as e:
+        print(f"❌ {e.args[0] if e.args else e}")
+        sys.exit(2)
+
+    if args.json:
+        print(json.dumps({'ids': ids, 'counts': counts}, indent=2))
+        return
+
+    for entity_id in ids:
+        print(entity_id)
+    print(f"\n📊 {len(ids)} of {len(index)} profiles match")
+    if counts:
+        for facet, values in counts.items():
+            print(f"\n  {facet}:")
+            for value, count in values.items():
+                print(f"    {value}: {count}")
@@ -0,0 +1,56 @@
+"""Tests for the bitmap facet index."""
+
+import json
+
+import pytest
+
+from saf_content.facets import FacetIndex, build_index, load_index, main, parse_selection
+
+ENTITIES = [
+    {'id': 'a', 'standard': 'STIG', 'status': 'active', 'tags': ['linux', 'os']},
+    {'id': 'b', 'standard': 'stig', 'status': 'beta', 'tags': ['windows', 'os']},
+    {'id': 'c', 'standard': 'CIS', 'status': 'active', 'tags': ['aws']},
+    {'id': 'd', 'standard': 'cis', 'status': 'active', 'tags': []},
+]
+
+
+@pytest.fixture
+def index():
+    return FacetIndex.build(ENTITIES)
+
+
+def test_and_across_facets_or_within(index):
+    assert index.ids(index.mask({'standard': ['STIG'], 'tags': ['linux', 'windows']})) == ['a', 'b']
+    assert index.ids(index.mask({'standard': ['stig', 'cis'], 'status': ['active']})) == ['a', 'c', 'd']
+    assert index.ids(index.mask({'tags': ['nope']})) == []
+    assert index.count({}) == 4
+
+
+def test_counts_ignore_the_facets_own_selection(index):
+    counts = index.counts({'standard': ['stig'], 'status': ['active']})
+    assert counts['standard'] == {'cis': 2, 'stig': 1}
+    assert counts['status'] == {'active': 1, 'beta': 1}
+    assert counts['tags'] == {'linux': 1, 'os': 1}
+
+
+def test_serialization_round_trip(index):
+    restored = FacetIndex.from_json(json.loads(json.dumps(index.to_json())))
+    assert restored.bitmaps == index.bitmaps and restored.entity_ids == index.entity_ids
+
+
+def test_parse_selection():
+    assert parse_selection(['tags=aws, azure', 'tags=gcp', 'status=active']) == {
+        'tags': ['aws', 'azure', 'gcp'], 'status': ['active']}
+    with pytest.raises(ValueError):
+        parse_selection(['standard'])
+
+
+def test_corpus_index_and_cli(tmp_path, capsys):
+    index = build_index()
+    assert index.count({'standard': ['stig']}) == index.counts()['standard']['stig'] > 0
+
+    path = tmp_path / 'facets.json'
+    main(['--index', str(path), '--where', 'standard=stig', '--where', 'status=active', '--json'])
+    result = json.loads(capsys.readouterr().out)
+    assert result['ids'] == index.ids(index.mask({'standard': ['stig'], 'status': ['active']}))
+    assert load_index(path).source_hash == index.source_hash
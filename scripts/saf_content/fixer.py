@@ -0,0 +1,588 @@
+"""
+Fix data quality issues in YAML files for SQLite import.
+
+This script:
+1. Normalizes IDs to lowercase-with-dashes format
+2. Fixes FK reference mismatches
+3. Reports missing required fields
+4. Validates YAML structure
+5. Checks every entity against its JSON Schema (saf_content/schemas, compiled
+   by saf_content/schema.py): value formats such as lastUpdated dates, the
+   status enum, URLs and versions
+
+With `since` (--since REF) only entities changed since the merge base of
+REF, plus the entities that reference added, removed or renamed IDs, are
+checked in phase 2 (see saf_content/changes.py).
+
+Sharded collections (saf_content/shards.py) are checked shard by shard;
+phase 1 takes the IDs of unchanged shards from their manifest.
+
+Run through scripts/fix-yaml-data-quality.py or `saf-py fix` / `saf-py validate`.
+"""
+
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+from datetime import datetime
+import shutil
+import yaml
+
+from .corpus import ENTITY_TYPES, ENTITY_TYPES_BY_DIR, SafeLoader, iter_files, load_file, entity_type as entity_type_for
+from .schema import DEFAULT_CACHE_DIR as VALIDATOR_CACHE, SchemaError, Validator, compile_validator
+from .ids import ORG_ID_MAPPING, STANDARD_ID_MAPPING, normalize_id
+
+
+class DataQualityFixer:
+    # Explicit normalization mappings (shared with the sync tools, see saf_content/ids.py)
+    STANDARD_ID_MAPPING = STANDARD_ID_MAPPING
+    ORG_ID_MAPPING = ORG_ID_MAPPING
+    # YAML list key -> table (hardeningProfiles -> hardening_profiles)
+    TABLES_BY_KEY = {etype.key: etype.table for etype in ENTITY_TYPES}
+
+    def __init__(self, data_dir: str = './content/data', dry_run: bool = True, verbose: bool = False, validate_only: bool = False,
+                 since: Optional[str] = None):
+        self.data_dir = Path(data_dir)
+        self.dry_run = dry_run
+        self.verbose = verbose
+        self.validate_only = validate_only
+        self.since = since
+        self.reference_index: Optional[Path] = None   # references.DEFAULT_INDEX
+        self.issues_found = 0
+        self.files_modified = 0
+
+        # Track all valid IDs from each entity type
+        self.valid_ids: Dict[str, Set[str]] = {
+            'standards': set(),
+            'technologies': set(),
+            'organizations': set(),
+            'teams': set(),
+            'tags': set(),
+            'capabilities': set()
+        }
+
+        # Track FK references that need fixing
+        self.fk_issues: List[Tuple[str, str, str, str]] = []
+
+        # Track data quality issues
+        self.duplicate_ids: Dict[str, List[str]] = {}  # ID -> [files where it appears]
+        self.missing_fields: List[Tuple[str, str, str]] = []  # (file, entity_id, missing_field)
+        self.validation_errors: List[str] = []
+        self.schema_issues: List[Tuple[str, str, str]] = []  # (file, path, message)
+        self.validators: Dict[str, Optional[Validator]] = {}   # compiled on first use
+        self.validator_cache: Optional[Path] = VALIDATOR_CACHE
+
+    def normalize_id(self, id_str: str, id_type: str = 'generic') -> str:
+        """Normalize ID using explicit mapping or algorithmic fallback."""
+        return normalize_id(id_str, id_type)
+
+    def scan_for_valid_ids(self):
+        """First pass: collect all valid IDs from entity files and detect duplicates."""
+        print("📊 Phase 1: Scanning for valid entity IDs and detecting duplicates...")
+        print()
+
+        # Track where each ID appears (for duplicate detection)
+        id_locations: Dict[str, Dict[str, List[str]]] = {
+            entity_type: {} for entity_type in self.valid_ids.keys()
+        }
+
+        for entity_type in self.valid_ids.keys():
+            entity_dir = self.data_dir / entity_type
+            if not entity_dir.exists():
+                continue
+
+            for filepath in iter_files(self.data_dir, ENTITY_TYPES_BY_DIR[entity_type]):
+                try:
+                    # A shard whose manifest entry is current needs no parse for its IDs
+                    ids = None
+                    if filepath.parent != entity_dir:
+                        from .shards import manifest_ids
+                        ids = manifest_ids(filepath)
+                    data = {entity_type: [{'id': i} for i in ids]} if ids is not None else load_file(filepath)
+
+                    if not data or entity_type not in data:
+                        continue
+
+                    entities = data[entity_type]
+                    if not isinstance(entities, list):
+                        print(f"⚠️  {filepath.name}: '{entity_type}' should be a list, got {type(entities).__name__}")
+                        self.validation_errors.append(f"{filepath.name}: '{entity_type}' should be a list")
+                        continue
+
+                    for entity in entities:
+                        if 'id' in entity:
+                            original_id = entity['id']
+                            # Determine ID type from entity type (standards → standard, organizations → organization)
+                            id_type = entity_type.rstrip('s') if entity_type.endswith('s') else entity_type
+                            normalized_id = self.normalize_id(original_id, id_type)
+
+                            # Track location for duplicate detection
+                            if normalized_id not in id_locations[entity_type]:
+                                id_locations[entity_type][normalized_id] = []
+                            id_locations[entity_type][normalized_id].append(str(filepath.relative_to(self.data_dir)))
+
+                            # Store both original and normalized
+                            self.valid_ids[entity_type].add(original_id)
+                            if normalized_id != original_id:
+                                self.valid_ids[entity_type].add(normalized_id)
+
+                except Exception as e:
+                    print(f"❌ Error reading {filepath}: {e}")
+                    self.validation_errors.append(f"Error reading {filepath.name}: {e}")
+
+        # Detect duplicates
+        for entity_type, id_map in id_locations.items():
+            for entity_id, locations in id_map.items():
+                if len(locations) > 1:
+                    self.duplicate_ids[f"{entity_type}:{entity_id}"] = locations
+
+        # Print summary
+        for entity_type, ids in self.valid_ids.items():
+            if ids:
+                print(f"  ✓ {entity_type}: {len(ids)} IDs found")
+
+        if self.duplicate_ids:
+            print()
+            print(f"  ⚠️  Found {len(self.duplicate_ids)} duplicate IDs!")
+
+        print()
+
+    def check_fk_reference(self, filepath: Path, entity_type: str, entity: dict,
+                          fk_field: str, fk_table: str) -> bool:
+        """Check if a FK reference is valid, track issues."""
+        if fk_field not in entity:
+            return True  # Missing is OK, we'll report separately
+
+        fk_value = entity[fk_field]
+        if not fk_value:
+            return True
+
+        # Check if reference exists (original or normalized form)
+        if fk_value not in self.valid_ids[fk_table]:
+            # Determine ID type from FK table (standards → standard, organizations → organization)
+            id_type = fk_table.rstrip('s') if fk_table.endswith('s') else fk_table
+            normalized = self.normalize_id(fk_value, id_type)
+            if normalized in self.valid_ids[fk_table]:
+                # Found with normalization
+                self.fk_issues.append((
+                    str(filepath.relative_to(self.data_dir)),
+                    entity.get('id', 'unknown'),
+                    fk_field,
+                    f"{fk_value} → {normalized}"
+                ))
+                return False
+            else:
+                # Not found at all
+                self.fk_issues.append((
+                    str(filepath.relative_to(self.data_dir)),
+                    entity.get('id', 'unknown'),
+                    fk_field,
+                    f"{fk_value} → NOT FOUND"
+                ))
+                return False
+
+        return True
+
+    def fix_yaml_file(self, filepath: Path, entity_type: str, only_ids: Optional[Set[str]] = None):
+        """Fix data quality issues in a single YAML file (only the `only_ids` entities, if given)."""
+        try:
+            with open(filepath, 'r', encoding='utf-8') as f:
+                content = f.read()
+                data = yaml.load(content, Loader=SafeLoader)
+
+            if not data or entity_type not in data:
+                return
+
+            entities = data[entity_type]
+            if not isinstance(entities, list):
+                return
+
+            modified = False
+            issues_in_file = []
+
+            for entity in entities:
+                entity_id = entity.get('id', 'unknown')
+                if only_ids is not None and str(entity_id) not in only_ids:
+                    continue
+
+                self.check_schema(filepath, entity_type, entity)
+
+                # Check and fix ID normalization
+                if 'id' in entity:
+                    original_id = entity['id']
+                    # Determine ID type from entity type
+                    id_type = entity_type.rstrip('s') if entity_type.endswith('s') else entity_type
+                    normalized_id = self.normalize_id(original_id, id_type)
+                    if original_id != normalized_id:
+                        issues_in_file.append(f"  • ID: {original_id} → {normalized_id}")
+                        if not self.dry_run and not self.validate_only:
+                            entity['id'] = normalized_id
+                        modified = True
+
+                # Check FK references
+                fk_checks = []
+                if entity_type == 'profiles' or entity_type == 'hardeningProfiles':
+                    fk_checks = [
+                        ('standard', 'standards'),
+                        ('technology', 'technologies'),
+                        ('organization', 'organizations'),
+                        ('team', 'teams')
+                    ]
+
+                for fk_field, fk_table in fk_checks:
+                    if fk_field in entity and entity[fk_field]:
+                        original_ref = entity[fk_field]
+                        # Determine ID type from FK table
+                        id_type = fk_table.rstrip('s') if fk_table.endswith('s') else fk_table
+                        normalized_ref = self.normalize_id(original_ref, id_type)
+
+                        # Check if normalized version exists
+                        if original_ref not in self.valid_ids[fk_table]:
+                            if normalized_ref in self.valid_ids[fk_table]:
+                                issues_in_file.append(f"  • {entity_id}.{fk_field}: {original_ref} → {normalized_ref}")
+                                if not self.dry_run and not self.validate_only:
+                                    entity[fk_field] = normalized_ref
+                                modified = True
+                            else:
+                                issues_in_file.append(f"  ⚠️  {entity_id}.{fk_field}: {original_ref} → NOT FOUND (will set to null)")
+                                if not self.dry_run and not self.validate_only:
+                                    entity[fk_field] = None
+                                modified = True
+                    elif entity_type in ['profiles', 'hardeningProfiles']:
+                        # Track missing recommended fields for profiles
+                        rel_path = str(filepath.relative_to(self.data_dir))
+                        self.missing_fields.append((rel_path, entity_id, fk_field))
+
+            if modified:
+                self.files_modified += 1
+                self.issues_found += len(issues_in_file)
+
+                rel_path = filepath.relative_to(self.data_dir)
+                if self.dry_run:
+                    print(f"📝 {rel_path} (would modify):")
+                else:
+                    print(f"✏️  {rel_path} (modified):")
+
+                for issue in issues_in_file:
+                    print(issue)
+                print()
+
+                if not self.dry_run and not self.validate_only:
+                    # Create backup before modifying
+                    backup_path = filepath.with_suffix(f'.yml.bak.{datetime.now().strftime("%Y%m%d-%H%M%S")}')
+                    shutil.copy2(filepath, backup_path)
+
+                    # Write modified data in canonical form, so the diff shows only the fixes
+                    # (imported here: canonical pulls in models and the process pool, which validation never needs)
+                    from .canonical import dump_text
+                    from .shards import refresh_for
+                    with open(filepath, 'w', encoding='utf-8') as f:
+                        f.write(dump_text(data, entity_type_for(entity_type)))
+                    refresh_for([filepath])
+            elif self.verbose:
+                rel_path = filepath.relative_to(self.data_dir)
+                print(f"✓ {rel_path} (no issues)")
+
+        except Exception as e:
+            print(f"❌ Error processing {filepath}: {e}")
+            self.validation_errors.append(f"Error processing {filepath.name}: {e}")
+
+    def validator_for(self, table: str) -> Optional[Validator]:
+        """Compile (or load from cache) the schema validator of an entity type on first use."""
+        if table not in self.validators:
+            try:
+                self.validators[table] = compile_validator(table, cache_dir=self.validator_cache)
+            except (OSError, ValueError, SchemaError) as e:
+                print(f"❌ Could not compile the {table} schema: {e}")
+                self.validation_errors.append(f"{table} schema: {e}")
+                self.validators[table] = None
+        return self.validators[table]
+
+    def check_schema(self, filepath: Path, entity_type_key: str, entity: dict):
+        """Record schema violations of one entity (paths start at the entity ID)."""
+        table = self.TABLES_BY_KEY.get(entity_type_key)
+        validator = self.validator_for(table) if table else None
+        if validator is None:
+            return
+        rel_path = str(filepath.relative_to(self.data_dir))
+        for issue in validator(entity, str(entity.get('id', '?'))):
+            self.schema_issues.append((rel_path, issue.path, issue.message))
+
+    def changed_scope(self) -> Optional[Dict[str, Set[str]]]:
+        """Relative file -> entity IDs to check for --since; None if git failed."""
+        # Imported here: plain `saf-py validate` runs from git hooks and does not need git or the reference index
+        from .changes import GitError, entity_changes, validation_scope
+        from .references import DEFAULT_INDEX
+
+        try:
+            changes = entity_changes(self.since, self.data_dir)
+            scope, referrers = validation_scope(changes, self.data_dir, self.reference_index or DEFAULT_INDEX)
+        except GitError as e:
+            print(f"❌ Could not determine changes since {self.since}: {e}")
+            self.validation_errors.append(f"--since {self.since}: {e}")
+            return None
+
+        print(f"🔎 Changes since {self.since} ({changes.base[:10]}): {len(changes.added)} added, "
+              f"{len(changes.removed)} removed, {len(changes.renamed)} renamed, {len(changes.modified)} modified")
+        for table, old_id, new_id in changes.renamed:
+            print(f"  • {table}: {old_id} → {new_id}")
+        entities = sum(len(ids) for ids in scope.values())
+        print(f"   Checking {entities} entities in {len(scope)} files ({referrers} pulled in as referrers)")
+        print()
+        return scope
+
+    def update_gitignore(self):
+        """Add backup files pattern to .gitignore if not already present."""
+        gitignore_path = Path('.gitignore')
+        backup_pattern = '*.bak.*'
+
+        try:
+            # Read existing .gitignore
+            if gitignore_path.exists():
+                with open(gitignore_path, 'r', encoding='utf-8') as f:
+                    content = f.read()
+
+                # Check if pattern already exists
+                if backup_pattern in content:
+                    return
+
+                # Append pattern
+                with open(gitignore_path, 'a', encoding='utf-8') as f:
+                    if not content.endswith('\n'):
+                        f.write('\n')
+                    f.write(f'\n# YAML data quality fixer backups\n{backup_pattern}\n')
+
+                print(f"✅ Added '{backup_pattern}' to .gitignore")
+            else:
+                # Create new .gitignore
+                with open(gitignore_path, 'w', encoding='utf-8') as f:
+                    f.write(f'# YAML data quality fixer backups\n{backup_pattern}\n')
+                print(f"✅ Created .gitignore with '{backup_pattern}'")
+
+        except Exception as e:
+            print(f"⚠️  Could not update .gitignore: {e}")
+
+    def print_quality_report(self):
+        """Print comprehensive data quality report."""
+        print("=" * 70)
+        print("  Data Quality Report")
+        print("=" * 70)
+        print()
+
+        # Duplicate IDs
+        if self.duplicate_ids:
+            print(f"🔴 DUPLICATE IDs ({len(self.duplicate_ids)} found):")
+            print()
+            for dup_id, locations in sorted(self.duplicate_ids.items()):
+                entity_type, entity_id = dup_id.split(':', 1)
+                print(f"  • {entity_type}: '{entity_id}'")
+                for loc in locations:
+                    print(f"      - {loc}")
+                print()
+        else:
+            print("✅ No duplicate IDs found")
+            print()
+
+        # Missing fields
+        if self.missing_fields:
+            # Group by field
+            by_field: Dict[str, List[Tuple[str, str]]] = {}
+            for file_path, entity_id, field in self.missing_fields:
+                if field not in by_field:
+                    by_field[field] = []
+                by_field[field].append((file_path, entity_id))
+
+            print(f"⚠️  MISSING RECOMMENDED FIELDS ({len(self.missing_fields)} profiles):")
+            print()
+            for field, entries in sorted(by_field.items()):
+                print(f"  • Missing '{field}': {len(entries)} profiles")
+                if self.verbose:
+                    for file_path, entity_id in entries[:10]:  # Show first 10
+                        print(f"      - {file_path}: {entity_id}")
+                    if len(entries) > 10:
+                        print(f"      ... and {len(entries) - 10} more")
+                print()
+        else:
+            print("✅ No missing recommended fields")
+            print()
+
+        # Schema violations
+        if self.schema_issues:
+            print(f"❌ SCHEMA VIOLATIONS ({len(self.schema_issues)} found):")
+            print()
+            for file_path, path, message in self.schema_issues:
+                print(f"  • {file_path}: {path}: {message}")
+            print()
+        else:
+            print("✅ All entities match their schemas")
+            print()
+
+        # Validation errors
+        if self.validation_errors:
+            print(f"❌ VALIDATION ERRORS ({len(self.validation_errors)} found):")
+            print()
+            for error in self.validation_errors:
+                print(f"  • {error}")
+            print()
+        else:
+            print("✅ No validation errors")
+            print()
+
+    def run(self) -> bool:
+        """Run the data quality fixer; returns False if validation failed."""
+        print("=" * 70)
+        print("  YAML Data Quality Fixer")
+        print("=" * 70)
+        print()
+
+        if self.validate_only:
+            print("📋 VALIDATION MODE - Reporting data quality issues only")
+        elif self.dry_run:
+            print("🔍 DRY RUN MODE - No files will be modified")
+            print("   Run with --fix to apply changes")
+        else:
+            print("⚠️  FIX MODE - Files will be modified!")
+            print("   Backups will be created with .bak.TIMESTAMP extension")
+        print()
+
+        # Phase 1: Scan for valid IDs and detect duplicates
+        self.scan_for_valid_ids()
+
+        # Phase 2: Check and fix files (skip if validate-only and duplicates found)
+        scope = None
+        if not (self.validate_only and self.duplicate_ids):
+            print("🔧 Phase 2: Checking and fixing data quality issues...")
+            print()
+
+            if self.since:
+                scope = self.changed_scope()
+                if scope is None:
+                    scope = {}
+
+            all_entity_types = ['standards', 'technologies', 'organizations', 'teams',
+                               'tags', 'capabilities', 'tools', 'profiles', 'hardening']
+
+            for entity_type in all_entity_types:
+                entity_dir = self.data_dir / entity_type
+                if not entity_dir.exists():
+                    continue
+
+                yaml_files = iter_files(self.data_dir, ENTITY_TYPES_BY_DIR[entity_type])
+
+                # Determine the key name (profiles vs hardeningProfiles)
+                if entity_type == 'hardening':
+                    key_name = 'hardeningProfiles'
+                else:
+                    key_name = entity_type
+
+                for filepath in yaml_files:
+                    if scope is None:
+                        self.fix_yaml_file(filepath, key_name)
+                        continue
+                    rel_path = filepath.relative_to(self.data_dir).as_posix()
+                    if rel_path in scope:
+                        self.fix_yaml_file(filepath, key_name, scope[rel_path])
+
+        # Phase 3: Quality report
+        self.print_quality_report()
+
+        # Summary
+        print("=" * 70)
+        print("  Summary")
+        print("=" * 70)
+        print()
+        if scope is not None:
+            print(f"  Files scanned: {len(scope)} (changed since {self.since})")
+        else:
+            print(f"  Files scanned: {len(list(self.data_dir.rglob('*.yml')))}")
+        print(f"  Normalization issues: {self.issues_found}")
+        print(f"  Duplicate IDs: {len(self.duplicate_ids)}")
+        print(f"  Missing fields: {len(self.missing_fields)}")
+        print(f"  Schema violations: {len(self.schema_issues)}")
+        print(f"  Validation errors: {len(self.validation_errors)}")
+        print()
+
+        # Update .gitignore if fixing
+        if not self.dry_run and not self.validate_only and self.files_modified > 0:
+            self.update_gitignore()
+            print()
+
+        # Final message
+        if self.validate_only:
+            if self.duplicate_ids or self.validation_errors or self.schema_issues:
+                print("❌ VALIDATION FAILED - Fix critical issues above before proceeding")
+            else:
+                print("✅ Validation passed! Data quality is good.")
+                if self.issues_found > 0 or self.missing_fields:
+                    print("   Some normalization/optional field issues found - run with --fix to clean up")
+        elif self.dry_run and self.issues_found > 0:
+            print("✅ Dry run complete. Review the changes above.")
+            print("   Run with --fix to apply these changes.")
+        elif not self.dry_run:
+            print("✅ Fixes applied!")
+            if self.files_modified > 0:
+                print()
+                print("📦 Backup files created with .bak.TIMESTAMP extension")
+                print("   To restore: mv file.yml.bak.TIMESTAMP file.yml")
+                print("   To remove backups: find content/data -name '*.bak.*' -delete")
+        else:
+            print("✅ No issues found!")
+        print()
+
+        return not (self.validate_only and (self.duplicate_ids or self.validation_errors or self.schema_issues))
+
+
+def main(argv: Optional[Sequence[str]] = None, prog: Optional[str] = None):
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog=prog,
+        description='Comprehensive YAML data quality checker and fixer',
+        epilog="""
+Examples:
+  python %(prog)s                           # Dry run (show what would change)
+  python %(prog)s --validate                # Validation only (report all issues)
+  python %(prog)s --validate --verbose      # Validation with detailed missing field list
+  python %(prog)s --fix                     # Apply all fixes with backups
+  python %(prog)s --fix --verbose           # Apply fixes with detailed output
+  python %(prog)s --validate --since origin/main   # Only entities changed by this branch
+        """,
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('--fix', action='store_true',
+                       help='Apply fixes to YAML files (creates timestamped backups)')
+    parser.add_argument('--validate', action='store_true',
+                       help='Validation mode: report all data quality issues without fixing')
+    parser.add_argument('--verbose', action='store_true',
+                       help='Show detailed output including files with no issues and full missing field lists')
+    parser.add_argument('--data-dir', default='./content/data',
+                       help='Path to data directory (default: ./content/data)')
+    parser.add_argument('--since', metavar='REF',
+                       help='Only check entities changed since the merge base with REF, and their referrers')
+
+    args = parser.parse_args(argv)
+
+    # Validate mode overrides fix mode
+    if args.validate:
+        fixer = DataQualityFixer(
+            data_dir=args.data_dir,
+            dry_run=True,
+            verbose=args.verbose,
+            validate_only=True,
+            since=args.since
+        )
+    else:
+        fixer = DataQualityFixer(
+            data_dir=args.data_dir,
+            dry_run=not args.fix,
+            verbose=args.verbose,
+            validate_only=False,
+            since=args.since
+        )
+
+    if not fixer.run():
+        sys.exit(1)
+
+
+def validate_main(argv: Optional[Sequence[str]] = None, prog: Optional[str] = None):
+    """`fix --validate`: report issues without touching files, exit 1 on failure."""
+    main(['--validate', *(sys.argv[1:] if argv is None else argv)], prog)
@@ -0,0 +1,59 @@
+"""
+Entity ID normalization shared by the data quality fixer and sync tools.
+"""
+
+import re
+
+# Explicit normalization mappings (self-documenting, handles special cases)
+STANDARD_ID_MAPPING = {
+    'STIG': 'stig',
+    'STIG-Ready': 'stig-ready',
+    'SRG-Ready': 'stig-ready',  # Erroneous form (should be STIG-Ready)
+    'CIS': 'cis',
+    'PCI-DSS': 'pci-dss',
+    'NIST 800-53': 'nist-800-53',
+    'NIST-800-53': 'nist-800-53',
+    'NIST CSF': 'nist-csf',
+    'VENDOR-GUIDANCE': 'vendor-guidance',
+    'Vendor Guidance': 'vendor-guidance',
+    'AWS Best Practices': 'vendor-guidance',
+    'Azure Best Practices': 'vendor-guidance',
+    'GCP Best Practices': 'vendor-guidance',
+    'Best Practices': 'vendor-guidance',
+    'OTHER': 'other',
+    'disa-stigs': 'stig',  # Old v4 ID format
+    'CMMC': 'cmmc',
+}
+
+ORG_ID_MAPPING = {
+    'MITRE': 'mitre',
+    'DISA': 'disa',
+    'CIS': 'cis',
+    'VMware': 'vmware',
+    'other': 'other',
+}
+
+
+def id_type_for(entity_type: str) -> str:
+    """Map an entity type or FK table (standards, organizations) to its ID type."""
+    return entity_type.rstrip('s') if entity_type.endswith('s') else entity_type
+
+
+def normalize_id(id_str: str, id_type: str = 'generic') -> str:
+    """Normalize ID using explicit mapping or algorithmic fallback."""
+    if not id_str:
+        return id_str
+
+    # Check explicit mappings first
+    if id_type == 'standard' and id_str in STANDARD_ID_MAPPING:
+        return STANDARD_ID_MAPPING[id_str]
+    elif id_type == 'organization' and id_str in ORG_ID_MAPPING:
+        return ORG_ID_MAPPING[id_str]
+
+    # Fallback: algorithmic normalization (lowercase-with-dashes)
+    normalized = id_str.lower()
+    normalized = re.sub(r'[\s_]+', '-', normalized)
+    normalized = re.sub(r'-+', '-', normalized)
+    normalized = normalized.strip('-')
+
+    return normalized
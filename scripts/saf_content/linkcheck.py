@@ -0,0 +1,278 @@
+"""
+Concurrent checker for the external URLs in the content/data corpus.
+
+Profiles, hardening profiles, tools and organizations carry `github`,
+`website` and `logo` URLs (LINK_FIELDS). Each distinct URL is requested
+once, however many entities share it:
+
+  - HEAD first, falling back to GET for servers that refuse HEAD
+    (FALLBACK_STATUSES); redirects are followed with the same method.
+  - Requests run on a thread pool driven by asyncio, bounded by a global
+    limit and a per-host limit, so a large corpus finishes in seconds
+    without hammering github.com.
+  - Validators (ETag, Last-Modified) of successful responses are kept in
+    DEFAULT_CACHE and sent back as If-None-Match / If-Modified-Since, so a
+    re-run mostly gets 304s and no bodies.
+
+Site-relative values ('/img/logos/...', '/apps/vulcan') point into the
+website itself; they are skipped unless --base-url says where to resolve
+them. 429 responses are reported as rate limited rather than broken.
+
+Usage:
+  scripts/saf-py check-links                    # Report broken links, exit 1 if any
+  scripts/saf-py check-links --json report.json
+  scripts/saf-py check-links --per-host 2 --base-url https://saf.mitre.org
+"""
+
+import asyncio
+import http.client
+import json
+import os
+import sys
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+from urllib.parse import urljoin, urlsplit
+
+from .corpus import DEFAULT_DATA_DIR, REPO_ROOT, entity_type, file_entities, iter_files, load_file
+
+DEFAULT_CACHE = REPO_ROOT / '.cache' / 'saf' / 'links.json'
+FORMAT = 1
+
+LINK_TYPES = ('organizations', 'profiles', 'hardening_profiles', 'tools')
+LINK_FIELDS = ('github', 'website', 'logo')
+
+FALLBACK_STATUSES = {403, 405, 501}   # HEAD refused or not implemented: retry with GET
+RATE_LIMITED = {429}
+
+USER_AGENT = 'saf-link-checker/1.0 (+https://saf.mitre.org)'
+
+
+class LinkSource(NamedTuple):
+    file: str    # relative to the data directory
+    table: str
+    id: str      # entity ID, or '_metadata' for the file's metadata block
+    field: str
+
+
+class LinkResult(NamedTuple):
+    url: str
+    status: Optional[int]          # final HTTP status (the cached one on a 304)
+    final_url: str                 # after redirects
+    method: str                    # method that produced the status: HEAD or GET
+    cached: bool = False           # server answered 304 Not Modified
+    error: Optional[str] = None    # network error, timeout, bad URL
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    @property
+    def rate_limited(self) -> bool:
+        return self.status in RATE_LIMITED
+
+    @property
+    def broken(self) -> bool:
+        return self.error is not None or (self.status is not None and self.status >= 400 and not self.rate_limited)
+
+    @property
+    def redirected(self) -> bool:
+        return self.final_url != self.url
+
+
+def collect_links(data_dir: Path = DEFAULT_DATA_DIR,
+                  base_url: Optional[str] = None) -> Tuple[Dict[str, List[LinkSource]], List[LinkSource]]:
+    """(absolute URL -> where it appears, sources of site-relative values that were skipped)."""
+    data_dir = Path(data_dir)
+    links: Dict[str, List[LinkSource]] = {}
+    skipped: List[LinkSource] = []
+    for name in LINK_TYPES:
+        etype = entity_type(name)
+        for path in iter_files(data_dir, etype):
+            rel = path.relative_to(data_dir).as_posix()
+            data = load_file(path)
+            blocks = [('_metadata', data.get('_metadata') if isinstance(data, dict) else None)]
+            blocks += [(str(e.get('id', '')), e) for e in file_entities(data, etype) if isinstance(e, dict)]
+            for entity_id, block in blocks:
+                if not isinstance(block, dict):
+                    continue
+                for field in LINK_FIELDS:
+                    value = block.get(field)
+                    if not isinstance(value, str) or not value.strip():
+                        continue
+                    url = value.strip()
+                    source = LinkSource(rel, etype.table, entity_id, field)
+                    if not urlsplit(url).scheme:
+                        if base_url is None:
+                            skipped.append(source)
+                            continue
+                        url = urljoin(base_url, url)
+                    links.setdefault(url, []).append(source)
+    return links, skipped
+
+
+class _SameMethodRedirect(urllib.request.HTTPRedirectHandler):
+    """Follow redirects without turning a HEAD into a GET."""
+
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        new = super().redirect_request(req, fp, code, msg, headers, newurl)
+        if new is not None:
+            new.method = req.get_method()
+        return new
+
+
+_opener = urllib.request.build_opener(_SameMethodRedirect)
+
+
+def _request(url: str, method: str, cached: Optional[dict], timeout: float) -> Tuple[int, str, dict]:
+    headers = {'User-Agent': USER_AGENT}
+    if cached:
+        if cached.get('etag'):
+            headers['If-None-Match'] = cached['etag']
+        if cached.get('last_modified'):
+            headers['If-Modified-Since'] = cached['last_modified']
+    request = urllib.request.Request(url, method=method, headers=headers)
+    try:
+        with _opener.open(request, timeout=timeout) as response:
+            return response.status, response.geturl(), dict(response.headers)
+    except urllib.error.HTTPError as e:
+        with e:
+            return e.code, e.geturl() or url, dict(e.headers or {})
+
+
+def check_url(url: str, cached: Optional[dict] = None, timeout: float = 10.0) -> LinkResult:
+    """Check one URL: HEAD, then GET if the server refuses HEAD."""
+    method = 'HEAD'
+    try:
+        status, final_url, headers = _request(url, method, cached, timeout)
+        if status in FALLBACK_STATUSES:
+            method = 'GET'
+            status, final_url, headers = _request(url, method, cached, timeout)
+    except (urllib.error.URLError, http.client.HTTPException, OSError, ValueError) as e:
+        reason = e.reason if isinstance(e, urllib.error.URLError) else e
+        return LinkResult(url, None, url, method, error=str(reason) or type(reason).__name__)
+
+    if status == 304 and cached:
+        return LinkResult(url, cached['status'], cached.get('final_url', final_url), method, cached=True,
+                          etag=headers.get('ETag') or cached.get('etag'),
+                          last_modified=headers.get('Last-Modified') or cached.get('last_modified'))
+    return LinkResult(url, status, final_url, method,
+                      etag=headers.get('ETag'), last_modified=headers.get('Last-Modified'))
+
+
+async def check_urls(urls: Iterable[str], cache: Optional[Dict[str, dict]] = None, concurrency: int = 32,
+                     per_host: int = 4, timeout: float = 10.0) -> List[LinkResult]:
+    """Check urls concurrently; results are in the order of `urls`."""
+    cache = cache or {}
+    loop = asyncio.get_running_loop()
+    executor = ThreadPoolExecutor(max_workers=concurrency)
+    overall = asyncio.Semaphore(concurrency)
+    hosts: Dict[str, asyncio.Semaphore] = {}
+
+    async def one(url: str) -> LinkResult:
+        host = hosts.setdefault(urlsplit(url).netloc.lower(), asyncio.Semaphore(per_host))
+        # Wait for the host's slot first so a busy host does not hold global slots
+        async with host, overall:
+            return await loop.run_in_executor(executor, check_url, url, cache.get(url), timeout)
+
+    try:
+        return list(await asyncio.gather(*(one(url) for url in urls)))
+    finally:
+        executor.shutdown(wait=False)
+
+
+def read_cache(path: Path = DEFAULT_CACHE) -> Dict[str, dict]:
+    try:
+        data = json.loads(Path(path).read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+    return data.get('urls', {}) if isinstance(data, dict) and data.get('format') == FORMAT else {}
+
+
+def write_cache(results: Sequence[LinkResult], path: Path = DEFAULT_CACHE):
+    """Keep the validators of successful responses; the rest are re-checked in full next time."""
+    urls = {}
+    for r in results:
+        if not r.broken and not r.rate_limited and (r.etag or r.last_modified):
+            urls[r.url] = {'status': r.status, 'final_url': r.final_url,
+                           'etag': r.etag, 'last_modified': r.last_modified}
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f'.{path.name}.tmp')
+    tmp.write_text(json.dumps({'format': FORMAT, 'urls': urls}, indent=1, sort_keys=True) + '\n', encoding='utf-8')
+    os.replace(tmp, path)
+
+
+def report(results: Sequence[LinkResult], links: Dict[str, List[LinkSource]],
+           skipped: Sequence[LinkSource]) -> dict:
+    """Structured findings: broken, rate-limited and redirected links with their sources."""
+    def finding(r: LinkResult) -> dict:
+        return {
+            'url': r.url,
+            'status': r.status,
+            'error': r.error,
+            'final_url': r.final_url,
+            'method': r.method,
+            'sources': [s._asdict() for s in links.get(r.url, [])],
+        }
+
+    return {
+        'summary': {
+            'checked': len(results),
+            'ok': sum(1 for r in results if not r.broken and not r.rate_limited),
+            'not_modified': sum(1 for r in results if r.cached),
+            'broken': sum(1 for r in results if r.broken),
+            'rate_limited': sum(1 for r in results if r.rate_limited),
+            'redirected': sum(1 for r in results if r.redirected and not r.broken),
+            'skipped': len(skipped),
+        },
+        'broken': [finding(r) for r in results if r.broken],
+        'rate_limited': [finding(r) for r in results if r.rate_limited],
+        'redirected': [finding(r) for r in results if r.redirected and not r.broken],
+        'skipped': [s._asdict() for s in skipped],
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None, prog: Optional[str] = None):
+    import argparse
+
+    parser = argparse.ArgumentParser(prog=prog, description='Check the github, website and logo URLs in content/data')
+    parser.add_argument('--data-dir', default=str(DEFAULT_DATA_DIR), help='Path to data directory')
+    parser.add_argument('--concurrency', type=int, default=32, help='Requests in flight overall (default: 32)')
+    parser.add_argument('--per-host', type=int, default=4, help='Requests in flight per host (default: 4)')
+    parser.add_argument('--timeout', type=float, default=10.0, help='Seconds per request (default: 10)')
+    parser.add_argument('--base-url', default=None, help='Resolve site-relative values against this URL instead of skipping them')
+    parser.add_argument('--cache', default=str(DEFAULT_CACHE), help=f'ETag/Last-Modified cache (default: {DEFAULT_CACHE})')
+    parser.add_argument('--no-cache', action='store_true', help='Ignore the cache and do not update it')
+    parser.add_argument('--json', metavar='FILE', help="Write the structured report to FILE ('-' for stdout)")
+    args = parser.parse_args(argv)
+    if args.concurrency < 1 or args.per_host < 1:
+        parser.error('--concurrency and --per-host must be at least 1')
+
+    start = time.perf_counter()
+    links, skipped = collect_links(Path(args.data_dir), args.base_url)
+    cache = {} if args.no_cache else read_cache(Path(args.cache))
+    results = asyncio.run(check_urls(sorted(links), cache, args.concurrency, args.per_host, args.timeout))
+    if not args.no_cache:
+        write_cache(results, Path(args.cache))
+    findings = report(results, links, skipped)
+
+    if args.json == '-':
+        print(json.dumps(findings, indent=2))
+    else:
+        if args.json:
+            Path(args.json).write_text(json.dumps(findings, indent=2) + '\n', encoding='utf-8')
+        for kind, icon in (('broken', '❌'), ('rate_limited', '⚠️ '), ('redirected', '→')):
+            for item in findings[kind]:
+                where = ', '.join(f"{s['file']}:{s['id']}.{s['field']}" for s in item['sources'])
+                status = item['error'] or item['status']
+                target = f" → {item['final_url']}" if kind == 'redirected' else ''
+                print(f"{icon} {item['url']} ({status}){target}\n     {where}")
+        summary = findings['summary']
+        print(f"\n📊 {summary['checked']} URLs in {time.perf_counter() - start:.1f}s: {summary['ok']} ok "
+              f"({summary['not_modified']} not modified), {summary['broken']} broken, "
+              f"{summary['rate_limited']} rate limited, {summary['redirected']} redirected, "
+              f"{summary['skipped']} site-relative skipped")
+    if findings['broken']:
+        sys.exit(1)
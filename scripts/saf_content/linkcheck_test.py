@@ -0,0 +1,134 @@
+"""Tests for the link checker, against a stub HTTP server on localhost."""
+
+import asyncio
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from saf_content.linkcheck import check_urls, collect_links, read_cache, report, write_cache
+
+ETAG = '"v1"'
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_HEAD(self):
+        self.server.requests.append(('HEAD', self.path))
+        if self.path == '/no-head':
+            self.reply(405)
+        else:
+            self.route()
+
+    def do_GET(self):
+        self.server.requests.append(('GET', self.path))
+        self.route()
+
+    def route(self):
+        if self.path == '/ok':
+            if self.headers.get('If-None-Match') == ETAG:
+                self.reply(304)
+            else:
+                self.reply(200, {'ETag': ETAG})
+        elif self.path == '/moved':
+            self.reply(301, {'Location': '/ok'})
+        elif self.path == '/busy':
+            self.reply(429)
+        elif self.path.startswith('/slow'):
+            with self.server.lock:
+                self.server.active += 1
+                self.server.peak = max(self.server.peak, self.server.active)
+            time.sleep(0.05)
+            with self.server.lock:
+                self.server.active -= 1
+            self.reply(200)
+        elif self.path == '/no-head':
+            self.reply(200)
+        elif self.path == '/garbage':
+            self.close_connection = True
+            self.wfile.write(b'HTCPCP/1.0 teapot\r\n\r\n')
+        else:
+            self.reply(404)
+
+    def reply(self, status, headers=None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    httpd.requests, httpd.lock, httpd.active, httpd.peak = [], threading.Lock(), 0, 0
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def url(server, path):
+    return f'http://127.0.0.1:{server.server_address[1]}{path}'
+
+
+def test_statuses_fallback_redirects_and_conditional_cache(server, tmp_path):
+    urls = [url(server, p) for p in ('/ok', '/no-head', '/missing', '/moved', '/busy')]
+    results = {r.url: r for r in asyncio.run(check_urls(urls))}
+    ok, no_head, missing, moved, busy = (results[u] for u in urls)
+
+    assert (ok.status, ok.method, ok.etag, ok.broken) == (200, 'HEAD', ETAG, False)
+    assert (no_head.status, no_head.method, no_head.broken) == (200, 'GET', False)
+    assert (missing.status, missing.broken) == (404, True)
+    assert (moved.status, moved.final_url, moved.redirected) == (200, url(server, '/ok'), True)
+    assert busy.rate_limited and not busy.broken
+    assert ('GET', '/moved') not in server.requests   # the redirect kept HEAD
+
+    cache_path = tmp_path / 'links.json'
+    write_cache(list(results.values()), cache_path)
+    cache = read_cache(cache_path)
+    assert set(cache) == {url(server, '/ok'), url(server, '/moved')}
+
+    again = asyncio.run(check_urls([url(server, '/ok'), url(server, '/moved')], cache))
+    assert [(r.status, r.cached) for r in again] == [(200, True), (200, True)]
+    assert again[1].final_url == url(server, '/ok')
+
+
+def test_protocol_errors_are_results_not_failures(server):
+    urls = [url(server, '/garbage'), url(server, '/ok')]
+    garbage, ok = asyncio.run(check_urls(urls))
+    assert garbage.status is None and garbage.broken and 'HTCPCP' in garbage.error
+    assert ok.status == 200   # one bad host does not abort the run
+
+
+def test_per_host_and_global_limits(server):
+    urls = [url(server, f'/slow/{i}') for i in range(12)]
+    results = asyncio.run(check_urls(urls, per_host=3))
+    assert all(r.status == 200 for r in results)
+    assert server.peak <= 3
+
+    server.peak = 0
+    asyncio.run(check_urls(urls, concurrency=2, per_host=8))
+    assert server.peak <= 2
+
+
+def test_report_attributes_findings_to_entities(server, tmp_path):
+    (tmp_path / 'organizations').mkdir()
+    (tmp_path / 'organizations' / 'orgs.yml').write_text(
+        'organizations:\n'
+        f'  - id: a\n    website: {url(server, "/missing")}\n    logo: /img/a.png\n'
+        f'  - id: b\n    website: {url(server, "/missing")}\n', encoding='utf-8')
+    links, skipped = collect_links(tmp_path)
+    assert list(links) == [url(server, '/missing')]
+    assert [(s.id, s.field) for s in skipped] == [('a', 'logo')]
+
+    findings = report(asyncio.run(check_urls(links)), links, skipped)
+    assert findings['summary']['broken'] == 1
+    assert [s['id'] for s in findings['broken'][0]['sources']] == ['a', 'b']
+
+    resolved, skipped = collect_links(tmp_path, base_url=url(server, '/'))
+    assert url(server, '/img/a.png') in resolved and not skipped
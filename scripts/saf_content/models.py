@@ -0,0 +1,273 @@
+"""
+Typed, compact entity models for the content/data corpus.
+
+Each entity type has a class with `__slots__`, so an instance stores its
+values in fixed slots instead of a per-instance dict, and attributes use the
+snake_case form of the YAML keys (`short_description` for
+`shortDescription`). Values that repeat across the corpus (status,
+framework, platform, requirements, FK IDs, tags, ...) are interned while
+loading, so 100k profiles share one `'active'` and one `'InSpec'` string
+instead of holding 100k copies each. Keys a class does not know are kept in
+`extra`, so `to_dict()` round-trips every entity.
+
+    from saf_content.models import load_models
+    models = load_models()
+    active = [p for p in models['profiles'] if p.status == 'active']
+
+See saf_content/bench_models.py for the memory and access-time comparison
+with plain dicts.
+"""
+
+import re
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Type, TypeVar
+
+from .corpus import DEFAULT_DATA_DIR, ENTITY_TYPES, iter_entities
+
+T = TypeVar('T', bound='Entity')
+
+_CAMEL = re.compile(r'_([a-z])')
+
+
+def yaml_key(attribute: str) -> str:
+    """YAML key for a model attribute (short_description -> shortDescription)."""
+    return _CAMEL.sub(lambda m: m.group(1).upper(), attribute)
+
+
+def _intern(value):
+    if isinstance(value, str):
+        return sys.intern(value)
+    if isinstance(value, list):
+        return [sys.intern(v) if isinstance(v, str) else v for v in value]
+    return value
+
+
+class Entity:
+    """Base class; subclasses list their attributes in __slots__."""
+
+    __slots__ = ('extra',)
+    # Attributes whose values repeat across entities and are interned on load
+    INTERNED: Tuple[str, ...] = ()
+    _keys: Tuple[Tuple[str, str], ...] = ()
+
+    extra: Optional[dict]
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._keys = tuple((name, yaml_key(name)) for name in cls.__slots__)
+
+    def __init__(self, **values):
+        for name in self.__slots__:
+            setattr(self, name, values.pop(name, None))
+        self.extra = values or None
+
+    @classmethod
+    def from_dict(cls: Type[T], data: dict, intern: bool = True) -> T:
+        """Build from a YAML entity dict; repeated values are interned."""
+        entity = cls.__new__(cls)
+        remaining = dict(data)
+        interned = cls.INTERNED if intern else ()
+        for name, key in cls._keys:
+            value = remaining.pop(key, None)
+            setattr(entity, name, _intern(value) if name in interned else value)
+        entity.extra = remaining or None
+        return entity
+
+    def to_dict(self) -> dict:
+        """The YAML entity dict, omitting unset attributes."""
+        data = {key: getattr(self, name) for name, key in self._keys if getattr(self, name) is not None}
+        data.update(self.extra or {})
+        return data
+
+    def __eq__(self, other) -> bool:
+        return type(self) is type(other) and self.to_dict() == other.to_dict()
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(id={getattr(self, 'id', None)!r})"
+
+
+class Tag(Entity):
+    __slots__ = ('id', 'name', 'description', 'category', 'status')
+    INTERNED = ('category', 'status')
+
+    id: str
+    name: Optional[str]
+    description: Optional[str]
+    category: Optional[str]
+    status: Optional[str]
+
+
+class Organization(Entity):
+    __slots__ = ('id', 'name', 'description', 'website', 'logo', 'contact', 'type')
+    INTERNED = ('type',)
+
+    id: str
+    name: Optional[str]
+    description: Optional[str]
+    website: Optional[str]
+    logo: Optional[str]
+    contact: Optional[str]
+    type: Optional[str]
+
+
+class Technology(Entity):
+    __slots__ = ('id', 'name', 'description', 'website', 'logo', 'type', 'category')
+    INTERNED = ('type', 'category')
+
+    id: str
+    name: Optional[str]
+    description: Optional[str]
+    website: Optional[str]
+    logo: Optional[str]
+    type: Optional[str]
+    category: Optional[str]
+
+
+class Standard(Entity):
+    __slots__ = ('id', 'name', 'description', 'website', 'type', 'category', 'version', 'status', 'vendor',
+                 'logo', 'last_updated', 'categories', 'profile_types', 'platforms', 'related_profiles',
+                 'hardening_profiles')
+    INTERNED = ('type', 'category', 'status', 'vendor', 'categories', 'profile_types', 'platforms')
+
+    id: str
+    name: Optional[str]
+    description: Optional[str]
+    website: Optional[str]
+    type: Optional[str]
+    category: Optional[str]
+    version: Optional[str]
+    status: Optional[str]
+    vendor: Optional[str]
+    logo: Optional[str]
+    last_updated: Optional[str]
+    categories: Optional[List[str]]
+    profile_types: Optional[List[str]]
+    platforms: Optional[List[str]]
+    related_profiles: Optional[List[str]]
+    hardening_profiles: Optional[List[str]]
+
+
+class Capability(Entity):
+    __slots__ = ('id', 'name', 'description', 'logo', 'category')
+    INTERNED = ('category',)
+
+    id: str
+    name: Optional[str]
+    description: Optional[str]
+    logo: Optional[str]
+    category: Optional[str]
+
+
+class Team(Entity):
+    __slots__ = ('id', 'name', 'description', 'organization', 'website', 'logo', 'contact', 'github',
+                 'twitter', 'members')
+    INTERNED = ('organization',)
+
+    id: str
+    name: Optional[str]
+    description: Optional[str]
+    organization: Optional[str]
+    website: Optional[str]
+    logo: Optional[str]
+    contact: Optional[str]
+    github: Optional[str]
+    twitter: Optional[str]
+    members: Optional[list]
+
+
+class Profile(Entity):
+    __slots__ = ('id', 'name', 'version', 'platform', 'framework', 'technology', 'vendor', 'organization',
+                 'team', 'github', 'details', 'status', 'last_updated', 'standard', 'standard_version', 'tags',
+                 'category', 'hardening_profiles', 'short_description', 'requirements')
+    INTERNED = ('version', 'platform', 'framework', 'technology', 'vendor', 'organization', 'team', 'status',
+                'last_updated', 'standard', 'standard_version', 'tags', 'category', 'hardening_profiles',
+                'requirements')
+
+    id: str
+    name: Optional[str]
+    version: Optional[str]
+    platform: Optional[str]
+    framework: Optional[str]
+    technology: Optional[str]
+    vendor: Optional[str]
+    organization: Optional[str]
+    team: Optional[str]
+    github: Optional[str]
+    details: Optional[str]
+    status: Optional[str]
+    last_updated: Optional[str]
+    standard: Optional[str]
+    standard_version: Optional[str]
+    tags: Optional[List[str]]
+    category: Optional[str]
+    hardening_profiles: Optional[List[str]]
+    short_description: Optional[str]
+    requirements: Optional[str]
+
+
+class HardeningProfile(Entity):
+    __slots__ = ('id', 'name', 'version', 'platform', 'framework', 'technology', 'vendor', 'organization',
+                 'team', 'github', 'details', 'status', 'last_updated', 'difficulty', 'standard',
+                 'standard_version', 'tags', 'category', 'validation_profiles', 'short_description',
+                 'requirements')
+    INTERNED = ('version', 'platform', 'framework', 'technology', 'vendor', 'organization', 'team', 'status',
+                'last_updated', 'difficulty', 'standard', 'standard_version', 'tags', 'category',
+                'validation_profiles', 'requirements')
+
+    id: str
+    name: Optional[str]
+    version: Optional[str]
+    platform: Optional[str]
+    framework: Optional[str]
+    technology: Optional[str]
+    vendor: Optional[str]
+    organization: Optional[str]
+    team: Optional[str]
+    github: Optional[str]
+    details: Optional[str]
+    status: Optional[str]
+    last_updated: Optional[str]
+    difficulty: Optional[str]
+    standard: Optional[str]
+    standard_version: Optional[str]
+    tags: Optional[List[str]]
+    category: Optional[str]
+    validation_profiles: Optional[List[str]]
+    short_description: Optional[str]
+    requirements: Optional[str]
+
+
+class Tool(Entity):
+    __slots__ = ('id', 'name', 'description', 'website', 'logo', 'category')
+    INTERNED = ('category',)
+
+    id: str
+    name: Optional[str]
+    description: Optional[str]
+    website: Optional[str]
+    logo: Optional[str]
+    category: Optional[str]
+
+
+MODELS: Dict[str, Type[Entity]] = {
+    'tags': Tag,
+    'organizations': Organization,
+    'technologies': Technology,
+    'standards': Standard,
+    'capabilities': Capability,
+    'teams': Team,
+    'profiles': Profile,
+    'hardening_profiles': HardeningProfile,
+    'tools': Tool,
+}
+
+
+def load_models(data_dir: Path = DEFAULT_DATA_DIR, tables: Optional[Sequence[str]] = None,
+                intern: bool = True) -> Dict[str, List[Entity]]:
+    """table -> model instances for every entity in the corpus."""
+    types = [t for t in ENTITY_TYPES if not tables or t.table in tables]
+    result: Dict[str, List[Entity]] = {t.table: [] for t in types}
+    for etype, _, entity in iter_entities(data_dir, types):
+        result[etype.table].append(MODELS[etype.table].from_dict(entity, intern))
+    return result
@@ -0,0 +1,31 @@
+"""Tests for the slotted entity models."""
+
+from saf_content.bench_models import run
+from saf_content.corpus import iter_entities
+from saf_content.models import MODELS, Profile, Team, load_models
+
+
+def test_models_round_trip_the_corpus():
+    for etype, _, entity in iter_entities():
+        model = MODELS[etype.table].from_dict(entity)
+        assert model.to_dict() == entity
+        assert not hasattr(model, '__dict__')
+
+
+def test_repeated_values_are_interned():
+    profiles = load_models(tables=['profiles'])['profiles']
+    copies = [Profile.from_dict({**p.to_dict(), 'status': ''.join(['act', 'ive'])}) for p in profiles[:3]]
+    assert copies[0].status is copies[1].status is profiles[0].status
+    assert copies[0].requirements is profiles[0].requirements
+
+
+def test_unknown_keys_are_kept():
+    team = Team.from_dict({'id': 'saf', 'name': 'SAF', 'slack': '#saf'})
+    assert team.extra == {'slack': '#saf'} and team.description is None
+    assert team.to_dict() == {'id': 'saf', 'name': 'SAF', 'slack': '#saf'}
+    assert Team(id='saf', name='SAF', slack='#saf') == team
+
+
+def test_models_use_less_memory_than_dicts():
+    result = run(2000)
+    assert result['model_bytes'] < result['dict_bytes']
@@ -0,0 +1,193 @@
+"""
+Reverse foreign-key index over the content/data corpus.
+
+REFERENCE_FIELDS lists, per entity type, the YAML keys that hold IDs of
+other entities (scalars like `standard`, lists like `tags`). The index
+records every such reference per file, keyed by a hash of the file's
+bytes, and inverts them so "which entities reference standards/stig" is a
+single dict lookup:
+
+    index = update_index()
+    for ref in index.referrers('standards', 'stig'):
+        print(ref.file, ref.id, ref.field)
+
+The index also records which file defines each entity (`locate`), so a
+tool that renames an ID knows every file it has to touch without reading
+the corpus. Referenced IDs are normalized like the fixer normalizes them
+('STIG' -> 'stig'). `update_index` re-parses only the files whose hash
+changed since the saved index, so keeping it current costs a read of the
+corpus bytes plus a parse of the edited files.
+"""
+
+import hashlib
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from .corpus import DEFAULT_DATA_DIR, ENTITY_TYPES, REPO_ROOT, entity_type, file_entities, iter_files, load_file
+from .ids import id_type_for, normalize_id
+
+DEFAULT_INDEX = REPO_ROOT / '.cache' / 'saf' / 'references.json'
+FORMAT = 2
+
+_PROFILE_REFERENCES = {
+    'standard': 'standards',
+    'technology': 'technologies',
+    'organization': 'organizations',
+    'team': 'teams',
+    'tags': 'tags',
+}
+
+# Entity table -> YAML key -> table whose IDs the key holds
+REFERENCE_FIELDS: Dict[str, Dict[str, str]] = {
+    'teams': {'organization': 'organizations'},
+    'standards': {'relatedProfiles': 'profiles', 'hardeningProfiles': 'hardening_profiles'},
+    'profiles': {**_PROFILE_REFERENCES, 'hardeningProfiles': 'hardening_profiles'},
+    'hardening_profiles': {**_PROFILE_REFERENCES, 'validationProfiles': 'profiles'},
+}
+
+
+class Reference(NamedTuple):
+    """Entity `id` of `table` in `file` refers to another entity through `field`."""
+    file: str    # relative to the data directory
+    table: str
+    id: str
+    field: str
+
+
+def entity_references(table: str, entity: dict) -> Iterator[Tuple[str, str, str]]:
+    """(field, target table, normalized target ID) for each reference in an entity."""
+    for field, target in REFERENCE_FIELDS.get(table, {}).items():
+        value = entity.get(field)
+        for item in value if isinstance(value, list) else [value]:
+            if item not in (None, ''):
+                yield field, target, normalize_id(str(item), id_type_for(target))
+
+
+def file_hash(raw: bytes) -> str:
+    return hashlib.sha1(raw).hexdigest()[:16]
+
+
+def index_file(table: str, data: dict, etype) -> dict:
+    """{"table", "ids": [...], "refs": [[entity id, field, target table, target id], ...]} for one file.
+
+    References in the file's `_metadata` block are recorded under the entity ID '_metadata'.
+    """
+    ids, refs = [], []
+    metadata = data.get('_metadata') if isinstance(data, dict) else None
+    if isinstance(metadata, dict):
+        for field, target, value in entity_references(table, metadata):
+            refs.append(['_metadata', field, target, value])
+    for entity in file_entities(data, etype):
+        if isinstance(entity, dict) and entity.get('id'):
+            ids.append(str(entity['id']))
+            for field, target, value in entity_references(table, entity):
+                refs.append([str(entity['id']), field, target, value])
+    return {'table': table, 'ids': ids, 'refs': refs}
+
+
+class ReferenceIndex:
+    def __init__(self, files: Dict[str, dict]):
+        # relative file -> {"table", "hash", "ids": [...], "refs": [[id, field, target, value], ...]}
+        self.files = files
+        self._by_target: Optional[Dict[Tuple[str, str], List[Reference]]] = None
+        self._by_id: Optional[Dict[Tuple[str, str], List[str]]] = None
+
+    def _inverted(self) -> Dict[Tuple[str, str], List[Reference]]:
+        if self._by_target is None:
+            inverted: Dict[Tuple[str, str], List[Reference]] = {}
+            for file, entry in self.files.items():
+                for entity_id, field, target, value in entry['refs']:
+                    inverted.setdefault((target, value), []).append(Reference(file, entry['table'], entity_id, field))
+            self._by_target = inverted
+        return self._by_target
+
+    def referrers(self, table: str, entity_id: str) -> List[Reference]:
+        """References to entity_id (any spelling that normalizes to it) of `table`."""
+        return self._inverted().get((table, normalize_id(entity_id, id_type_for(table))), [])
+
+    def locate(self, table: str, entity_id: str) -> List[str]:
+        """Files defining entity_id of `table` (more than one means a duplicate ID)."""
+        if self._by_id is None:
+            by_id: Dict[Tuple[str, str], List[str]] = {}
+            for file, entry in self.files.items():
+                for defined in entry['ids']:
+                    by_id.setdefault((entry['table'], normalize_id(defined, id_type_for(entry['table']))), []).append(file)
+            self._by_id = by_id
+        return self._by_id.get((table, normalize_id(entity_id, id_type_for(table))), [])
+
+    def to_json(self) -> dict:
+        return {'format': FORMAT, 'files': self.files}
+
+    @classmethod
+    def from_json(cls, data: dict) -> 'ReferenceIndex':
+        if data.get('format') != FORMAT:
+            raise ValueError(f"Unsupported reference index format {data.get('format')}")
+        return cls(data['files'])
+
+    def save(self, path: Path = DEFAULT_INDEX):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f'.{path.name}.tmp')
+        tmp.write_text(json.dumps(self.to_json(), separators=(',', ':'), sort_keys=True) + '\n', encoding='utf-8')
+        os.replace(tmp, path)
+
+
+def read_index(path: Path = DEFAULT_INDEX) -> Optional[ReferenceIndex]:
+    try:
+        return ReferenceIndex.from_json(json.loads(Path(path).read_text(encoding='utf-8')))
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def build_index(data_dir: Path = DEFAULT_DATA_DIR,
+                previous: Optional[ReferenceIndex] = None) -> Tuple[ReferenceIndex, int]:
+    """(index, number of files parsed), reusing entries of unchanged files."""
+    data_dir = Path(data_dir)
+    old = previous.files if previous is not None else {}
+    files: Dict[str, dict] = {}
+    parsed = 0
+    for etype in ENTITY_TYPES:
+        for path in iter_files(data_dir, etype):
+            rel = path.relative_to(data_dir).as_posix()
+            digest = file_hash(path.read_bytes())
+            entry = old.get(rel)
+            if entry is None or entry['hash'] != digest or entry['table'] != etype.table:
+                entry = {'hash': digest, **index_file(etype.table, load_file(path), etype)}
+                parsed += 1
+            files[rel] = entry
+    return ReferenceIndex(files), parsed
+
+
+def update_index(data_dir: Path = DEFAULT_DATA_DIR, path: Path = DEFAULT_INDEX) -> ReferenceIndex:
+    """The saved index brought up to date with the corpus (saved again if it changed)."""
+    previous = read_index(path)
+    index, parsed = build_index(data_dir, previous)
+    if parsed or previous is None or set(previous.files) != set(index.files):
+        index.save(path)
+    return index
+
+
+def main(argv: Optional[Sequence[str]] = None, prog: Optional[str] = None):
+    import argparse
+
+    parser = argparse.ArgumentParser(prog=prog, description='Show where an entity is defined and who references it')
+    parser.add_argument('type', help='Entity type (table, directory or YAML key), e.g. standards')
+    parser.add_argument('id', help='Entity ID (any spelling that normalizes to it)')
+    parser.add_argument('--data-dir', default=str(DEFAULT_DATA_DIR), help='Path to data directory')
+    args = parser.parse_args(argv)
+
+    try:
+        table = entity_type(args.type).table
+    except KeyError as e:
+        print(f"❌ {e.args[0]}")
+        sys.exit(2)
+    index = update_index(args.data_dir)
+    files = index.locate(table, args.id)
+    refs = index.referrers(table, args.id)
+    print(f"{table}/{args.id}: defined in {', '.join(files) if files else 'NOT FOUND'}")
+    for ref in refs:
+        print(f"  {ref.file}: {ref.id}.{ref.field}")
+    print(f"\n📊 {len(refs)} references")
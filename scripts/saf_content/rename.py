@@ -0,0 +1,243 @@
+"""
+Bulk rename of entity IDs across the content/data corpus.
+
+A mapping file lists the renames per entity type (table, directory or YAML
+key), in YAML or JSON:
+
+    standards:
+      cis: cis-benchmarks
+    organizations:
+      DISA: disa-gov
+
+The reverse FK index (saf_content.references) gives the files defining
+each old ID and every file referencing it, so only those files are read.
+Each affected file is rewritten once, with every rename applied: entity
+`id` values, scalar references (`standard`, `team`, ...), list references
+(`tags`, `hardeningProfiles`, ...) and the file's `_metadata` block.
+
+Edits are made on the YAML text at the positions of the changed scalars,
+keeping their quoting, so the rest of the file (comments, key order, list
+style) stays byte for byte and the diff shows only the renamed IDs. Each
+rewritten file is parsed again and compared with the expected data before
+anything is written.
+"""
+
+import json
+import os
+import re
+import sys
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+import yaml
+
+from .corpus import DEFAULT_DATA_DIR, ENTITY_TYPES_BY_TABLE, SafeLoader, entity_type
+from .ids import id_type_for, normalize_id
+from .references import DEFAULT_INDEX, REFERENCE_FIELDS, ReferenceIndex, update_index
+from .shards import refresh_for
+
+Renames = Dict[str, Dict[str, str]]   # table -> normalized old ID -> new ID
+
+_PLAIN_ID = re.compile(r'^[A-Za-z0-9][A-Za-z0-9._/-]*$')
+
+
+class RenameError(Exception):
+    pass
+
+
+class FileEdit(NamedTuple):
+    file: str          # relative to the data directory
+    replacements: int
+
+
+def read_mapping(path: Path) -> Renames:
+    """Parse a mapping file into table -> normalized old ID -> new ID."""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = yaml.load(f, Loader=SafeLoader)
+    if not isinstance(data, dict):
+        raise RenameError(f'{path}: expected a mapping of entity type -> {{old ID: new ID}}')
+    renames: Renames = {}
+    for name, pairs in data.items():
+        try:
+            table = entity_type(str(name)).table
+        except KeyError as e:
+            raise RenameError(f'{path}: {e.args[0]}') from e
+        if not isinstance(pairs, dict):
+            raise RenameError(f'{path}: {name} should map old IDs to new IDs')
+        for old, new in pairs.items():
+            renames.setdefault(table, {})[normalize_id(str(old), id_type_for(table))] = str(new)
+    return renames
+
+
+def check_renames(renames: Renames, index: ReferenceIndex):
+    """Raise RenameError for unknown old IDs, taken new IDs and chained renames."""
+    problems = []
+    for table, pairs in renames.items():
+        for old, new in pairs.items():
+            if not index.locate(table, old):
+                problems.append(f'{table}: {old!r} does not exist')
+            if normalize_id(new, id_type_for(table)) in pairs:
+                problems.append(f'{table}: {new!r} is both a new and an old ID (rename in two steps)')
+            elif index.locate(table, new) and normalize_id(new, id_type_for(table)) != old:
+                problems.append(f'{table}: {new!r} already exists')
+    if problems:
+        raise RenameError('; '.join(problems))
+
+
+def affected_files(renames: Renames, index: ReferenceIndex) -> Set[str]:
+    files: Set[str] = set()
+    for table, pairs in renames.items():
+        for old in pairs:
+            files.update(index.locate(table, old))
+            files.update(ref.file for ref in index.referrers(table, old))
+    return files
+
+
+def _renamed(value, target: str, renames: Renames) -> Optional[str]:
+    if not isinstance(value, str) or target not in renames:
+        return None
+    return renames[target].get(normalize_id(value, id_type_for(target)))
+
+
+def _scalar(value: str, style: Optional[str]) -> str:
+    if style == "'":
+        return "'" + value.replace("'", "''") + "'"
+    if style == '"' or not _PLAIN_ID.match(value):
+        return json.dumps(value, ensure_ascii=False)
+    return value
+
+
+def _node_edits(mapping: yaml.MappingNode, fields: Dict[str, str], renames: Renames,
+                edits: List[Tuple[int, int, str]]):
+    """Collect (start, end, text) edits for the reference fields of one mapping node."""
+    for key, value in mapping.value:
+        target = fields.get(key.value) if isinstance(key, yaml.ScalarNode) else None
+        if target is None:
+            continue
+        scalars = value.value if isinstance(value, yaml.SequenceNode) else [value]
+        for node in scalars:
+            if isinstance(node, yaml.ScalarNode):
+                new = _renamed(node.value, target, renames)
+                if new is not None and new != node.value:
+                    edits.append((node.start_mark.index, node.end_mark.index, _scalar(new, node.style)))
+
+
+def _apply(data: dict, table: str, key: str, renames: Renames):
+    """The same renames applied to loaded data (used to verify the text edits)."""
+    fields = {**REFERENCE_FIELDS.get(table, {})}
+    blocks = [(data.get('_metadata'), fields)]
+    blocks += [(entity, {'id': table, **fields}) for entity in data.get(key) or []]
+    for block, block_fields in blocks:
+        if not isinstance(block, dict):
+            continue
+        for field, target in block_fields.items():
+            value = block.get(field)
+            if isinstance(value, list):
+                block[field] = [_renamed(v, target, renames) or v for v in value]
+            elif value is not None:
+                block[field] = _renamed(value, target, renames) or value
+
+
+def rewrite_text(text: str, table: str, renames: Renames) -> Tuple[str, int]:
+    """(new text, number of replaced scalars) for the YAML of one `table` file."""
+    key = ENTITY_TYPES_BY_TABLE[table].key
+    root = yaml.compose(text, Loader=SafeLoader)
+    if not isinstance(root, yaml.MappingNode):
+        return text, 0
+    fields = REFERENCE_FIELDS.get(table, {})
+    edits: List[Tuple[int, int, str]] = []
+    for k, value in root.value:
+        if k.value == '_metadata' and isinstance(value, yaml.MappingNode):
+            _node_edits(value, fields, renames, edits)
+        elif k.value == key and isinstance(value, yaml.SequenceNode):
+            for entity in value.value:
+                if isinstance(entity, yaml.MappingNode):
+                    _node_edits(entity, {'id': table, **fields}, renames, edits)
+    if not edits:
+        return text, 0
+
+    parts = []
+    position = 0
+    for start, end, replacement in sorted(edits):
+        parts += [text[position:start], replacement]
+        position = end
+    parts.append(text[position:])
+    new_text = ''.join(parts)
+
+    expected = yaml.load(text, Loader=SafeLoader)
+    _apply(expected, table, key, renames)
+    if yaml.load(new_text, Loader=SafeLoader) != expected:
+        raise RenameError(f'Rewriting a {table} file did not produce the expected data')
+    return new_text, len(edits)
+
+
+def rename(renames: Renames, data_dir: Path = DEFAULT_DATA_DIR, dry_run: bool = False,
+           index_path: Path = DEFAULT_INDEX) -> List[FileEdit]:
+    """Apply the renames to every affected file; each file is written at most once.
+
+    All files are rewritten in memory and verified before the first one is
+    written, so a failure leaves the corpus untouched.
+    """
+    data_dir = Path(data_dir)
+    index = update_index(data_dir, index_path)
+    check_renames(renames, index)
+
+    rewritten: List[Tuple[str, str, int]] = []
+    for rel in sorted(affected_files(renames, index)):
+        path = data_dir / rel
+        text = path.read_text(encoding='utf-8')
+        try:
+            new_text, count = rewrite_text(text, index.files[rel]['table'], renames)
+        except yaml.YAMLError as e:
+            raise RenameError(f'{rel}: {e}') from e
+        if count:
+            rewritten.append((rel, new_text, count))
+
+    if not dry_run:
+        for rel, new_text, _ in rewritten:
+            path = data_dir / rel
+            tmp = path.with_name(f'.{path.name}.tmp')
+            tmp.write_text(new_text, encoding='utf-8')
+            os.replace(tmp, path)
+        if rewritten:
+            refresh_for(data_dir / rel for rel, _, _ in rewritten)
+            update_index(data_dir, index_path)
+    return [FileEdit(rel, count) for rel, _, count in rewritten]
+
+
+def main(argv: Optional[Sequence[str]] = None, prog: Optional[str] = None):
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog=prog,
+        description='Rename entity IDs and every reference to them',
+        epilog="""
+Mapping file (YAML or JSON), entity type -> old ID -> new ID:
+
+  standards:
+    cis: cis-benchmarks
+  tags:
+    k8s: kubernetes
+        """,
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('mapping', help='Mapping file')
+    parser.add_argument('--dry-run', action='store_true', help='Show the files that would change; write nothing')
+    parser.add_argument('--data-dir', default=str(DEFAULT_DATA_DIR), help='Path to data directory')
+    args = parser.parse_args(argv)
+
+    try:
+        renames = read_mapping(Path(args.mapping))
+        edits = rename(renames, Path(args.data_dir), args.dry_run)
+    except (OSError, RenameError, yaml.YAMLError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    for table, pairs in renames.items():
+        for old, new in pairs.items():
+            print(f"  • {table}: {old} → {new}")
+    print()
+    for edit in edits:
+        print(f"{'📝' if args.dry_run else '✏️ '} {edit.file}: {edit.replacements} replacements")
+    verb = 'would be rewritten' if args.dry_run else 'rewritten'
+    print(f"\n✅ {len(edits)} files {verb}, {sum(e.replacements for e in edits)} IDs replaced")
@@ -0,0 +1,61 @@
+"""Tests for the reverse-dependency index and bulk ID rename."""
+
+import difflib
+
+import pytest
+
+from saf_content.corpus import iter_entities
+from saf_content.references import build_index
+from saf_content.rename import RenameError, read_mapping, rename, rewrite_text
+
+
+def test_rewrite_keeps_formatting_and_quoting():
+    text = ("_metadata:\n  standard: CIS   # keep me\n"
+            "profiles:\n"
+            "  - id: a\n    standard: 'cis'\n    tags: [linux, \"k8s\"]\n    hardeningProfiles:\n      - h1\n"
+            "  - id: b\n    standard: stig\n")
+    renames = {'standards': {'cis': 'cis-benchmarks'}, 'tags': {'k8s': 'kubernetes'},
+               'hardening_profiles': {'h1': 'h-one'}}
+    new_text, count = rewrite_text(text, 'profiles', renames)
+    assert count == 4
+    assert new_text == ("_metadata:\n  standard: cis-benchmarks   # keep me\n"
+                        "profiles:\n"
+                        "  - id: a\n    standard: 'cis-benchmarks'\n    tags: [linux, \"kubernetes\"]\n"
+                        "    hardeningProfiles:\n      - h-one\n"
+                        "  - id: b\n    standard: stig\n")
+
+
+def test_rename_rewrites_ids_and_referrers_once(data_dir, tmp_path):
+    index_path = tmp_path / 'refs.json'
+    mapping = tmp_path / 'mapping.yml'
+    mapping.write_text('standards:\n  CIS: cis-benchmarks\norganizations:\n  mitre: mitre-corp\n', encoding='utf-8')
+    before = {p: p.read_text(encoding='utf-8') for p in data_dir.rglob('*.yml')}
+    old_index = build_index(data_dir)[0]
+    referrers = len(old_index.referrers('standards', 'cis')) + len(old_index.referrers('organizations', 'mitre'))
+
+    edits = rename(read_mapping(mapping), data_dir, index_path=index_path)
+    assert len({e.file for e in edits}) == len(edits)
+    # every referrer plus the two definitions
+    assert sum(e.replacements for e in edits) == referrers + 2
+
+    index = build_index(data_dir)[0]
+    assert not index.referrers('standards', 'cis') and not index.referrers('organizations', 'mitre')
+    assert index.locate('standards', 'cis-benchmarks') == ['standards/cis.yml']
+    assert len(index.referrers('standards', 'cis-benchmarks')) == len(old_index.referrers('standards', 'cis'))
+    assert sum(1 for _ in iter_entities(data_dir)) == sum(len(f['ids']) for f in old_index.files.values())
+
+    # Only lines holding a renamed ID changed
+    for path, text in before.items():
+        for line in difflib.unified_diff(text.splitlines(), path.read_text(encoding='utf-8').splitlines(), n=0):
+            if line.startswith('+') and not line.startswith('+++'):
+                assert 'cis-benchmarks' in line or 'mitre-corp' in line, line
+
+
+def test_rename_refuses_conflicts(data_dir, tmp_path):
+    for renames, message in [
+        ({'standards': {'nope': 'x'}}, "'nope' does not exist"),
+        ({'standards': {'cis': 'stig'}}, "'stig' already exists"),
+        ({'standards': {'cis': 'stig', 'stig': 'disa'}}, 'rename in two steps'),
+    ]:
+        with pytest.raises(RenameError, match=message):
+            rename(renames, data_dir, index_path=tmp_path / 'refs.json')
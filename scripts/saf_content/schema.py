@@ -0,0 +1,375 @@
+"""
+Compiled JSON Schema validators for content/data entities.
+
+Each entity type has a JSON Schema in saf_content/schemas/<table>.json
+(shared definitions such as the status enum, dates, URLs and versions live
+in schemas/common.json). Rather than interpreting a schema per entity,
+`compile_validator` generates a Python function specialized to it: one
+straight-line check per keyword, with properties, enums, patterns and
+required keys unrolled into constants. The generated source is cached in
+DEFAULT_CACHE_DIR under the hash of the resolved schema, so it is only
+generated again when a schema (or GENERATOR) changes.
+
+    validate = compile_validator('profiles')
+    for issue in validate(entity, entity['id']):
+        print(issue.path, issue.message)    # rhel-8.tags[2]: expected string, got int
+
+Supported keywords: type, enum, const, required, properties,
+additionalProperties, items, minItems, maxItems, uniqueItems, minLength,
+maxLength, pattern, format (date, uri, uri-reference), minimum, maximum and
+$ref to `#/$defs/...` or `common.json#/$defs/...`. Annotations (title,
+description, ...) are ignored; any other keyword is a SchemaError, so a
+schema never silently checks less than it says.
+
+YAML loads unquoted dates (`lastUpdated: 2023-10-10`) as date objects, so
+`format: date` accepts those as well as 'YYYY-MM-DD' strings.
+"""
+
+import datetime
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence
+
+from .corpus import REPO_ROOT
+
+SCHEMA_DIR = Path(__file__).resolve().parent / 'schemas'
+DEFAULT_CACHE_DIR = REPO_ROOT / '.cache' / 'saf' / 'validators'
+
+# Bump when the generated code changes, so cached validators are regenerated
+GENERATOR = 1
+
+ANNOTATIONS = {'$schema', '$id', '$comment', '$defs', 'title', 'description', 'examples', 'default'}
+KEYWORDS = {'type', 'enum', 'const', 'required', 'properties', 'additionalProperties', 'items', 'minItems',
+            'maxItems', 'uniqueItems', 'minLength', 'maxLength', 'pattern', 'format', 'minimum', 'maximum'}
+
+_TYPE_CHECKS = {
+    'string': 'isinstance({v}, str)',
+    'integer': '(isinstance({v}, int) and not isinstance({v}, bool))',
+    'number': '(isinstance({v}, (int, float)) and not isinstance({v}, bool))',
+    'boolean': 'isinstance({v}, bool)',
+    'array': 'isinstance({v}, list)',
+    'object': 'isinstance({v}, dict)',
+    'null': '{v} is None',
+}
+
+Validator = Callable[..., List['SchemaIssue']]
+
+
+class SchemaError(Exception):
+    pass
+
+
+class SchemaIssue(NamedTuple):
+    path: str       # entity path: '$' (or the caller's prefix), '.field', '[index]'
+    message: str
+
+
+# --- Runtime helpers the generated code calls (kept out of the hot path) ---
+
+_DATE = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+_URI = re.compile(r'^https?://[^\s/?#]+[^\s]*$')
+_PATH = re.compile(r'^/[^\s]*$')
+
+
+def _is_date(value) -> bool:
+    if type(value) is datetime.date:
+        return True
+    if not isinstance(value, str) or not _DATE.match(value):
+        return False
+    try:
+        datetime.date.fromisoformat(value)
+    except ValueError:
+        return False
+    return True
+
+
+def _show(value) -> str:
+    text = repr(value)
+    return text if len(text) <= 60 else text[:57] + '...'
+
+
+def _type_name(value) -> str:
+    if value is None:
+        return 'null'
+    return {bool: 'boolean', int: 'integer', float: 'number', str: 'string', list: 'array',
+            dict: 'object'}.get(type(value), type(value).__name__)
+
+
+def _has_duplicates(items: list) -> bool:
+    try:
+        return len(set(items)) != len(items)
+    except TypeError:
+        seen: list = []
+        for item in items:
+            if item in seen:
+                return True
+            seen.append(item)
+        return False
+
+
+RUNTIME = {
+    'SchemaIssue': SchemaIssue,
+    'date': datetime.date,
+    're': re,
+    '_is_date': _is_date,
+    '_show': _show,
+    '_type_name': _type_name,
+    '_has_duplicates': _has_duplicates,
+    '_URI': _URI,
+    '_PATH': _PATH,
+}
+
+_FORMATS = {
+    'date': ('not _is_date({v})', 'expected a YYYY-MM-DD date'),
+    'uri': ('_URI.match({v}) is None', 'expected an http(s) URL'),
+    'uri-reference': ('(_URI.match({v}) is None and _PATH.match({v}) is None)',
+                      'expected an http(s) URL or a site-relative path'),
+}
+
+
+# --- Loading and resolving schemas ---
+
+def _resolve(node, defs: Dict[str, Dict[str, Any]], current: str, seen: Sequence[str] = ()):
+    """Inline every $ref; defs maps schema file name -> its $defs."""
+    if isinstance(node, list):
+        return [_resolve(item, defs, current, seen) for item in node]
+    if not isinstance(node, dict):
+        return node
+    if '$ref' in node:
+        ref = node['$ref']
+        target_file, _, pointer = ref.partition('#')
+        target_file = target_file or current
+        if not pointer.startswith('/$defs/') or target_file not in defs:
+            raise SchemaError(f'Unsupported $ref {ref!r} (use #/$defs/NAME or common.json#/$defs/NAME)')
+        name = pointer[len('/$defs/'):]
+        key = f'{target_file}#{name}'
+        if key in seen:
+            raise SchemaError(f'Recursive $ref {ref!r}')
+        if name not in defs[target_file]:
+            raise SchemaError(f'Unknown $ref {ref!r}')
+        resolved = _resolve(defs[target_file][name], defs, target_file, (*seen, key))
+        siblings = {k: v for k, v in node.items() if k != '$ref'}
+        return {**resolved, **_resolve(siblings, defs, current, seen)}
+    return {k: (v if k in ('enum', 'const', '$defs') else _resolve(v, defs, current, seen)) for k, v in node.items()}
+
+
+def load_schema(table: str, schema_dir: Path = SCHEMA_DIR) -> dict:
+    """The schema for `table` with every $ref inlined."""
+    schema_dir = Path(schema_dir)
+    path = schema_dir / f'{table}.json'
+    if not path.exists():
+        raise SchemaError(f'No schema for {table} ({path})')
+    schema = json.loads(path.read_text(encoding='utf-8'))
+    defs = {path.name: schema.get('$defs', {})}
+    common = schema_dir / 'common.json'
+    if common.exists():
+        defs['common.json'] = json.loads(common.read_text(encoding='utf-8')).get('$defs', {})
+    return _resolve(schema, defs, path.name)
+
+
+def schema_hash(schema: dict) -> str:
+    canonical = json.dumps(schema, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(f'{GENERATOR}\0{canonical}'.encode('utf-8')).hexdigest()
+
+
+# --- Code generation ---
+
+def _literal(text: str) -> str:
+    """Schema text (patterns, enum values) embedded in a generated f-string."""
+    return text.replace('{', '{{').replace('}', '}}')
+
+
+class _Generator:
+    def __init__(self):
+        self.lines: List[str] = []
+        self.constants: List[str] = []
+        self.counter = 0
+
+    def name(self, prefix: str) -> str:
+        self.counter += 1
+        return f'{prefix}{self.counter}'
+
+    def constant(self, prefix: str, expression: str) -> str:
+        name = self.name(prefix)
+        self.constants.append(f'{name} = {expression}')
+        return name
+
+    def emit(self, indent: int, line: str):
+        self.lines.append('    ' * indent + line)
+
+    def error(self, indent: int, path: str, message: str):
+        """Append an issue; `message` is an f-string body evaluated only on failure.
+
+        Text taken from the schema must go through _literal first.
+        """
+        self.emit(indent, f'errors.append(SchemaIssue({path}, f{message!r}))')
+
+    def node(self, schema: dict, v: str, path: str, indent: int):
+        unknown = set(schema) - KEYWORDS - ANNOTATIONS
+        if unknown:
+            raise SchemaError(f"Unsupported keyword(s) {', '.join(sorted(unknown))} at {path}")
+
+        if 'const' in schema:
+            const = self.constant('C', repr(schema['const']))
+            self.emit(indent, f'if {v} != {const}:')
+            self.error(indent + 1, path, f'expected {_literal(repr(schema["const"]))}, got {{_show({v})}}')
+        if 'enum' in schema:
+            values = tuple(schema['enum'])
+            enum = self.constant('E', repr(values))
+            self.emit(indent, f'if {v} not in {enum}:')
+            allowed = _literal(', '.join(repr(x) for x in values))
+            self.error(indent + 1, path, f'expected one of {allowed}; got {{_show({v})}}')
+
+        types = schema.get('type')
+        types = [types] if isinstance(types, str) else list(types or [])
+        for t in types:
+            if t not in _TYPE_CHECKS:
+                raise SchemaError(f'Unknown type {t!r} at {path}')
+        checks = [_TYPE_CHECKS[t].format(v=v) for t in types]
+        if 'string' in types and schema.get('format') == 'date':
+            checks.append(f'type({v}) is date')
+
+        body = []
+        for kind, keywords, emit in (('string', ('minLength', 'maxLength', 'pattern', 'format'), self.string),
+                                     ('number', ('minimum', 'maximum'), self.number),
+                                     ('array', ('items', 'minItems', 'maxItems', 'uniqueItems'), self.array),
+                                     ('object', ('required', 'properties', 'additionalProperties'), self.object)):
+            if any(k in schema for k in keywords):
+                body.append((kind, emit))
+
+        if checks:
+            expected = ' or '.join(types)
+            self.emit(indent, f"if not ({' or '.join(checks)}):")
+            self.error(indent + 1, path, f'expected {expected}, got {{_type_name({v})}}')
+            if not body:
+                return
+            self.emit(indent, 'else:')
+            indent += 1
+        for kind, emit in body:
+            if types == [kind] or (kind == 'number' and types == ['integer']):
+                emit(schema, v, path, indent)
+            else:
+                guard = _TYPE_CHECKS['number' if kind == 'number' else kind].format(v=v)
+                self.emit(indent, f'if {guard}:')
+                emit(schema, v, path, indent + 1)
+
+    def string(self, schema: dict, v: str, path: str, indent: int):
+        guard = f'isinstance({v}, str) and ' if schema.get('format') == 'date' else ''
+        if 'minLength' in schema:
+            self.emit(indent, f"if {guard}len({v}) < {int(schema['minLength'])}:")
+            self.error(indent + 1, path, 'empty string' if schema['minLength'] == 1
+                       else f"shorter than {schema['minLength']} characters")
+        if 'maxLength' in schema:
+            self.emit(indent, f"if {guard}len({v}) > {int(schema['maxLength'])}:")
+            self.error(indent + 1, path, f"longer than {schema['maxLength']} characters")
+        if 'pattern' in schema:
+            pattern = self.constant('P', f"re.compile({schema['pattern']!r})")
+            self.emit(indent, f'if {guard}{pattern}.search({v}) is None:')
+            self.error(indent + 1, path, f"{{_show({v})}} does not match {_literal(schema['pattern'])}")
+        if 'format' in schema:
+            if schema['format'] not in _FORMATS:
+                raise SchemaError(f"Unsupported format {schema['format']!r} at {path}")
+            condition, message = _FORMATS[schema['format']]
+            self.emit(indent, f'if {condition.format(v=v)}:')
+            self.error(indent + 1, path, f'{message}, got {{_show({v})}}')
+
+    def number(self, schema: dict, v: str, path: str, indent: int):
+        if 'minimum' in schema:
+            self.emit(indent, f"if {v} < {schema['minimum']!r}:")
+            self.error(indent + 1, path, f"less than {schema['minimum']}")
+        if 'maximum' in schema:
+            self.emit(indent, f"if {v} > {schema['maximum']!r}:")
+            self.error(indent + 1, path, f"greater than {schema['maximum']}")
+
+    def array(self, schema: dict, v: str, path: str, indent: int):
+        if 'minItems' in schema:
+            self.emit(indent, f"if len({v}) < {int(schema['minItems'])}:")
+            self.error(indent + 1, path, f"fewer than {schema['minItems']} items")
+        if 'maxItems' in schema:
+            self.emit(indent, f"if len({v}) > {int(schema['maxItems'])}:")
+            self.error(indent + 1, path, f"more than {schema['maxItems']} items")
+        if schema.get('uniqueItems'):
+            self.emit(indent, f'if _has_duplicates({v}):')
+            self.error(indent + 1, path, 'duplicate items')
+        if isinstance(schema.get('items'), dict) and schema['items']:
+            index, item = self.name('i'), self.name('x')
+            self.emit(indent, f'for {index}, {item} in enumerate({v}):')
+            self.node(schema['items'], item, f"{path} + '[' + str({index}) + ']'", indent + 1)
+
+    def object(self, schema: dict, v: str, path: str, indent: int):
+        for key in schema.get('required', []):
+            self.emit(indent, f'if {key!r} not in {v}:')
+            self.error(indent + 1, path, f'missing required property {_literal(repr(key))}')
+        properties = schema.get('properties', {})
+        for key, subschema in properties.items():
+            if not isinstance(subschema, dict) or not subschema:
+                continue
+            item = self.name('x')
+            self.emit(indent, f'{item} = {v}.get({key!r}, _MISSING)')
+            self.emit(indent, f'if {item} is not _MISSING:')
+            before = len(self.lines)
+            self.node(subschema, item, f'{path} + {"." + key!r}', indent + 1)
+            if len(self.lines) == before:
+                self.emit(indent + 1, 'pass')
+        additional = schema.get('additionalProperties', True)
+        if additional is False:
+            known = self.constant('K', f'frozenset({tuple(sorted(properties))!r})')
+            key = self.name('k')
+            self.emit(indent, f'for {key} in {v}:')
+            self.emit(indent + 1, f'if {key} not in {known}:')
+            self.error(indent + 2, path, f'unexpected property {{_show({key})}}')
+        elif isinstance(additional, dict) and additional:
+            key = self.name('k')
+            self.emit(indent, f'for {key} in {v}:')
+            known = self.constant('K', f'frozenset({tuple(sorted(properties))!r})')
+            self.emit(indent + 1, f'if {key} not in {known}:')
+            self.node(additional, f'{v}[{key}]', f"{path} + '.' + str({key})", indent + 2)
+
+
+def generate(schema: dict, name: str = 'validate') -> str:
+    """Python source of a function `name(value, path='$') -> [SchemaIssue]` for a resolved schema."""
+    gen = _Generator()
+    gen.node(schema, 'value', 'path', 1)
+    header = [f'# Generated by saf_content/schema.py (generator {GENERATOR}) from {schema.get("$id", "a schema")}',
+              '# Do not edit: regenerated whenever the schema changes.', '',
+              '_MISSING = object()', *gen.constants, '', '',
+              f"def {name}(value, path='$'):", '    errors = []']
+    return '\n'.join(header + gen.lines + ['    return errors', ''])
+
+
+_validators: Dict[str, Validator] = {}
+
+
+def compile_validator(table: str, schema_dir: Path = SCHEMA_DIR,
+                      cache_dir: Optional[Path] = DEFAULT_CACHE_DIR) -> Validator:
+    """The generated validator for `table`, from the on-disk cache when the schema is unchanged."""
+    schema = load_schema(table, schema_dir)
+    digest = schema_hash(schema)
+    if digest in _validators:
+        return _validators[digest]
+
+    source = None
+    cached = Path(cache_dir) / f'{table}-{digest[:16]}.py' if cache_dir is not None else None
+    if cached is not None and cached.exists():
+        source = cached.read_text(encoding='utf-8')
+    if source is None:
+        source = generate(schema, f'validate_{table}')
+        if cached is not None:
+            cached.parent.mkdir(parents=True, exist_ok=True)
+            tmp = cached.with_name(f'.{cached.name}.tmp')
+            tmp.write_text(source, encoding='utf-8')
+            os.replace(tmp, cached)
+
+    namespace = dict(RUNTIME)
+    exec(compile(source, str(cached or f'<validate_{table}>'), 'exec'), namespace)
+    validator = namespace[f'validate_{table}']
+    _validators[digest] = validator
+    return validator
+
+
+def compile_validators(tables: Sequence[str], schema_dir: Path = SCHEMA_DIR,
+                       cache_dir: Optional[Path] = DEFAULT_CACHE_DIR) -> Dict[str, Validator]:
+    return {table: compile_validator(table, schema_dir, cache_dir) for table in tables}
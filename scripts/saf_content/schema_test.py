@@ -0,0 +1,82 @@
+"""Tests for the generated entity schema validators."""
+
+import json
+import shutil
+
+import pytest
+import yaml
+
+from saf_content.bench_schema import run as bench
+from saf_content.corpus import iter_entities
+from saf_content.fixer import DataQualityFixer
+from saf_content.schema import SCHEMA_DIR, SchemaError, compile_validator, generate
+
+
+@pytest.fixture(scope='module')
+def profiles():
+    return [entity for etype, _, entity in iter_entities() if etype.table == 'profiles']
+
+
+def test_corpus_matches_schemas(tmp_path):
+    for etype, path, entity in iter_entities():
+        validate = compile_validator(etype.table, cache_dir=tmp_path)
+        assert validate(entity, entity['id']) == [], path
+
+
+def test_errors_have_precise_paths(tmp_path, profiles):
+    validate = compile_validator('profiles', cache_dir=tmp_path)
+    entity = {**profiles[0], 'id': 'p', 'status': 'retired', 'lastUpdated': '2023-02-30',
+              'tags': ['linux', 7, 'linux'], 'github': 'github.com/mitre/x', 'vesion': 'v1.0.0'}
+    del entity['name']
+    assert sorted(validate(entity, 'p')) == [
+        ('p', "missing required property 'name'"),
+        ('p', "unexpected property 'vesion'"),
+        ('p.github', "expected an http(s) URL, got 'github.com/mitre/x'"),
+        ('p.lastUpdated', "expected a YYYY-MM-DD date, got '2023-02-30'"),
+        ('p.status', "expected one of 'active', 'beta', 'deprecated', 'draft'; got 'retired'"),
+        ('p.tags', 'duplicate items'),
+        ('p.tags[1]', 'expected string, got integer'),
+    ]
+
+
+def test_generated_code_is_cached_by_schema_hash(tmp_path):
+    schemas = tmp_path / 'schemas'
+    shutil.copytree(SCHEMA_DIR, schemas)
+    # A schema no other test compiled, so nothing is memoized in-process yet
+    tags = json.loads((schemas / 'tags.json').read_text())
+    (schemas / 'tags.json').write_text(json.dumps({**tags, '$comment': str(tmp_path)}))
+    cache = tmp_path / 'cache'
+    validate = compile_validator('tags', schemas, cache)
+    first = list(cache.iterdir())
+    assert len(first) == 1 and first[0].read_text().startswith('# Generated')
+    assert validate({'id': 'x', 'status': 'gone'})
+
+    schema = json.loads((schemas / 'common.json').read_text())
+    schema['$defs']['status']['enum'].append('gone')
+    (schemas / 'common.json').write_text(json.dumps(schema))
+    validate = compile_validator('tags', schemas, cache)
+    assert validate({'id': 'x', 'status': 'gone'}) == []
+    assert len(list(cache.iterdir())) == 2
+
+    with pytest.raises(SchemaError, match='patternProperties'):
+        generate({'type': 'object', 'patternProperties': {}})
+
+
+def test_bench_validates_the_corpus_cleanly():
+    # Throughput itself is reported by scripts/bench-schema.py, not asserted
+    result = bench(500, rounds=1)
+    assert result['issues'] == 0 and result['rate'] > 0
+
+
+def test_fixer_fails_validation_on_schema_violations(tmp_path, capsys):
+    (tmp_path / 'tags').mkdir()
+    (tmp_path / 'tags' / 'tags.yml').write_text(
+        yaml.safe_dump({'tags': [{'id': 'linux', 'status': 'active'}, {'id': 'k8s', 'status': 'archived'}]}),
+        encoding='utf-8')
+    fixer = DataQualityFixer(data_dir=str(tmp_path), validate_only=True)
+    fixer.validator_cache = tmp_path / 'validators'
+    assert not fixer.run()
+    assert list(fixer.validators) == ['tags']   # compiled only for the types present
+    assert fixer.schema_issues == [('tags/tags.yml', 'k8s.status',
+                                    "expected one of 'active', 'beta', 'deprecated', 'draft'; got 'archived'")]
+    assert 'SCHEMA VIOLATIONS (1 found)' in capsys.readouterr().out
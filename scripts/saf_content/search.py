@@ -0,0 +1,263 @@
+"""
+Prebuilt full-text search index for profiles and hardening profiles.
+
+Indexed fields and their weights are in FIELDS. Text is lowercased, split
+into alphanumeric tokens, stripped of stop words and stemmed with a small
+suffix stemmer (see `stem`, deliberately simple so the site can apply the
+same rules to queries). Each document gets a weighted term frequency per
+term (sum of the weights of the fields the term occurs in, per occurrence).
+
+Index file (JSON, compact):
+
+    {"format": 1, "stemmer": "saf-suffix-1", "fields": {"name": 3.0, ...},
+     "docs": [{"id": "...", "type": "profiles", "name": "...", "hash": "..."}],
+     "terms": {"rhel": [[0, 3.0], [7, 4.5]], ...}}
+
+Postings are [doc position, weighted tf] pairs sorted by position; the
+document frequency of a term is its postings length, so a client can score
+with tf * idf without any other data.
+
+Rebuilds are incremental: each document stores a hash of its indexed
+fields, and documents whose hash did not change reuse their terms from the
+previous index instead of being tokenized again.
+
+The index is written to docs/public (`pnpm search:index`, run by `pnpm
+build`), and the Content Library page adds its matches to those of its
+fuzzy search: docs/.vitepress/theme/composables/useSearchIndex.ts ports
+`tokenize`, `stem` and `SearchIndex.search`, so a change to any of them (or
+to FORMAT/STEMMER) must be made there too.
+"""
+
+import hashlib
+import json
+import math
+import os
+import re
+import sys
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from .corpus import DEFAULT_DATA_DIR, REPO_ROOT, entity_type, iter_entities
+
+DEFAULT_INDEX = REPO_ROOT / 'docs' / 'public' / 'search-index.json'
+FORMAT = 1
+STEMMER = 'saf-suffix-1'
+
+# YAML key -> weight
+FIELDS = {
+    'name': 3.0,
+    'tags': 2.0,
+    'platform': 1.5,
+    'shortDescription': 1.0,
+}
+TABLES = ['profiles', 'hardening_profiles']
+
+STOP_WORDS = frozenset("""
+a an and are as at be by for from in into is it of on or the to with
+""".split())
+
+_TOKEN = re.compile(r'[a-z0-9]+')
+_VOWEL = re.compile(r'[aeiouy]')
+
+Terms = Dict[str, float]
+
+
+def stem(word: str) -> str:
+    """Strip common English inflections (plurals, -ed, -ing, -ly).
+
+    Words of three letters or fewer and words containing digits are kept
+    as they are, so 'aws', 's3' and 'rhel8' survive unchanged.
+    """
+    if len(word) <= 3 or not word.isalpha():
+        return word
+    if word.endswith('sses'):
+        word = word[:-2]
+    elif word.endswith('ies'):
+        word = word[:-3] + 'y'
+    elif word.endswith('s') and not word.endswith(('ss', 'us', 'is')):
+        word = word[:-1]
+
+    for suffix in ('ing', 'ed', 'ly'):
+        base = word[:-len(suffix)]
+        if word.endswith(suffix) and len(base) >= 3 and _VOWEL.search(base):
+            word = base
+            # running -> run, but keep 'install' and 'access'
+            if len(word) > 3 and word[-1] == word[-2] and word[-1] not in 'lsz':
+                word = word[:-1]
+            break
+    return word
+
+
+def tokenize(text: str) -> List[str]:
+    return [stem(t) for t in _TOKEN.findall(text.lower()) if t not in STOP_WORDS]
+
+
+def field_text(value) -> str:
+    if isinstance(value, list):
+        return ' '.join(str(v) for v in value if v is not None)
+    return '' if value is None else str(value)
+
+
+def document_terms(entity: dict) -> Terms:
+    terms: Terms = {}
+    for field, weight in FIELDS.items():
+        for term in tokenize(field_text(entity.get(field))):
+            terms[term] = terms.get(term, 0.0) + weight
+    return terms
+
+
+def document_hash(entity: dict) -> str:
+    """Hash of what the index depends on: indexed fields, weights and stemmer."""
+    payload = [STEMMER, FIELDS, {f: entity.get(f) for f in FIELDS}]
+    return hashlib.sha1(json.dumps(payload, sort_keys=True, default=str).encode('utf-8')).hexdigest()[:16]
+
+
+class Document(NamedTuple):
+    id: str
+    type: str
+    name: str
+    hash: str
+
+
+class SearchIndex:
+    def __init__(self, docs: List[Document], terms: Dict[str, List[List[float]]]):
+        self.docs = docs
+        self.terms = terms
+
+    def document_terms(self) -> Dict[Tuple[str, str], Terms]:
+        """(type, id) -> term -> weighted tf, recovered from the postings."""
+        per_doc: Dict[Tuple[str, str], Terms] = {(d.type, d.id): {} for d in self.docs}
+        for term, postings in self.terms.items():
+            for position, weight in postings:
+                doc = self.docs[int(position)]
+                per_doc[(doc.type, doc.id)][term] = weight
+        return per_doc
+
+    def search(self, query: str, limit: int = 20) -> List[Tuple[Document, float]]:
+        """Documents containing every query term, best tf-idf score first.
+
+        The last query term also matches as a prefix (search-as-you-type).
+        """
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        n = len(self.docs)
+        scores: Optional[Dict[int, float]] = None
+        for i, token in enumerate(tokens):
+            matched = [token] if token in self.terms else []
+            if i == len(tokens) - 1:
+                matched = [t for t in self.terms if t.startswith(token)]
+            token_scores: Dict[int, float] = {}
+            for term in matched:
+                postings = self.terms[term]
+                idf = math.log(1 + n / len(postings))
+                for position, weight in postings:
+                    token_scores[position] = token_scores.get(position, 0.0) + weight * idf
+            if scores is None:
+                scores = token_scores
+            else:
+                scores = {p: s + token_scores[p] for p, s in scores.items() if p in token_scores}
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:limit]
+        return [(self.docs[p], round(score, 3)) for p, score in ranked]
+
+    def to_json(self) -> dict:
+        return {
+            'format': FORMAT,
+            'stemmer': STEMMER,
+            'fields': FIELDS,
+            'docs': [d._asdict() for d in self.docs],
+            'terms': self.terms,
+        }
+
+    @classmethod
+    def from_json(cls, data: dict) -> 'SearchIndex':
+        if data.get('format') != FORMAT or data.get('stemmer') != STEMMER:
+            raise ValueError('Search index was built with a different format or stemmer')
+        return cls([Document(**d) for d in data['docs']], data['terms'])
+
+    def save(self, path: Path = DEFAULT_INDEX):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f'.{path.name}.tmp')
+        text = json.dumps(self.to_json(), ensure_ascii=False, separators=(',', ':'), sort_keys=True)
+        tmp.write_text(text + '\n', encoding='utf-8')
+        os.replace(tmp, path)
+
+
+def read_index(path: Path = DEFAULT_INDEX) -> Optional[SearchIndex]:
+    try:
+        return SearchIndex.from_json(json.loads(Path(path).read_text(encoding='utf-8')))
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+class BuildStats(NamedTuple):
+    documents: int
+    reindexed: int
+    removed: int
+
+
+def build_index(data_dir: Path = DEFAULT_DATA_DIR,
+                previous: Optional[SearchIndex] = None) -> Tuple[SearchIndex, BuildStats]:
+    """Index the corpus, reusing terms of unchanged documents from `previous`."""
+    reusable: Dict[Tuple[str, str], Tuple[str, Terms]] = {}
+    if previous is not None:
+        old_terms = previous.document_terms()
+        reusable = {(d.type, d.id): (d.hash, old_terms[(d.type, d.id)]) for d in previous.docs}
+
+    docs: List[Document] = []
+    doc_terms: List[Terms] = []
+    reindexed = 0
+    for etype, _, entity in iter_entities(data_dir, [entity_type(t) for t in TABLES]):
+        key = (etype.table, str(entity['id']))
+        digest = document_hash(entity)
+        old = reusable.pop(key, None)
+        if old is not None and old[0] == digest:
+            terms = old[1]
+        else:
+            terms = document_terms(entity)
+            reindexed += 1
+        docs.append(Document(key[1], etype.table, str(entity.get('name') or key[1]), digest))
+        doc_terms.append(terms)
+
+    postings: Dict[str, List[List[float]]] = {}
+    for position, terms in enumerate(doc_terms):
+        for term, weight in terms.items():
+            postings.setdefault(term, []).append([position, weight])
+    index = SearchIndex(docs, dict(sorted(postings.items())))
+    return index, BuildStats(len(docs), reindexed, len(reusable))
+
+
+def update_index(path: Path = DEFAULT_INDEX, data_dir: Path = DEFAULT_DATA_DIR,
+                 full: bool = False) -> Tuple[SearchIndex, BuildStats]:
+    """Rebuild the index file incrementally (or from scratch with full=True)."""
+    index, stats = build_index(data_dir, None if full else read_index(path))
+    index.save(path)
+    return index, stats
+
+
+def main(argv: Optional[Sequence[str]] = None, prog: Optional[str] = None):
+    import argparse
+
+    parser = argparse.ArgumentParser(prog=prog, description='Build the profile search index (and optionally query it)')
+    parser.add_argument('query', nargs='?', help='Search the index after building it')
+    parser.add_argument('--output', default=str(DEFAULT_INDEX), help=f'Index file (default: {DEFAULT_INDEX})')
+    parser.add_argument('--full', action='store_true', help='Reindex every document')
+    parser.add_argument('--limit', type=int, default=20, help='Maximum results for a query (default: 20)')
+    parser.add_argument('--data-dir', default=str(DEFAULT_DATA_DIR), help='Path to data directory')
+    args = parser.parse_args(argv)
+
+    try:
+        index, stats = update_index(args.output, args.data_dir, args.full)
+    except OSError as e:
+        print(f"❌ Could not write {args.output}: {e}")
+        sys.exit(1)
+    print(f"✓ {args.output}: {stats.documents} documents, {len(index.terms)} terms "
+          f"({stats.reindexed} reindexed, {stats.removed} removed)")
+
+    if args.query:
+        print()
+        results = index.search(args.query, args.limit)
+        for doc, score in results:
+            print(f"  {score:7.2f}  {doc.type}/{doc.id}  {doc.name}")
+        print(f"\n📊 {len(results)} results for {args.query!r}")
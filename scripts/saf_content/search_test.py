@@ -0,0 +1,36 @@
+"""Tests for the prebuilt search index."""
+
+from saf_content.search import build_index, read_index, stem, tokenize, update_index
+
+
+def test_tokenize_and_stem():
+    # Keep in sync with docs/.vitepress/theme/composables/useSearchIndex.spec.ts
+    assert tokenize('Running the Databases, RHEL8 on AWS') == ['run', 'database', 'rhel8', 'aws']
+    assert [stem(w) for w in ('policies', 'access', 'installed', 'class')] == ['policy', 'access', 'install', 'class']
+    assert [stem(w) for w in ('hardening', 'quickly', 'passes', 'filling', 'status', 'used')] == \
+           ['harden', 'quick', 'pass', 'fill', 'status', 'used']
+
+
+def test_search_ranks_name_matches_first(data_dir):
+    index, stats = build_index(data_dir)
+    assert stats.documents == stats.reindexed == len(index.docs)
+    results = index.search('windows')
+    assert results and all('windows' in doc.name.lower() for doc, _ in results[:3])
+    assert {d.type for d in index.docs} == {'profiles', 'hardening_profiles'}
+    # the last term matches as a prefix
+    assert [d.id for d, _ in index.search('window')] == [d.id for d, _ in index.search('win')]
+
+
+def test_rebuild_reindexes_only_changed_documents(data_dir, tmp_path):
+    path = tmp_path / 'search.json'
+    first, _ = update_index(path, data_dir)
+    _, stats = update_index(path, data_dir)
+    assert stats.reindexed == 0 and stats.documents == len(first.docs)
+
+    cis = data_dir / 'profiles' / 'cis.yml'
+    text = cis.read_text(encoding='utf-8')
+    cis.write_text(text.replace('name: Docker CE CIS', 'name: Docker CE CIS Quokka', 1), encoding='utf-8')
+    index, stats = update_index(path, data_dir)
+    assert stats.reindexed == 1
+    assert [d.id for d, _ in index.search('quokka')] == ['docker-ce-cis']
+    assert read_index(path).terms == index.terms == build_index(data_dir)[0].terms
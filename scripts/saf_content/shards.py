@@ -0,0 +1,183 @@
+"""
+Sharded collections: one logical corpus file stored as a directory of shards.
+
+A large file such as profiles/stig.yml can be split (saf-py shard split,
+see saf_content/split.py) into a directory of smaller files plus a
+manifest:
+
+    content/data/profiles/stig/
+      _manifest.json     {"format", "id", "strategy", "size", "shards": [{"file", "hash", "ids"}]}
+      inspec.yml         _id: stig-profiles-inspec, _metadata: ..., profiles: [...]
+      ansible.yml
+
+Every shard is an ordinary corpus file (with its own copy of the original
+`_metadata`), so tools that walk corpus.iter_files work unchanged and parse
+and write costs follow the size of the shard being edited.
+
+The manifest lists the IDs in each shard under the hash of the shard's
+bytes. A hash that no longer matches (a shard edited by hand) only means
+the shard is parsed instead of trusted, so a stale manifest is slower,
+never wrong; `refresh_manifest` brings it up to date and the tools that
+write shards call `refresh_for` afterwards.
+
+    path = locate(data_dir / 'profiles' / 'stig', 'rhel-8-stig')   # reads the manifest, not the shards
+    entities = load_entities(data_dir / 'profiles' / 'stig', ['rhel-8-stig', 'ubuntu-20.04-stig'])
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+from .corpus import ENTITY_TYPES_BY_DIR, SHARD_MANIFEST, EntityType, file_entities, load_file
+
+FORMAT = 1
+
+
+class ShardError(Exception):
+    pass
+
+
+class Shard(NamedTuple):
+    file: str          # relative to the collection directory
+    hash: str
+    ids: List[str]
+
+
+class Manifest(NamedTuple):
+    id: Optional[str]          # `_id` of the original file, restored by merge
+    strategy: str              # 'size' or 'technology'
+    size: Optional[int]        # entities per shard for the 'size' strategy
+    shards: List[Shard]
+
+    def to_json(self) -> dict:
+        return {'format': FORMAT, 'id': self.id, 'strategy': self.strategy, 'size': self.size,
+                'shards': [s._asdict() for s in self.shards]}
+
+    @classmethod
+    def from_json(cls, data: dict) -> 'Manifest':
+        if data.get('format') != FORMAT:
+            raise ShardError(f"Unsupported shard manifest format {data.get('format')}")
+        return cls(data.get('id'), data['strategy'], data.get('size'),
+                   [Shard(s['file'], s['hash'], list(s['ids'])) for s in data['shards']])
+
+
+def shard_hash(raw: bytes) -> str:
+    return hashlib.sha1(raw).hexdigest()[:16]
+
+
+def is_sharded(directory: Path) -> bool:
+    return (Path(directory) / SHARD_MANIFEST).is_file()
+
+
+def collection_type(directory: Path) -> EntityType:
+    try:
+        return ENTITY_TYPES_BY_DIR[Path(directory).parent.name]
+    except KeyError as e:
+        raise ShardError(f'{directory} is not inside an entity type directory') from e
+
+
+def shard_files(directory: Path) -> List[Path]:
+    directory = Path(directory)
+    return sorted(list(directory.glob('*.yml')) + list(directory.glob('*.yaml')))
+
+
+def read_manifest(directory: Path) -> Manifest:
+    path = Path(directory) / SHARD_MANIFEST
+    try:
+        return Manifest.from_json(json.loads(path.read_text(encoding='utf-8')))
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        raise ShardError(f'{path}: {e}') from e
+
+
+def write_manifest(directory: Path, manifest: Manifest):
+    path = Path(directory) / SHARD_MANIFEST
+    tmp = path.with_name(f'.{path.name}.tmp')
+    tmp.write_text(json.dumps(manifest.to_json(), indent=1) + '\n', encoding='utf-8')
+    os.replace(tmp, path)
+
+
+def entity_ids(path: Path, etype: EntityType) -> List[str]:
+    return [str(e['id']) for e in file_entities(load_file(path), etype) if isinstance(e, dict) and e.get('id')]
+
+
+def refresh_manifest(directory: Path) -> Manifest:
+    """Re-read the IDs of shards whose hash changed, add new shards, drop missing ones."""
+    directory = Path(directory)
+    etype = collection_type(directory)
+    manifest = read_manifest(directory)
+    known = {s.file: s for s in manifest.shards}
+    files = {p.name: p for p in shard_files(directory)}
+    # Keep the manifest's shard order (merge follows it); new shards go last
+    names = [s.file for s in manifest.shards if s.file in files] + sorted(set(files) - set(known))
+
+    shards = []
+    for name in names:
+        digest = shard_hash(files[name].read_bytes())
+        shard = known.get(name)
+        if shard is None or shard.hash != digest:
+            shard = Shard(name, digest, entity_ids(files[name], etype))
+        shards.append(shard)
+    refreshed = manifest._replace(shards=shards)
+    if refreshed != manifest:
+        write_manifest(directory, refreshed)
+    return refreshed
+
+
+def refresh_for(paths: Iterable[Path]) -> List[Path]:
+    """Refresh the manifests of the sharded collections the given files belong to."""
+    directories = sorted({Path(p).parent for p in paths if is_sharded(Path(p).parent)})
+    for directory in directories:
+        refresh_manifest(directory)
+    return directories
+
+
+def manifest_ids(path: Path) -> Optional[List[str]]:
+    """IDs of a shard file from its manifest, or None if it is not a shard or the entry is stale."""
+    path = Path(path)
+    if not is_sharded(path.parent):
+        return None
+    try:
+        manifest = read_manifest(path.parent)
+    except ShardError:
+        return None
+    for shard in manifest.shards:
+        if shard.file == path.name:
+            return shard.ids if shard.hash == shard_hash(path.read_bytes()) else None
+    return None
+
+
+def _shard_ids(directory: Path, etype: EntityType) -> Dict[str, List[str]]:
+    """shard file -> IDs, trusting manifest entries whose hash matches and parsing the rest."""
+    known = {s.file: s for s in read_manifest(directory).shards}
+    ids = {}
+    for path in shard_files(directory):
+        shard = known.get(path.name)
+        fresh = shard is not None and shard.hash == shard_hash(path.read_bytes())
+        ids[path.name] = shard.ids if fresh else entity_ids(path, etype)
+    return ids
+
+
+def locate(directory: Path, entity_id: str) -> Optional[Path]:
+    """The shard holding entity_id, without parsing shards the manifest vouches for."""
+    directory = Path(directory)
+    for name, ids in _shard_ids(directory, collection_type(directory)).items():
+        if entity_id in ids:
+            return directory / name
+    return None
+
+
+def load_entities(directory: Path, ids: Optional[Sequence[str]] = None) -> List[dict]:
+    """Entities of a sharded collection, parsing only the shards that hold `ids` (all if None)."""
+    directory = Path(directory)
+    etype = collection_type(directory)
+    wanted = None if ids is None else set(ids)
+    entities = []
+    for name, shard_ids in _shard_ids(directory, etype).items():
+        if wanted is not None and wanted.isdisjoint(shard_ids):
+            continue
+        for entity in file_entities(load_file(directory / name), etype):
+            if wanted is None or (isinstance(entity, dict) and str(entity.get('id')) in wanted):
+                entities.append(entity)
+    return entities
@@ -0,0 +1,84 @@
+"""Tests for sharded collections and the split/merge tool."""
+
+import pytest
+
+from saf_content import shards
+from saf_content.corpus import SHARD_MANIFEST, iter_entities, load_file
+from saf_content.fixer import DataQualityFixer
+from saf_content.shards import ShardError, load_entities, locate, manifest_ids, read_manifest, refresh_manifest
+from saf_content.split import main, merge, split
+
+
+def corpus_ids(data_dir):
+    return sorted((etype.table, entity['id']) for etype, _, entity in iter_entities(data_dir))
+
+
+def test_split_and_merge_round_trip(data_dir):
+    original = load_file(data_dir / 'profiles' / 'stig.yml')
+    ids = corpus_ids(data_dir)
+
+    manifest = split(data_dir / 'profiles' / 'stig.yml', 'size', 20)
+    collection = data_dir / 'profiles' / 'stig'
+    assert not (data_dir / 'profiles' / 'stig.yml').exists()
+    profiles = [p['id'] for p in original['profiles']]
+    assert [s.ids for s in manifest.shards] == [profiles[i:i + 20] for i in range(0, len(profiles), 20)]
+    assert manifest.shards[1].file == 'part-002.yml'
+    assert read_manifest(collection) == manifest
+    first = load_file(collection / 'part-001.yml')
+    assert first['_id'] == f"{original['_id']}-part-001" and first['_metadata'] == original['_metadata']
+    assert corpus_ids(data_dir) == ids
+
+    (data_dir / 'profiles' / 'stig.yml').write_text('profiles: []\n')
+    with pytest.raises(ShardError, match='already exists'):
+        merge(collection)
+    (data_dir / 'profiles' / 'stig.yml').unlink()
+
+    merged = load_file(merge(collection))
+    assert not collection.exists()
+    assert merged['_id'] == original['_id']
+    assert [p['id'] for p in merged['profiles']] == profiles
+
+
+def test_lookups_trust_current_manifest_entries(data_dir, monkeypatch):
+    manifest = split(data_dir / 'profiles' / 'stig.yml', 'size', 20)
+    collection = data_dir / 'profiles' / 'stig'
+    wanted = manifest.shards[2].ids[0]
+
+    parsed = []
+    real_load = shards.load_file
+    monkeypatch.setattr(shards, 'load_file', lambda path: parsed.append(path.name) or real_load(path))
+    assert locate(collection, wanted) == collection / 'part-003.yml'
+    assert [e['id'] for e in load_entities(collection, [wanted])] == [wanted]
+    assert parsed == ['part-003.yml']   # only the shard holding the entity
+
+    # A hand edit makes the entry stale: the shard is parsed until the manifest is refreshed
+    shard = collection / 'part-001.yml'
+    shard.write_text(shard.read_text().replace(manifest.shards[0].ids[0], 'renamed-profile', 1))
+    assert manifest_ids(shard) is None
+    assert locate(collection, 'renamed-profile') == shard
+    refreshed = refresh_manifest(collection)
+    assert refreshed.shards[0].ids[0] == 'renamed-profile'
+    assert manifest_ids(shard) == refreshed.shards[0].ids
+
+
+def test_fixer_reads_sharded_collections(data_dir, capsys):
+    split(data_dir / 'standards' / 'stig.yml', 'size', 1)
+    assert (data_dir / 'standards' / 'stig' / SHARD_MANIFEST).exists()
+    assert DataQualityFixer(data_dir=str(data_dir), validate_only=True).run()
+
+    # A duplicate between a shard and a flat file is still caught, from the manifest IDs
+    duplicate = read_manifest(data_dir / 'standards' / 'stig').shards[0].ids[0]
+    (data_dir / 'standards' / 'extra.yml').write_text(f'standards:\n- id: {duplicate}\n  name: Copy\n')
+    fixer = DataQualityFixer(data_dir=str(data_dir), validate_only=True)
+    assert not fixer.run()
+    assert f'standards:{duplicate}' in fixer.duplicate_ids
+
+
+def test_split_defaults_to_size(data_dir, capsys):
+    # Every STIG profile is InSpec, so a split by technology would be one shard
+    main(['split', str(data_dir / 'profiles' / 'stig.yml'), '--size', '20'])
+    assert 'into 3 shards by size' in capsys.readouterr().out
+    assert read_manifest(data_dir / 'profiles' / 'stig').strategy == 'size'
+    assert merge(data_dir / 'profiles' / 'stig')
+
+    assert [s.file for s in split(data_dir / 'profiles' / 'stig.yml', 'technology').shards] == ['inspec.yml']
@@ -0,0 +1,261 @@
+"""
+Precompiled snapshot of the content/data corpus with lookup indexes.
+
+`build` parses every YAML file once and writes a single file holding each
+entity type as a separate JSON section, plus per-type indexes from
+standard, technology, organization, team, tag and status to entity
+positions. FK values are normalized the same way the sync tools normalize
+them, so `profiles` indexed by standard 'cis' include profiles written
+with `standard: CIS`.
+
+File layout: one JSON header line, then the sections back to back:
+
+    {"format": 1, "source_hash": "...", "counts": {...},
+     "sections": {"profiles": [offset, length], "profiles.index": [...], ...}}
+    [{"id": "aws-rds-mysql-57-cis", ...}, ...]{"standard": {"cis": [0, 1]}, ...}...
+
+Offsets are relative to the end of the header line. `Snapshot` reads only
+the header on open and decodes a section the first time it is used, so a
+script that needs profiles never parses tools or tags:
+
+    snap = load()   # rebuilds first if the YAML changed since the last build
+    for profile in snap.find('profiles', standard='stig', status='active'):
+        ...
+
+The snapshot is keyed by `source_hash`, a hash of the YAML file contents;
+`load` rebuilds a stale snapshot automatically.
+"""
+
+import hashlib
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .corpus import DEFAULT_DATA_DIR, ENTITY_TYPES, REPO_ROOT, file_entities, iter_files, load_file
+from .ids import id_type_for, normalize_id
+
+DEFAULT_SNAPSHOT = REPO_ROOT / '.cache' / 'saf' / 'content-snapshot.json'
+FORMAT = 1
+
+# Indexed YAML key -> table whose IDs its values refer to (None: plain value)
+INDEX_FIELDS = {
+    'standard': 'standards',
+    'technology': 'technologies',
+    'organization': 'organizations',
+    'team': 'teams',
+    'tags': 'tags',
+    'status': None,
+}
+
+Index = Dict[str, List[int]]
+
+
+class SnapshotError(Exception):
+    pass
+
+
+def source_files(data_dir: Path = DEFAULT_DATA_DIR) -> List[Path]:
+    return [path for etype in ENTITY_TYPES for path in iter_files(data_dir, etype)]
+
+
+def _add_file(digest, data_dir: Path, path: Path, raw: bytes):
+    digest.update(path.relative_to(data_dir).as_posix().encode() + b'\0')
+    digest.update(raw + b'\0')
+
+
+def source_hash(data_dir: Path = DEFAULT_DATA_DIR) -> str:
+    """Hash of the names and contents of every corpus file."""
+    data_dir = Path(data_dir)
+    digest = hashlib.sha256()
+    for path in source_files(data_dir):
+        _add_file(digest, data_dir, path, path.read_bytes())
+    return digest.hexdigest()
+
+
+def index_values(value, table: Optional[str]) -> List[str]:
+    values = value if isinstance(value, list) else [value]
+    values = [str(v) for v in values if v not in (None, '')]
+    return [normalize_id(v, id_type_for(table)) for v in values] if table else values
+
+
+def build_indexes(entities: List[dict]) -> Dict[str, Index]:
+    """field -> value -> positions, for the INDEX_FIELDS the entities use."""
+    indexes: Dict[str, Index] = {}
+    for position, entity in enumerate(entities):
+        for field, table in INDEX_FIELDS.items():
+            if field not in entity:
+                continue
+            index = indexes.setdefault(field, {})
+            for value in index_values(entity[field], table):
+                positions = index.setdefault(value, [])
+                if not positions or positions[-1] != position:
+                    positions.append(position)
+    return indexes
+
+
+def compile_corpus(data_dir: Path = DEFAULT_DATA_DIR) -> Tuple[str, Dict[str, List[dict]]]:
+    """(source hash, table -> entities) read from the YAML in one pass."""
+    data_dir = Path(data_dir)
+    digest = hashlib.sha256()
+    sections: Dict[str, List[dict]] = {}
+    for etype in ENTITY_TYPES:
+        entities = sections.setdefault(etype.table, [])
+        for path in iter_files(data_dir, etype):
+            # Same digest as source_hash(), without reading the files twice
+            _add_file(digest, data_dir, path, path.read_bytes())
+            data = load_file(path)
+            entities += [e for e in file_entities(data, etype) if isinstance(e, dict) and e.get('id')]
+    return digest.hexdigest(), sections
+
+
+def _dumps(value) -> bytes:
+    # default=str: unquoted YAML dates load as datetime.date
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':'), default=str).encode('utf-8')
+
+
+def build(data_dir: Path = DEFAULT_DATA_DIR, output: Path = DEFAULT_SNAPSHOT) -> 'Snapshot':
+    """Compile the corpus and write the snapshot atomically."""
+    digest, sections = compile_corpus(data_dir)
+    blobs: List[bytes] = []
+    layout: Dict[str, List[int]] = {}
+    offset = 0
+    for table, entities in sections.items():
+        for name, value in ((table, entities), (f'{table}.index', build_indexes(entities))):
+            blob = _dumps(value)
+            layout[name] = [offset, len(blob)]
+            blobs.append(blob)
+            offset += len(blob)
+    header = {
+        'format': FORMAT,
+        'source_hash': digest,
+        'counts': {table: len(entities) for table, entities in sections.items()},
+        'sections': layout,
+    }
+
+    output = Path(output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    tmp = output.with_name(f'.{output.name}.tmp')
+    with open(tmp, 'wb') as f:
+        f.write(_dumps(header) + b'\n')
+        for blob in blobs:
+            f.write(blob)
+    os.replace(tmp, output)
+    return Snapshot(output)
+
+
+class Snapshot:
+    """Read-only view of a snapshot file; sections are decoded on first use."""
+
+    def __init__(self, path: Path = DEFAULT_SNAPSHOT):
+        self.path = Path(path)
+        with open(self.path, 'rb') as f:
+            header_line = f.readline()
+            self._base = f.tell()
+        try:
+            header = json.loads(header_line)
+        except ValueError as e:
+            raise SnapshotError(f'{self.path}: invalid snapshot header') from e
+        if header.get('format') != FORMAT:
+            raise SnapshotError(f"{self.path}: unsupported snapshot format {header.get('format')}")
+        self.source_hash: str = header['source_hash']
+        self.counts: Dict[str, int] = header['counts']
+        self._layout: Dict[str, List[int]] = header['sections']
+        self._sections: Dict[str, object] = {}
+        self._by_id: Dict[str, Dict[str, dict]] = {}
+
+    @property
+    def tables(self) -> List[str]:
+        return list(self.counts)
+
+    def _section(self, name: str):
+        if name not in self._sections:
+            if name not in self._layout:
+                raise KeyError(f'No section {name!r} in snapshot')
+            offset, length = self._layout[name]
+            with open(self.path, 'rb') as f:
+                f.seek(self._base + offset)
+                self._sections[name] = json.loads(f.read(length))
+        return self._sections[name]
+
+    def entities(self, table: str) -> List[dict]:
+        return self._section(table)
+
+    def __iter__(self) -> Iterator[Tuple[str, dict]]:
+        for table in self.tables:
+            for entity in self.entities(table):
+                yield table, entity
+
+    def index(self, table: str, field: str) -> Index:
+        """value -> positions in entities(table); empty if the field is not indexed."""
+        return self._section(f'{table}.index').get(field, {})
+
+    def get(self, table: str, entity_id: str) -> Optional[dict]:
+        if table not in self._by_id:
+            self._by_id[table] = {str(e['id']): e for e in self.entities(table)}
+        return self._by_id[table].get(entity_id)
+
+    def find(self, table: str, **criteria: str) -> List[dict]:
+        """Entities matching every indexed field=value criterion, in corpus order.
+
+        Values are normalized like the index (standard='STIG' finds 'stig').
+        """
+        positions: Optional[set] = None
+        for field, value in criteria.items():
+            if field not in INDEX_FIELDS:
+                raise KeyError(f'{field!r} is not an indexed field')
+            key = index_values(value, INDEX_FIELDS[field])[0]
+            matches = set(self.index(table, field).get(key, ()))
+            positions = matches if positions is None else positions & matches
+        entities = self.entities(table)
+        if positions is None:
+            return list(entities)
+        return [entities[p] for p in sorted(positions)]
+
+
+def load(path: Path = DEFAULT_SNAPSHOT, data_dir: Path = DEFAULT_DATA_DIR,
+         rebuild: bool = True) -> Snapshot:
+    """Open the snapshot, rebuilding it first if missing or stale.
+
+    With rebuild=False a stale or missing snapshot raises SnapshotError.
+    """
+    try:
+        snapshot = Snapshot(path)
+        if snapshot.source_hash == source_hash(data_dir):
+            return snapshot
+        problem = 'is stale'
+    except (OSError, SnapshotError, KeyError):
+        problem = 'is missing or unreadable'
+    if not rebuild:
+        raise SnapshotError(f'{path} {problem}; run `saf-py snapshot`')
+    return build(data_dir, path)
+
+
+def main(argv: Optional[Sequence[str]] = None, prog: Optional[str] = None):
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(prog=prog, description='Compile content/data into an indexed snapshot file')
+    parser.add_argument('--data-dir', default=str(DEFAULT_DATA_DIR), help='Path to data directory')
+    parser.add_argument('--output', default=str(DEFAULT_SNAPSHOT), help=f'Snapshot file (default: {DEFAULT_SNAPSHOT})')
+    parser.add_argument('--check', action='store_true', help='Exit 1 if the snapshot is missing or stale; write nothing')
+    args = parser.parse_args(argv)
+
+    if args.check:
+        try:
+            snapshot = load(args.output, args.data_dir, rebuild=False)
+        except SnapshotError as e:
+            print(f"❌ Snapshot {e}")
+            sys.exit(1)
+        print(f"✅ Snapshot is up to date ({snapshot.source_hash[:12]})")
+        return
+
+    start = time.perf_counter()
+    snapshot = build(args.data_dir, args.output)
+    elapsed = time.perf_counter() - start
+    print("📊 Snapshot contents:")
+    for table, count in snapshot.counts.items():
+        print(f"  {table}: {count}")
+    size = snapshot.path.stat().st_size
+    print(f"\n✅ Wrote {snapshot.path} ({size / 1024:.0f} KiB, {snapshot.source_hash[:12]}) in {elapsed * 1000:.0f} ms")
@@ -0,0 +1,45 @@
+"""Tests for the indexed content snapshot."""
+
+import pytest
+
+from saf_content.corpus import iter_entities
+from saf_content.snapshot import Snapshot, SnapshotError, build, load, main, source_hash
+
+
+def test_snapshot_matches_the_corpus(data_dir, tmp_path):
+    snap = build(data_dir, tmp_path / 'snap.json')
+    entities = [(etype.table, entity['id']) for etype, _, entity in iter_entities(data_dir)]
+    assert [(table, e['id']) for table, e in Snapshot(snap.path)] == entities
+    assert snap.source_hash == source_hash(data_dir)
+
+
+def test_sections_load_lazily_and_indexes_normalize(data_dir, tmp_path):
+    snap = Snapshot(build(data_dir, tmp_path / 'snap.json').path)
+    assert snap.counts['profiles'] > 0 and not snap._sections
+
+    stig = snap.find('profiles', standard='STIG', status='active')
+    assert stig and all(p['standard'].lower() == 'stig' and p['status'] == 'active' for p in stig)
+    assert set(snap._sections) == {'profiles', 'profiles.index'}
+
+    tagged = snap.find('profiles', tags='database')
+    assert tagged and all('database' in [t.lower() for t in p['tags']] for p in tagged)
+    assert snap.get('profiles', stig[0]['id']) is stig[0]
+    assert snap.find('tools') == snap.entities('tools')
+
+
+def test_stale_snapshot_is_rebuilt(data_dir, tmp_path, capsys):
+    path = tmp_path / 'snap.json'
+    first = build(data_dir, path)
+    assert load(path, data_dir, rebuild=False).source_hash == first.source_hash
+
+    tags = data_dir / 'tags' / 'tags.yml'
+    tags.write_text(tags.read_text(encoding='utf-8') + '- id: zz-new\n  status: active\n', encoding='utf-8')
+    with pytest.raises(SnapshotError):
+        load(path, data_dir, rebuild=False)
+    with pytest.raises(SystemExit):
+        main(['--check', '--data-dir', str(data_dir), '--output', str(path)])
+
+    snap = load(path, data_dir)
+    assert snap.source_hash != first.source_hash and snap.get('tags', 'zz-new')
+    main(['--check', '--data-dir', str(data_dir), '--output', str(path)])
+    assert 'up to date' in capsys.readouterr().out
@@ -0,0 +1,180 @@
+"""
+Convert corpus files to sharded collections and back.
+
+    saf-py shard split content/data/profiles/stig.yml                 # 100 entities per shard
+    saf-py shard split content/data/profiles/stig.yml --size 50       # 50 entities per shard
+    saf-py shard split content/data/profiles/stig.yml --by technology # one shard per technology
+    saf-py shard merge content/data/profiles/stig                     # back to stig.yml
+    saf-py shard refresh                                              # update stale manifests
+
+`split` writes profiles/stig/<shard>.yml files (canonical YAML, each with the
+original `_metadata` and an `_id` derived from the original one) and the
+manifest, checks that the shards hold exactly the original entities, and
+only then removes the original file. `merge` concatenates the shards in
+manifest order (for a split by technology that groups entities by
+technology) and restores the original `_id`. See saf_content/shards.py for
+the layout.
+"""
+
+import os
+import re
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from .canonical import dump_text
+from .corpus import DEFAULT_DATA_DIR, ENTITY_TYPES, ENTITY_TYPES_BY_DIR, SHARD_MANIFEST, file_entities, load_file
+from .shards import (Manifest, Shard, ShardError, collection_type, entity_ids, is_sharded, refresh_manifest,
+                     shard_files, shard_hash, write_manifest)
+
+# Splitting by technology only helps files that mix technologies (most
+# collections are a single one, e.g. every STIG is InSpec), so size is the default
+STRATEGIES = ('size', 'technology')
+DEFAULT_SIZE = 100
+
+_SLUG = re.compile(r'[^a-z0-9]+')
+
+
+def _write(path: Path, text: str):
+    tmp = path.with_name(f'.{path.name}.tmp')
+    tmp.write_text(text, encoding='utf-8')
+    os.replace(tmp, path)
+
+
+def _by_id(entity) -> str:
+    return str(entity.get('id')) if isinstance(entity, dict) else repr(entity)
+
+
+def group_entities(entities: list, strategy: str, size: int = DEFAULT_SIZE) -> Dict[str, list]:
+    """Shard name -> entities, in the order the shards should be merged back."""
+    groups: Dict[str, list] = {}
+    if strategy == 'technology':
+        for entity in entities:
+            technology = entity.get('technology') if isinstance(entity, dict) else None
+            name = _SLUG.sub('-', str(technology or 'other').lower()).strip('-') or 'other'
+            groups.setdefault(name, []).append(entity)
+    elif strategy == 'size':
+        if size < 1:
+            raise ShardError('Shard size must be at least 1')
+        for start in range(0, len(entities), size):
+            groups[f'part-{start // size + 1:03d}'] = entities[start:start + size]
+    else:
+        raise ShardError(f"Unknown strategy {strategy!r} (use {' or '.join(STRATEGIES)})")
+    return groups
+
+
+def split(path: Path, strategy: str = 'size', size: int = DEFAULT_SIZE) -> Manifest:
+    """Replace a corpus file with a sharded collection directory of the same name."""
+    path = Path(path)
+    etype = ENTITY_TYPES_BY_DIR.get(path.parent.name)
+    if etype is None or path.suffix not in ('.yml', '.yaml'):
+        raise ShardError(f'{path} is not a corpus file')
+    directory = path.with_suffix('')
+    if directory.exists():
+        raise ShardError(f'{directory} already exists')
+
+    data = load_file(path)
+    entities = file_entities(data, etype)
+    header = {key: value for key, value in data.items() if key != etype.key}
+    groups = group_entities(entities, strategy, size)
+
+    directory.mkdir()
+    shards = []
+    for name, group in groups.items():
+        shard = {**header, etype.key: group}
+        if '_id' in header:
+            shard['_id'] = f"{header['_id']}-{name}"
+        text = dump_text(shard, etype)
+        _write(directory / f'{name}.yml', text)
+        ids = entity_ids(directory / f'{name}.yml', etype)
+        shards.append(Shard(f'{name}.yml', shard_hash(text.encode('utf-8')), ids))
+    manifest = Manifest(header.get('_id'), strategy, size if strategy == 'size' else None, shards)
+    write_manifest(directory, manifest)
+
+    sharded = [e for s in shards for e in file_entities(load_file(directory / s.file), etype)]
+    # Compared as canonical text, since dumping turned YAML dates into strings
+    original = dump_text({etype.key: sorted(entities, key=_by_id)}, etype)
+    if dump_text({etype.key: sorted(sharded, key=_by_id)}, etype) != original:
+        for shard in shards:
+            (directory / shard.file).unlink()
+        (directory / SHARD_MANIFEST).unlink()
+        directory.rmdir()
+        raise ShardError(f'Shards of {path} do not hold the original entities; nothing changed')
+    path.unlink()
+    return manifest
+
+
+def merge(directory: Path) -> Path:
+    """Replace a sharded collection with a single file; returns the file."""
+    directory = Path(directory)
+    if not is_sharded(directory):
+        raise ShardError(f'{directory} is not a sharded collection (no {SHARD_MANIFEST})')
+    etype = collection_type(directory)
+    target = directory.with_suffix('.yml')
+    if target.exists():
+        raise ShardError(f'{target} already exists')
+
+    manifest = refresh_manifest(directory)
+    data: dict = {}
+    entities: List = []
+    for shard in manifest.shards:
+        shard_data = load_file(directory / shard.file)
+        if not data:
+            data = {key: value for key, value in shard_data.items() if key != etype.key}
+        entities += file_entities(shard_data, etype)
+    if manifest.id is not None:
+        data['_id'] = manifest.id
+    else:
+        data.pop('_id', None)
+    data[etype.key] = entities
+
+    _write(target, dump_text(data, etype))
+    for path in shard_files(directory):
+        path.unlink()
+    (directory / SHARD_MANIFEST).unlink()
+    directory.rmdir()
+    return target
+
+
+def sharded_collections(data_dir: Path = DEFAULT_DATA_DIR) -> List[Path]:
+    return sorted(manifest.parent for etype in ENTITY_TYPES
+                  for manifest in (Path(data_dir) / etype.directory).glob(f'*/{SHARD_MANIFEST}'))
+
+
+def main(argv: Optional[Sequence[str]] = None, prog: Optional[str] = None):
+    import argparse
+
+    parser = argparse.ArgumentParser(prog=prog, description='Split corpus files into sharded collections and back',
+                                     epilog=__doc__.split('\n\n')[1], formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest='action', required=True)
+    split_parser = sub.add_parser('split', help='Split a corpus file into a directory of shards')
+    split_parser.add_argument('file', help='Corpus file, e.g. content/data/profiles/stig.yml')
+    split_parser.add_argument('--by', choices=STRATEGIES, default='size', dest='strategy',
+                              help='Shard by a fixed number of entities (default) or by technology')
+    split_parser.add_argument('--size', type=int, default=DEFAULT_SIZE,
+                              help=f'Entities per shard with --by size (default: {DEFAULT_SIZE})')
+    merge_parser = sub.add_parser('merge', help='Merge a sharded collection back into one file')
+    merge_parser.add_argument('directory', help='Sharded collection, e.g. content/data/profiles/stig')
+    refresh_parser = sub.add_parser('refresh', help='Update the manifests of sharded collections')
+    refresh_parser.add_argument('directories', nargs='*', help='Collections (default: all under --data-dir)')
+    refresh_parser.add_argument('--data-dir', default=str(DEFAULT_DATA_DIR), help='Path to data directory')
+    args = parser.parse_args(argv)
+
+    try:
+        if args.action == 'split':
+            manifest = split(Path(args.file), args.strategy, args.size)
+            for shard in manifest.shards:
+                print(f"  • {shard.file}: {len(shard.ids)} entities")
+            print(f"\n✅ Split {args.file} into {len(manifest.shards)} shards by {args.strategy}")
+        elif args.action == 'merge':
+            target = merge(Path(args.directory))
+            print(f"✅ Merged {args.directory} into {target}")
+        else:
+            directories = [Path(d) for d in args.directories] or sharded_collections(Path(args.data_dir))
+            for directory in directories:
+                manifest = refresh_manifest(directory)
+                print(f"✓ {directory}: {len(manifest.shards)} shards, "
+                      f"{sum(len(s.ids) for s in manifest.shards)} entities")
+    except (OSError, ShardError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
@@ -0,0 +1,4 @@
+"""
+Python dump/load of SQLite databases in the diffable (NDJSON) format used by
+scripts/db-diffable.ts and .pocketbase/pb_data/diffable.
+"""
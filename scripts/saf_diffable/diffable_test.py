@@ -0,0 +1,173 @@
+"""Tests for the diffable dump and load."""
+
+import json
+import sqlite3
+
+import pytest
+
+from saf_diffable import dump as dump_module
+from saf_diffable.dump import dump
+from saf_diffable.format import META_TABLE, file_checksum, fk_order, metadata_path, ndjson_path, read_all_metadata
+from saf_diffable.freshness import check, refresh
+from saf_diffable.load import load
+
+SCHEMA = [
+    'CREATE TABLE `teams` (`id` text PRIMARY KEY NOT NULL, `org` text REFERENCES `orgs`(`id`), `score` real)',
+    'CREATE TABLE `orgs` (`id` text PRIMARY KEY NOT NULL, `name` text, `logo` blob)',
+    'CREATE TABLE `log` (`message` text)',
+]
+
+
+@pytest.fixture
+def db(tmp_path):
+    path = tmp_path / 'data.db'
+    conn = sqlite3.connect(path)
+    for sql in SCHEMA:
+        conn.execute(sql)
+    conn.executemany('INSERT INTO orgs VALUES (?, ?, ?)',
+                     [('mitre', 'MITRE', b'\x89PNG'), ('cis', 'Café "CIS"\n', None)])
+    conn.executemany('INSERT INTO teams VALUES (?, ?, ?)',
+                     [(f't{i:04d}', 'mitre', i / 2) for i in range(3000, 0, -1)])
+    conn.executemany('INSERT INTO log VALUES (?)', [('b',), ('a',)])
+    conn.commit()
+    conn.close()
+    return path
+
+
+def test_dump_format_and_ordering(db, tmp_path):
+    out = tmp_path / 'diffable'
+    results = {r.table: r.rows for r in dump(db, out, workers=2)}
+    assert results == {'log': 2, 'orgs': 2, 'teams': 3000}
+    assert (out / 'orgs.ndjson').read_text(encoding='utf-8') == \
+        '["cis","Café \\"CIS\\"\\n",null]\n["mitre","MITRE","iVBORw=="]\n'
+    teams = (out / 'teams.ndjson').read_text(encoding='utf-8').splitlines()
+    assert teams[:2] == ['["t0001","mitre",0.5]', '["t0002","mitre",1]']
+    # rowid order for tables without a primary key
+    assert (out / 'log.ndjson').read_text(encoding='utf-8') == '["b"]\n["a"]\n'
+    assert (out / 'orgs.metadata.json').read_text(encoding='utf-8').startswith('{\n    "name": "orgs",\n')
+
+
+def test_parallel_and_serial_dumps_are_identical(db, tmp_path):
+    dump(db, tmp_path / 'a', workers=1)
+    dump(db, tmp_path / 'b', workers=3)
+    for path in (tmp_path / 'a').iterdir():
+        assert path.read_bytes() == (tmp_path / 'b' / path.name).read_bytes()
+
+
+def test_incremental_dump_rewrites_only_changed_tables(db, tmp_path):
+    out = tmp_path / 'diffable'
+    assert all(r.changed for r in dump(db, out, workers=1))
+    meta = json.loads(metadata_path(out, 'teams').read_text(encoding='utf-8'))
+    assert meta['checksum'] == file_checksum(out / 'teams.ndjson')
+
+    before = {p.name: p.stat().st_mtime_ns for p in out.iterdir()}
+    assert not any(r.changed for r in dump(db, out, workers=2))
+    assert {p.name: p.stat().st_mtime_ns for p in out.iterdir()} == before
+
+    conn = sqlite3.connect(db)
+    conn.execute("UPDATE orgs SET name = 'MITRE Corp' WHERE id = 'mitre'")
+    conn.commit()
+    conn.close()
+    assert [r.table for r in dump(db, out, workers=1, dry_run=True) if r.changed] == ['orgs']
+    assert {p.name: p.stat().st_mtime_ns for p in out.iterdir()} == before
+
+    assert [r.table for r in dump(db, out, workers=1) if r.changed] == ['orgs']
+    assert '"MITRE Corp"' in (out / 'orgs.ndjson').read_text(encoding='utf-8')
+    after = {p.name: p.stat().st_mtime_ns for p in out.iterdir()}
+    assert [name for name in sorted(after) if after[name] != before[name]] == \
+        ['orgs.metadata.json', 'orgs.ndjson']
+
+
+def test_unchanged_tables_are_compared_by_recorded_checksum(db, tmp_path):
+    out = tmp_path / 'diffable'
+    dump(db, out, workers=1)
+    # Only the sidecar checksum is consulted, so a no-op dump never reads
+    # (or rewrites) the NDJSON file; --full restores it
+    (out / 'teams.ndjson').write_text('edited by hand\n', encoding='utf-8')
+    assert not any(r.changed for r in dump(db, out, workers=1))
+    assert (out / 'teams.ndjson').read_text(encoding='utf-8') == 'edited by hand\n'
+    assert not list(out.glob('.*.tmp'))
+
+    assert all(r.changed for r in dump(db, out, workers=1, full=True))
+    assert json.loads(metadata_path(out, 'teams').read_text(encoding='utf-8'))['checksum'] == \
+        file_checksum(out / 'teams.ndjson')
+
+
+def test_both_passes_read_the_same_snapshot(db, tmp_path, monkeypatch):
+    conn = sqlite3.connect(db)
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.close()
+    passes = []
+    real_select = dump_module.select_rows
+
+    def select_with_concurrent_write(read_conn, meta):
+        passes.append(meta.name)
+        if passes.count(meta.name) == 2:
+            writer = sqlite3.connect(db)
+            writer.execute("UPDATE orgs SET name = 'Written between passes'")
+            writer.commit()
+            writer.close()
+        return real_select(read_conn, meta)
+
+    monkeypatch.setattr(dump_module, 'select_rows', select_with_concurrent_write)
+    out = tmp_path / 'diffable'
+    dump(db, out, tables=['orgs'], workers=1)
+    assert passes == ['orgs', 'orgs']
+    assert 'Written between passes' not in (out / 'orgs.ndjson').read_text(encoding='utf-8')
+    assert json.loads(metadata_path(out, 'orgs').read_text(encoding='utf-8'))['checksum'] == \
+        file_checksum(out / 'orgs.ndjson')
+
+
+def test_load_round_trip_in_fk_order(db, tmp_path):
+    out = tmp_path / 'diffable'
+    dump(db, out)
+    assert fk_order(read_all_metadata(out)) == ['log', 'orgs', 'teams']
+
+    restored = tmp_path / 'restored.db'
+    assert [r.table for r in load(restored, out, workers=2)] == ['log', 'orgs', 'teams']
+    dump(restored, tmp_path / 'again')
+    for path in out.iterdir():
+        assert path.read_bytes() == (tmp_path / 'again' / path.name).read_bytes()
+
+
+def test_failed_load_leaves_no_database(db, tmp_path):
+    out = tmp_path / 'diffable'
+    dump(db, out)
+    with open(out / 'teams.ndjson', 'a', encoding='utf-8') as f:
+        f.write('["t0001","dup",1]\n')
+    target = tmp_path / 'restored.db'
+    with pytest.raises(sqlite3.IntegrityError):
+        load(target, out)
+    assert not target.exists()
+
+
+def test_freshness_reloads_only_changed_tables(db, tmp_path):
+    out = tmp_path / 'diffable'
+    dump(db, out)
+    restored = tmp_path / 'restored.db'
+    staleness, results = refresh(restored, out, workers=1)
+    assert staleness.full and [r.table for r in results] == ['log', 'orgs', 'teams']
+    assert not check(restored, out).stale
+
+    # Same content with a new mtime (as after a checkout) is not a change
+    ndjson_path(out, 'teams').write_bytes(ndjson_path(out, 'teams').read_bytes())
+    assert refresh(restored, out)[1] == []
+
+    with open(ndjson_path(out, 'orgs'), 'a', encoding='utf-8') as f:
+        f.write('["disa","DISA",null]\n')
+    ndjson_path(out, 'log').unlink()
+    metadata_path(out, 'log').unlink()
+    staleness, results = refresh(restored, out, workers=1)
+    assert (staleness.changed, staleness.removed) == (['orgs'], ['log'])
+    assert [r.table for r in results] == ['orgs']
+
+    conn = sqlite3.connect(restored)
+    assert conn.execute('SELECT count(*) FROM orgs').fetchone() == (3,)
+    assert conn.execute('SELECT count(*) FROM teams').fetchone() == (3000,)
+    assert conn.execute("SELECT name FROM sqlite_master WHERE name = 'log'").fetchone() is None
+    conn.close()
+    assert not check(restored, out).stale
+
+    # The checksum table is never dumped
+    dump(restored, tmp_path / 'again')
+    assert not (tmp_path / 'again' / f'{META_TABLE}.ndjson').exists()
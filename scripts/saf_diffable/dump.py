@@ -0,0 +1,196 @@
+"""
+Streaming, parallel dump of a SQLite database to the diffable format.
+
+Each table is read with an ordered SELECT and its rows are written to
+<table>.ndjson through a large write buffer as they arrive, so memory use
+does not grow with the table. Rows are ordered by primary key (rowid for
+tables without one), which makes dumps deterministic. Tables are
+independent, so they are dumped by a pool of worker processes, each with
+its own read-only connection. Files are written to a temporary name and
+renamed into place.
+
+Exports are incremental: each <table>.metadata.json records the checksum of
+its NDJSON file (sha256 of the rows as written, in primary key order). A
+table is first streamed into the hash alone; if that matches the recorded
+checksum its NDJSON file is not opened at all (and is kept byte for byte,
+so git only sees the tables that really changed); otherwise the table is
+selected again and written. Use --full to rewrite files that were edited by hand.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from .format import (CHECKSUM_PREFIX, DEFAULT_DB, DEFAULT_DIR, SKIP_TABLES, TableMetadata, metadata_path,
+                     metadata_text, ndjson_path, quote_name, row_line)
+
+WRITE_BUFFER = 1 << 20   # bytes
+FETCH_SIZE = 5000        # rows per cursor fetch
+
+
+class TableDump(NamedTuple):
+    table: str
+    rows: int
+    changed: bool = True
+
+
+def connect_readonly(db_path: Path) -> sqlite3.Connection:
+    return sqlite3.connect(f'file:{Path(db_path).resolve()}?mode=ro', uri=True)
+
+
+def list_tables(conn: sqlite3.Connection) -> List[TableMetadata]:
+    """Dumpable tables, Pocketbase system tables (_name) first, then by name."""
+    rows = conn.execute("""
+        SELECT name, sql FROM sqlite_master
+        WHERE type = 'table' AND sql IS NOT NULL
+        ORDER BY CASE WHEN name LIKE '\\_%' ESCAPE '\\' THEN 0 ELSE 1 END, name
+    """).fetchall()
+    tables = []
+    for name, sql in rows:
+        if name in SKIP_TABLES:
+            continue
+        columns = [c[1] for c in conn.execute(f'PRAGMA table_info({quote_name(name)})')]
+        tables.append(TableMetadata(name, columns, sql))
+    return tables
+
+
+def order_by(conn: sqlite3.Connection, table: str) -> str:
+    """ORDER BY clause: the primary key columns, or rowid."""
+    info = conn.execute(f'PRAGMA table_info({quote_name(table)})').fetchall()
+    pk = [c[1] for c in sorted(info, key=lambda c: c[5]) if c[5]]
+    if pk:
+        return ', '.join(quote_name(c) for c in pk)
+    without_rowid = conn.execute("SELECT sql LIKE '%WITHOUT ROWID%' FROM sqlite_master WHERE name = ?",
+                                 (table,)).fetchone()[0]
+    return ', '.join(quote_name(c[1]) for c in info) if without_rowid else 'rowid'
+
+
+def write_atomic(path: Path, text: str):
+    tmp = path.with_name(f'.{path.name}.tmp')
+    tmp.write_text(text, encoding='utf-8')
+    os.replace(tmp, path)
+
+
+def recorded_checksum(out_dir: Path, table: str) -> Optional[str]:
+    """The NDJSON checksum in the table's metadata sidecar (None if missing)."""
+    try:
+        with open(metadata_path(out_dir, table), 'r', encoding='utf-8') as f:
+            return json.load(f).get('checksum')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def select_rows(conn: sqlite3.Connection, meta: TableMetadata) -> Iterator[Tuple[int, bytes]]:
+    """(rows, NDJSON bytes) chunks of the table in primary key order."""
+    columns = ', '.join(quote_name(c) for c in meta.columns)
+    cursor = conn.execute(f'SELECT {columns} FROM {quote_name(meta.name)} '
+                          f'ORDER BY {order_by(conn, meta.name)}')
+    while True:
+        rows = cursor.fetchmany(FETCH_SIZE)
+        if not rows:
+            break
+        yield len(rows), ''.join(row_line(row) for row in rows).encode('utf-8')
+
+
+def dump_table(db_path: Path, out_dir: Path, meta: TableMetadata, full: bool = False,
+               dry_run: bool = False) -> TableDump:
+    """Stream one table to <out_dir>/<table>.ndjson and write its metadata.
+
+    The rows are hashed first (sha256 of the NDJSON bytes, in order) and
+    compared with the checksum recorded in the metadata file; only when
+    they differ is the table selected again (in the same read transaction)
+    and written. With dry_run nothing is written.
+    """
+    out_dir = Path(out_dir)
+    target = ndjson_path(out_dir, meta.name)
+    digest = hashlib.sha256()
+    count = 0
+
+    conn = connect_readonly(db_path)
+    try:
+        # One read transaction, so both passes see the same snapshot even if
+        # Pocketbase writes in between
+        conn.execute('BEGIN')
+        for rows, chunk in select_rows(conn, meta):
+            digest.update(chunk)
+            count += rows
+        checksum = CHECKSUM_PREFIX + digest.hexdigest()
+        rows_changed = full or checksum != recorded_checksum(out_dir, meta.name) or not target.exists()
+        if rows_changed and not dry_run:
+            tmp = target.with_name(f'.{target.name}.tmp')
+            try:
+                with open(tmp, 'wb', buffering=WRITE_BUFFER) as f:
+                    for _, chunk in select_rows(conn, meta):
+                        f.write(chunk)
+                os.replace(tmp, target)
+            except BaseException:
+                if tmp.exists():
+                    tmp.unlink()
+                raise
+        conn.execute('COMMIT')
+    finally:
+        conn.close()
+
+    text = metadata_text(meta, checksum=checksum)
+    path = metadata_path(out_dir, meta.name)
+    meta_changed = full or not path.exists() or path.read_text(encoding='utf-8') != text
+    if meta_changed and not dry_run:
+        write_atomic(path, text)
+    return TableDump(meta.name, count, rows_changed or meta_changed)
+
+
+def dump(db_path: Path = DEFAULT_DB, out_dir: Path = DEFAULT_DIR,
+         tables: Optional[Sequence[str]] = None, exclude: Sequence[str] = (),
+         workers: Optional[int] = None, full: bool = False, dry_run: bool = False) -> List[TableDump]:
+    """Dump the selected tables in worker processes.
+
+    Only tables whose checksum changed are rewritten unless full=True.
+    """
+    if not Path(db_path).exists():
+        raise FileNotFoundError(f'Database not found: {db_path}')
+    conn = connect_readonly(db_path)
+    try:
+        selected = [t for t in list_tables(conn)
+                    if t.name not in exclude and (not tables or t.name in tables)]
+    finally:
+        conn.close()
+    if not dry_run:
+        Path(out_dir).mkdir(parents=True, exist_ok=True)
+
+    n = len(selected)
+    if workers == 1 or n <= 1:
+        return [dump_table(db_path, out_dir, meta, full, dry_run) for meta in selected]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(dump_table, [db_path] * n, [out_dir] * n, selected, [full] * n, [dry_run] * n))
+
+
+def main(argv: Optional[Sequence[str]] = None, prog: Optional[str] = None):
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(prog=prog, description='Dump a SQLite database to diffable NDJSON files')
+    parser.add_argument('db', nargs='?', default=str(DEFAULT_DB), help=f'Database (default: {DEFAULT_DB})')
+    parser.add_argument('out_dir', nargs='?', default=str(DEFAULT_DIR), help=f'Output directory (default: {DEFAULT_DIR})')
+    parser.add_argument('--tables', nargs='+', metavar='TABLE', help='Only dump these tables')
+    parser.add_argument('--exclude', nargs='+', default=[], metavar='TABLE', help='Skip these tables')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count)')
+    parser.add_argument('--full', action='store_true', help='Rewrite every table, even if its checksum is unchanged')
+    parser.add_argument('--dry-run', action='store_true', help='Report which tables changed; write nothing')
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    try:
+        results = dump(args.db, args.out_dir, args.tables, args.exclude, args.workers, args.full, args.dry_run)
+    except (OSError, sqlite3.Error) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    changed = [r for r in results if r.changed]
+    for result in changed:
+        print(f"  {result.table}: {result.rows} rows")
+    verb = 'would change' if args.dry_run else 'exported'
+    print(f"\n✅ {len(changed)} of {len(results)} tables {verb} ({args.out_dir}) in {time.perf_counter() - start:.2f}s")
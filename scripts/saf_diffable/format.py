@@ -0,0 +1,148 @@
+"""
+The diffable file format, byte-compatible with scripts/db-diffable.ts.
+
+Each table is two files in the diffable directory:
+
+    <table>.metadata.json   {"name", "columns", "schema"} as JSON, indent 4,
+                            plus "checksum" when written by saf_diffable.dump
+    <table>.ndjson          one compact JSON array per row, values in column order
+
+Values are written as JSON.stringify writes them: non-ASCII text as is,
+integral floats without a fraction, BLOBs as base64 strings.
+"""
+
+import base64
+import hashlib
+import json
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, NamedTuple, Optional, Sequence
+
+# Not saf_content.corpus.REPO_ROOT: `pnpm dev` runs db-freshness, which must
+# not need PyYAML or anything else outside the standard library
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+DEFAULT_DB = REPO_ROOT / '.pocketbase' / 'pb_data' / 'data.db'
+DEFAULT_DIR = REPO_ROOT / '.pocketbase' / 'pb_data' / 'diffable'
+
+# Metadata "checksum": sha256 of the table's NDJSON file contents
+CHECKSUM_PREFIX = 'sha256:'
+
+# Table in data.db recording the checksums of the diffable files it was
+# loaded from (see saf_diffable.freshness); never dumped
+META_TABLE = '_saf_diffable'
+
+# SQLite internal tables that cannot be restored, and META_TABLE (same as db-diffable.ts)
+SKIP_TABLES = {'sqlite_stat1', 'sqlite_stat4', 'sqlite_sequence', META_TABLE}
+
+_REFERENCES = re.compile(r'REFERENCES\s+[`"\[]?(\w+)', re.IGNORECASE)
+
+
+class TableMetadata(NamedTuple):
+    name: str
+    columns: List[str]
+    schema: str
+
+    def references(self) -> List[str]:
+        """Tables this table's schema has foreign keys to."""
+        return sorted(set(_REFERENCES.findall(self.schema)) - {self.name})
+
+
+def metadata_path(directory: Path, table: str) -> Path:
+    return Path(directory) / f'{table}.metadata.json'
+
+
+def ndjson_path(directory: Path, table: str) -> Path:
+    return Path(directory) / f'{table}.ndjson'
+
+
+def quote_name(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def read_metadata(path: Path) -> TableMetadata:
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return TableMetadata(data['name'], data['columns'], data['schema'])
+
+
+def read_all_metadata(directory: Path) -> Dict[str, TableMetadata]:
+    tables = {}
+    for path in sorted(Path(directory).glob('*.metadata.json')):
+        meta = read_metadata(path)
+        if meta.name not in SKIP_TABLES:
+            tables[meta.name] = meta
+    return tables
+
+
+def file_checksum(path: Path) -> Optional[str]:
+    """Checksum of an NDJSON file in the metadata format (None if missing)."""
+    digest = hashlib.sha256()
+    try:
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+    except OSError:
+        return None
+    return CHECKSUM_PREFIX + digest.hexdigest()
+
+
+def table_checksum(directory: Path, table: str) -> str:
+    """Checksum of a table's metadata and NDJSON files together.
+
+    Covers the schema as well as the rows, so a schema-only change still
+    counts as a change when deciding what to reload.
+    """
+    digest = hashlib.sha256()
+    for path in (metadata_path(directory, table), ndjson_path(directory, table)):
+        try:
+            digest.update(Path(path).read_bytes())
+        except FileNotFoundError:
+            pass
+        digest.update(b'\0')
+    return CHECKSUM_PREFIX + digest.hexdigest()
+
+
+def metadata_text(meta: TableMetadata, **extra: Any) -> str:
+    return json.dumps({**meta._asdict(), **extra}, indent=4, ensure_ascii=False) + '\n'
+
+
+def _json_value(value):
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, bytes):
+        return base64.b64encode(value).decode('ascii')
+    return value
+
+
+def row_line(row: Sequence) -> str:
+    """One NDJSON line (with trailing newline) for a row."""
+    return json.dumps([_json_value(v) for v in row], ensure_ascii=False, separators=(',', ':')) + '\n'
+
+
+def fk_order(tables: Dict[str, TableMetadata],
+             extra: Optional[Mapping[str, Iterable[str]]] = None) -> List[str]:
+    """Table names with referenced tables before the tables that reference them.
+
+    `extra` adds references the schemas do not declare (table -> referenced
+    tables). Ties (and cycles, which cannot be ordered) fall back to name order.
+    """
+    extra = extra or {}
+    remaining = {name: (set(meta.references()) | set(extra.get(name, ()))) & set(tables) - {name}
+                 for name, meta in tables.items()}
+    order: List[str] = []
+    while remaining:
+        ready = sorted(name for name, deps in remaining.items() if not deps - set(order))
+        if not ready:  # cycle: take the alphabetically first table
+            ready = [min(remaining)]
+        for name in ready:
+            order.append(name)
+            del remaining[name]
+    return order
+
+
+def read_rows(path: Path) -> Iterable[list]:
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
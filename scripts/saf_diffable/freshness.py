@@ -0,0 +1,143 @@
+"""
+Content-hash freshness check of data.db against the diffable directory.
+
+Every load records the checksum of each table's diffable files (metadata
+plus NDJSON, see format.table_checksum) in META_TABLE inside data.db. The
+check hashes the diffable files again and compares: tables whose checksum
+differs (or that are new) are reloaded into the existing database, tables
+that disappeared from diffable/ are dropped, and everything else is left
+alone. A database without recorded checksums (missing, or loaded by
+db-diffable.ts) is rebuilt from scratch.
+
+Unlike comparing mtimes, this does not reload after a `git checkout` or a
+fresh clone that leaves the content identical.
+"""
+
+import hashlib
+import sqlite3
+import sys
+from pathlib import Path
+from typing import Dict, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+from .format import DEFAULT_DB, DEFAULT_DIR, quote_name, read_all_metadata, table_checksum
+from .load import TableLoad, load, read_checksums, require_valid, write_checksums
+
+
+class Staleness(NamedTuple):
+    checksum: str         # combined checksum of the diffable directory
+    changed: List[str]    # tables new or different in diffable/
+    removed: List[str]    # tables loaded before but gone from diffable/
+    full: bool            # no recorded checksums: the database must be rebuilt
+
+    @property
+    def stale(self) -> bool:
+        return self.full or bool(self.changed or self.removed)
+
+
+def diffable_checksums(src_dir: Path = DEFAULT_DIR) -> Dict[str, str]:
+    return {table: table_checksum(src_dir, table) for table in read_all_metadata(src_dir)}
+
+
+def combined_checksum(checksums: Mapping[str, str]) -> str:
+    digest = hashlib.sha256()
+    for table in sorted(checksums):
+        digest.update(f'{table}\0{checksums[table]}\n'.encode('utf-8'))
+    return digest.hexdigest()
+
+
+def recorded_checksums(db_path: Path = DEFAULT_DB) -> Optional[Dict[str, str]]:
+    """Checksums recorded in the database (None if it has none or does not exist)."""
+    if not Path(db_path).exists():
+        return None
+    conn = sqlite3.connect(f'file:{Path(db_path).resolve()}?mode=ro', uri=True)
+    try:
+        return read_checksums(conn)
+    finally:
+        conn.close()
+
+
+def check(db_path: Path = DEFAULT_DB, src_dir: Path = DEFAULT_DIR) -> Staleness:
+    if not Path(src_dir).is_dir():
+        raise FileNotFoundError(f'Source directory not found: {src_dir}')
+    current = diffable_checksums(src_dir)
+    recorded = recorded_checksums(db_path)
+    checksum = combined_checksum(current)
+    if recorded is None:
+        return Staleness(checksum, sorted(current), [], True)
+    if combined_checksum(recorded) == checksum:
+        return Staleness(checksum, [], [], False)
+    changed = sorted(t for t, c in current.items() if recorded.get(t) != c)
+    removed = sorted(set(recorded) - set(current))
+    return Staleness(checksum, changed, removed, False)
+
+
+def refresh(db_path: Path = DEFAULT_DB, src_dir: Path = DEFAULT_DIR, workers: Optional[int] = None,
+            full: bool = False) -> Tuple[Staleness, List[TableLoad]]:
+    """Bring db_path up to date with src_dir, reloading only what changed."""
+    staleness = check(db_path, src_dir)
+    if full or staleness.full:
+        return staleness, load(db_path, src_dir, workers=workers)
+    if not staleness.stale:
+        return staleness, []
+
+    if staleness.removed:
+        conn = sqlite3.connect(db_path, isolation_level=None)
+        try:
+            conn.execute('BEGIN')
+            for table in staleness.removed:
+                conn.execute(f'DROP TABLE IF EXISTS {quote_name(table)}')
+            write_checksums(conn, {table: None for table in staleness.removed})
+            conn.execute('COMMIT')
+        finally:
+            if conn.in_transaction:
+                conn.execute('ROLLBACK')
+            conn.close()
+    results = load(db_path, src_dir, staleness.changed, workers, replace=False) if staleness.changed else []
+    return staleness, results
+
+
+def main(argv: Optional[Sequence[str]] = None, prog: Optional[str] = None):
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(prog=prog, description='Reload the tables of a database whose diffable files changed')
+    parser.add_argument('db', nargs='?', default=str(DEFAULT_DB), help=f'Database (default: {DEFAULT_DB})')
+    parser.add_argument('src_dir', nargs='?', default=str(DEFAULT_DIR), help=f'Source directory (default: {DEFAULT_DIR})')
+    parser.add_argument('--check', action='store_true', help='Exit 1 if the database is stale; write nothing')
+    parser.add_argument('--full', action='store_true', help='Rebuild the whole database')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count)')
+    parser.add_argument('--validate', action='store_true', help='Validate the NDJSON files before reloading anything')
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    try:
+        staleness = check(args.db, args.src_dir)
+        if not args.check and (staleness.stale or args.full):
+            if args.validate:
+                require_valid(args.src_dir)
+            staleness, results = refresh(args.db, args.src_dir, args.workers, args.full)
+    except (OSError, ValueError, sqlite3.Error) as e:
+        print(f"❌ Freshness check failed: {e}")
+        sys.exit(1)
+
+    if not staleness.stale and not args.full:
+        print(f"✓ data.db is up to date with diffable/ ({staleness.checksum[:12]})")
+        return
+    if staleness.full:
+        reason = 'no recorded checksums'
+    elif staleness.stale:
+        parts = []
+        if staleness.changed:
+            parts.append(f"changed: {', '.join(staleness.changed)}")
+        if staleness.removed:
+            parts.append(f"removed: {', '.join(staleness.removed)}")
+        reason = '; '.join(parts)
+    else:
+        reason = '--full'
+    if args.check:
+        print(f"❌ data.db is stale ({reason})")
+        sys.exit(1)
+    print(f"→ Reloading data.db from diffable/ ({reason})")
+    dropped = f", dropped {len(staleness.removed)}" if staleness.removed else ''
+    print(f"✓ Reloaded {len(results)} tables{dropped} in {time.perf_counter() - start:.2f}s "
+          f"({staleness.checksum[:12]})")
@@ -0,0 +1,171 @@
+"""
+Parallel bulk load of diffable NDJSON files into a new SQLite database.
+
+NDJSON files are decoded by a pool of worker processes while the main
+process inserts: tables are created and filled in FK order (referenced
+tables first) with batched executemany calls, all inside one transaction,
+with synchronous writes and the rollback journal disabled for the
+duration of the load. A failed load leaves no partial database behind.
+
+The checksum of every loaded table's files is recorded in META_TABLE in the
+same transaction, so saf_diffable.freshness can tell later which tables
+the diffable directory has changed since.
+"""
+
+import os
+import sqlite3
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Iterator, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+from .format import (DEFAULT_DB, DEFAULT_DIR, META_TABLE, fk_order, ndjson_path, quote_name, read_all_metadata,
+                     read_rows, table_checksum)
+
+BATCH_SIZE = 10_000   # rows per executemany
+
+
+class TableLoad(NamedTuple):
+    table: str
+    rows: int
+
+
+def parse_table(directory: Path, table: str) -> Tuple[str, List[list], str]:
+    """(table, rows, checksum of the table's files)"""
+    path = ndjson_path(directory, table)
+    rows = list(read_rows(path)) if path.exists() else []
+    return table, rows, table_checksum(directory, table)
+
+
+def _parsed(directory: Path, order: List[str],
+            workers: Optional[int]) -> Iterator[Tuple[str, List[list], str]]:
+    if workers == 1 or len(order) <= 1:
+        for table in order:
+            yield parse_table(directory, table)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # map() keeps FK order while later tables are decoded in the background
+        yield from pool.map(parse_table, [directory] * len(order), order)
+
+
+def read_checksums(conn: sqlite3.Connection) -> Optional[Dict[str, str]]:
+    """table -> checksum recorded by the last load (None if never recorded)."""
+    try:
+        return dict(conn.execute(f'SELECT name, checksum FROM {quote_name(META_TABLE)}'))
+    except sqlite3.OperationalError:
+        return None
+
+
+def write_checksums(conn: sqlite3.Connection, checksums: Mapping[str, Optional[str]]):
+    """Record (or, for None, forget) table checksums in META_TABLE."""
+    conn.execute(f'CREATE TABLE IF NOT EXISTS {quote_name(META_TABLE)} '
+                 '(name TEXT PRIMARY KEY NOT NULL, checksum TEXT NOT NULL)')
+    conn.executemany(f'DELETE FROM {quote_name(META_TABLE)} WHERE name = ?',
+                     [(t,) for t, c in checksums.items() if c is None])
+    conn.executemany(f'INSERT OR REPLACE INTO {quote_name(META_TABLE)} (name, checksum) VALUES (?, ?)',
+                     [(t, c) for t, c in checksums.items() if c is not None])
+
+
+def remove_database(db_path: Path):
+    for suffix in ('', '-shm', '-wal', '-journal'):
+        path = Path(f'{db_path}{suffix}')
+        if path.exists():
+            path.unlink()
+
+
+def load(db_path: Path = DEFAULT_DB, src_dir: Path = DEFAULT_DIR,
+         tables: Optional[Sequence[str]] = None, workers: Optional[int] = None,
+         replace: bool = True) -> List[TableLoad]:
+    """Create db_path from the diffable files.
+
+    With replace=True (the default, as in db-diffable.ts) an existing
+    database is deleted first; otherwise the tables are added to it and
+    replace existing tables of the same name.
+    """
+    if not Path(src_dir).is_dir():
+        raise FileNotFoundError(f'Source directory not found: {src_dir}')
+    metadata = read_all_metadata(src_dir)
+    if tables:
+        metadata = {name: meta for name, meta in metadata.items() if name in tables}
+    order = fk_order(metadata)
+
+    if replace:
+        remove_database(db_path)
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    results = []
+    checksums: Dict[str, str] = {}
+    try:
+        conn.execute('PRAGMA synchronous = OFF')
+        if replace:
+            # Journal mode persists in the file; keep an existing database's (WAL)
+            conn.execute('PRAGMA journal_mode = MEMORY')
+        conn.execute('BEGIN')
+        for table in order:
+            conn.execute(f'DROP TABLE IF EXISTS {quote_name(table)}')
+            conn.execute(metadata[table].schema)
+        for table, rows, checksum in _parsed(Path(src_dir), order, workers):
+            meta = metadata[table]
+            insert = (f'INSERT INTO {quote_name(table)} ({", ".join(quote_name(c) for c in meta.columns)}) '
+                      f'VALUES ({", ".join("?" * len(meta.columns))})')
+            it = iter(rows)
+            while True:
+                batch = list(islice(it, BATCH_SIZE))
+                if not batch:
+                    break
+                conn.executemany(insert, batch)
+            results.append(TableLoad(table, len(rows)))
+            checksums[table] = checksum
+        write_checksums(conn, checksums)
+        conn.execute('COMMIT')
+    except BaseException:
+        if conn.in_transaction:
+            conn.execute('ROLLBACK')
+        conn.close()
+        if replace:
+            remove_database(db_path)
+        raise
+    conn.close()
+    return results
+
+
+def require_valid(src_dir: Path):
+    """Exit 1, printing the problems, unless the diffable files validate."""
+    from .validate import validate
+
+    try:
+        report = validate(src_dir)
+    except (OSError, ValueError) as e:
+        print(f"❌ Validation failed: {e}")
+        sys.exit(1)
+    if not report.ok:
+        for issue in report.issues:
+            print(f"  ❌ {issue}")
+        print(f"\n❌ {sum(report.counts.values())} problems in {src_dir}; not loading (see saf-py db-validate)")
+        sys.exit(1)
+
+
+def main(argv: Optional[Sequence[str]] = None, prog: Optional[str] = None):
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(prog=prog, description='Load diffable NDJSON files into a SQLite database')
+    parser.add_argument('db', nargs='?', default=str(DEFAULT_DB), help=f'Database (default: {DEFAULT_DB})')
+    parser.add_argument('src_dir', nargs='?', default=str(DEFAULT_DIR), help=f'Source directory (default: {DEFAULT_DIR})')
+    parser.add_argument('--tables', nargs='+', metavar='TABLE', help='Only load these tables (into the existing database)')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count)')
+    parser.add_argument('--validate', action='store_true', help='Validate the NDJSON files first; load nothing if invalid')
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    if args.validate:
+        require_valid(args.src_dir)
+    try:
+        results = load(args.db, args.src_dir, args.tables, args.workers, replace=not args.tables)
+    except (OSError, ValueError, sqlite3.Error) as e:
+        print(f"❌ Load failed: {e}")
+        sys.exit(1)
+    for result in results:
+        print(f"  {result.table}: {result.rows} rows")
+    size = os.path.getsize(args.db)
+    print(f"\n✅ Loaded {len(results)} tables into {args.db} ({size:,} bytes) in {time.perf_counter() - start:.2f}s")
@@ -0,0 +1,459 @@
+"""
+Streaming validation of diffable NDJSON files against their metadata.
+
+Each <table>.metadata.json is compiled once into a row checker: the
+`schema` SQL is parsed for column types, NOT NULL, defaults, primary key,
+UNIQUE and REFERENCES constraints, and every column gets a small check
+function for its declared type (INTEGER columns such as `applied` must
+hold integers, BOOLEAN columns 0/1, JSON columns valid JSON text, ...).
+Rows are then streamed line by line, so memory use does not grow with the
+file, apart from one set of key hashes per primary key, UNIQUE column and
+FK target.
+
+Foreign keys come from the SQL (REFERENCES) and, for Pocketbase tables,
+from the relation fields in _collections.ndjson, whose values hold record
+IDs of another collection (a JSON array of IDs when maxSelect > 1). Tables
+are checked in FK order, so a reference is looked up in the target's key
+set as soon as it is read; references that cannot be ordered (cycles) are
+checked at the end.
+
+Checks report what would make db-load fail (wrong column count, NULL in a
+NOT NULL column, duplicate keys) as well as data SQLite would accept but
+Pocketbase would not (type mismatches, dangling relations).
+"""
+
+import json
+import re
+import sys
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+from .format import DEFAULT_DIR, TableMetadata, fk_order, ndjson_path, read_all_metadata
+
+DEFAULT_MAX_ISSUES = 20   # reported per table; the rest are only counted
+
+_TOKEN = re.compile(r"""'(?:[^']|'')*'|"(?:[^"]|"")*"|`[^`]*`|\[[^\]]*\]|\(|\)|,|[^\s(),]+""")
+_CONSTRAINT_WORDS = {'CONSTRAINT', 'PRIMARY', 'NOT', 'NULL', 'UNIQUE', 'CHECK', 'DEFAULT', 'COLLATE',
+                     'REFERENCES', 'GENERATED', 'AS'}
+_TABLE_CONSTRAINTS = {'CONSTRAINT', 'PRIMARY', 'UNIQUE', 'CHECK', 'FOREIGN'}
+
+
+class ForeignKey(NamedTuple):
+    column: str
+    table: str
+    target: Optional[str] = None   # referenced column (None: the target's primary key)
+    many: bool = False             # value is a JSON array of keys (Pocketbase multi-relation)
+
+
+class Column(NamedTuple):
+    name: str
+    type: str
+    not_null: bool = False
+    default: Optional[str] = None
+    primary_key: bool = False
+    unique: bool = False
+
+
+class TableSchema(NamedTuple):
+    name: str
+    columns: List[Column]
+    primary_key: List[str]
+    unique: List[str]
+    foreign_keys: List[ForeignKey]
+
+
+class Issue(NamedTuple):
+    table: str
+    line: int        # 1-based line in <table>.ndjson (0: the table as a whole)
+    column: str
+    message: str
+
+    def __str__(self) -> str:
+        where = f'{self.table}.ndjson:{self.line}' if self.line else f'{self.table}.ndjson'
+        return f'{where} {self.column}: {self.message}' if self.column else f'{where}: {self.message}'
+
+
+class Report(NamedTuple):
+    rows: Dict[str, int]      # table -> rows checked
+    issues: List[Issue]       # reported issues (at most max_issues per table)
+    counts: Dict[str, int]    # table -> total number of issues
+
+    @property
+    def ok(self) -> bool:
+        return not any(self.counts.values())
+
+
+# -- schema parsing ----------------------------------------------------------
+
+def _unquote(token: str) -> str:
+    if token[:1] == '[':
+        return token[1:-1]
+    if token[:1] in ('"', '`', "'"):
+        return token[1:-1].replace(token[0] * 2, token[0])
+    return token
+
+
+def _groups(sql: str) -> List[List[str]]:
+    """Tokens of each top-level definition inside the outer parentheses.
+
+    A nested parenthesized group is kept as one token with its original
+    text, e.g. "('r'||lower(hex(randomblob(7))))".
+    """
+    groups: List[List[str]] = [[]]
+    depth = 0
+    start = 0
+    for match in _TOKEN.finditer(sql):
+        token = match.group()
+        if token == '(':
+            depth += 1
+            if depth == 2:
+                start = match.start()
+        elif token == ')':
+            depth -= 1
+            if depth == 1:
+                groups[-1].append(sql[start:match.end()])
+        elif depth == 1:
+            if token == ',':
+                groups.append([])
+            else:
+                groups[-1].append(token)
+    return [g for g in groups if g]
+
+
+def _names(group: str) -> List[str]:
+    """Column names listed in a "( a , b )" token."""
+    return [_unquote(t) for t in _TOKEN.findall(group) if t not in ('(', ')', ',')]
+
+
+def parse_schema(name: str, sql: str) -> TableSchema:
+    """Columns and constraints of a CREATE TABLE statement."""
+    columns: List[Column] = []
+    primary_key: List[str] = []
+    unique: List[str] = []
+    foreign_keys: List[ForeignKey] = []
+
+    for group in _groups(sql):
+        head = group[0].upper()
+        if head in _TABLE_CONSTRAINTS:
+            words = [t.upper() for t in group]
+            if 'CONSTRAINT' == head:
+                group, words = group[2:], words[2:]
+            if words[:2] == ['PRIMARY', 'KEY']:
+                primary_key = _names(group[2])
+            elif words[0] == 'UNIQUE' and len(group) > 1:
+                cols = _names(group[1])
+                if len(cols) == 1:
+                    unique.append(cols[0])
+            elif words[:2] == ['FOREIGN', 'KEY'] and 'REFERENCES' in words:
+                i = words.index('REFERENCES')
+                targets = _names(group[i + 2]) if len(group) > i + 2 and group[i + 2].startswith('(') else []
+                for j, col in enumerate(_names(group[2])):
+                    foreign_keys.append(ForeignKey(col, _unquote(group[i + 1]), targets[j] if j < len(targets) else None))
+            continue
+
+        col_name = _unquote(group[0])
+        type_tokens: List[str] = []
+        i = 1
+        while i < len(group) and group[i].upper() not in _CONSTRAINT_WORDS:
+            type_tokens.append(group[i])
+            i += 1
+        not_null = is_pk = is_unique = False
+        default = None
+        while i < len(group):
+            word = group[i].upper()
+            if word == 'NOT' and i + 1 < len(group) and group[i + 1].upper() == 'NULL':
+                not_null = True
+                i += 1
+            elif word == 'PRIMARY':
+                is_pk = True
+            elif word == 'UNIQUE':
+                is_unique = True
+            elif word == 'DEFAULT' and i + 1 < len(group):
+                default = group[i + 1]
+                i += 1
+            elif word == 'REFERENCES' and i + 1 < len(group):
+                target = None
+                if i + 2 < len(group) and group[i + 2].startswith('('):
+                    target = _names(group[i + 2])[0]
+                foreign_keys.append(ForeignKey(col_name, _unquote(group[i + 1]), target))
+                i += 1
+            i += 1
+        columns.append(Column(col_name, ' '.join(type_tokens), not_null, default, is_pk, is_unique))
+        if is_pk:
+            primary_key = [col_name]
+        if is_unique:
+            unique.append(col_name)
+
+    return TableSchema(name, columns, primary_key, unique, foreign_keys)
+
+
+def pocketbase_relations(src_dir: Path, metadata: Dict[str, TableMetadata]) -> Dict[str, List[ForeignKey]]:
+    """table -> relation fields declared in _collections.ndjson (empty if absent)."""
+    meta = metadata.get('_collections')
+    path = ndjson_path(src_dir, '_collections')
+    if meta is None or not path.exists() or not {'id', 'name', 'fields'} <= set(meta.columns):
+        return {}
+    id_i, name_i, fields_i = (meta.columns.index(c) for c in ('id', 'name', 'fields'))
+    collections = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                row = json.loads(line)
+                fields = row[fields_i]
+                collections.append((row[id_i], row[name_i], json.loads(fields) if isinstance(fields, str) else fields))
+    names = {cid: name for cid, name, _ in collections}
+    relations: Dict[str, List[ForeignKey]] = {}
+    for _, name, fields in collections:
+        for field in fields or []:
+            if field.get('type') == 'relation' and field.get('collectionId') in names:
+                many = (field.get('maxSelect') or 1) != 1
+                relations.setdefault(name, []).append(
+                    ForeignKey(field['name'], names[field['collectionId']], 'id', many))
+    return relations
+
+
+# -- value checks ------------------------------------------------------------
+
+Check = Callable[[Any], Optional[str]]
+
+
+def _is_int(value) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _check_integer(value) -> Optional[str]:
+    if _is_int(value):
+        return None
+    if isinstance(value, float) and value.is_integer():
+        return None
+    return f'expected an integer, got {value!r}'
+
+
+def _check_boolean(value) -> Optional[str]:
+    return None if value in (0, 1) else f'expected 0 or 1, got {value!r}'
+
+
+def _check_number(value) -> Optional[str]:
+    return None if _is_number(value) else f'expected a number, got {value!r}'
+
+
+def _check_text(value) -> Optional[str]:
+    return None if isinstance(value, str) else f'expected text, got {value!r}'
+
+
+def _check_json(value) -> Optional[str]:
+    if not isinstance(value, str):
+        return f'expected JSON text, got {value!r}'
+    try:
+        json.loads(value)
+    except ValueError as e:
+        return f'invalid JSON text ({e.msg})'
+    return None
+
+
+def type_check(declared: str) -> Optional[Check]:
+    """Check for non-NULL values of a declared column type (None: anything goes).
+
+    Declared names are interpreted like SQLite's affinity rules, with
+    Pocketbase's BOOLEAN and JSON types checked more strictly.
+    """
+    upper = declared.upper()
+    if 'INT' in upper:
+        return _check_integer
+    if 'BOOL' in upper:
+        return _check_boolean
+    if 'JSON' in upper:
+        return _check_json
+    if any(word in upper for word in ('CHAR', 'CLOB', 'TEXT')):
+        return _check_text
+    if not upper or 'BLOB' in upper:
+        return None
+    return _check_number   # REAL, FLOAT, DOUBLE, NUMERIC, DECIMAL, ...
+
+
+def compile_checker(schema: TableSchema) -> Callable[[list], List[Tuple[str, str]]]:
+    """Row -> [(column, message)] for the column count, NULLs and value types."""
+    width = len(schema.columns)
+    checks: List[Tuple[int, str, bool, Optional[Check], Optional[str]]] = [
+        (i, c.name, c.not_null, type_check(c.type), c.default) for i, c in enumerate(schema.columns)
+    ]
+
+    def check_row(row) -> List[Tuple[str, str]]:
+        if not isinstance(row, list):
+            return [('', f'expected a JSON array, got {type(row).__name__}')]
+        if len(row) != width:
+            return [('', f'expected {width} values, got {len(row)}')]
+        problems = []
+        for i, name, not_null, check, default in checks:
+            value = row[i]
+            if value is None:
+                if not_null:
+                    # db-load inserts every column, so the default never applies
+                    note = f' (DEFAULT {default} is not applied on load)' if default is not None else ''
+                    problems.append((name, f'NULL in NOT NULL column{note}'))
+            elif check is not None:
+                message = check(value)
+                if message:
+                    problems.append((name, message))
+        return problems
+
+    return check_row
+
+
+# -- validation --------------------------------------------------------------
+
+def _key_values(value, many: bool) -> Iterable[Any]:
+    if value is None or value == '':
+        return ()
+    if many and isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            return ()   # reported as invalid JSON text
+    return value if isinstance(value, list) else (value,)
+
+
+def _hash(value) -> int:
+    """Hash of a key value; JSON arrays and objects (already reported as type errors) hash by their JSON text."""
+    if isinstance(value, (list, dict)):
+        return hash(json.dumps(value, sort_keys=True))
+    return hash(value)
+
+
+def validate(src_dir: Path = DEFAULT_DIR, max_issues: int = DEFAULT_MAX_ISSUES) -> Report:
+    """Check every table in src_dir; see the module docstring for what is checked."""
+    src_dir = Path(src_dir)
+    if not src_dir.is_dir():
+        raise FileNotFoundError(f'Source directory not found: {src_dir}')
+    metadata = read_all_metadata(src_dir)
+    schemas = {name: parse_schema(name, meta.schema) for name, meta in metadata.items()}
+    relations = pocketbase_relations(src_dir, metadata)
+    fks: Dict[str, List[ForeignKey]] = {
+        name: schema.foreign_keys + relations.get(name, []) for name, schema in schemas.items()
+    }
+
+    rows: Dict[str, int] = {}
+    issues: List[Issue] = []
+    counts: Dict[str, int] = {name: 0 for name in schemas}
+
+    def report(issue: Issue):
+        counts[issue.table] += 1
+        if counts[issue.table] <= max_issues:
+            issues.append(issue)
+
+    # (table, column) -> hashes of its values, for every FK target column
+    targets: Dict[Tuple[str, str], Set[int]] = {}
+    for name, table_fks in fks.items():
+        for fk in table_fks:
+            if fk.table not in schemas:
+                report(Issue(name, 0, fk.column, f'references missing table {fk.table!r}'))
+                continue
+            target = fk.target or (schemas[fk.table].primary_key or ['rowid'])[0]
+            targets.setdefault((fk.table, target), set())
+    done: Set[str] = set()
+    pending: List[Tuple[str, int, ForeignKey, str, Any]] = []
+
+    order = fk_order(metadata, {name: [fk.table for fk in table_fks] for name, table_fks in fks.items()})
+    for name in order:
+        schema = schemas[name]
+        columns = [c.name for c in schema.columns]
+        check_row = compile_checker(schema)
+        unique_sets = [(col, columns.index(col), set()) for col in schema.unique if col in columns]
+        pk_index = [columns.index(c) for c in schema.primary_key if c in columns]
+        pk_seen: Set[int] = set()
+        collect = [(columns.index(col), hashes) for (table, col), hashes in targets.items()
+                   if table == name and col in columns]
+        refs = []
+        for fk in fks[name]:
+            if fk.table in schemas and fk.column in columns:
+                target = fk.target or (schemas[fk.table].primary_key or ['rowid'])[0]
+                refs.append((columns.index(fk.column), fk, target, targets[(fk.table, target)]))
+        done.add(name)
+        path = ndjson_path(src_dir, name)
+        if not path.exists():
+            report(Issue(name, 0, '', 'metadata without an .ndjson file'))
+            rows[name] = 0
+            continue
+
+        count = 0
+        with open(path, 'r', encoding='utf-8') as f:
+            for line_no, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                count += 1
+                try:
+                    row = json.loads(line)
+                except ValueError as e:
+                    report(Issue(name, line_no, '', f'invalid JSON ({e.msg})'))
+                    continue
+                problems = check_row(row)
+                for column, message in problems:
+                    report(Issue(name, line_no, column, message))
+                if problems and (not isinstance(row, list) or len(row) != len(columns)):
+                    continue
+
+                if pk_index:
+                    key = hash(tuple(_hash(row[i]) for i in pk_index))
+                    if key in pk_seen:
+                        report(Issue(name, line_no, ', '.join(schema.primary_key), 'duplicate primary key'))
+                    pk_seen.add(key)
+                for col, i, seen in unique_sets:
+                    if row[i] is not None:
+                        key = _hash(row[i])
+                        if key in seen:
+                            report(Issue(name, line_no, col, f'duplicate value {row[i]!r} in UNIQUE column'))
+                        seen.add(key)
+                for i, hashes in collect:
+                    if row[i] is not None:
+                        hashes.add(_hash(row[i]))
+                for i, fk, target, hashes in refs:
+                    for value in _key_values(row[i], fk.many):
+                        if fk.table not in done or fk.table == name:
+                            pending.append((name, line_no, fk, target, value))
+                        elif _hash(value) not in hashes:
+                            report(Issue(name, line_no, fk.column, f'{value!r} not found in {fk.table}.{target}'))
+        rows[name] = count
+
+    for name, line_no, fk, target, value in pending:
+        if _hash(value) not in targets[(fk.table, target)]:
+            report(Issue(name, line_no, fk.column, f'{value!r} not found in {fk.table}.{target}'))
+    issues.sort(key=lambda i: (order.index(i.table), i.line))
+    return Report(rows, issues, counts)
+
+
+def main(argv: Optional[Sequence[str]] = None, prog: Optional[str] = None):
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(prog=prog, description='Validate diffable NDJSON files against their metadata')
+    parser.add_argument('src_dir', nargs='?', default=str(DEFAULT_DIR), help=f'Diffable directory (default: {DEFAULT_DIR})')
+    parser.add_argument('--max-issues', type=int, default=DEFAULT_MAX_ISSUES,
+                        help=f'Issues shown per table (default: {DEFAULT_MAX_ISSUES})')
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    try:
+        report = validate(args.src_dir, args.max_issues)
+    except (OSError, ValueError) as e:
+        print(f"❌ Validation failed: {e}")
+        sys.exit(1)
+    elapsed = time.perf_counter() - start
+    total_rows = sum(report.rows.values())
+
+    if report.ok:
+        print(f"✅ {len(report.rows)} tables, {total_rows:,} rows valid in {elapsed * 1000:.0f} ms")
+        return
+    for issue in report.issues:
+        print(f"  ❌ {issue}")
+    for table, count in report.counts.items():
+        if count > args.max_issues:
+            print(f"  ... {count - args.max_issues} more in {table}")
+    problems = sum(report.counts.values())
+    tables = sum(1 for count in report.counts.values() if count)
+    print(f"\n❌ {problems} problems in {tables} of {len(report.rows)} tables ({total_rows:,} rows, "
+          f"{elapsed * 1000:.0f} ms)")
+    sys.exit(1)
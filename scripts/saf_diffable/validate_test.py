@@ -0,0 +1,97 @@
+"""Tests for the diffable NDJSON validator."""
+
+import json
+
+import pytest
+
+from saf_diffable.format import TableMetadata, metadata_path, metadata_text, ndjson_path
+from saf_diffable.validate import ForeignKey, parse_schema, validate
+
+COLLECTIONS_SQL = ('CREATE TABLE `_collections` (`id` TEXT PRIMARY KEY NOT NULL, `name` TEXT UNIQUE NOT NULL, '
+                   '`fields` JSON DEFAULT "[]" NOT NULL)')
+TAGS_SQL = ("CREATE TABLE \"tags\" (`id` TEXT PRIMARY KEY DEFAULT ('r'||lower(hex(randomblob(7)))) NOT NULL, "
+            "`name` TEXT DEFAULT '' NOT NULL, `sort_order` NUMERIC DEFAULT 0 NOT NULL, "
+            "`is_featured` BOOLEAN DEFAULT FALSE NOT NULL)")
+TOOLS_SQL = ("CREATE TABLE `tools` (`id` TEXT PRIMARY KEY NOT NULL, `tag` TEXT DEFAULT '' NOT NULL, "
+             "`tags` JSON DEFAULT NULL, `created_at` INTEGER)")
+
+
+def write_table(directory, name, sql, rows):
+    columns = [c.name for c in parse_schema(name, sql).columns]
+    metadata_path(directory, name).write_text(metadata_text(TableMetadata(name, columns, sql)), encoding='utf-8')
+    ndjson_path(directory, name).write_text(''.join(json.dumps(r) + '\n' for r in rows), encoding='utf-8')
+
+
+@pytest.fixture
+def diffable(tmp_path):
+    fields = {
+        'c_tools': [{'name': 'tag', 'type': 'relation', 'collectionId': 'c_tags', 'maxSelect': 1},
+                    {'name': 'tags', 'type': 'relation', 'collectionId': 'c_tags', 'maxSelect': 99}],
+        'c_tags': [],
+    }
+    write_table(tmp_path, '_collections', COLLECTIONS_SQL,
+                [['c_tools', 'tools', json.dumps(fields['c_tools'])], ['c_tags', 'tags', '[]']])
+    write_table(tmp_path, 'tags', TAGS_SQL, [['aws', 'AWS', 1, 0], ['azure', 'Azure', 2.5, 1]])
+    write_table(tmp_path, 'tools', TOOLS_SQL,
+                [['heimdall', 'aws', '["aws","azure"]', 1700000000], ['saf', '', None, None]])
+    return tmp_path
+
+
+def test_parse_schema():
+    schema = parse_schema('tags', TAGS_SQL)
+    assert [c.name for c in schema.columns] == ['id', 'name', 'sort_order', 'is_featured']
+    assert schema.primary_key == ['id']
+    assert schema.columns[0].default == "('r'||lower(hex(randomblob(7))))"
+    assert all(c.not_null for c in schema.columns)
+
+    schema = parse_schema('t', 'CREATE TABLE t (a int, b "x y" REFERENCES other, '
+                               'CONSTRAINT fk FOREIGN KEY (a) REFERENCES [orgs] ("code"), UNIQUE (b))')
+    assert schema.foreign_keys == [ForeignKey('b', 'other'), ForeignKey('a', 'orgs', 'code')]
+    assert schema.unique == ['b'] and schema.primary_key == []
+
+
+def test_valid_directory(diffable):
+    report = validate(diffable)
+    assert report.ok, report.issues
+    assert report.rows == {'_collections': 2, 'tags': 2, 'tools': 2}
+
+
+def test_reports_types_nulls_duplicates_and_dangling_relations(diffable):
+    write_table(diffable, 'tools', TOOLS_SQL, [
+        ['heimdall', 'aws', '["gcp","ibm"]', '2024-01-01'],
+        ['heimdall', None, '{oops', 1],
+        ['saf', 'ibm', None],
+    ])
+    with open(ndjson_path(diffable, 'tags'), 'a', encoding='utf-8') as f:
+        f.write('["gcp","GCP","1",2]\nnot json\n')
+
+    report = validate(diffable)
+    assert [str(i) for i in report.issues] == [
+        "tags.ndjson:3 sort_order: expected a number, got '1'",
+        "tags.ndjson:3 is_featured: expected 0 or 1, got 2",
+        "tags.ndjson:4: invalid JSON (Expecting value)",
+        "tools.ndjson:1 created_at: expected an integer, got '2024-01-01'",
+        # gcp is on a tags row with type errors, which still counts as a key
+        "tools.ndjson:1 tags: 'ibm' not found in tags.id",
+        "tools.ndjson:2 tag: NULL in NOT NULL column (DEFAULT '' is not applied on load)",
+        "tools.ndjson:2 tags: invalid JSON text (Expecting property name enclosed in double quotes)",
+        "tools.ndjson:2 id: duplicate primary key",
+        "tools.ndjson:3: expected 4 values, got 3",
+    ]
+    assert report.counts == {'_collections': 0, 'tags': 3, 'tools': 6}
+
+
+def test_json_values_in_key_columns_are_reported_not_raised(diffable):
+    with open(ndjson_path(diffable, '_collections'), 'a', encoding='utf-8') as f:
+        f.write('["c_x",["x"],"[]"]\n["c_y",["x"],"[]"]\n')
+    with open(ndjson_path(diffable, 'tools'), 'a', encoding='utf-8') as f:
+        f.write('[{"id":1},["aws"],null,null]\n')
+
+    report = validate(diffable)
+    assert [str(i) for i in report.issues] == [
+        "_collections.ndjson:3 name: expected text, got ['x']",
+        "_collections.ndjson:4 name: expected text, got ['x']",
+        "_collections.ndjson:4 name: duplicate value ['x'] in UNIQUE column",
+        "tools.ndjson:3 id: expected text, got {'id': 1}",
+        "tools.ndjson:3 tag: expected text, got ['aws']",
+    ]
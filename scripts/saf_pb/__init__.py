@@ -0,0 +1,3 @@
+"""
+Shared Python helpers for the Pocketbase provisioning and data scripts.
+"""
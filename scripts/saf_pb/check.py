@@ -0,0 +1,58 @@
+"""
+Record counts (and optionally id/name listings) for Pocketbase collections.
+
+Totals for all requested collections are fetched concurrently, one
+single-item request per collection; listings stream page by page with only
+the id and name columns projected.
+"""
+
+import sys
+from typing import Optional, Sequence
+
+from .client import add_connection_args, config_from_args, connect
+from .http import ApiError
+from .records import count_many, iter_records
+
+
+def main(argv: Optional[Sequence[str]] = None, prog: Optional[str] = None):
+    import argparse
+
+    parser = argparse.ArgumentParser(prog=prog, description='Check what data is loaded in Pocketbase')
+    parser.add_argument('--collections', nargs='+', default=['organizations', 'profiles'],
+                        help='Collections to check (default: organizations profiles)')
+    parser.add_argument('--list', action='store_true',
+                        help='Stream and print every record id and name')
+    parser.add_argument('--page-size', type=int, default=500,
+                        help='Records per page when listing (default: 500)')
+    add_connection_args(parser)
+    args = parser.parse_args(argv)
+
+    try:
+        session = connect(config_from_args(args)).session
+    except (ApiError, OSError) as e:
+        print(f"❌ Authentication failed: {e}")
+        sys.exit(1)
+
+    counts = count_many(session, args.collections)
+    failed = False
+
+    for name in args.collections:
+        print(f"Checking {name}...")
+        total = counts[name]
+        if isinstance(total, ApiError):
+            print(f"  Error: {total}")
+            failed = True
+            continue
+        print(f"  Found {total} {name}")
+
+        if args.list:
+            try:
+                for record in iter_records(session, name, fields=['id', 'name'], per_page=args.page_size):
+                    print(f"    - {record['id']}: {record.get('name') or 'NO NAME'}")
+            except ApiError as e:
+                print(f"  Error: {e}")
+                failed = True
+        print()
+
+    sys.exit(1 if failed else 0)
+
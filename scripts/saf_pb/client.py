@@ -0,0 +1,209 @@
+"""
+Shared Pocketbase client for the scripts under scripts/.
+
+Connection settings come from the same environment variables as the TS CLI
+(PB_URL, PB_EMAIL, PB_PASSWORD), overridable per script with --url,
+--email and --password:
+
+    from saf_pb.client import add_connection_args, connect, config_from_args
+
+    parser = argparse.ArgumentParser()
+    add_connection_args(parser)
+    pb = connect(config_from_args(parser.parse_args()))
+
+    profiles = pb.collection('profiles')
+    for profile in profiles.iter(fields=['id', 'name']):
+        ...
+    pb.collections.create({'name': 'tags', 'type': 'base', 'fields': [...]})
+
+Records and collections are plain dicts exactly as Pocketbase returns them.
+All requests go through one pooled, retrying Session (see saf_pb.http).
+"""
+
+import os
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from . import probe
+from .http import (AUTH_ENDPOINTS, DEFAULT_EMAIL, DEFAULT_PASSWORD, DEFAULT_RETRIES, DEFAULT_TIMEOUT,
+                   DEFAULT_URL, ApiError, Session)
+from .query import quote
+from .records import DEFAULT_PAGE_SIZE, count_records, fetch_all, iter_records, records_path
+
+
+class Config(NamedTuple):
+    url: str = DEFAULT_URL
+    email: str = DEFAULT_EMAIL
+    password: str = DEFAULT_PASSWORD
+    timeout: float = DEFAULT_TIMEOUT
+    retries: int = DEFAULT_RETRIES
+
+    @classmethod
+    def from_env(cls, environ=None) -> 'Config':
+        env = os.environ if environ is None else environ
+        return cls(
+            url=env.get('PB_URL') or DEFAULT_URL,
+            email=env.get('PB_EMAIL') or DEFAULT_EMAIL,
+            password=env.get('PB_PASSWORD') or DEFAULT_PASSWORD,
+            timeout=float(env.get('PB_TIMEOUT') or DEFAULT_TIMEOUT),
+            retries=int(env.get('PB_RETRIES') or DEFAULT_RETRIES),
+        )
+
+
+class RecordsApi:
+    """Record operations on one collection."""
+
+    def __init__(self, session: Session, name: str):
+        self.session = session
+        self.name = name
+        self.path = records_path(name)
+
+    def page(self, page: int = 1, per_page: int = DEFAULT_PAGE_SIZE, **params) -> dict:
+        """One raw list page ({page, perPage, totalItems, totalPages, items})."""
+        return self.session.get(self.path, {'page': page, 'perPage': per_page, **params})
+
+    def iter(self, **kwargs) -> Iterator[dict]:
+        """Stream all matching records page by page (see records.iter_pages for options)."""
+        return iter_records(self.session, self.name, **kwargs)
+
+    def all(self, **kwargs) -> List[dict]:
+        """All matching records, fetching pages concurrently (see records.fetch_all)."""
+        return list(fetch_all(self.session, self.name, **kwargs))
+
+    def first(self, filter: Optional[str] = None, **kwargs) -> Optional[dict]:
+        items = self.page(1, 1, **({'filter': filter} if filter else {}), **kwargs)['items']
+        return items[0] if items else None
+
+    def find(self, **values) -> Optional[dict]:
+        """First record whose fields equal the given values."""
+        return self.first(' && '.join(f'{k} = {quote(v)}' for k, v in values.items()))
+
+    def get(self, record_id: str, **params) -> dict:
+        return self.session.get(f'{self.path}/{record_id}', params or None)
+
+    def create(self, data: dict) -> dict:
+        return self.session.post(self.path, data)
+
+    def update(self, record_id: str, data: dict) -> dict:
+        return self.session.request('PATCH', f'{self.path}/{record_id}', json=data)
+
+    def delete(self, record_id: str):
+        self.session.request('DELETE', f'{self.path}/{record_id}')
+
+    def count(self, filter: Optional[str] = None) -> int:
+        return count_records(self.session, self.name, filter)
+
+
+class CollectionsApi:
+    """Collection (schema) management."""
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def list(self, include_system: bool = True) -> List[dict]:
+        items = []
+        page = 1
+        while True:
+            result = self.session.get('/api/collections', {'page': page, 'perPage': 200})
+            items += result['items']
+            if page >= result['totalPages']:
+                break
+            page += 1
+        return [c for c in items if include_system or not c.get('system') and not c['name'].startswith('_')]
+
+    def ids(self) -> Dict[str, str]:
+        """name -> collection ID"""
+        return {c['name']: c['id'] for c in self.list()}
+
+    def get(self, name: str) -> dict:
+        return self.session.get(f'/api/collections/{name}')
+
+    def exists(self, name: str) -> bool:
+        try:
+            self.get(name)
+            return True
+        except ApiError as e:
+            if e.status == 404:
+                return False
+            raise
+
+    def create(self, definition: dict) -> dict:
+        return self.session.post('/api/collections', definition)
+
+    def update(self, name: str, data: dict) -> dict:
+        return self.session.request('PATCH', f'/api/collections/{name}', json=data)
+
+    def delete(self, name: str):
+        self.session.request('DELETE', f'/api/collections/{name}')
+
+    def delete_many(self, names: Optional[Iterable[str]] = None) -> List[Tuple[str, Optional[ApiError]]]:
+        """Delete the given (default: all non-system) collections, newest first so
+        collections holding relations go before the ones they point to.
+
+        Returns (name, error or None) for every collection attempted.
+        """
+        existing = self.list(include_system=False)
+        wanted = set(names) if names is not None else None
+        results = []
+        for collection in reversed(existing):
+            if wanted is not None and collection['name'] not in wanted:
+                continue
+            try:
+                self.delete(collection['id'])
+                results.append((collection['name'], None))
+            except ApiError as e:
+                results.append((collection['name'], e))
+        return results
+
+
+class Client:
+    """Authenticated access to one Pocketbase server."""
+
+    def __init__(self, config: Optional[Config] = None):
+        self.config = config or Config.from_env()
+        self.session = Session(self.config.url, timeout=self.config.timeout, retries=self.config.retries)
+        self.collections = CollectionsApi(self.session)
+
+    @property
+    def url(self) -> str:
+        return self.session.base_url
+
+    def auth(self) -> 'Client':
+        """Authenticate, trying the cached probe's endpoint first (see saf_pb.probe)."""
+        caps = probe.cached(self.url)
+        endpoints = list(AUTH_ENDPOINTS)
+        if caps is not None and caps.auth_endpoint in endpoints:
+            endpoints.remove(caps.auth_endpoint)
+            endpoints.insert(0, caps.auth_endpoint)
+        self.session.auth(self.config.email, self.config.password, endpoints)
+        return self
+
+    def capabilities(self, refresh: bool = False) -> 'probe.Capabilities':
+        """Server capabilities, probed once per DEFAULT_TTL and cached per URL."""
+        return probe.capabilities(self.url, refresh=refresh)
+
+    def collection(self, name: str) -> RecordsApi:
+        return RecordsApi(self.session, name)
+
+    def health(self) -> bool:
+        try:
+            self.session.get('/api/health')
+            return True
+        except (ApiError, OSError):
+            return False
+
+
+def connect(config: Optional[Config] = None) -> Client:
+    """Authenticated client; settings default to PB_URL/PB_EMAIL/PB_PASSWORD."""
+    return Client(config).auth()
+
+
+def add_connection_args(parser):
+    """Add --url/--email/--password, defaulting to the PB_* environment variables."""
+    env = Config.from_env()
+    parser.add_argument('--url', default=env.url, help=f'Pocketbase URL (default: $PB_URL or {DEFAULT_URL})')
+    parser.add_argument('--email', default=env.email, help='Admin email (default: $PB_EMAIL)')
+    parser.add_argument('--password', default=env.password, help='Admin password (default: $PB_PASSWORD)')
+
+
+def config_from_args(args) -> Config:
+    return Config.from_env()._replace(url=args.url, email=args.email, password=args.password)
@@ -0,0 +1,58 @@
+"""Tests for the shared Pocketbase client."""
+
+import argparse
+
+import pytest
+
+from saf_pb.client import Client, Config, add_connection_args, config_from_args, connect
+from saf_pb.http import ApiError, DEFAULT_URL
+
+
+@pytest.fixture
+def client(pb):
+    return connect(Config(pb.server.url, pb.server.email, pb.server.password))
+
+
+def test_config_from_env():
+    config = Config.from_env({'PB_URL': 'http://pb:8091', 'PB_PASSWORD': 'secret'})
+    assert config.url == 'http://pb:8091' and config.password == 'secret'
+    assert Config.from_env({}).url == DEFAULT_URL
+
+
+def test_connection_args_default_to_env(monkeypatch):
+    monkeypatch.setenv('PB_URL', 'http://pb:8091')
+    parser = argparse.ArgumentParser()
+    add_connection_args(parser)
+    assert config_from_args(parser.parse_args([])).url == 'http://pb:8091'
+    assert config_from_args(parser.parse_args(['--url', 'http://other'])).url == 'http://other'
+
+
+def test_bad_credentials(pb):
+    with pytest.raises(ApiError) as e:
+        connect(Config(pb.server.url, pb.server.email, 'wrong'))
+    assert e.value.status == 400
+
+
+def test_record_accessors(client):
+    client.collections.create({'name': 'tags', 'fields': [{'name': 'name', 'type': 'text'}]})
+    tags = client.collection('tags')
+    created = tags.create({'name': 'web "app"'})
+    tags.create({'name': 'database'})
+
+    assert tags.count() == 2
+    assert tags.find(name='web "app"')['id'] == created['id']
+    assert tags.update(created['id'], {'name': 'web'})['name'] == 'web'
+    assert sorted(r['name'] for r in tags.iter(per_page=1)) == ['database', 'web']
+    tags.delete(created['id'])
+    assert [r['name'] for r in tags.all()] == ['database']
+    assert tags.first('name = "missing"') is None
+
+
+def test_delete_many_skips_system_collections(client):
+    for name in ('organizations', 'teams'):
+        client.collections.create({'name': name, 'fields': []})
+    assert client.collections.exists('teams')
+
+    assert client.collections.delete_many() == [('teams', None), ('organizations', None)]
+    assert not client.collections.exists('teams')
+    assert client.health() and not Client(Config('http://127.0.0.1:9', retries=0)).health()
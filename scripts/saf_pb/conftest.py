@@ -0,0 +1,25 @@
+"""Shared fixtures: a fake Pocketbase server with an authenticated session."""
+
+import types
+
+import pytest
+
+from saf_pb.client import Client, Config
+from saf_pb.fake_server import FakePocketBase
+from saf_pb.http import Session
+from saf_pb.provision import provision
+
+
+@pytest.fixture
+def pb():
+    with FakePocketBase() as server:
+        session = Session(server.url).auth(server.email, server.password)
+        yield types.SimpleNamespace(server=server, session=session)
+
+
+@pytest.fixture
+def content_pb(pb):
+    """Fake server with the content and join collections provisioned."""
+    client = Client(Config(pb.server.url, pb.server.email, pb.server.password)).auth()
+    provision(client, log=lambda message: None, flat_fields=True)
+    return pb
@@ -0,0 +1,191 @@
+"""
+Deterministic Pocketbase -> content/data YAML exporter.
+
+Each collection is fetched with large, concurrent page requests and only the
+content columns projected. Records are mapped back onto the existing file
+layout: an entity stays in the file it already lives in, and new entities
+go to the file whose entities share its grouping value (the standard for
+profiles, the technology for hardening profiles) or to the type's single
+file. Existing entity order is preserved, new entities are appended sorted
+by ID, files are written as canonical YAML (saf_content/canonical.py), and a
+file is only rewritten when its parsed content actually changed, so a
+CMS -> git round trip produces minimal diffs.
+"""
+
+import os
+import sys
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from saf_content.canonical import KeyOrders, dump_text, key_orders
+from saf_content.corpus import DEFAULT_DATA_DIR, ENTITY_TYPES, EntityType, file_entities, iter_files, load_file
+from saf_content.ids import id_type_for, normalize_id
+from saf_content.shards import refresh_for
+
+from .client import add_connection_args, config_from_args, connect
+from .http import ApiError, Session
+from .mapping import camel_case, columns, foreign_keys, merge_record
+from .records import fetch_all
+from .sync import table_names
+
+# Column that decides which file a new entity belongs to
+GROUP_COLUMNS = {
+    'profiles': 'standard',
+    'hardening_profiles': 'technology',
+}
+
+
+class FileChange:
+    def __init__(self, path: Path, added: int = 0, updated: int = 0, removed: int = 0):
+        self.path = path
+        self.added = added
+        self.updated = updated
+        self.removed = removed
+
+
+def write_atomic(path: Path, text: str):
+    tmp = path.with_name(f'.{path.name}.tmp')
+    tmp.write_text(text, encoding='utf-8')
+    os.replace(tmp, path)
+
+
+def group_value(etype: EntityType, values: dict) -> str:
+    column = GROUP_COLUMNS.get(etype.table)
+    if not column:
+        return ''
+    value = str(values.get(column) or '')
+    target = foreign_keys(etype.table).get(column)
+    return normalize_id(value, id_type_for(target)) if target and value else value
+
+
+def export_type(session: Session, etype: EntityType, data_dir: Path = DEFAULT_DATA_DIR,
+                dry_run: bool = False, max_workers: int = 8,
+                warnings: Optional[List[str]] = None, orders: Optional[KeyOrders] = None) -> List[FileChange]:
+    """Export one collection onto its YAML files; returns the files that changed."""
+    records = {r['id']: r for r in fetch_all(session, etype.table, fields=columns(etype.table),
+                                             max_workers=max_workers)}
+    if not records:
+        # Almost certainly an unsynced server, not a request to delete everything
+        if warnings is not None:
+            warnings.append(f'{etype.table}: no records on the server, skipped')
+        return []
+
+    files: Dict[Path, dict] = {}
+    location: Dict[str, Path] = {}
+    group_files: Dict[str, Counter] = {}
+    for path in iter_files(data_dir, etype):
+        files[path] = load_file(path)
+        for entity in file_entities(files[path], etype):
+            if isinstance(entity, dict) and entity.get('id'):
+                location[str(entity['id'])] = path
+                group = group_value(etype, {c: entity.get(camel_case(c)) for c in GROUP_COLUMNS.values()})
+                group_files.setdefault(group, Counter())[path] += 1
+
+    # Assign new records to a file
+    new_by_file: Dict[Path, List[dict]] = {}
+    for record_id in sorted(set(records) - set(location)):
+        group = group_value(etype, records[record_id])
+        if group in group_files:
+            path = group_files[group].most_common(1)[0][0]
+        elif etype.table in GROUP_COLUMNS and group:
+            path = Path(data_dir) / etype.directory / f'{group}.yml'
+        elif files:
+            path = next(iter(files))
+        else:
+            path = Path(data_dir) / etype.directory / f'{etype.directory}.yml'
+        if path not in files:
+            files[path] = {'_id': f'{group}-{etype.directory}' if group else etype.directory, etype.key: []}
+        new_by_file.setdefault(path, []).append(records[record_id])
+
+    orders = key_orders() if orders is None else orders
+    changes = []
+    for path, data in files.items():
+        old_entities = file_entities(data, etype)
+        change = FileChange(path)
+        entities = []
+        for entity in old_entities:
+            if not isinstance(entity, dict) or not entity.get('id'):
+                entities.append(entity)
+                continue
+            record = records.get(str(entity['id']))
+            if record is None:
+                change.removed += 1
+                continue
+            merged = merge_record(etype, entity, record)
+            if merged != entity:
+                change.updated += 1
+            entities.append(merged)
+        for record in new_by_file.get(path, []):
+            entities.append(merge_record(etype, {'id': record['id']}, record))
+            change.added += 1
+
+        if not (change.added or change.updated or change.removed):
+            continue
+        changes.append(change)
+        if not dry_run:
+            data[etype.key] = entities
+            path.parent.mkdir(parents=True, exist_ok=True)
+            write_atomic(path, dump_text(data, etype, orders))
+    if not dry_run:
+        refresh_for(change.path for change in changes)
+    return changes
+
+
+def export_all(session: Session, data_dir: Path = DEFAULT_DATA_DIR,
+               tables: Optional[Sequence[str]] = None, dry_run: bool = False,
+               max_workers: int = 8,
+               warnings: Optional[List[str]] = None) -> List[Tuple[EntityType, List[FileChange]]]:
+    orders = key_orders()
+    results = []
+    for etype in ENTITY_TYPES:
+        if tables and etype.table not in tables:
+            continue
+        results.append((etype, export_type(session, etype, data_dir, dry_run, max_workers, warnings, orders)))
+    return results
+
+
+def main(argv: Optional[Sequence[str]] = None, prog: Optional[str] = None):
+    import argparse
+
+    parser = argparse.ArgumentParser(prog=prog, description='Export Pocketbase records back to content/data YAML')
+    parser.add_argument('--dry-run', action='store_true', help='Report changed files without writing them')
+    parser.add_argument('--only', nargs='+', metavar='COLLECTION', help='Limit export to these collections')
+    parser.add_argument('--workers', type=int, default=8, help='Concurrent page requests (default: 8)')
+    parser.add_argument('--data-dir', default=str(DEFAULT_DATA_DIR), help='Path to data directory')
+    add_connection_args(parser)
+    args = parser.parse_args(argv)
+
+    try:
+        session = connect(config_from_args(args)).session
+    except (ApiError, OSError) as e:
+        print(f"❌ Authentication failed: {e}")
+        sys.exit(1)
+    print("✓ Authenticated\n")
+
+    warnings = []
+    try:
+        results = export_all(session, args.data_dir, tables=table_names(args.only),
+                             dry_run=args.dry_run, max_workers=args.workers, warnings=warnings)
+    except ApiError as e:
+        print(f"❌ Export failed: {e}")
+        sys.exit(1)
+
+    for warning in warnings:
+        print(f"  ⚠️  {warning}")
+    if warnings:
+        print()
+
+    files = 0
+    for etype, changes in results:
+        for change in changes:
+            files += 1
+            print(f"  {etype.directory}/{change.path.name}: {change.added} new, "
+                  f"{change.updated} changed, {change.removed} removed")
+    if files:
+        print()
+
+    if args.dry_run:
+        print(f"✅ Dry run complete: {files} files would change. Run without --dry-run to write them.")
+    else:
+        print(f"✅ Export complete: {files} files written.")
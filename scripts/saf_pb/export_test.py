@@ -0,0 +1,59 @@
+"""Tests for the Pocketbase -> YAML exporter."""
+
+import pytest
+
+from saf_content.corpus import entity_type
+from saf_pb.export import export_all
+from saf_pb.sync import sync
+
+
+@pytest.fixture
+def synced(content_pb, data_dir, tmp_path):
+    sync(content_pb.session, data_dir, state_file=tmp_path / 'state.json')
+    return content_pb
+
+
+def snapshot(data_dir):
+    return {p: p.read_bytes() for p in data_dir.rglob('*.yml')}
+
+
+def test_round_trip_changes_nothing(synced, data_dir):
+    before = snapshot(data_dir)
+    results = export_all(synced.session, data_dir)
+    assert [c.path for _, changes in results for c in changes] == []
+    assert snapshot(data_dir) == before
+
+
+def test_record_edit_rewrites_only_its_file(synced, data_dir):
+    synced.session.request('PATCH', '/api/collections/profiles/records/red-hat-7-stig',
+                           json={'name': 'Red Hat 7 STIG (edited)'})
+    before = snapshot(data_dir)
+
+    changes = [c for _, cs in export_all(synced.session, data_dir) for c in cs]
+    stig = data_dir / 'profiles' / 'stig.yml'
+    assert [(c.path, c.updated) for c in changes] == [(stig, 1)]
+    after = snapshot(data_dir)
+    assert [p for p in after if after[p] != before[p]] == [stig]
+    # Written canonically, so the diff is the edited line only
+    old, new = before[stig].decode('utf-8').splitlines(), after[stig].decode('utf-8').splitlines()
+    assert len(old) == len(new)
+    assert [(a, b) for a, b in zip(old, new) if a != b] == [('  name: Red Hat 7 STIG', '  name: Red Hat 7 STIG (edited)')]
+
+
+def test_new_and_deleted_records(synced, data_dir):
+    session = synced.session
+    session.post('/api/collections/profiles/records',
+                 {'id': 'new-cis-profile', 'name': 'New CIS Profile', 'standard': 'cis', 'status': 'active'})
+    session.request('DELETE', '/api/collections/tools/records/ohdf')
+
+    changes = {c.path.name: c for _, cs in export_all(session, data_dir, ['profiles', 'tools']) for c in cs}
+    assert changes['tools.yml'].removed == 1
+    added = [c for c in changes.values() if c.added]
+    assert len(added) == 1 and 'id: new-cis-profile' in added[0].path.read_text(encoding='utf-8')
+    assert '- id: ohdf\n' not in (data_dir / 'tools' / 'tools.yml').read_text(encoding='utf-8')
+
+
+def test_empty_collection_is_skipped(content_pb, data_dir):
+    warnings = []
+    assert export_all(content_pb.session, data_dir, ['tags'], warnings=warnings) == [(entity_type('tags'), [])]
+    assert warnings == ['tags: no records on the server, skipped']
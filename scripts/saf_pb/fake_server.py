@@ -0,0 +1,835 @@
+"""
+In-process fake Pocketbase server for offline tests and throughput benchmarks.
+
+Implements the subset of the Pocketbase REST API that the scripts under
+scripts/ rely on, backed by SQLite and served from a threaded HTTP server:
+
+  - Health:        GET  /api/health
+  - Auth:          POST /api/collections/_superusers/auth-with-password  (>= 0.23)
+                   POST /api/admins/auth-with-password                   (< 0.23, or legacy_auth)
+  - Collections:   GET/POST /api/collections, GET/PATCH/DELETE /api/collections/{idOrName}
+  - Records:       GET/POST /api/collections/{c}/records (page, perPage, skipTotal,
+                   sort, filter, fields, expand), GET/PATCH/DELETE .../records/{id}
+  - Batch:         POST /api/batch  (>= 0.23)
+
+The `version` argument selects which server generation is emulated: 0.23+
+uses flat relation options ("collectionId" directly on the field) and
+supports the batch API, older versions expect them nested under "options".
+Every request can be delayed by `latency` seconds (plus up to `jitter`
+seconds) to approximate a real network round-trip.
+
+Usage:
+  python scripts/fake-pocketbase.py                          # http://127.0.0.1:8090
+  python scripts/fake-pocketbase.py --port 8091 --latency-ms 20
+
+  from saf_pb.fake_server import FakePocketBase
+  with FakePocketBase(latency=0.005) as pb:
+      requests.get(f"{pb.url}/api/health")
+"""
+
+import json
+import random
+import re
+import secrets
+import sqlite3
+import string
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+DEFAULT_EMAIL = 'admin@localhost.com'
+DEFAULT_PASSWORD = 'test1234567'
+
+# Pseudo collection id used to store collection definitions next to records
+COLLECTIONS_KEY = '__collections__'
+
+ID_ALPHABET = string.ascii_lowercase + string.digits
+MAX_PER_PAGE = 1000
+MAX_EXPAND_DEPTH = 6
+
+
+class ApiError(Exception):
+    """Error rendered as a Pocketbase-style JSON error response."""
+
+    def __init__(self, status: int, message: str, data: Optional[dict] = None):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+        self.data = data or {}
+
+    def payload(self) -> dict:
+        return {'status': self.status, 'message': self.message, 'data': self.data}
+
+
+def parse_version(version: str) -> Tuple[int, ...]:
+    return tuple(int(part) for part in re.findall(r'\d+', version)[:3])
+
+
+def new_id() -> str:
+    return ''.join(random.choices(ID_ALPHABET, k=15))
+
+
+def now() -> str:
+    return datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S.%f')[:-3] + 'Z'
+
+
+# -----------------------------------------------------------------------------
+# Filter and sort compilation (Pocketbase filter syntax -> SQLite over JSON)
+# -----------------------------------------------------------------------------
+
+_FILTER_TOKEN = re.compile(r"""
+    \s*(?:
+        (?P<lparen>\()
+      | (?P<rparen>\))
+      | (?P<logic>&&|\|\|)
+      | (?P<op>\?=|\?~|!=|!~|>=|<=|=|~|>|<)
+      | (?P<string>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')
+      | (?P<number>-?\d+(?:\.\d+)?)
+      | (?P<ident>[A-Za-z_@][\w.]*)
+    )""", re.VERBOSE)
+
+_FIELD_NAME = re.compile(r'^[A-Za-z_]\w*$')
+
+
+def _json_path(field: str) -> str:
+    if not _FIELD_NAME.match(field):
+        raise ApiError(400, f"Invalid filter field: {field}")
+    return f"json_extract(data, '$.\"{field}\"')"
+
+
+def _tokenize_filter(expr: str) -> List[Tuple[str, str]]:
+    tokens = []
+    pos = 0
+    expr = expr.rstrip()
+    while pos < len(expr):
+        match = _FILTER_TOKEN.match(expr, pos)
+        if not match or match.end() == pos:
+            raise ApiError(400, f"Invalid filter expression near: {expr[pos:pos + 20]!r}")
+        kind = match.lastgroup
+        tokens.append((kind, match.group(kind)))
+        pos = match.end()
+    return tokens
+
+
+def _literal(kind: str, text: str) -> Any:
+    if kind == 'string':
+        return re.sub(r'\\(.)', r'\1', text[1:-1])
+    if kind == 'number':
+        return float(text) if '.' in text else int(text)
+    if text == 'true':
+        return 1
+    if text == 'false':
+        return 0
+    if text == 'null':
+        return ''
+    raise ApiError(400, f"Unsupported filter operand: {text}")
+
+
+def compile_filter(expr: str) -> Tuple[str, List[Any]]:
+    """Compile a Pocketbase filter expression into a SQL WHERE clause."""
+    if not expr or not expr.strip():
+        return '1', []
+
+    tokens = _tokenize_filter(expr)
+    params: List[Any] = []
+    pos = 0
+
+    def peek() -> Optional[Tuple[str, str]]:
+        return tokens[pos] if pos < len(tokens) else None
+
+    def take(kind: Optional[str] = None) -> Tuple[str, str]:
+        nonlocal pos
+        token = peek()
+        if token is None or (kind and token[0] != kind):
+            raise ApiError(400, f"Invalid filter expression: {expr}")
+        pos += 1
+        return token
+
+    def comparison() -> str:
+        token = peek()
+        if token and token[0] == 'lparen':
+            take('lparen')
+            inner = disjunction()
+            take('rparen')
+            return f'({inner})'
+
+        _, field = take('ident')
+        _, op = take('op')
+        kind, text = take()
+        if kind not in ('string', 'number', 'ident'):
+            raise ApiError(400, f"Invalid filter expression: {expr}")
+        value = _literal(kind, text)
+        column = 'id' if field == 'id' else _json_path(field)
+
+        if op in ('?=', '?~'):
+            sql_op = '=' if op == '?=' else 'LIKE'
+            if op == '?~':
+                value = f'%{value}%'
+            params.append(value)
+            return (f"EXISTS (SELECT 1 FROM json_each(data, '$.\"{field}\"') "
+                    f"WHERE value {sql_op} ?)")
+
+        if isinstance(value, str):
+            column = f"COALESCE({column}, '')"
+        if op in ('~', '!~'):
+            params.append(value if '%' in str(value) else f'%{value}%')
+            return f"{column} {'NOT ' if op == '!~' else ''}LIKE ?"
+        params.append(value)
+        return f"{column} {'<>' if op == '!=' else op} ?"
+
+    def conjunction() -> str:
+        parts = [comparison()]
+        while peek() == ('logic', '&&'):
+            take()
+            parts.append(comparison())
+        return ' AND '.join(parts)
+
+    def disjunction() -> str:
+        parts = [conjunction()]
+        while peek() == ('logic', '||'):
+            take()
+            parts.append(conjunction())
+        return ' OR '.join(f'({p})' for p in parts) if len(parts) > 1 else parts[0]
+
+    clause = disjunction()
+    if pos != len(tokens):
+        raise ApiError(400, f"Invalid filter expression: {expr}")
+    return clause, params
+
+
+def compile_sort(sort: str) -> str:
+    """Compile a Pocketbase sort expression ("-created,name") into ORDER BY."""
+    terms = []
+    for item in filter(None, (s.strip() for s in (sort or '').split(','))):
+        direction = 'DESC' if item.startswith('-') else 'ASC'
+        field = item.lstrip('+-')
+        if field == '@random':
+            terms.append('random()')
+            continue
+        column = 'id' if field == 'id' else _json_path(field)
+        terms.append(f'{column} {direction}')
+    terms.append('rowid ASC')
+    return ', '.join(terms)
+
+
+def parse_fields(fields: str) -> Optional[dict]:
+    """Parse a "fields" projection ("id,name,expand.team.name") into a tree."""
+    if not fields:
+        return None
+    tree: dict = {}
+    for item in filter(None, (f.strip() for f in fields.split(','))):
+        node = tree
+        for part in item.split(':', 1)[0].split('.'):
+            node = node.setdefault(part, {})
+    return tree
+
+
+def project(record: dict, tree: Optional[dict]) -> dict:
+    if not tree or '*' in tree and len(tree) == 1:
+        return record
+    if '*' in tree:
+        result = dict(record)
+        if 'expand' in tree and 'expand' in record:
+            result['expand'] = _project_expand(record['expand'], tree['expand'])
+        return result
+    result = {}
+    for key, subtree in tree.items():
+        if key not in record:
+            continue
+        if key == 'expand':
+            result[key] = _project_expand(record[key], subtree)
+        else:
+            result[key] = record[key]
+    return result
+
+
+def _project_expand(expand: dict, tree: dict) -> dict:
+    if not tree or '*' in tree:
+        return expand
+    result = {}
+    for rel, subtree in tree.items():
+        if rel not in expand:
+            continue
+        value = expand[rel]
+        if isinstance(value, list):
+            result[rel] = [project(v, subtree) for v in value]
+        else:
+            result[rel] = project(value, subtree)
+    return result
+
+
+# -----------------------------------------------------------------------------
+# Storage and API implementation
+# -----------------------------------------------------------------------------
+
+class FakePocketBase:
+    """Threaded fake Pocketbase server backed by an SQLite database."""
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, *,
+                 version: str = '0.36.0',
+                 email: str = DEFAULT_EMAIL,
+                 password: str = DEFAULT_PASSWORD,
+                 latency: float = 0.0,
+                 jitter: float = 0.0,
+                 legacy_auth: bool = True,
+                 batch_max: int = 50,
+                 db_path: str = ':memory:',
+                 verbose: bool = False):
+        self.host = host
+        self.port = port
+        self.version = version
+        self.flat_fields = parse_version(version) >= (0, 23)
+        self.email = email
+        self.password = password
+        self.latency = latency
+        self.jitter = jitter
+        self.legacy_auth = legacy_auth
+        self.batch_max = batch_max
+        self.verbose = verbose
+
+        self.request_count = 0
+        self.requests_by_route: Dict[str, int] = {}
+        self._tokens: set = set()
+        self._lock = threading.RLock()
+        self._db = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._db.execute('PRAGMA journal_mode = MEMORY')
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS records (
+                coll TEXT NOT NULL,
+                id   TEXT NOT NULL,
+                data TEXT NOT NULL,
+                PRIMARY KEY (coll, id)
+            )
+        """)
+        if self.flat_fields:
+            self._insert(COLLECTIONS_KEY, {
+                'id': 'pbc_3142635823', 'name': '_superusers', 'type': 'auth',
+                'system': True, 'fields': [], 'created': now(), 'updated': now(),
+            })
+
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    # -- lifecycle -------------------------------------------------------------
+
+    @property
+    def url(self) -> str:
+        return f'http://{self.host}:{self.port}'
+
+    def start(self) -> 'FakePocketBase':
+        handler = type('FakePocketBaseHandler', (_Handler,), {'app': self})
+        self._server = ThreadingHTTPServer((self.host, self.port), handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever,
+                                        kwargs={'poll_interval': 0.05}, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> 'FakePocketBase':
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def reset_stats(self):
+        with self._lock:
+            self.request_count = 0
+            self.requests_by_route = {}
+
+    def issue_token(self) -> str:
+        """Create a superuser token without going through the auth endpoint."""
+        token = secrets.token_hex(16)
+        self._tokens.add(token)
+        return token
+
+    # -- storage ---------------------------------------------------------------
+
+    def _insert(self, coll: str, doc: dict):
+        self._db.execute('INSERT INTO records (coll, id, data) VALUES (?, ?, ?)',
+                         (coll, doc['id'], json.dumps(doc)))
+
+    def _update(self, coll: str, doc: dict):
+        self._db.execute('UPDATE records SET data = ? WHERE coll = ? AND id = ?',
+                         (json.dumps(doc), coll, doc['id']))
+
+    def _get(self, coll: str, doc_id: str) -> Optional[dict]:
+        row = self._db.execute('SELECT data FROM records WHERE coll = ? AND id = ?',
+                               (coll, doc_id)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _delete(self, coll: str, doc_id: str):
+        self._db.execute('DELETE FROM records WHERE coll = ? AND id = ?', (coll, doc_id))
+
+    def _list(self, coll: str, query: Dict[str, str]) -> dict:
+        try:
+            page = max(1, int(query.get('page', 1)))
+            per_page = min(MAX_PER_PAGE, max(1, int(query.get('perPage', 30))))
+        except ValueError:
+            raise ApiError(400, 'Invalid page or perPage parameter.')
+        where, params = compile_filter(query.get('filter', ''))
+        order = compile_sort(query.get('sort', ''))
+
+        try:
+            rows = self._db.execute(
+                f'SELECT data FROM records WHERE coll = ? AND ({where}) '
+                f'ORDER BY {order} LIMIT ? OFFSET ?',
+                [coll, *params, per_page, (page - 1) * per_page],
+            ).fetchall()
+            if query.get('skipTotal') in ('1', 'true'):
+                total = -1
+            else:
+                total = self._db.execute(
+                    f'SELECT COUNT(*) FROM records WHERE coll = ? AND ({where})',
+                    [coll, *params],
+                ).fetchone()[0]
+        except sqlite3.Error as e:
+            raise ApiError(400, f'Invalid filter or sort: {e}')
+
+        return {
+            'page': page,
+            'perPage': per_page,
+            'totalItems': total,
+            'totalPages': -1 if total < 0 else (total + per_page - 1) // per_page,
+            'items': [json.loads(r[0]) for r in rows],
+        }
+
+    # -- collections -----------------------------------------------------------
+
+    def _collection_fields(self, collection: dict) -> List[dict]:
+        return collection.get('fields') or collection.get('schema') or []
+
+    def _relation_target(self, field: dict) -> Tuple[Optional[str], int]:
+        if self.flat_fields:
+            return field.get('collectionId'), int(field.get('maxSelect') or 1)
+        options = field.get('options') or {}
+        return options.get('collectionId'), int(options.get('maxSelect') or 1)
+
+    def find_collection(self, id_or_name: str) -> dict:
+        collection = self._get(COLLECTIONS_KEY, id_or_name)
+        if collection is None:
+            row = self._db.execute(
+                "SELECT data FROM records WHERE coll = ? AND json_extract(data, '$.name') = ?",
+                (COLLECTIONS_KEY, id_or_name),
+            ).fetchone()
+            collection = json.loads(row[0]) if row else None
+        if collection is None:
+            raise ApiError(404, "The requested resource wasn't found.")
+        return collection
+
+    def _validate_collection(self, body: dict, existing_id: Optional[str] = None):
+        errors = {}
+        name = body.get('name')
+        if not name:
+            errors['name'] = {'code': 'validation_required', 'message': 'Cannot be blank.'}
+        else:
+            try:
+                other = self.find_collection(name)
+                if other['id'] != existing_id:
+                    errors['name'] = {'code': 'validation_collection_name_exists',
+                                      'message': 'Collection name must be unique (case insensitive).'}
+            except ApiError:
+                pass
+
+        fields = self._collection_fields(body)
+        if not isinstance(fields, list) or not all(isinstance(f, dict) for f in fields):
+            raise ApiError(400, 'Failed to create collection.', {'fields': {
+                'code': 'validation_invalid_fields', 'message': 'Must be a list of field objects.'}})
+        for i, field in enumerate(fields):
+            if not field.get('name'):
+                errors.setdefault('fields', {})[str(i)] = {
+                    'name': {'code': 'validation_required', 'message': 'Cannot be blank.'}}
+                continue
+            if field['name'] == 'id' and not self.flat_fields:
+                errors.setdefault('fields', {})[str(i)] = {
+                    'name': {'code': 'validation_reserved_name', 'message': 'The name is reserved.'}}
+                continue
+            if field['name'] == 'id' and self.flat_fields and not field.get('primaryKey'):
+                errors.setdefault('fields', {})[str(i)] = {
+                    'name': {'code': 'validation_not_primary_key',
+                             'message': 'The id field must be the primary key.'}}
+                continue
+            if field.get('type') != 'relation':
+                continue
+            target, _ = self._relation_target(field)
+            if not target:
+                errors.setdefault('fields', {})[str(i)] = {
+                    'collectionId': {'code': 'validation_required', 'message': 'Cannot be blank.'}}
+                continue
+            try:
+                self.find_collection(target)
+            except ApiError:
+                errors.setdefault('fields', {})[str(i)] = {
+                    'collectionId': {'code': 'validation_missing_collection',
+                                     'message': 'The related collection does not exist.'}}
+        if errors:
+            raise ApiError(400, 'Failed to create collection.', errors)
+
+    def create_collection(self, body: dict) -> dict:
+        self._validate_collection(body)
+        collection = dict(body)
+        collection['id'] = body.get('id') or f'pbc_{random.randint(10**9, 10**10 - 1)}'
+        collection.setdefault('type', 'base')
+        collection['system'] = False
+        for rule in ('listRule', 'viewRule', 'createRule', 'updateRule', 'deleteRule'):
+            collection.setdefault(rule, None)
+        if self.flat_fields:
+            fields = list(collection.pop('fields', None) or collection.pop('schema', None) or [])
+            if not any(f.get('name') == 'id' for f in fields):
+                fields.insert(0, {'name': 'id', 'type': 'text', 'system': True,
+                                  'primaryKey': True, 'required': True})
+            collection['fields'] = fields
+        else:
+            collection['schema'] = list(collection.pop('schema', None) or collection.pop('fields', None) or [])
+        collection['created'] = collection['updated'] = now()
+        self._insert(COLLECTIONS_KEY, collection)
+        return collection
+
+    def update_collection(self, id_or_name: str, body: dict) -> dict:
+        collection = self.find_collection(id_or_name)
+        merged = {**collection, **body, 'id': collection['id']}
+        self._validate_collection(merged, existing_id=collection['id'])
+        merged['updated'] = now()
+        self._update(COLLECTIONS_KEY, merged)
+        return merged
+
+    def delete_collection(self, id_or_name: str):
+        collection = self.find_collection(id_or_name)
+        if collection.get('system'):
+            raise ApiError(400, 'System collections cannot be deleted.')
+        self._db.execute('DELETE FROM records WHERE coll = ?', (collection['id'],))
+        self._delete(COLLECTIONS_KEY, collection['id'])
+
+    # -- records ---------------------------------------------------------------
+
+    def _normalize_record(self, collection: dict, body: dict, existing: Optional[dict]) -> dict:
+        fields = [f for f in self._collection_fields(collection) if f.get('name') != 'id']
+        known = {f['name'] for f in fields}
+        record = dict(existing or {})
+        for key, value in body.items():
+            if key in known or not fields:
+                record[key] = value
+
+        errors = {}
+        for field in fields:
+            name = field['name']
+            ftype = field.get('type')
+            target, max_select = self._relation_target(field) if ftype == 'relation' else (None, 1)
+            if name not in record:
+                if ftype == 'relation':
+                    record[name] = [] if max_select > 1 else ''
+                elif ftype == 'bool':
+                    record[name] = False
+                elif ftype == 'number':
+                    record[name] = 0
+                elif ftype == 'json':
+                    record[name] = None
+                else:
+                    record[name] = ''
+
+            value = record[name]
+            if field.get('required') and value in ('', None, [], 0, False):
+                errors[name] = {'code': 'validation_required', 'message': 'Cannot be blank.'}
+                continue
+            if ftype == 'relation' and target and value:
+                ids = value if isinstance(value, list) else [value]
+                target_coll = self.find_collection(target)
+                if any(self._get(target_coll['id'], rid) is None for rid in ids):
+                    errors[name] = {'code': 'validation_missing_rel_records',
+                                    'message': 'Failed to find all relation records with the provided ids.'}
+        if errors:
+            raise ApiError(400, 'Failed to create record.', errors)
+        return record
+
+    def _check_rule(self, collection: dict, rule: str, authed: bool):
+        if not authed and collection.get(rule) is None:
+            raise ApiError(403, 'Only superusers can perform this action.')
+
+    def create_record(self, coll_name: str, body: dict, authed: bool) -> dict:
+        collection = self.find_collection(coll_name)
+        self._check_rule(collection, 'createRule', authed)
+        record = self._normalize_record(collection, body, None)
+        record_id = body.get('id') or new_id()
+        if self._get(collection['id'], record_id) is not None:
+            raise ApiError(400, 'Failed to create record.', {
+                'id': {'code': 'validation_pk_invalid', 'message': 'The record primary key is invalid or already exists.'}})
+        record.update({'id': record_id, 'collectionId': collection['id'],
+                       'collectionName': collection['name'], 'created': now(), 'updated': now()})
+        self._insert(collection['id'], record)
+        return record
+
+    def update_record(self, coll_name: str, record_id: str, body: dict, authed: bool) -> dict:
+        collection = self.find_collection(coll_name)
+        self._check_rule(collection, 'updateRule', authed)
+        existing = self._get(collection['id'], record_id)
+        if existing is None:
+            raise ApiError(404, "The requested resource wasn't found.")
+        body = {k: v for k, v in body.items() if k != 'id'}
+        record = self._normalize_record(collection, body, existing)
+        record['updated'] = now()
+        self._update(collection['id'], record)
+        return record
+
+    def upsert_record(self, coll_name: str, body: dict, authed: bool) -> dict:
+        collection = self.find_collection(coll_name)
+        if body.get('id') and self._get(collection['id'], body['id']) is not None:
+            return self.update_record(coll_name, body['id'], body, authed)
+        return self.create_record(coll_name, body, authed)
+
+    def view_record(self, coll_name: str, record_id: str, query: Dict[str, str], authed: bool) -> dict:
+        collection = self.find_collection(coll_name)
+        self._check_rule(collection, 'viewRule', authed)
+        record = self._get(collection['id'], record_id)
+        if record is None:
+            raise ApiError(404, "The requested resource wasn't found.")
+        self._expand([record], collection, query.get('expand', ''))
+        return project(record, parse_fields(query.get('fields', '')))
+
+    def list_records(self, coll_name: str, query: Dict[str, str], authed: bool) -> dict:
+        collection = self.find_collection(coll_name)
+        self._check_rule(collection, 'listRule', authed)
+        result = self._list(collection['id'], query)
+        self._expand(result['items'], collection, query.get('expand', ''))
+        tree = parse_fields(query.get('fields', ''))
+        result['items'] = [project(r, tree) for r in result['items']]
+        return result
+
+    def delete_record(self, coll_name: str, record_id: str, authed: bool):
+        collection = self.find_collection(coll_name)
+        self._check_rule(collection, 'deleteRule', authed)
+        if self._get(collection['id'], record_id) is None:
+            raise ApiError(404, "The requested resource wasn't found.")
+        self._delete(collection['id'], record_id)
+
+    def _expand(self, records: List[dict], collection: dict, expand: str, depth: int = 0):
+        if not expand or not records or depth >= MAX_EXPAND_DEPTH:
+            return
+        paths: Dict[str, List[str]] = {}
+        for item in filter(None, (e.strip() for e in expand.split(','))):
+            head, _, rest = item.partition('.')
+            paths.setdefault(head, [])
+            if rest:
+                paths[head].append(rest)
+
+        fields = {f['name']: f for f in self._collection_fields(collection)}
+        for rel, nested in paths.items():
+            field = fields.get(rel)
+            if not field or field.get('type') != 'relation':
+                continue
+            target, max_select = self._relation_target(field)
+            if not target:
+                continue
+            target_coll = self.find_collection(target)
+            cache: Dict[str, Optional[dict]] = {}
+            related_all = []
+            for record in records:
+                value = record.get(rel)
+                ids = value if isinstance(value, list) else ([value] if value else [])
+                related = []
+                for rid in ids:
+                    if rid not in cache:
+                        cache[rid] = self._get(target_coll['id'], rid)
+                    if cache[rid] is not None:
+                        related.append(cache[rid])
+                if not related:
+                    continue
+                record.setdefault('expand', {})[rel] = related if max_select > 1 else related[0]
+                related_all.extend(related)
+            if nested and related_all:
+                unique = list({id(r): r for r in related_all}.values())
+                self._expand(unique, target_coll, ','.join(nested), depth + 1)
+
+    # -- batch -----------------------------------------------------------------
+
+    def batch(self, body: dict, authed: bool) -> list:
+        requests = body.get('requests') or []
+        if not isinstance(requests, list) or not all(isinstance(r, dict) for r in requests):
+            raise ApiError(400, 'The batch requests must be a list of objects.')
+        if len(requests) > self.batch_max:
+            raise ApiError(400, f'The allowed max number of batch requests is {self.batch_max}.')
+        results = []
+        self._db.execute('BEGIN')
+        try:
+            for i, req in enumerate(requests):
+                parts = urlsplit(req.get('url', ''))
+                query = {k: v[-1] for k, v in parse_qs(parts.query).items()}
+                method = (req.get('method') or 'GET').upper()
+                try:
+                    status, payload = self.route(method, parts.path, query, req.get('body') or {}, authed,
+                                                 in_batch=True)
+                except ApiError as e:
+                    raise ApiError(400, 'Batch transaction failed.', {'requests': {str(i): {
+                        'code': 'batch_request_failed', 'message': 'Batch request failed.',
+                        'response': e.payload()}}})
+                results.append({'status': status, 'body': payload})
+        except Exception:
+            self._db.execute('ROLLBACK')
+            raise
+        self._db.execute('COMMIT')
+        return results
+
+    # -- routing ---------------------------------------------------------------
+
+    def authenticate(self, identity: str, password: str) -> str:
+        if identity != self.email or password != self.password:
+            raise ApiError(400, 'Failed to authenticate.')
+        return self.issue_token()
+
+    def route(self, method: str, path: str, query: Dict[str, str], body: dict,
+              authed: bool, in_batch: bool = False) -> Tuple[int, Any]:
+        parts = [unquote(p) for p in path.strip('/').split('/')]
+        if parts[:1] != ['api']:
+            raise ApiError(404, "The requested resource wasn't found.")
+        parts = parts[1:]
+
+        with self._lock:
+            if parts == ['health'] and method == 'GET':
+                return 200, {'code': 200, 'message': 'API is healthy.', 'data': {}}
+
+            if parts == ['admins', 'auth-with-password'] and method == 'POST' and \
+                    (self.legacy_auth or not self.flat_fields):
+                token = self.authenticate(body.get('identity', ''), body.get('password', ''))
+                return 200, {'token': token, 'admin': {'id': 'admin0000000001', 'email': self.email}}
+
+            if parts == ['collections', '_superusers', 'auth-with-password'] and method == 'POST' \
+                    and self.flat_fields:
+                token = self.authenticate(body.get('identity', ''), body.get('password', ''))
+                return 200, {'token': token, 'record': {
+                    'id': 'admin0000000001', 'email': self.email, 'collectionName': '_superusers'}}
+
+            if parts == ['batch'] and method == 'POST' and self.flat_fields and not in_batch:
+                return 200, self.batch(body, authed)
+
+            if parts[:1] != ['collections']:
+                raise ApiError(404, "The requested resource wasn't found.")
+
+            if len(parts) <= 2:
+                if not authed:
+                    raise ApiError(401, 'The request requires valid superuser authorization token.')
+                if len(parts) == 1 and method == 'GET':
+                    return 200, self._list(COLLECTIONS_KEY, query)
+                if len(parts) == 1 and method == 'POST':
+                    return 200, self.create_collection(body)
+                if len(parts) == 2 and method == 'GET':
+                    return 200, self.find_collection(parts[1])
+                if len(parts) == 2 and method == 'PATCH':
+                    return 200, self.update_collection(parts[1], body)
+                if len(parts) == 2 and method == 'DELETE':
+                    self.delete_collection(parts[1])
+                    return 204, None
+
+            if len(parts) >= 3 and parts[2] == 'records':
+                coll = parts[1]
+                if len(parts) == 3 and method == 'GET':
+                    return 200, self.list_records(coll, query, authed)
+                if len(parts) == 3 and method == 'POST':
+                    return 200, self.create_record(coll, body, authed)
+                if len(parts) == 3 and method == 'PUT' and in_batch:
+                    return 200, self.upsert_record(coll, body, authed)
+                if len(parts) == 4 and method == 'GET':
+                    return 200, self.view_record(coll, parts[3], query, authed)
+                if len(parts) == 4 and method == 'PATCH':
+                    return 200, self.update_record(coll, parts[3], body, authed)
+                if len(parts) == 4 and method == 'DELETE':
+                    self.delete_record(coll, parts[3], authed)
+                    return 204, None
+
+        raise ApiError(404, "The requested resource wasn't found.")
+
+    def handle(self, method: str, raw_path: str, headers, body_bytes: bytes) -> Tuple[int, Optional[bytes]]:
+        delay = self.latency + (random.uniform(0, self.jitter) if self.jitter else 0)
+        if delay:
+            time.sleep(delay)
+
+        parts = urlsplit(raw_path)
+        query = {k: v[-1] for k, v in parse_qs(parts.query).items()}
+        token = (headers.get('Authorization') or '').replace('Bearer ', '').strip()
+        route_key = f"{method} {re.sub(r'/records/[^/?]+', '/records/:id', parts.path)}"
+        with self._lock:
+            self.request_count += 1
+            self.requests_by_route[route_key] = self.requests_by_route.get(route_key, 0) + 1
+
+        try:
+            body = json.loads(body_bytes) if body_bytes else {}
+            if not isinstance(body, dict):
+                raise ApiError(400, 'The request body must be a JSON object.')
+            status, payload = self.route(method, parts.path, query, body, token in self._tokens)
+        except json.JSONDecodeError:
+            status, payload = 400, ApiError(400, 'Invalid JSON body.').payload()
+        except ApiError as e:
+            status, payload = e.status, e.payload()
+        except Exception:
+            # Like Pocketbase: a bug is a 500 response, not a dropped connection
+            status, payload = 500, ApiError(500, 'Something went wrong while processing your request.').payload()
+        return status, None if payload is None else json.dumps(payload).encode()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    app: FakePocketBase
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def _dispatch(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else b''
+        status, payload = self.app.handle(self.command, self.path, self.headers, body)
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload or b'')))
+        self.end_headers()
+        if payload:
+            self.wfile.write(payload)
+
+    do_GET = do_POST = do_PATCH = do_PUT = do_DELETE = _dispatch
+
+    def log_message(self, format, *args):
+        if self.app.verbose:
+            super().log_message(format, *args)
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='Run a fake Pocketbase server for offline testing and benchmarks',
+        epilog="""
+Examples:
+  python %(prog)s                              # Serve on http://127.0.0.1:8090
+  python %(prog)s --latency-ms 20 --jitter-ms 5
+  python %(prog)s --version 0.22.0             # Emulate pre-0.23 (nested options, no batch)
+        """,
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('--host', default='127.0.0.1', help='Bind address (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8090, help='Port (default: 8090)')
+    parser.add_argument('--version', default='0.36.0', help='Pocketbase version to emulate (default: 0.36.0)')
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='Fixed latency added to every request')
+    parser.add_argument('--jitter-ms', type=float, default=0.0, help='Random extra latency (0..N ms)')
+    parser.add_argument('--db', default=':memory:', help='SQLite file to persist data (default: in-memory)')
+    parser.add_argument('--verbose', action='store_true', help='Log every request')
+    args = parser.parse_args()
+
+    server = FakePocketBase(args.host, args.port, version=args.version,
+                            latency=args.latency_ms / 1000, jitter=args.jitter_ms / 1000,
+                            db_path=args.db, verbose=args.verbose)
+    server.start()
+    print(f"✓ Fake Pocketbase {args.version} listening on {server.url}")
+    print(f"  Credentials: {server.email} / {server.password}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
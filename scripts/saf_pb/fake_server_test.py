@@ -0,0 +1,168 @@
+"""Tests for the fake Pocketbase server."""
+
+import time
+
+import pytest
+import requests
+
+from saf_pb.fake_server import ApiError, FakePocketBase, compile_filter
+
+
+@pytest.fixture
+def pb():
+    with FakePocketBase() as server:
+        session = requests.Session()
+        token = session.post(f'{server.url}/api/collections/_superusers/auth-with-password',
+                             json={'identity': server.email, 'password': server.password}).json()['token']
+        session.headers['Authorization'] = token
+        session.base = server.url
+        server.session = session
+        yield server
+
+
+def create_orgs_and_profiles(pb):
+    s = pb.session
+    orgs = s.post(f'{s.base}/api/collections', json={
+        'name': 'organizations', 'type': 'base',
+        'fields': [{'name': 'name', 'type': 'text', 'required': True}],
+    }).json()
+    s.post(f'{s.base}/api/collections', json={
+        'name': 'profiles', 'type': 'base',
+        'fields': [
+            {'name': 'name', 'type': 'text', 'required': True},
+            {'name': 'organization', 'type': 'relation', 'collectionId': orgs['id'], 'maxSelect': 1},
+        ],
+    }).raise_for_status()
+    s.post(f'{s.base}/api/collections/organizations/records', json={'id': 'mitre', 'name': 'MITRE'})
+    for i in range(5):
+        s.post(f'{s.base}/api/collections/profiles/records',
+               json={'id': f'p{i}', 'name': f'Profile {i}', 'organization': 'mitre'}).raise_for_status()
+
+
+class TestAuth:
+    def test_superuser_and_legacy_admin_auth(self):
+        with FakePocketBase() as pb:
+            for path in ('/api/collections/_superusers/auth-with-password', '/api/admins/auth-with-password'):
+                r = requests.post(pb.url + path, json={'identity': pb.email, 'password': pb.password})
+                assert r.status_code == 200 and r.json()['token']
+
+    def test_wrong_password_is_rejected(self):
+        with FakePocketBase() as pb:
+            r = requests.post(f'{pb.url}/api/admins/auth-with-password',
+                              json={'identity': pb.email, 'password': 'nope'})
+            assert r.status_code == 400
+
+    def test_collections_require_auth(self):
+        with FakePocketBase() as pb:
+            assert requests.get(f'{pb.url}/api/collections').status_code == 401
+
+    def test_old_versions_have_no_superusers_or_batch(self):
+        with FakePocketBase(version='0.22.0') as pb:
+            assert requests.post(f'{pb.url}/api/collections/_superusers/auth-with-password',
+                                 json={'identity': pb.email, 'password': pb.password}).status_code == 404
+            assert requests.post(f'{pb.url}/api/batch', json={'requests': []}).status_code == 404
+
+
+class TestCollections:
+    def test_crud(self, pb):
+        s = pb.session
+        created = s.post(f'{s.base}/api/collections', json={'name': 'tags', 'fields': []}).json()
+        assert s.get(f'{s.base}/api/collections/tags').json()['id'] == created['id']
+        assert s.post(f'{s.base}/api/collections', json={'name': 'tags'}).status_code == 400
+        assert s.patch(f'{s.base}/api/collections/tags', json={'listRule': ''}).json()['listRule'] == ''
+        assert s.delete(f'{s.base}/api/collections/tags').status_code == 204
+        assert s.get(f'{s.base}/api/collections/tags').status_code == 404
+
+    def test_flat_relation_options_required_on_new_versions(self, pb):
+        s = pb.session
+        r = s.post(f'{s.base}/api/collections', json={'name': 'x', 'fields': [
+            {'name': 'org', 'type': 'relation', 'options': {'collectionId': 'whatever'}}]})
+        assert r.status_code == 400
+
+    def test_malformed_definitions_are_rejected(self, pb):
+        s = pb.session
+        assert s.post(f'{s.base}/api/collections', json=[1, 2]).status_code == 400
+        assert s.post(f'{s.base}/api/collections', json={'name': 'x', 'fields': [{'type': 'text'}]}).status_code == 400
+        assert s.post(f'{s.base}/api/collections', json={'name': 'x', 'fields': 'name'}).status_code == 400
+        assert s.post(f'{s.base}/api/batch', json={'requests': [1]}).status_code == 400
+        assert s.post(f'{s.base}/api/collections', json={'name': 'x', 'fields': [
+            {'name': 'id', 'type': 'text', 'required': True}]}).status_code == 400
+        assert s.get(f'{s.base}/api/collections/x').status_code == 404
+
+    def test_unexpected_errors_are_500_responses(self, pb, monkeypatch):
+        def fail(*args, **kwargs):
+            raise RuntimeError('boom')
+
+        monkeypatch.setattr(pb, 'create_collection', fail)
+        r = pb.session.post(f'{pb.url}/api/collections', json={'name': 'x', 'fields': []})
+        assert r.status_code == 500 and r.json()['status'] == 500
+        assert pb.session.get(f'{pb.url}/api/health').status_code == 200
+
+
+class TestRecords:
+    def test_paging_and_totals(self, pb):
+        create_orgs_and_profiles(pb)
+        s = pb.session
+        page = s.get(f'{s.base}/api/collections/profiles/records', params={'page': 2, 'perPage': 2}).json()
+        assert page['totalItems'] == 5 and page['totalPages'] == 3
+        assert [r['id'] for r in page['items']] == ['p2', 'p3']
+        skipped = s.get(f'{s.base}/api/collections/profiles/records', params={'skipTotal': 1}).json()
+        assert skipped['totalItems'] == -1
+
+    def test_filter_sort_fields_expand(self, pb):
+        create_orgs_and_profiles(pb)
+        s = pb.session
+        page = s.get(f'{s.base}/api/collections/profiles/records', params={
+            'filter': "name ~ 'Profile' && (id = 'p1' || id = 'p3')",
+            'sort': '-name',
+            'fields': 'id,expand.organization.name',
+            'expand': 'organization',
+        }).json()
+        assert page['items'] == [
+            {'id': 'p3', 'expand': {'organization': {'name': 'MITRE'}}},
+            {'id': 'p1', 'expand': {'organization': {'name': 'MITRE'}}},
+        ]
+
+    def test_relation_and_required_validation(self, pb):
+        create_orgs_and_profiles(pb)
+        s = pb.session
+        assert s.post(f'{s.base}/api/collections/profiles/records',
+                      json={'name': 'x', 'organization': 'missing'}).status_code == 400
+        assert s.post(f'{s.base}/api/collections/profiles/records', json={}).status_code == 400
+
+    def test_rules_gate_unauthenticated_access(self, pb):
+        create_orgs_and_profiles(pb)
+        assert requests.get(f'{pb.url}/api/collections/profiles/records').status_code == 403
+
+
+class TestBatch:
+    def test_batch_is_transactional(self, pb):
+        create_orgs_and_profiles(pb)
+        s = pb.session
+        ok = s.post(f'{s.base}/api/batch', json={'requests': [
+            {'method': 'PUT', 'url': '/api/collections/profiles/records', 'body': {'id': 'p0', 'name': 'Renamed'}},
+            {'method': 'PUT', 'url': '/api/collections/profiles/records', 'body': {'id': 'p9', 'name': 'New'}},
+            {'method': 'DELETE', 'url': '/api/collections/profiles/records/p1'},
+        ]})
+        assert ok.status_code == 200
+        assert [r['status'] for r in ok.json()] == [200, 200, 204]
+
+        failed = s.post(f'{s.base}/api/batch', json={'requests': [
+            {'method': 'DELETE', 'url': '/api/collections/profiles/records/p2'},
+            {'method': 'DELETE', 'url': '/api/collections/profiles/records/missing'},
+        ]})
+        assert failed.status_code == 400
+        ids = [r['id'] for r in s.get(f'{s.base}/api/collections/profiles/records').json()['items']]
+        assert ids == ['p0', 'p2', 'p3', 'p4', 'p9']
+
+
+def test_latency_injection():
+    with FakePocketBase(latency=0.05) as pb:
+        start = time.perf_counter()
+        requests.get(f'{pb.url}/api/health')
+        assert time.perf_counter() - start >= 0.05
+
+
+def test_filter_compiler_rejects_garbage():
+    with pytest.raises(ApiError):
+        compile_filter("name = ")
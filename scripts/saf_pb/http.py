@@ -0,0 +1,98 @@
+"""
+Authenticated HTTP session for the Pocketbase REST API.
+
+One pooled keep-alive connection set per Session, with a (connect, read)
+timeout on every request and automatic retries with exponential backoff
+for connection errors and transient responses (429, 502, 503, 504).
+Non-idempotent POSTs are only retried when the connection could not be
+established, so a create is never sent twice.
+"""
+
+from typing import Any, Optional, Sequence
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+DEFAULT_URL = 'http://127.0.0.1:8090'
+DEFAULT_EMAIL = 'admin@localhost.com'
+DEFAULT_PASSWORD = 'test1234567'
+
+DEFAULT_TIMEOUT = 30.0
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF = 0.3   # seconds; doubles on each retry
+DEFAULT_POOL_SIZE = 16  # keep-alive connections, enough for the thread pools in records.py
+CONNECT_TIMEOUT = 5.0
+RETRY_STATUSES = (429, 502, 503, 504)
+
+# Superuser auth moved in Pocketbase 0.23; try the current endpoint first
+AUTH_ENDPOINTS = [
+    '/api/collections/_superusers/auth-with-password',
+    '/api/admins/auth-with-password',
+]
+
+
+class ApiError(Exception):
+    """Non-2xx response from Pocketbase."""
+
+    def __init__(self, status: int, message: str, data: Optional[dict] = None):
+        super().__init__(f'{status}: {message}')
+        self.status = status
+        self.message = message
+        self.data = data or {}
+
+
+class Session:
+    """requests.Session bound to one Pocketbase server and auth token."""
+
+    def __init__(self, base_url: str = DEFAULT_URL, timeout: float = DEFAULT_TIMEOUT,
+                 retries: int = DEFAULT_RETRIES, backoff: float = DEFAULT_BACKOFF,
+                 pool_size: int = DEFAULT_POOL_SIZE):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = (min(CONNECT_TIMEOUT, timeout), timeout)
+        self.http = requests.Session()
+        retry = Retry(total=retries, connect=retries, read=retries, status=retries,
+                      backoff_factor=backoff, status_forcelist=RETRY_STATUSES,
+                      respect_retry_after_header=True, raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+        self.http.mount('http://', adapter)
+        self.http.mount('https://', adapter)
+
+    def request(self, method: str, path: str, params: Optional[dict] = None,
+                json: Any = None) -> Any:
+        response = self.http.request(method, self.base_url + path, params=params,
+                                     json=json, timeout=self.timeout)
+        if response.status_code >= 400:
+            try:
+                payload = response.json()
+            except ValueError:
+                payload = {'message': response.text[:200]}
+            raise ApiError(response.status_code, payload.get('message', ''), payload.get('data'))
+        if response.status_code == 204 or not response.content:
+            return None
+        return response.json()
+
+    def get(self, path: str, params: Optional[dict] = None) -> Any:
+        return self.request('GET', path, params=params)
+
+    def post(self, path: str, json: Any = None) -> Any:
+        return self.request('POST', path, json=json)
+
+    def auth(self, email: str = DEFAULT_EMAIL, password: str = DEFAULT_PASSWORD,
+             endpoints: Sequence[str] = AUTH_ENDPOINTS) -> 'Session':
+        """Authenticate as superuser (Pocketbase >= 0.23) or admin (older).
+
+        `endpoints` are tried in order until one exists (see saf_pb.probe).
+        """
+        last_error: Optional[ApiError] = None
+        for endpoint in endpoints:
+            try:
+                result = self.post(endpoint, {'identity': email, 'password': password})
+            except ApiError as e:
+                if e.status != 404:
+                    raise
+                last_error = e
+                continue
+            self.http.headers['Authorization'] = result['token']
+            return self
+        raise last_error or ApiError(0, 'No auth endpoint available')
@@ -0,0 +1,199 @@
+"""
+Set-based sync of the many-to-many join collections.
+
+Links live in the YAML as lists on the owning entity (profile `tags`,
+hardening profile `tags`, profile `hardeningProfiles`). They are extracted
+for the whole corpus as sets of normalized (source, target) pairs, each join
+collection is read once in a projected paged scan, and only the set
+difference is written: one POST per new link and one DELETE per removed
+link (or duplicate row), sent through the batch API. Editing the tags of a
+single profile therefore costs one scan per join collection plus one batch.
+"""
+
+import sys
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+from saf_content.corpus import DEFAULT_DATA_DIR, entity_type, iter_entities
+from saf_content.ids import id_type_for, normalize_id
+
+from .client import add_connection_args, config_from_args, connect
+from .http import ApiError, Session
+from .mapping import columns, foreign_keys
+from .records import iter_records, records_path
+from .sync import DEFAULT_BATCH_SIZE, send_operations
+
+Link = Tuple[str, str]
+
+
+class JoinTable(NamedTuple):
+    table: str          # join collection
+    owner: str          # entity type whose YAML holds the list
+    key: str            # YAML list key on the owning entity
+
+    @property
+    def source_column(self) -> str:
+        return columns(self.table)[0]
+
+    @property
+    def target_column(self) -> str:
+        return columns(self.table)[1]
+
+    @property
+    def target_table(self) -> str:
+        return foreign_keys(self.table)[self.target_column]
+
+
+JOIN_TABLES = [
+    JoinTable('profiles_tags', 'profiles', 'tags'),
+    JoinTable('hardening_profiles_tags', 'hardening_profiles', 'tags'),
+    JoinTable('validation_to_hardening', 'profiles', 'hardeningProfiles'),
+]
+
+
+class LinkPlan:
+    """Rows to add to and remove from one join collection."""
+
+    def __init__(self, table: str):
+        self.table = table
+        self.adds: List[Link] = []
+        self.removes: List[str] = []  # record IDs
+        self.unchanged = 0
+
+    @property
+    def changes(self) -> int:
+        return len(self.adds) + len(self.removes)
+
+
+def local_links(data_dir: Path = DEFAULT_DATA_DIR,
+                warnings: Optional[List[str]] = None) -> Dict[str, Set[Link]]:
+    """join table -> set of (source id, target id) for the whole corpus.
+
+    Links to IDs that do not exist in the corpus are dropped (and reported
+    in `warnings`), as Pocketbase would reject the relation.
+    """
+    entities = list(iter_entities(data_dir))
+    valid_ids: Dict[str, Set[str]] = {}
+    for etype, _, entity in entities:
+        valid_ids.setdefault(etype.table, set()).add(str(entity['id']))
+
+    links: Dict[str, Set[Link]] = {j.table: set() for j in JOIN_TABLES}
+    for join in JOIN_TABLES:
+        owner = entity_type(join.owner)
+        target = join.target_table
+        for etype, _, entity in entities:
+            if etype != owner:
+                continue
+            for value in entity.get(join.key) or []:
+                target_id = normalize_id(str(value), id_type_for(target))
+                if target_id not in valid_ids.get(target, set()):
+                    if warnings is not None:
+                        warnings.append(f"{join.table}: {entity['id']} → {target_id} NOT FOUND")
+                    continue
+                links[join.table].add((str(entity['id']), target_id))
+    return links
+
+
+def remote_links(session: Session, join: JoinTable) -> Dict[Link, List[str]]:
+    """(source, target) -> record IDs, from one projected scan of the join collection."""
+    rows: Dict[Link, List[str]] = {}
+    fields = ['id', join.source_column, join.target_column]
+    for record in iter_records(session, join.table, fields=fields, per_page=1000):
+        link = (record[join.source_column], record[join.target_column])
+        rows.setdefault(link, []).append(record['id'])
+    return rows
+
+
+def plan_links(session: Session, local: Dict[str, Set[Link]],
+               tables: Optional[Sequence[str]] = None) -> List[LinkPlan]:
+    plans = []
+    for join in JOIN_TABLES:
+        if tables and join.table not in tables:
+            continue
+        plan = LinkPlan(join.table)
+        wanted = local.get(join.table, set())
+        existing = remote_links(session, join)
+        plan.adds = sorted(wanted - set(existing))
+        for link, record_ids in sorted(existing.items()):
+            # Keep one row per wanted link; anything else is stale or a duplicate
+            keep = 1 if link in wanted else 0
+            plan.removes += record_ids[keep:]
+            plan.unchanged += keep
+        plans.append(plan)
+    return plans
+
+
+def link_operations(plans: List[LinkPlan]) -> List[dict]:
+    joins = {j.table: j for j in JOIN_TABLES}
+    ops = []
+    for plan in plans:
+        join = joins[plan.table]
+        path = records_path(plan.table)
+        ops += [{'method': 'DELETE', 'url': f'{path}/{record_id}'} for record_id in plan.removes]
+        ops += [{'method': 'POST', 'url': path,
+                 'body': {join.source_column: source, join.target_column: target}}
+                for source, target in plan.adds]
+    return ops
+
+
+def sync_links(session: Session, data_dir: Path = DEFAULT_DATA_DIR,
+               tables: Optional[Sequence[str]] = None, dry_run: bool = False,
+               batch_size: int = DEFAULT_BATCH_SIZE,
+               warnings: Optional[List[str]] = None) -> List[LinkPlan]:
+    """Plan and (unless dry_run) apply the join table differences."""
+    plans = plan_links(session, local_links(data_dir, warnings), tables)
+    if not dry_run:
+        send_operations(session, link_operations(plans), batch_size)
+    return plans
+
+
+def format_link_plan(plan: LinkPlan) -> str:
+    return (f'  {plan.table}: {len(plan.adds)} added, {len(plan.removes)} removed, '
+            f'{plan.unchanged} unchanged')
+
+
+def main(argv: Optional[Sequence[str]] = None, prog: Optional[str] = None):
+    import argparse
+
+    parser = argparse.ArgumentParser(prog=prog, description='Sync join collections from content/data YAML')
+    parser.add_argument('--dry-run', action='store_true', help='Show the plan without writing anything')
+    parser.add_argument('--only', nargs='+', metavar='COLLECTION', choices=[j.table for j in JOIN_TABLES],
+                        help='Limit sync to these join collections')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                        help=f'Operations per batch request (default: {DEFAULT_BATCH_SIZE})')
+    parser.add_argument('--data-dir', default=str(DEFAULT_DATA_DIR), help='Path to data directory')
+    add_connection_args(parser)
+    args = parser.parse_args(argv)
+
+    try:
+        session = connect(config_from_args(args)).session
+    except (ApiError, OSError) as e:
+        print(f"❌ Authentication failed: {e}")
+        sys.exit(1)
+    print("✓ Authenticated\n")
+
+    warnings = []
+    try:
+        plans = sync_links(session, args.data_dir, tables=args.only, dry_run=args.dry_run,
+                           batch_size=args.batch_size, warnings=warnings)
+    except ApiError as e:
+        print(f"❌ Link sync failed: {e}")
+        if e.data:
+            print(f"   {e.data}")
+        sys.exit(1)
+
+    for warning in warnings:
+        print(f"  ⚠️  {warning}")
+    if warnings:
+        print()
+
+    print("📊 Dry run - planned changes:" if args.dry_run else "📊 Changes:")
+    for plan in plans:
+        print(format_link_plan(plan))
+    print()
+
+    total = sum(p.changes for p in plans)
+    if args.dry_run:
+        print(f"✅ Dry run complete: {total} link changes pending. Run without --dry-run to apply.")
+    else:
+        print(f"✅ Link sync complete: {total} link changes applied.")
@@ -0,0 +1,50 @@
+"""Tests for the set-based join table sync."""
+
+from saf_pb.links import local_links, sync_links
+from saf_pb.records import count_records, iter_records
+from saf_pb.sync import sync
+
+
+def edit(path, old, new):
+    text = path.read_text(encoding='utf-8')
+    assert old in text
+    path.write_text(text.replace(old, new, 1), encoding='utf-8')
+
+
+def test_local_links_are_normalized_and_checked(data_dir):
+    warnings = []
+    links = local_links(data_dir, warnings)
+    assert ('docker-ce-cis', 'docker-cis-kitchen') in links['validation_to_hardening']
+    assert links['profiles_tags'] and all(t == t.lower() for _, t in links['profiles_tags'])
+    assert any('NOT FOUND' in w for w in warnings)
+
+
+def test_tag_edit_writes_only_the_difference(content_pb, data_dir, tmp_path):
+    session = content_pb.session
+    sync(session, data_dir, state_file=tmp_path / 'state.json')
+    plans = {p.table: p for p in sync_links(session, data_dir)}
+    total = len(plans['profiles_tags'].adds)
+    assert total == count_records(session, 'profiles_tags') > 0
+
+    assert sum(p.changes for p in sync_links(session, data_dir)) == 0
+
+    edit(data_dir / 'profiles' / 'cis.yml', '  - aws\n  - database\n', '  - aws\n')
+    content_pb.server.reset_stats()
+    plans = {p.table: p for p in sync_links(session, data_dir)}
+    changed = plans['profiles_tags']
+    assert len(changed.removes) == 1 and len(changed.adds) == 0
+    # one scan per join collection plus one batch
+    assert content_pb.server.request_count == 4
+    assert count_records(session, 'profiles_tags') == total - 1
+
+
+def test_duplicate_rows_are_removed(content_pb, data_dir, tmp_path):
+    session = content_pb.session
+    sync(session, data_dir, state_file=tmp_path / 'state.json')
+    sync_links(session, data_dir)
+    row = next(iter_records(session, 'hardening_profiles_tags'))
+    session.post('/api/collections/hardening_profiles_tags/records',
+                 {'hardening_profile_id': row['hardening_profile_id'], 'tag_id': row['tag_id']})
+
+    plans = {p.table: p for p in sync_links(session, data_dir)}
+    assert len(plans['hardening_profiles_tags'].removes) == 1
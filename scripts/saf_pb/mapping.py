@@ -0,0 +1,131 @@
+"""
+Mapping between content/data YAML entities and Pocketbase records.
+
+Collection columns and FK targets are read from the Drizzle-generated
+diffable/<table>.metadata.json files, which match the collections created
+by scripts/create-all-collections.py. YAML keys are camelCase
+(shortDescription), record fields snake_case (short_description).
+"""
+
+import hashlib
+import json
+import re
+from datetime import date
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Set
+
+from saf_content.corpus import REPO_ROOT, EntityType
+from saf_content.ids import id_type_for, normalize_id
+
+SCHEMA_DIR = REPO_ROOT / 'diffable'
+
+# Timestamps are Pocketbase system fields (created/updated), not content
+TIMESTAMP_COLUMNS = {'created_at', 'last_updated'}
+
+# Field holding the content hash of the YAML entity a record was synced from
+HASH_FIELD = 'content_hash'
+
+COLUMN_DEFAULTS = {'status': 'active'}
+
+_FOREIGN_KEY = re.compile(r'FOREIGN KEY \(`(\w+)`\) REFERENCES `(\w+)`')
+
+
+@lru_cache(maxsize=None)
+def table_metadata(table: str) -> dict:
+    with open(SCHEMA_DIR / f'{table}.metadata.json', 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def columns(table: str) -> List[str]:
+    """Content columns of a collection, in schema order."""
+    return [c for c in table_metadata(table)['columns'] if c not in TIMESTAMP_COLUMNS]
+
+
+def foreign_keys(table: str) -> Dict[str, str]:
+    """FK column -> referenced table."""
+    return dict(_FOREIGN_KEY.findall(table_metadata(table)['schema']))
+
+
+def camel_case(column: str) -> str:
+    head, *rest = column.split('_')
+    return head + ''.join(part.title() for part in rest)
+
+
+def to_value(value) -> str:
+    """Coerce a YAML scalar to the text stored in Pocketbase."""
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, date):
+        return value.isoformat()
+    return str(value)
+
+
+def to_record(etype: EntityType, entity: dict,
+              valid_ids: Optional[Dict[str, Set[str]]] = None,
+              warnings: Optional[List[str]] = None) -> dict:
+    """Build the Pocketbase record for a YAML entity.
+
+    FK values are normalized; when `valid_ids` is given, references to IDs
+    that do not exist are cleared (and reported in `warnings`) so a single
+    dangling FK does not make Pocketbase reject a whole batch.
+    """
+    fks = foreign_keys(etype.table)
+    record = {}
+    for column in columns(etype.table):
+        value = to_value(entity.get(camel_case(column)))
+        if column in fks and value:
+            target = fks[column]
+            value = normalize_id(value, id_type_for(target))
+            if valid_ids is not None and value not in valid_ids.get(target, set()):
+                if warnings is not None:
+                    warnings.append(f"{etype.table}/{entity.get('id')}.{column}: {value} → NOT FOUND")
+                value = ''
+        if not value and column in COLUMN_DEFAULTS:
+            value = COLUMN_DEFAULTS[column]
+        record[column] = value
+    return record
+
+
+def content_hash(record: dict) -> str:
+    """Stable hash of a record's content fields (order-independent)."""
+    payload = {k: v for k, v in record.items() if k != HASH_FIELD}
+    canonical = json.dumps(payload, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:32]
+
+
+def combined_hash(hashes: Iterable[str]) -> str:
+    """Hash of a whole collection, from its per-record hashes."""
+    digest = hashlib.sha256()
+    for h in sorted(hashes):
+        digest.update(h.encode('ascii'))
+    return digest.hexdigest()[:32]
+
+
+def merge_record(etype: EntityType, entity: dict, record: dict) -> dict:
+    """Apply a Pocketbase record onto a YAML entity, keeping diffs minimal.
+
+    Values that already map to the record value (same text, unnormalized FK
+    spellings, an implicit default) keep their original YAML form; YAML-only
+    keys (tags, hardeningProfiles, members, ...) are preserved as-is; new
+    keys are appended in column order.
+    """
+    fks = foreign_keys(etype.table)
+    merged = dict(entity)
+    for column in columns(etype.table):
+        key = camel_case(column)
+        new = to_value(record.get(column))
+        old = entity.get(key)
+        current = to_value(old)
+        if column in fks and current:
+            current = normalize_id(current, id_type_for(fks[column]))
+        if key not in entity and new == COLUMN_DEFAULTS.get(column):
+            continue
+        if current == new:
+            continue
+        if new:
+            merged[key] = new
+        else:
+            merged.pop(key, None)
+    return merged
@@ -0,0 +1,160 @@
+"""
+Pocketbase capability probing, cached per server URL.
+
+Instead of each script guessing endpoints in turn, one probe sends the
+candidate requests concurrently, unauthenticated and with a short timeout,
+and reads the answer from the status codes: 404 means the route does not
+exist, anything else (typically 400 for an empty auth body) means it does.
+
+  - auth endpoint:  _superusers (>= 0.23) or admins (< 0.23)
+  - version:        the API generation the endpoints imply ('0.23+' or '<0.23';
+                    Pocketbase does not report its exact version over the API)
+  - field options:  flat on the field (0.23+) or nested under "options"
+  - batch API:      POST /api/batch exists and is enabled
+
+Results are stored in .cache/saf/pb-capabilities.json keyed by URL and
+reused for DEFAULT_TTL seconds, so later tools skip the probe entirely:
+
+    from saf_pb.probe import capabilities
+    caps = capabilities('http://127.0.0.1:8090')
+    if caps.flat_fields: ...
+"""
+
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, NamedTuple, Optional, Sequence
+
+from saf_content.corpus import REPO_ROOT
+
+from .http import AUTH_ENDPOINTS, ApiError, Session
+
+DEFAULT_CACHE_FILE = REPO_ROOT / '.cache' / 'saf' / 'pb-capabilities.json'
+DEFAULT_TTL = 3600.0     # seconds
+PROBE_TIMEOUT = 2.0      # seconds per request; probes never retry
+
+HEALTH_ENDPOINT = '/api/health'
+BATCH_ENDPOINT = '/api/batch'
+SUPERUSER_ENDPOINT = AUTH_ENDPOINTS[0]
+
+
+class Capabilities(NamedTuple):
+    url: str
+    auth_endpoint: Optional[str]
+    version: str
+    flat_fields: bool
+    batch: bool
+    probed_at: float
+
+    def fresh(self, ttl: float = DEFAULT_TTL, now: Optional[float] = None) -> bool:
+        return (time.time() if now is None else now) - self.probed_at < ttl
+
+
+def _status(session: Session, method: str, path: str) -> Optional[int]:
+    """HTTP status of an unauthenticated request (None if unreachable)."""
+    try:
+        session.request(method, path, json={} if method == 'POST' else None)
+        return 200
+    except ApiError as e:
+        return e.status
+    except OSError:
+        return None
+
+
+def probe(url: str, timeout: float = PROBE_TIMEOUT) -> Capabilities:
+    """Probe a server now, sending all candidate requests at once."""
+    session = Session(url, timeout=timeout, retries=0)
+    checks = [('GET', HEALTH_ENDPOINT), ('POST', BATCH_ENDPOINT)] + [('POST', e) for e in AUTH_ENDPOINTS]
+    with ThreadPoolExecutor(max_workers=len(checks)) as pool:
+        statuses = dict(zip([path for _, path in checks],
+                            pool.map(lambda check: _status(session, *check), checks)))
+
+    if statuses[HEALTH_ENDPOINT] is None:
+        raise ApiError(0, f'Pocketbase is not reachable at {session.base_url}')
+    auth_endpoint = next((e for e in AUTH_ENDPOINTS if statuses[e] not in (None, 404)), None)
+    modern = auth_endpoint == SUPERUSER_ENDPOINT
+    return Capabilities(
+        url=session.base_url,
+        auth_endpoint=auth_endpoint,
+        version='0.23+' if modern else '<0.23',
+        flat_fields=modern,
+        # 403: the route exists but batch requests are disabled in the settings
+        batch=statuses[BATCH_ENDPOINT] not in (None, 403, 404),
+        probed_at=time.time(),
+    )
+
+
+def _load(cache_file: Path) -> Dict[str, dict]:
+    try:
+        return json.loads(Path(cache_file).read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+
+
+def cached(url: str, ttl: float = DEFAULT_TTL,
+           cache_file: Path = DEFAULT_CACHE_FILE) -> Optional[Capabilities]:
+    """Cached capabilities for a server if still fresh; never sends a request."""
+    entry = _load(cache_file).get(url.rstrip('/'))
+    try:
+        caps = Capabilities(**entry) if entry else None
+    except TypeError:  # written by an older version of this module
+        return None
+    return caps if caps and caps.fresh(ttl) else None
+
+
+def capabilities(url: str, ttl: float = DEFAULT_TTL, cache_file: Optional[Path] = DEFAULT_CACHE_FILE,
+                 refresh: bool = False) -> Capabilities:
+    """Capabilities from the cache, probing (and caching) when missing or stale."""
+    if cache_file is None:
+        return probe(url)
+    if not refresh:
+        caps = cached(url, ttl, cache_file)
+        if caps is not None:
+            return caps
+    caps = probe(url)
+    data = _load(cache_file)
+    data[caps.url] = caps._asdict()
+    path = Path(cache_file)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data, indent=2, sort_keys=True) + '\n', encoding='utf-8')
+    return caps
+
+
+def main(argv: Optional[Sequence[str]] = None, prog: Optional[str] = None):
+    import argparse
+
+    from .client import Client, add_connection_args, config_from_args
+
+    parser = argparse.ArgumentParser(prog=prog, description='Detect Pocketbase capabilities and test authentication')
+    parser.add_argument('--refresh', action='store_true', help='Ignore the cached result and probe again')
+    parser.add_argument('--no-auth', action='store_true', help='Only probe, do not try the credentials')
+    add_connection_args(parser)
+    args = parser.parse_args(argv)
+
+    try:
+        caps = capabilities(args.url, refresh=args.refresh)
+    except ApiError as e:
+        print(f"❌ {e.message}")
+        sys.exit(1)
+
+    age = time.time() - caps.probed_at
+    print(f"📊 Pocketbase at {caps.url} ({'probed now' if age < 1 else f'cached {age:.0f}s ago'})")
+    print(f"  Version:       {caps.version}")
+    print(f"  Auth endpoint: {caps.auth_endpoint or 'none found'}")
+    print(f"  Field options: {'flat' if caps.flat_fields else 'nested'}")
+    print(f"  Batch API:     {'yes' if caps.batch else 'no'}")
+    print()
+
+    if caps.auth_endpoint is None:
+        print("❌ No auth endpoint available")
+        sys.exit(1)
+    if args.no_auth:
+        return
+    try:
+        Client(config_from_args(args)).auth()
+    except (ApiError, OSError) as e:
+        print(f"❌ Authentication failed: {e}")
+        sys.exit(1)
+    print(f"✅ Authenticated as {args.email}")
@@ -0,0 +1,65 @@
+"""Tests for the cached capability probe."""
+
+import pytest
+
+from saf_pb.client import Client, Config
+from saf_pb.fake_server import FakePocketBase
+from saf_pb.http import ApiError
+from saf_pb.probe import cached, capabilities, probe
+from saf_pb.http import Session
+from saf_pb.provision import provision
+from saf_pb.records import count_records
+from saf_pb.sync import sync
+
+
+def test_probe_modern_server(pb):
+    caps = probe(pb.server.url)
+    assert caps.auth_endpoint == '/api/collections/_superusers/auth-with-password'
+    assert caps.version == '0.23+' and caps.flat_fields and caps.batch
+
+
+def test_probe_legacy_server():
+    with FakePocketBase(version='0.22.4') as server:
+        caps = probe(server.url)
+    assert caps.auth_endpoint == '/api/admins/auth-with-password'
+    assert caps.version == '<0.23' and not caps.flat_fields and not caps.batch
+
+
+def test_probe_unreachable():
+    with FakePocketBase() as server:
+        url = server.url
+    with pytest.raises(ApiError):
+        probe(url, timeout=0.5)
+
+
+def test_capabilities_are_cached_per_url(pb, tmp_path):
+    cache_file = tmp_path / 'caps.json'
+    first = capabilities(pb.server.url, cache_file=cache_file)
+    pb.server.reset_stats()
+    assert capabilities(pb.server.url + '/', cache_file=cache_file) == first
+    assert pb.server.request_count == 0
+
+    assert cached(pb.server.url, ttl=0, cache_file=cache_file) is None
+    assert capabilities(pb.server.url, ttl=0, cache_file=cache_file).probed_at > first.probed_at
+    assert pb.server.request_count == 4
+
+
+def test_provision_uses_nested_options_on_legacy_servers():
+    with FakePocketBase(version='0.22.4') as server:
+        client = Client(Config(server.url, server.email, server.password)).auth()
+        provision(client, log=lambda message: None, flat_fields=False)
+        links = client.collections.get('validation_to_hardening')
+    assert 'fields' not in links
+    assert all(f['options']['collectionId'] and 'collectionId' not in f for f in links['schema'])
+
+
+def test_provision_and_sync_end_to_end_on_legacy_servers(data_dir, tmp_path):
+    with FakePocketBase(version='0.22.0') as server:
+        client = Client(Config(server.url, server.email, server.password)).auth()
+        ids = provision(client, log=lambda message: None, flat_fields=False)
+        assert all('id' not in [f['name'] for f in client.collections.get(name)['schema']] for name in ids)
+
+        session = Session(server.url).auth(server.email, server.password)
+        plans = sync(session, data_dir, state_file=tmp_path / 'state.json', capabilities_file=None)
+        assert all(count_records(session, plan.table) == len(plan.creates) for plan in plans)
+        assert sum(len(plan.creates) for plan in plans) > 0
@@ -0,0 +1,122 @@
+"""
+Create the content and join collections from the schema in diffable/.
+
+Collections are defined from the same column/FK metadata the sync and
+export tools use (see saf_pb.mapping), in FK order so every relation target
+exists before the collection that points to it. Existing collections are
+left alone unless --reset is given, so provisioning is safe to re-run.
+"""
+
+import sys
+from typing import Dict, List, Optional, Sequence
+
+from saf_content.corpus import ENTITY_TYPES
+
+from .client import Client, add_connection_args, config_from_args, connect
+from .http import ApiError
+from .links import JOIN_TABLES
+from .mapping import HASH_FIELD, columns, foreign_keys
+
+REQUIRED_COLUMNS = {'id', 'status'}
+# Field keys that stay on the field in the pre-0.23 format; the rest go under options
+FIELD_KEYS = {'name', 'type', 'required', 'system'}
+
+
+def collection_definitions(collection_ids: Dict[str, str]) -> List[dict]:
+    """Collection definitions in creation order.
+
+    `collection_ids` maps collection name -> Pocketbase collection ID and is
+    used for relation fields; it must be filled in as collections are
+    created (see provision()).
+    """
+    definitions = []
+    for etype in ENTITY_TYPES:
+        fks = foreign_keys(etype.table)
+        fields = []
+        for column in columns(etype.table):
+            if column == 'id':
+                fields.append({'name': 'id', 'type': 'text', 'required': True, 'primaryKey': True})
+            elif column in fks:
+                fields.append({'name': column, 'type': 'relation', 'maxSelect': 1,
+                               'collectionId': collection_ids.get(fks[column], fks[column])})
+            else:
+                fields.append({'name': column, 'type': 'text', 'required': column in REQUIRED_COLUMNS})
+        fields.append({'name': HASH_FIELD, 'type': 'text', 'required': False})
+        definitions.append({'name': etype.table, 'type': 'base', 'fields': fields})
+    for join in JOIN_TABLES:
+        fields = [{'name': column, 'type': 'relation', 'required': True, 'maxSelect': 1,
+                   'cascadeDelete': True, 'collectionId': collection_ids.get(table, table)}
+                  for column, table in foreign_keys(join.table).items()]
+        definitions.append({'name': join.table, 'type': 'base', 'fields': fields})
+    return definitions
+
+
+def nested_definition(definition: dict) -> dict:
+    """A definition in the pre-0.23 format: `schema` with field options nested.
+
+    `id` is a system field there and may not appear in the schema.
+    """
+    schema = []
+    for field in definition['fields']:
+        if field['name'] == 'id':
+            continue
+        base = {k: v for k, v in field.items() if k in FIELD_KEYS}
+        options = {k: v for k, v in field.items() if k not in FIELD_KEYS}
+        schema.append({**base, 'options': options})
+    nested = {k: v for k, v in definition.items() if k != 'fields'}
+    nested['schema'] = schema
+    return nested
+
+
+def provision(client: Client, reset: bool = False, log=print,
+              flat_fields: Optional[bool] = None) -> Dict[str, str]:
+    """Create missing collections; returns name -> collection ID.
+
+    `flat_fields` selects the definition format and defaults to what the
+    server's cached capability probe reports (see saf_pb.probe).
+    """
+    if flat_fields is None:
+        flat_fields = client.capabilities().flat_fields
+    names = [t.table for t in ENTITY_TYPES] + [j.table for j in JOIN_TABLES]
+    if reset:
+        for name, error in client.collections.delete_many(names):
+            log(f"  ✓ Deleted {name}" if error is None else f"  ⚠️  Could not delete {name}: {error}")
+
+    collection_ids = client.collections.ids()
+    # Definitions depend on the IDs of earlier collections, so rebuild per step
+    for index in range(len(names)):
+        definition = collection_definitions(collection_ids)[index]
+        name = definition['name']
+        if name in collection_ids:
+            log(f"  = {name} (exists)")
+            continue
+        if not flat_fields:
+            definition = nested_definition(definition)
+        collection_ids[name] = client.collections.create(definition)['id']
+        log(f"  ✓ {name} (ID: {collection_ids[name]})")
+    return collection_ids
+
+
+def main(argv: Optional[Sequence[str]] = None, prog: Optional[str] = None):
+    import argparse
+
+    parser = argparse.ArgumentParser(prog=prog, description='Create the content and join collections in Pocketbase')
+    parser.add_argument('--reset', action='store_true', help='Delete the collections first (destroys their records)')
+    add_connection_args(parser)
+    args = parser.parse_args(argv)
+
+    try:
+        client = connect(config_from_args(args))
+    except (ApiError, OSError) as e:
+        print(f"❌ Authentication failed: {e}")
+        sys.exit(1)
+    print("✓ Authenticated\n")
+
+    try:
+        provision(client, reset=args.reset)
+    except ApiError as e:
+        print(f"❌ Provisioning failed: {e}")
+        if e.data:
+            print(f"   {e.data}")
+        sys.exit(1)
+    print(f"\n✅ Collections ready at {client.url}/_/")
@@ -0,0 +1,184 @@
+"""
+Relation-expanding record queries.
+
+`Query` builds the `fields`, `expand`, `filter` and `sort` list parameters
+for one collection. `QueryClient` runs queries over a Session so that FK
+targets arrive in the same paged responses as the records that reference
+them, instead of one lookup per relation per record:
+
+    client = QueryClient(session)
+    query = Query('profiles').expand('organization', 'team', 'standard', 'technology')
+    for profile in client.list(query):
+        org = client.related(profile, 'organization')
+
+Expanded relation records are cached by (collection, id) for the life of the
+client, so `record()` and `related()` only hit the server for records no
+earlier response contained, and identical GETs issued concurrently from
+several threads share a single in-flight request.
+"""
+
+import threading
+from concurrent.futures import Future
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .http import ApiError, Session
+from .mapping import foreign_keys
+from .records import DEFAULT_PAGE_SIZE, iter_records, records_path
+
+
+def quote(value) -> str:
+    """Render a Python value as a Pocketbase filter literal."""
+    if value is None:
+        return 'null'
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, (int, float)):
+        return str(value)
+    text = str(value).replace('\\', '\\\\').replace('"', '\\"')
+    return f'"{text}"'
+
+
+def bind(expr: str, **params) -> str:
+    """Substitute `{:name}` placeholders with quoted literals."""
+    for name, value in params.items():
+        expr = expr.replace(f'{{:{name}}}', quote(value))
+    return expr
+
+
+class Query:
+    """List parameters for one collection, built by chaining."""
+
+    def __init__(self, collection: str):
+        self.collection = collection
+        self.fields: List[str] = []
+        self.relations: List[str] = []
+        self.filters: List[str] = []
+        self.sort: List[str] = []
+
+    def select(self, *fields: str) -> 'Query':
+        self.fields.extend(fields)
+        return self
+
+    def expand(self, *relations: str) -> 'Query':
+        """Expand relation fields; dotted paths (team.organization) expand nested relations."""
+        self.relations.extend(relations)
+        return self
+
+    def where(self, expr: str, **params) -> 'Query':
+        """Add a filter clause (ANDed with the others), e.g. where('standard = {:s}', s='stig')."""
+        self.filters.append(bind(expr, **params))
+        return self
+
+    def order_by(self, *fields: str) -> 'Query':
+        """Sort fields; prefix with '-' for descending."""
+        self.sort.extend(fields)
+        return self
+
+    def params(self) -> Dict[str, Optional[str]]:
+        fields = list(self.fields)
+        if fields and self.relations and 'expand' not in fields:
+            fields.append('expand')
+        if len(self.filters) > 1:
+            filter = ' && '.join(f'({f})' for f in self.filters)
+        else:
+            filter = self.filters[0] if self.filters else None
+        return {
+            'fields': fields or None,
+            'expand': ','.join(self.relations) or None,
+            'filter': filter,
+            'sort': ','.join(self.sort) or None,
+        }
+
+
+class QueryClient:
+    """Runs queries with a per-session relation cache and in-flight request sharing."""
+
+    def __init__(self, session: Session):
+        self.session = session
+        self.cache: Dict[Tuple[str, str], dict] = {}
+        self._inflight: Dict[tuple, Future] = {}
+        self._lock = threading.Lock()
+
+    def get(self, path: str, params: Optional[dict] = None) -> Any:
+        """Session.get, sharing one request between identical concurrent calls."""
+        key = (path, tuple(sorted((params or {}).items())))
+        with self._lock:
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._inflight[key] = Future()
+        if not owner:
+            return future.result()
+
+        try:
+            future.set_result(self.session.get(path, params))
+        except BaseException as e:
+            future.set_exception(e)
+        finally:
+            with self._lock:
+                del self._inflight[key]
+        return future.result()
+
+    def relation_target(self, collection: str, field: str) -> str:
+        """Collection a relation field points to (the field name if the schema is unknown)."""
+        try:
+            return foreign_keys(collection).get(field, field)
+        except OSError:
+            return field
+
+    def list(self, query: Query, per_page: int = DEFAULT_PAGE_SIZE) -> Iterator[dict]:
+        """Stream matching records with their relations expanded.
+
+        Expanded records are only cached when the query does not project
+        fields, so the cache never hands out partial records.
+        """
+        cacheable = not query.fields
+        # iter_records only needs .get(), so route its pages through the deduplicating get
+        for record in iter_records(self, query.collection, per_page=per_page, **query.params()):
+            if cacheable:
+                self._remember_expanded(query.collection, record)
+            yield record
+
+    def record(self, collection: str, record_id: str) -> dict:
+        """One full record, from the relation cache when possible."""
+        key = (collection, record_id)
+        if key not in self.cache:
+            self.cache[key] = self.get(f'{records_path(collection)}/{record_id}')
+        return self.cache[key]
+
+    def related(self, record: dict, field: str, collection: Optional[str] = None) -> Optional[dict]:
+        """The record a single relation field points to (None if unset or missing).
+
+        Uses the response's expand data when present, then the cache, and
+        only then the server. `collection` is the collection `record` belongs
+        to; it is inferred from the record's collectionName when omitted.
+        """
+        expanded = record.get('expand', {}).get(field)
+        if expanded is not None:
+            return expanded
+        related_id = record.get(field)
+        if not related_id:
+            return None
+        source = collection or record.get('collectionName', '')
+        try:
+            return self.record(self.relation_target(source, field), related_id)
+        except ApiError as e:
+            if e.status == 404:
+                return None
+            raise
+
+    def _remember_expanded(self, collection: str, record: dict):
+        expand = record.get('expand')
+        if not expand:
+            return
+        for field, value in expand.items():
+            target = self.relation_target(collection, field)
+            if isinstance(value, list):
+                expand[field] = [self._remember(target, v) for v in value]
+            else:
+                expand[field] = self._remember(target, value)
+
+    def _remember(self, collection: str, record: dict) -> dict:
+        """Cache an expanded record; repeated expansions share one dict."""
+        self._remember_expanded(collection, record)
+        return self.cache.setdefault((collection, record['id']), record)
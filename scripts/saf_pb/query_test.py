@@ -0,0 +1,74 @@
+"""Tests for the relation-expanding query helper."""
+
+import threading
+
+import pytest
+
+from saf_pb.query import Query, QueryClient, bind
+from saf_pb.sync import sync
+
+RELATIONS = ('organization', 'team', 'standard', 'technology')
+
+
+@pytest.fixture
+def synced(content_pb, data_dir, tmp_path):
+    sync(content_pb.session, data_dir, state_file=tmp_path / 'state.json')
+    return content_pb
+
+
+def test_bind_quotes_values():
+    assert bind('name = {:n} && n > {:k}', n='a "b"', k=3) == 'name = "a \\"b\\"" && n > 3'
+
+
+def test_query_params():
+    query = (Query('profiles').select('id', 'name').expand('organization')
+             .where('standard = {:s}', s='stig').where('status = "active"').order_by('-name'))
+    assert query.params() == {
+        'fields': ['id', 'name', 'expand'],
+        'expand': 'organization',
+        'filter': '(standard = "stig") && (status = "active")',
+        'sort': '-name',
+    }
+
+
+def test_list_resolves_relations_without_extra_requests(synced):
+    client = QueryClient(synced.session)
+    synced.server.reset_stats()
+
+    profiles = list(client.list(Query('profiles').expand(*RELATIONS), per_page=20))
+    pages = synced.server.request_count
+    assert pages == len(profiles) // 20 + 1
+
+    resolved = [client.related(p, rel) for p in profiles for rel in RELATIONS if p[rel]]
+    assert resolved and all(resolved)
+    assert client.record('organizations', profiles[0]['organization'])['id'] == profiles[0]['organization']
+    assert synced.server.request_count == pages
+
+    # Every profile referencing an organization shares one cached instance of it
+    orgs = {id(p['expand']['organization']) for p in profiles if p['organization'] == 'mitre'}
+    assert len(orgs) == 1
+
+
+def test_related_falls_back_to_cached_lookup(synced):
+    client = QueryClient(synced.session)
+    profile = next(client.list(Query('profiles').where('id = {:id}', id='red-hat-7-stig')))
+    synced.server.reset_stats()
+
+    first = client.related(profile, 'organization', 'profiles')
+    assert first['id'] == profile['organization']
+    assert client.related(profile, 'organization', 'profiles') is first
+    assert synced.server.request_count == 1
+
+
+def test_identical_concurrent_requests_are_shared(pb):
+    pb.server.latency = 0.05
+    client = QueryClient(pb.session)
+    pb.server.reset_stats()
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(client.get('/api/health'))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(results) == 8 and pb.server.request_count == 1
@@ -0,0 +1,105 @@
+"""
+Paged record streaming and concurrent counting.
+
+`iter_records` walks a collection page by page and yields one record at a
+time, asking the server only for the requested `fields` and skipping the
+COUNT query (`skipTotal`) so memory stays constant regardless of collection
+size. `fetch_all` trades memory for latency: after the first page reports
+`totalPages`, the remaining pages are requested concurrently. `count_records`
+reads `totalItems` from a one-item page, and `count_many` issues those counts
+for several collections concurrently.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+
+from .http import ApiError, Session
+
+DEFAULT_PAGE_SIZE = 500
+MAX_PAGE_SIZE = 1000  # Pocketbase caps perPage at 1000
+
+
+def records_path(collection: str) -> str:
+    return f'/api/collections/{collection}/records'
+
+
+def _list_params(fields: Optional[Iterable[str]], filter: Optional[str], sort: Optional[str],
+                 expand: Optional[str], per_page: int) -> Dict[str, Union[str, int]]:
+    params: Dict[str, Union[str, int]] = {'perPage': per_page}
+    if fields:
+        params['fields'] = ','.join(fields)
+    if filter:
+        params['filter'] = filter
+    if sort:
+        params['sort'] = sort
+    if expand:
+        params['expand'] = expand
+    return params
+
+
+def iter_pages(session: Session, collection: str, *, fields: Optional[Iterable[str]] = None,
+               filter: Optional[str] = None, sort: Optional[str] = None,
+               expand: Optional[str] = None,
+               per_page: int = DEFAULT_PAGE_SIZE) -> Iterator[List[dict]]:
+    """Yield successive pages (lists of records) until the collection is exhausted."""
+    params = _list_params(fields, filter, sort, expand, per_page)
+    params['skipTotal'] = 1
+
+    page = 1
+    while True:
+        params['page'] = page
+        items = session.get(records_path(collection), params)['items']
+        if items:
+            yield items
+        if len(items) < per_page:
+            return
+        page += 1
+
+
+def iter_records(session: Session, collection: str, **kwargs) -> Iterator[dict]:
+    """Stream records one at a time; accepts the same options as iter_pages."""
+    for page in iter_pages(session, collection, **kwargs):
+        yield from page
+
+
+def fetch_all(session: Session, collection: str, *, fields: Optional[Iterable[str]] = None,
+              filter: Optional[str] = None, sort: Optional[str] = None,
+              expand: Optional[str] = None, per_page: int = MAX_PAGE_SIZE,
+              max_workers: int = 8) -> Iterator[dict]:
+    """Yield every record, fetching pages 2..N concurrently once page 1 reports the total."""
+    path = records_path(collection)
+    params = _list_params(fields, filter, sort, expand, per_page)
+    first = session.get(path, {**params, 'page': 1})
+    yield from first['items']
+    if first['totalPages'] <= 1:
+        return
+
+    def fetch(page: int) -> List[dict]:
+        return session.get(path, {**params, 'page': page})['items']
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for items in pool.map(fetch, range(2, first['totalPages'] + 1)):
+            yield from items
+
+
+def count_records(session: Session, collection: str, filter: Optional[str] = None) -> int:
+    """Total number of matching records, read from a one-item page."""
+    params: Dict[str, Union[str, int]] = {'page': 1, 'perPage': 1, 'fields': 'id'}
+    if filter:
+        params['filter'] = filter
+    return session.get(records_path(collection), params)['totalItems']
+
+
+def count_many(session: Session, collections: Iterable[str],
+               max_workers: int = 8) -> Dict[str, Union[int, ApiError]]:
+    """Count several collections concurrently; failures are returned, not raised."""
+    names = list(collections)
+
+    def count(name: str) -> Union[int, ApiError]:
+        try:
+            return count_records(session, name)
+        except ApiError as e:
+            return e
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(names)))) as pool:
+        return dict(zip(names, pool.map(count, names)))
@@ -0,0 +1,51 @@
+"""Tests for paged record streaming and concurrent counts."""
+
+import pytest
+
+from saf_pb.fake_server import FakePocketBase
+from saf_pb.http import ApiError, Session
+from saf_pb.records import count_many, count_records, iter_records
+
+
+@pytest.fixture
+def pb(pb):
+    pb.session.post('/api/collections', {'name': 'profiles', 'fields': [
+        {'name': 'name', 'type': 'text'}, {'name': 'details', 'type': 'text'}]})
+    pb.session.post('/api/batch', {'requests': [
+        {'method': 'POST', 'url': '/api/collections/profiles/records',
+         'body': {'id': f'p{i:04d}', 'name': f'Profile {i}', 'details': 'x' * 100}}
+        for i in range(50)]})
+    return pb
+
+
+def test_iter_records_streams_projected_pages(pb):
+    pb.server.reset_stats()
+    records = iter_records(pb.session, 'profiles', fields=['id', 'name'], per_page=20)
+    first = next(records)
+    assert first == {'id': 'p0000', 'name': 'Profile 0'}
+    assert pb.server.request_count == 1
+    assert len(list(records)) == 49
+    assert pb.server.request_count == 3
+
+
+def test_iter_records_filter(pb):
+    ids = [r['id'] for r in iter_records(pb.session, 'profiles', fields=['id'], filter="name ~ 'Profile 4'")]
+    assert ids == ['p0004'] + [f'p{i:04d}' for i in range(40, 50)]
+
+
+def test_count_records_uses_one_request(pb):
+    pb.server.reset_stats()
+    assert count_records(pb.session, 'profiles') == 50
+    assert pb.server.request_count == 1
+
+
+def test_count_many_reports_failures(pb):
+    counts = count_many(pb.session, ['profiles', 'missing'])
+    assert counts['profiles'] == 50
+    assert isinstance(counts['missing'], ApiError) and counts['missing'].status == 404
+
+
+def test_auth_rejects_wrong_password():
+    with FakePocketBase() as server:
+        with pytest.raises(ApiError):
+            Session(server.url).auth(server.email, 'wrong')
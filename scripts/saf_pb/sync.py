@@ -0,0 +1,263 @@
+"""
+Hash-based incremental sync from content/data YAML to Pocketbase records.
+
+Every record carries a `content_hash` of the fields it was built from. A
+sync reads the (id, content_hash) pairs of each collection in one projected
+paged scan, compares them with hashes computed from the YAML, and then
+creates or updates only new/changed records and deletes only records whose
+entity disappeared, all through the batch API.
+
+A small state file remembers the combined hash of each collection as of the
+last successful sync to a given server, so collections whose YAML did not
+change are skipped without any request. A one-profile edit therefore costs
+one scan of `profiles` plus one batch request. Use `full=True` to ignore the
+state (for example after editing records in the Pocketbase UI).
+"""
+
+import json
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Set
+
+from saf_content.corpus import DEFAULT_DATA_DIR, ENTITY_TYPES, REPO_ROOT, entity_type, iter_entities
+
+from .client import add_connection_args, config_from_args, connect
+from .http import ApiError, Session
+from .mapping import HASH_FIELD, combined_hash, content_hash, to_record
+from .probe import DEFAULT_CACHE_FILE, cached
+from .records import iter_records, records_path
+
+DEFAULT_STATE_FILE = REPO_ROOT / '.cache' / 'saf' / 'pb-sync-state.json'
+DEFAULT_BATCH_SIZE = 50
+
+
+class TablePlan:
+    """Changes needed to bring one collection in line with the YAML."""
+
+    def __init__(self, table: str):
+        self.table = table
+        self.creates: List[dict] = []
+        self.updates: List[dict] = []
+        self.deletes: List[str] = []
+        self.unchanged = 0
+        self.skipped = False
+        self.needs_hash_field = False   # empty or never-synced collection
+
+    @property
+    def changes(self) -> int:
+        return len(self.creates) + len(self.updates) + len(self.deletes)
+
+
+def local_records(data_dir: Path = DEFAULT_DATA_DIR,
+                  warnings: Optional[List[str]] = None) -> Dict[str, Dict[str, dict]]:
+    """table -> id -> record (with content_hash) for the whole corpus."""
+    entities = list(iter_entities(data_dir))
+    valid_ids: Dict[str, Set[str]] = {}
+    for etype, _, entity in entities:
+        valid_ids.setdefault(etype.table, set()).add(str(entity['id']))
+
+    result: Dict[str, Dict[str, dict]] = {t.table: {} for t in ENTITY_TYPES}
+    for etype, path, entity in entities:
+        record = to_record(etype, entity, valid_ids, warnings)
+        if record['id'] in result[etype.table] and warnings is not None:
+            warnings.append(f"{etype.table}/{record['id']}: duplicate ID in {path.name} (last one wins)")
+        record[HASH_FIELD] = content_hash(record)
+        result[etype.table][record['id']] = record
+    return result
+
+
+def remote_hashes(session: Session, table: str) -> Dict[str, str]:
+    """id -> content_hash (None if the field is missing) in one projected scan."""
+    return {r['id']: r.get(HASH_FIELD)
+            for r in iter_records(session, table, fields=['id', HASH_FIELD], per_page=1000)}
+
+
+def ensure_hash_field(session: Session, table: str):
+    """Add the content_hash text field to a collection that predates sync."""
+    collection = session.get(f'/api/collections/{table}')
+    key = 'fields' if 'fields' in collection else 'schema'
+    fields = collection.get(key) or []
+    if any(f.get('name') == HASH_FIELD for f in fields):
+        return
+    session.request('PATCH', f'/api/collections/{table}',
+                    json={key: fields + [{'name': HASH_FIELD, 'type': 'text', 'required': False}]})
+
+
+class SyncState:
+    """Per-server combined collection hashes from the last successful sync."""
+
+    def __init__(self, path: Path = DEFAULT_STATE_FILE):
+        self.path = Path(path)
+        try:
+            self.data = json.loads(self.path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            self.data = {}
+
+    def get(self, server: str, table: str) -> Optional[str]:
+        return self.data.get(server, {}).get(table)
+
+    def set(self, server: str, table: str, value: str):
+        self.data.setdefault(server, {})[table] = value
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(json.dumps(self.data, indent=2, sort_keys=True) + '\n', encoding='utf-8')
+
+
+def plan_sync(session: Session, local: Dict[str, Dict[str, dict]],
+              tables: Optional[Sequence[str]] = None,
+              state: Optional[SyncState] = None, full: bool = False) -> List[TablePlan]:
+    """Diff local records against the server, one scan per changed collection."""
+    plans = []
+    for etype in ENTITY_TYPES:
+        if tables and etype.table not in tables:
+            continue
+        plan = TablePlan(etype.table)
+        records = local.get(etype.table, {})
+        local_hash = combined_hash(r[HASH_FIELD] for r in records.values())
+        if not full and state is not None and state.get(session.base_url, etype.table) == local_hash:
+            plan.skipped = True
+            plan.unchanged = len(records)
+            plans.append(plan)
+            continue
+
+        remote = remote_hashes(session, etype.table)
+        # Records without a hash count as changed; sync() adds the field before writing
+        plan.needs_hash_field = not remote or None in remote.values()
+        for record_id, record in records.items():
+            if record_id not in remote:
+                plan.creates.append(record)
+            elif remote[record_id] != record[HASH_FIELD]:
+                plan.updates.append(record)
+            else:
+                plan.unchanged += 1
+        plan.deletes = sorted(set(remote) - set(records))
+        plans.append(plan)
+    return plans
+
+
+def batch_operations(plans: List[TablePlan]) -> List[dict]:
+    """Batch requests: creates/updates in FK order, then deletes in reverse FK order."""
+    ops = []
+    for plan in plans:
+        path = records_path(plan.table)
+        ops += [{'method': 'POST', 'url': path, 'body': r} for r in plan.creates]
+        ops += [{'method': 'PATCH', 'url': f"{path}/{r['id']}",
+                 'body': {k: v for k, v in r.items() if k != 'id'}} for r in plan.updates]
+    for plan in reversed(plans):
+        path = records_path(plan.table)
+        ops += [{'method': 'DELETE', 'url': f'{path}/{record_id}'} for record_id in plan.deletes]
+    return ops
+
+
+def send_operations(session: Session, ops: List[dict], batch_size: int = DEFAULT_BATCH_SIZE,
+                    capabilities_file: Optional[Path] = DEFAULT_CACHE_FILE) -> int:
+    """Send operations through /api/batch, falling back to one request per
+    operation when the server has no batch API or has it disabled.
+
+    A cached probe (saf_pb.probe) that found no batch API skips straight to
+    the per-operation requests. Returns the number of HTTP requests made.
+    """
+    caps = cached(session.base_url, cache_file=capabilities_file) if capabilities_file else None
+    sent = requests_made = 0
+    if caps is None or caps.batch:
+        while sent < len(ops):
+            chunk = ops[sent:sent + batch_size]
+            requests_made += 1
+            try:
+                session.post('/api/batch', {'requests': chunk})
+            except ApiError as e:
+                if e.status not in (403, 404):
+                    raise
+                break
+            sent += len(chunk)
+    for op in ops[sent:]:
+        session.request(op['method'], op['url'], json=op.get('body'))
+        requests_made += 1
+    return requests_made
+
+
+def sync(session: Session, data_dir: Path = DEFAULT_DATA_DIR,
+         tables: Optional[Sequence[str]] = None, dry_run: bool = False, full: bool = False,
+         batch_size: int = DEFAULT_BATCH_SIZE, state_file: Optional[Path] = DEFAULT_STATE_FILE,
+         warnings: Optional[List[str]] = None,
+         capabilities_file: Optional[Path] = DEFAULT_CACHE_FILE) -> List[TablePlan]:
+    """Plan and (unless dry_run) apply a sync; returns the per-collection plans."""
+    local = local_records(data_dir, warnings)
+    state = SyncState(state_file) if state_file else None
+    plans = plan_sync(session, local, tables, state, full)
+
+    if dry_run:
+        return plans
+
+    for plan in plans:
+        if plan.needs_hash_field:
+            ensure_hash_field(session, plan.table)
+    send_operations(session, batch_operations(plans), batch_size, capabilities_file)
+    if state is not None:
+        for plan in plans:
+            records = local.get(plan.table, {})
+            state.set(session.base_url, plan.table, combined_hash(r[HASH_FIELD] for r in records.values()))
+        state.save()
+    return plans
+
+
+def table_names(names: Optional[Sequence[str]]) -> Optional[List[str]]:
+    """Accept table, directory or YAML key names for --only."""
+    if not names:
+        return None
+    return [entity_type(n).table for n in names]
+
+
+def format_plan(plan: TablePlan) -> str:
+    if plan.skipped:
+        return f'  {plan.table}: unchanged since last sync ({plan.unchanged} records)'
+    return (f'  {plan.table}: {len(plan.creates)} new, {len(plan.updates)} changed, '
+            f'{len(plan.deletes)} removed, {plan.unchanged} unchanged')
+
+
+def main(argv: Optional[Sequence[str]] = None, prog: Optional[str] = None):
+    import argparse
+
+    parser = argparse.ArgumentParser(prog=prog, description='Incrementally sync content/data YAML into Pocketbase')
+    parser.add_argument('--dry-run', action='store_true', help='Show the plan without writing anything')
+    parser.add_argument('--full', action='store_true', help='Rescan every collection, ignoring sync state')
+    parser.add_argument('--only', nargs='+', metavar='COLLECTION', help='Limit sync to these collections')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                        help=f'Operations per batch request (default: {DEFAULT_BATCH_SIZE})')
+    parser.add_argument('--data-dir', default=str(DEFAULT_DATA_DIR), help='Path to data directory')
+    add_connection_args(parser)
+    args = parser.parse_args(argv)
+
+    try:
+        session = connect(config_from_args(args)).session
+    except (ApiError, OSError) as e:
+        print(f"❌ Authentication failed: {e}")
+        sys.exit(1)
+    print("✓ Authenticated\n")
+
+    warnings = []
+    try:
+        plans = sync(session, args.data_dir, tables=table_names(args.only), dry_run=args.dry_run,
+                     full=args.full, batch_size=args.batch_size, warnings=warnings)
+    except ApiError as e:
+        print(f"❌ Sync failed: {e}")
+        if e.data:
+            print(f"   {e.data}")
+        sys.exit(1)
+
+    for warning in warnings:
+        print(f"  ⚠️  {warning}")
+    if warnings:
+        print()
+
+    print("📊 Dry run - planned changes:" if args.dry_run else "📊 Changes:")
+    for plan in plans:
+        print(format_plan(plan))
+    print()
+
+    total = sum(p.changes for p in plans)
+    if args.dry_run:
+        print(f"✅ Dry run complete: {total} changes pending. Run without --dry-run to apply.")
+    else:
+        print(f"✅ Sync complete: {total} changes applied.")
@@ -0,0 +1,105 @@
+"""Tests for the incremental YAML -> Pocketbase sync."""
+
+import pytest
+
+from saf_pb.client import Client, Config
+from saf_pb.fake_server import FakePocketBase
+from saf_pb.http import Session
+from saf_pb.mapping import HASH_FIELD
+from saf_pb.probe import capabilities
+from saf_pb.provision import provision
+from saf_pb.records import count_records, iter_records
+from saf_pb.sync import send_operations, sync
+
+
+def edit(path, old, new):
+    text = path.read_text(encoding='utf-8')
+    assert old in text
+    path.write_text(text.replace(old, new, 1), encoding='utf-8')
+
+
+@pytest.fixture
+def state_file(tmp_path):
+    return tmp_path / 'state.json'
+
+
+def test_initial_sync_creates_everything(content_pb, data_dir, state_file):
+    plans = sync(content_pb.session, data_dir, state_file=state_file)
+    by_table = {p.table: p for p in plans}
+    assert len(by_table['profiles'].creates) == count_records(content_pb.session, 'profiles') > 50
+    hardening = {r['id']: r for r in iter_records(content_pb.session, 'hardening_profiles')}
+    assert hardening['apache-ansible']['standard'] == 'cis'  # FK normalized from "CIS"
+    assert all(r[HASH_FIELD] for r in hardening.values())
+
+
+def test_one_profile_edit_costs_two_requests(content_pb, data_dir, state_file):
+    sync(content_pb.session, data_dir, state_file=state_file)
+    edit(data_dir / 'profiles' / 'stig.yml', 'name: Red Hat 7 STIG', 'name: Red Hat 7 STIG (edited)')
+
+    content_pb.server.reset_stats()
+    plans = sync(content_pb.session, data_dir, state_file=state_file)
+    changed = [p for p in plans if p.changes]
+    assert [(p.table, len(p.updates)) for p in changed] == [('profiles', 1)]
+    assert content_pb.server.request_count == 2
+
+    record = content_pb.session.get('/api/collections/profiles/records/red-hat-7-stig')
+    assert record['name'] == 'Red Hat 7 STIG (edited)'
+
+
+def test_removed_entities_are_deleted(content_pb, data_dir, state_file):
+    sync(content_pb.session, data_dir, state_file=state_file)
+    before = count_records(content_pb.session, 'tools')
+    edit(data_dir / 'tools' / 'tools.yml', '- id: ohdf', '- id: ohdf-renamed')
+
+    plans = {p.table: p for p in sync(content_pb.session, data_dir, state_file=state_file)}
+    assert plans['tools'].deletes == ['ohdf'] and len(plans['tools'].creates) == 1
+    assert count_records(content_pb.session, 'tools') == before
+
+
+def test_full_sync_detects_remote_drift(content_pb, data_dir, state_file):
+    sync(content_pb.session, data_dir, state_file=state_file)
+    content_pb.session.request('PATCH', '/api/collections/tags/records/ansible',
+                               json={'description': 'edited in UI', HASH_FIELD: 'stale'})
+
+    assert sum(p.changes for p in sync(content_pb.session, data_dir, state_file=state_file)) == 0
+    plans = {p.table: p for p in sync(content_pb.session, data_dir, state_file=state_file, full=True)}
+    assert [r['id'] for r in plans['tags'].updates] == ['ansible']
+
+
+def test_dry_run_writes_nothing(content_pb, data_dir, state_file):
+    plans = sync(content_pb.session, data_dir, state_file=state_file, dry_run=True)
+    assert sum(p.changes for p in plans) > 0
+    assert count_records(content_pb.session, 'profiles') == 0
+    assert not state_file.exists()
+
+
+def test_dry_run_leaves_collection_schema_alone(pb, data_dir, state_file):
+    pb.session.post('/api/collections', {'name': 'tags', 'fields': [
+        {'name': 'name', 'type': 'text'}, {'name': 'description', 'type': 'text'}]})
+    pb.session.post('/api/collections/tags/records', {'id': 'ansible', 'name': 'Ansible'})
+    before = pb.session.get('/api/collections/tags')
+
+    plans = sync(pb.session, data_dir, tables=['tags'], state_file=state_file, dry_run=True)
+    assert [r['id'] for r in plans[0].updates] == ['ansible']   # no hash yet: counts as changed
+    assert pb.session.get('/api/collections/tags') == before
+
+
+def test_cached_probe_without_batch_skips_the_batch_api(data_dir, state_file, tmp_path):
+    cache_file = tmp_path / 'caps.json'
+    with FakePocketBase(version='0.22.4') as server:
+        provision(Client(Config(server.url, server.email, server.password)).auth(),
+                  log=lambda message: None, flat_fields=False)
+        session = Session(server.url).auth(server.email, server.password)
+        assert not capabilities(server.url, cache_file=cache_file).batch
+
+        server.reset_stats()
+        sync(session, data_dir, tables=['tags'], state_file=state_file, capabilities_file=cache_file)
+        assert 'POST /api/batch' not in server.requests_by_route
+        assert server.requests_by_route['POST /api/collections/tags/records'] > 1
+
+        # Without a cached probe the batch API is tried once, then abandoned
+        ops = [{'method': 'DELETE', 'url': f"/api/collections/tags/records/{record['id']}"}
+               for record in list(iter_records(session, 'tags'))[:2]]
+        server.reset_stats()
+        assert send_operations(session, ops, batch_size=1, capabilities_file=None) == 3
+        assert server.requests_by_route['POST /api/batch'] == 1
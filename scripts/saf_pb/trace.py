@@ -0,0 +1,278 @@
+"""
+HTTP call instrumentation for the Pocketbase provisioning and data scripts.
+
+Hooks into both transports the scripts use:
+  - `requests` (every Session.send, which also covers requests.get/post/...)
+  - the `pocketbase` Python SDK (Client.send), when it is installed
+
+Each call is recorded with its method, path, status, request/response
+payload bytes and latency. The summary groups calls per endpoint (record
+and collection IDs are folded into ":id") and reports call counts,
+p50/p95/p99 latency and total time, which makes redundant calls such as
+repeated `collections.get_full_list()` stand out immediately.
+
+Usage:
+  python scripts/pb-trace.py scripts/create-all-collections.py
+  python scripts/pb-trace.py --json trace.json scripts/check-data.py
+
+  from saf_pb import trace
+  tracer = trace.install()
+  ...
+  print(tracer.summary())
+"""
+
+import json
+import math
+import re
+import sys
+import threading
+import time
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+# Generated Pocketbase IDs: 15-char record IDs and "pbc_<digits>" collection IDs
+_GENERATED_ID = re.compile(r'^(?:[a-z0-9]{15}|pbc_\d+)$')
+
+
+class CallRecord:
+    __slots__ = ('method', 'path', 'status', 'bytes_sent', 'bytes_received', 'seconds', 'started')
+
+    def __init__(self, method: str, path: str, status: int, bytes_sent: int,
+                 bytes_received: int, seconds: float, started: float):
+        self.method = method
+        self.path = path
+        self.status = status
+        self.bytes_sent = bytes_sent
+        self.bytes_received = bytes_received
+        self.seconds = seconds
+        self.started = started
+
+    @property
+    def endpoint(self) -> str:
+        return f'{self.method} {endpoint_template(self.path)}'
+
+    def to_dict(self) -> dict:
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+
+def endpoint_template(path: str) -> str:
+    """Fold record IDs and generated collection IDs out of an API path."""
+    parts = urlsplit(path).path.rstrip('/').split('/')
+    for i, part in enumerate(parts):
+        if i > 0 and parts[i - 1] == 'records' or _GENERATED_ID.match(part):
+            parts[i] = ':id'
+    return '/'.join(parts) or '/'
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class Tracer:
+    """Thread-safe collector of HTTP call records."""
+
+    def __init__(self):
+        self.calls: List[CallRecord] = []
+        self._lock = threading.Lock()
+        self._started = time.perf_counter()
+
+    def record(self, method: str, path: str, status: int, bytes_sent: int,
+               bytes_received: int, seconds: float):
+        call = CallRecord(method.upper(), path, status, bytes_sent, bytes_received,
+                          seconds, time.perf_counter() - seconds - self._started)
+        with self._lock:
+            self.calls.append(call)
+
+    def reset(self):
+        with self._lock:
+            self.calls = []
+            self._started = time.perf_counter()
+
+    def stats(self) -> Dict[str, dict]:
+        """Per-endpoint aggregate statistics, slowest total first."""
+        grouped: Dict[str, List[CallRecord]] = {}
+        with self._lock:
+            for call in self.calls:
+                grouped.setdefault(call.endpoint, []).append(call)
+
+        stats = {}
+        for endpoint, calls in grouped.items():
+            latencies = sorted(c.seconds for c in calls)
+            stats[endpoint] = {
+                'calls': len(calls),
+                'errors': sum(1 for c in calls if not 200 <= c.status < 400),
+                'p50_ms': percentile(latencies, 50) * 1000,
+                'p95_ms': percentile(latencies, 95) * 1000,
+                'p99_ms': percentile(latencies, 99) * 1000,
+                'total_ms': sum(latencies) * 1000,
+                'bytes_sent': sum(c.bytes_sent for c in calls),
+                'bytes_received': sum(c.bytes_received for c in calls),
+            }
+        return dict(sorted(stats.items(), key=lambda kv: -kv[1]['total_ms']))
+
+    def summary(self) -> str:
+        stats = self.stats()
+        total_calls = sum(s['calls'] for s in stats.values())
+        total_ms = sum(s['total_ms'] for s in stats.values())
+        width = max([len(e) for e in stats] + [8])
+
+        lines = [
+            '=' * 70,
+            '  HTTP Call Summary',
+            '=' * 70,
+            '',
+            f"  {'Endpoint':<{width}}  {'Calls':>5}  {'Err':>3}  {'p50':>8}  {'p95':>8}  {'p99':>8}  {'Total':>9}",
+        ]
+        for endpoint, s in stats.items():
+            lines.append(
+                f"  {endpoint:<{width}}  {s['calls']:>5}  {s['errors']:>3}  "
+                f"{s['p50_ms']:>6.1f}ms  {s['p95_ms']:>6.1f}ms  {s['p99_ms']:>6.1f}ms  {s['total_ms']:>7.1f}ms"
+            )
+        lines += [
+            '',
+            f'  {total_calls} calls, {total_ms:.1f}ms in HTTP '
+            f'({(time.perf_counter() - self._started) * 1000:.1f}ms wall clock)',
+            '',
+        ]
+        return '\n'.join(lines)
+
+    def export_json(self, path: str):
+        with self._lock:
+            calls = [c.to_dict() for c in self.calls]
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'calls': calls, 'endpoints': self.stats()}, f, indent=2)
+            f.write('\n')
+
+
+# -----------------------------------------------------------------------------
+# Transport hooks
+# -----------------------------------------------------------------------------
+
+_active: Optional[Tracer] = None
+_originals: Dict[str, object] = {}
+
+
+def _install_requests(tracer: Tracer):
+    try:
+        import requests
+    except ImportError:
+        return
+    original = requests.Session.send
+    _originals['requests'] = original
+
+    def send(self, request, **kwargs):
+        started = time.perf_counter()
+        status, received = 0, 0
+        try:
+            response = original(self, request, **kwargs)
+            status = response.status_code
+            if kwargs.get('stream'):
+                received = int(response.headers.get('Content-Length') or 0)
+            else:
+                received = len(response.content or b'')
+            return response
+        finally:
+            body = request.body or b''
+            tracer.record(request.method or 'GET', urlsplit(request.url).path, status,
+                          len(body.encode() if isinstance(body, str) else body),
+                          received, time.perf_counter() - started)
+
+    requests.Session.send = send
+
+
+def _install_pocketbase(tracer: Tracer):
+    try:
+        from pocketbase.client import Client
+    except ImportError:
+        return
+    original = Client.send
+    _originals['pocketbase'] = original
+
+    def send(self, path, req_config):
+        started = time.perf_counter()
+        status, received = 0, 0
+        try:
+            result = original(self, path, req_config)
+            status = 200
+            received = len(json.dumps(result, default=str)) if result is not None else 0
+            return result
+        except Exception as e:
+            status = getattr(e, 'status', 0) or 0
+            raise
+        finally:
+            body = req_config.get('body')
+            sent = len(json.dumps(body, default=str)) if body is not None else 0
+            tracer.record(req_config.get('method', 'GET'), path, status, sent, received,
+                          time.perf_counter() - started)
+
+    Client.send = send
+
+
+def install(tracer: Optional[Tracer] = None) -> Tracer:
+    """Start recording every requests/SDK call. Idempotent."""
+    global _active
+    if _active is not None:
+        return _active
+    _active = tracer or Tracer()
+    _install_requests(_active)
+    _install_pocketbase(_active)
+    return _active
+
+
+def uninstall():
+    """Restore the original transports."""
+    global _active
+    if 'requests' in _originals:
+        import requests
+        requests.Session.send = _originals.pop('requests')
+    if 'pocketbase' in _originals:
+        from pocketbase.client import Client
+        Client.send = _originals.pop('pocketbase')
+    _active = None
+
+
+def active() -> Optional[Tracer]:
+    return _active
+
+
+def main():
+    import argparse
+    import os
+    import runpy
+
+    parser = argparse.ArgumentParser(
+        description='Run a Python script with Pocketbase/HTTP call instrumentation',
+        epilog="""
+Examples:
+  python %(prog)s scripts/create-all-collections.py
+  python %(prog)s --json trace.json scripts/check-data.py
+        """,
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('--json', metavar='PATH', help='Write the full call trace as JSON')
+    parser.add_argument('script', help='Python script to run')
+    parser.add_argument('args', nargs=argparse.REMAINDER, help='Arguments passed to the script')
+    args = parser.parse_args()
+
+    tracer = install()
+    sys.argv = [args.script] + args.args
+    sys.path.insert(0, os.path.dirname(os.path.abspath(args.script)))
+    exit_code = 0
+    try:
+        runpy.run_path(args.script, run_name='__main__')
+    except SystemExit as e:
+        exit_code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+    finally:
+        print(tracer.summary(), file=sys.stderr)
+        if args.json:
+            tracer.export_json(args.json)
+            print(f'  Trace written to {args.json}', file=sys.stderr)
+    sys.exit(exit_code)
+
+
+if __name__ == '__main__':
+    main()
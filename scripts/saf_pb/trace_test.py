@@ -0,0 +1,61 @@
+"""Tests for HTTP call instrumentation."""
+
+import json
+
+import pytest
+import requests
+
+from saf_pb import trace
+from saf_pb.fake_server import FakePocketBase
+
+
+@pytest.fixture
+def tracer():
+    tracer = trace.install()
+    tracer.reset()
+    yield tracer
+    trace.uninstall()
+
+
+def test_records_requests_calls_per_endpoint(tracer, tmp_path):
+    with FakePocketBase() as pb:
+        token = requests.post(f'{pb.url}/api/admins/auth-with-password',
+                              json={'identity': pb.email, 'password': pb.password}).json()['token']
+        headers = {'Authorization': token}
+        for _ in range(3):
+            requests.get(f'{pb.url}/api/collections', headers=headers)
+        requests.get(f'{pb.url}/api/collections/missing', headers=headers)
+
+    stats = tracer.stats()
+    assert stats['GET /api/collections']['calls'] == 3
+    assert stats['GET /api/collections/missing']['errors'] == 1
+    assert stats['POST /api/admins/auth-with-password']['bytes_sent'] > 0
+    assert 'HTTP Call Summary' in tracer.summary()
+
+    out = tmp_path / 'trace.json'
+    tracer.export_json(str(out))
+    exported = json.loads(out.read_text())
+    assert len(exported['calls']) == 5
+    assert exported['calls'][0]['method'] == 'POST'
+
+
+def test_uninstall_restores_transport(tracer):
+    trace.uninstall()
+    assert trace.active() is None
+    assert requests.Session.send.__qualname__ == 'Session.send'
+
+
+@pytest.mark.parametrize('path, expected', [
+    ('/api/collections/profiles/records/red-hat-7-stig', '/api/collections/profiles/records/:id'),
+    ('/api/collections/pbc_1234567890', '/api/collections/:id'),
+    ('/api/collections/profiles/records?page=2', '/api/collections/profiles/records'),
+])
+def test_endpoint_template(path, expected):
+    assert trace.endpoint_template(path) == expected
+
+
+def test_percentile_nearest_rank():
+    values = [1.0, 2.0, 3.0, 4.0]
+    assert trace.percentile(values, 50) == 2.0
+    assert trace.percentile(values, 75) == 3.0
+    assert trace.percentile(values, 99) == 4.0
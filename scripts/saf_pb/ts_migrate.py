@@ -0,0 +1,437 @@
+"""
+Structural rewriter for TypeScript Pocketbase collection scripts.
+
+Pocketbase 0.23 renamed a collection's `schema` to `fields` and moved field
+options (collectionId, maxSelect, min, max, ...) from a nested `options`
+object onto the field itself. This module migrates TS sources such as
+scripts/create-all-collections.ts accordingly:
+
+    schema: [                          fields: [
+      { name: 'org', type: 'relation',   { name: 'org', type: 'relation',
+        options: { collectionId: id,       collectionId: id,
+                   maxSelect: 1 } },       maxSelect: 1 },
+    ]                                  ]
+
+Sources are tokenized once (strings, template literals, comments and regex
+literals are opaque, brackets are matched with a stack) and every object
+literal's direct properties are visited exactly once, so a file is
+rewritten in linear time regardless of nesting. Only the edited spans
+change; everything else, including formatting and comments, is preserved.
+
+By default only relation fields are flattened (as the old regex-based
+fixer did); `flatten_all=True` flattens the options of every field.
+"""
+
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from saf_content.corpus import REPO_ROOT
+
+DEFAULT_FILES = [REPO_ROOT / 'scripts' / 'create-all-collections.ts']
+
+# Tokens: kind is one of 'ws', 'comment', 'string', 'ident', 'punct', 'other'
+_WS = re.compile(r'\s+')
+_IDENT = re.compile(r'[A-Za-z_$][\w$]*')
+_NUMBER = re.compile(r'\d[\w.]*')
+_OPENERS = {'{': '}', '[': ']', '(': ')'}
+_CLOSERS = {'}', ']', ')'}
+# After these tokens a '/' starts a regex literal rather than a division
+_REGEX_PRECEDERS = set('(,=:[!&|?{};+-*%<>~^') | {'return', 'typeof', 'case', 'do', 'else', 'in', 'of'}
+
+
+class Token(NamedTuple):
+    kind: str
+    text: str
+    start: int
+    end: int
+
+
+class TokenizeError(ValueError):
+    pass
+
+
+def _scan_string(src: str, pos: int) -> int:
+    quote = src[pos]
+    i = pos + 1
+    while i < len(src):
+        ch = src[i]
+        if ch == '\\':
+            i += 2
+            continue
+        if ch == quote:
+            return i + 1
+        if ch == '\n':
+            break
+        i += 1
+    raise TokenizeError(f'Unterminated string at offset {pos}')
+
+
+def _scan_template(src: str, pos: int) -> int:
+    """End of the template literal starting at src[pos] == '`'."""
+    i = pos + 1
+    while i < len(src):
+        ch = src[i]
+        if ch == '\\':
+            i += 2
+        elif ch == '`':
+            return i + 1
+        elif src.startswith('${', i):
+            i = _scan_code(src, i + 2, '}')
+        else:
+            i += 1
+    raise TokenizeError(f'Unterminated template literal at offset {pos}')
+
+
+def _scan_code(src: str, pos: int, closer: str) -> int:
+    """Skip a `${ ... }` expression; returns the offset after its closing brace."""
+    depth = 0
+    i = pos
+    while i < len(src):
+        ch = src[i]
+        if ch in '\'"':
+            i = _scan_string(src, i)
+        elif ch == '`':
+            i = _scan_template(src, i)
+        elif src.startswith('//', i):
+            i = src.find('\n', i)
+            i = len(src) if i < 0 else i
+        elif src.startswith('/*', i):
+            i = _comment_end(src, i)
+        elif ch == '{':
+            depth += 1
+            i += 1
+        elif ch == closer and depth == 0:
+            return i + 1
+        else:
+            if ch == '}':
+                depth -= 1
+            i += 1
+    raise TokenizeError(f'Unterminated template expression at offset {pos}')
+
+
+def _comment_end(src: str, pos: int) -> int:
+    end = src.find('*/', pos + 2)
+    if end < 0:
+        raise TokenizeError(f'Unterminated comment at offset {pos}')
+    return end + 2
+
+
+def _scan_regex(src: str, pos: int) -> int:
+    i = pos + 1
+    in_class = False
+    while i < len(src) and src[i] != '\n':
+        ch = src[i]
+        if ch == '\\':
+            i += 2
+            continue
+        if ch == '[':
+            in_class = True
+        elif ch == ']':
+            in_class = False
+        elif ch == '/' and not in_class:
+            i += 1
+            while i < len(src) and (src[i].isalnum() or src[i] == '_'):
+                i += 1  # flags
+            return i
+        i += 1
+    raise TokenizeError(f'Unterminated regex literal at offset {pos}')
+
+
+def tokenize(src: str) -> List[Token]:
+    tokens: List[Token] = []
+    last = ''  # text of the last significant token
+    i = 0
+    n = len(src)
+    while i < n:
+        ch = src[i]
+        if ch.isspace():
+            end = _WS.match(src, i).end()
+            kind = 'ws'
+        elif src.startswith('//', i) or (i == 0 and src.startswith('#!')):
+            end = src.find('\n', i)
+            end = n if end < 0 else end
+            kind = 'comment'
+        elif src.startswith('/*', i):
+            end = _comment_end(src, i)
+            kind = 'comment'
+        elif ch in '\'"':
+            end = _scan_string(src, i)
+            kind = 'string'
+        elif ch == '`':
+            end = _scan_template(src, i)
+            kind = 'string'
+        elif ch == '/' and (not last or last in _REGEX_PRECEDERS):
+            end = _scan_regex(src, i)
+            kind = 'string'
+        elif ch == '_' or ch == '$' or ch.isalpha():
+            end = _IDENT.match(src, i).end()
+            kind = 'ident'
+        elif ch.isdigit():
+            end = _NUMBER.match(src, i).end()
+            kind = 'other'
+        elif ch in '{}[]():,':
+            end = i + 1
+            kind = 'punct'
+        else:
+            end = i + 1
+            kind = 'other'
+        tokens.append(Token(kind, src[i:end], i, end))
+        if kind not in ('ws', 'comment'):
+            last = src[i:end]
+        i = end
+    return tokens
+
+
+def match_brackets(tokens: List[Token]) -> Dict[int, int]:
+    """Index of each opening bracket token -> index of its closing token."""
+    matches: Dict[int, int] = {}
+    stack: List[int] = []
+    for index, token in enumerate(tokens):
+        if token.kind != 'punct':
+            continue
+        if token.text in _OPENERS:
+            stack.append(index)
+        elif token.text in _CLOSERS:
+            if not stack or _OPENERS[tokens[stack[-1]].text] != token.text:
+                raise TokenizeError(f'Unbalanced {token.text!r} at offset {token.start}')
+            matches[stack.pop()] = index
+    if stack:
+        raise TokenizeError(f'Unclosed {tokens[stack[-1]].text!r} at offset {tokens[stack[-1]].start}')
+    return matches
+
+
+class Property(NamedTuple):
+    key: str
+    key_index: int     # token index of the key
+    value_index: int   # token index of the first value token
+    end_index: int     # token index of the ',' or closing '}' after the value
+
+
+def object_properties(tokens: List[Token], matches: Dict[int, int], open_index: int) -> List[Property]:
+    """Direct `key: value` properties of the object literal opened at open_index."""
+    close = matches[open_index]
+    props = []
+    i = open_index + 1
+    while i < close:
+        i = _skip_trivia(tokens, i)
+        if i >= close:
+            break
+        key_token = tokens[i]
+        colon = _skip_trivia(tokens, i + 1)
+        is_key = key_token.kind in ('ident', 'string') and tokens[colon].text == ':'
+        j = _skip_trivia(tokens, colon + 1) if is_key else i
+        value_index = j
+        while j < close and tokens[j].text != ',':
+            j = matches[j] + 1 if j in matches else j + 1
+        if is_key:
+            props.append(Property(_unquote(key_token), i, value_index, j))
+        i = j + 1
+    return props
+
+
+def _skip_trivia(tokens: List[Token], i: int) -> int:
+    while i < len(tokens) and tokens[i].kind in ('ws', 'comment'):
+        i += 1
+    return i
+
+
+def _unquote(token: Token) -> str:
+    return token.text[1:-1] if token.kind == 'string' else token.text
+
+
+def _line_start(src: str, offset: int) -> int:
+    return src.rfind('\n', 0, offset) + 1
+
+
+def _line_end(src: str, offset: int) -> int:
+    end = src.find('\n', offset)
+    return len(src) if end < 0 else end
+
+
+def _flatten_options(src: str, tokens: List[Token], prop: Property, open_index: int,
+                     close_index: int) -> Tuple[int, int, str]:
+    """Edit (start, end, replacement) that inlines `options: { ... }`."""
+    key_start = tokens[prop.key_index].start
+    inner_start = tokens[open_index].end
+    inner_end = tokens[close_index].start
+    inner = src[inner_start:inner_end]
+    has_comma = tokens[prop.end_index].text == ','
+    after = tokens[prop.end_index].end if has_comma else tokens[close_index].end
+
+    line_start = _line_start(src, key_start)
+    own_line = not src[line_start:key_start].strip() and not src[after:_line_end(src, after)].strip()
+
+    if not inner.strip():
+        # Empty options: drop the property (and its line if it had one to itself)
+        if own_line:
+            return line_start, _line_end(src, after) + 1, ''
+        if not has_comma:
+            # Last property: drop the comma before it instead
+            prev = prop.key_index - 1
+            while tokens[prev].kind in ('ws', 'comment'):
+                prev -= 1
+            if tokens[prev].text == ',':
+                return tokens[prev].start, after, ''
+        end = after
+        while end < len(src) and src[end] in ' \t':
+            end += 1
+        return key_start, end, ''
+
+    last = close_index - 1
+    while tokens[last].kind in ('ws', 'comment'):
+        last -= 1
+    if '\n' in inner and own_line:
+        if has_comma and tokens[last].text != ',':
+            # Before any trailing comment, not after it
+            cut = tokens[last].end - inner_start
+            inner = inner[:cut] + ',' + inner[cut:]
+        indent = src[line_start:key_start]
+        lines = inner.split('\n')
+        if not lines[0].strip():
+            lines = lines[1:]
+        if lines and not lines[-1].strip():
+            lines = lines[:-1]
+        base = min(len(l) - len(l.lstrip()) for l in lines if l.strip())
+        lines = [indent + l[base:] if l.strip() else '' for l in lines]
+        return line_start, _line_end(src, after), '\n'.join(lines)
+
+    end = tokens[close_index].end
+    flat = src[inner_start:tokens[last].end].strip()
+    trailing = src[tokens[last].end:inner_end]
+    if not trailing.strip() and flat.endswith(','):
+        flat = flat[:-1].rstrip()
+    elif trailing.strip():
+        # A trailing line comment would swallow what follows: keep its line break
+        # and let the text after the closing brace start the next line
+        flat += trailing.rstrip(' \t') + src[_line_start(src, inner_end):inner_end]
+        while end < len(src) and src[end] in ' \t':
+            end += 1
+    return key_start, end, flat
+
+
+def migrate_source(src: str, flatten_all: bool = False) -> Tuple[str, Dict[str, int]]:
+    """Rewrite one TS source; returns (new source, counts of each kind of edit)."""
+    tokens = tokenize(src)
+    matches = match_brackets(tokens)
+    edits: List[Tuple[int, int, str]] = []
+    stats = {'schema': 0, 'options': 0}
+
+    for open_index, token in enumerate(tokens):
+        if token.text != '{' or token.kind != 'punct':
+            continue
+        props = object_properties(tokens, matches, open_index)
+        by_key = {p.key: p for p in props}
+
+        schema = by_key.get('schema')
+        if schema and tokens[schema.value_index].text == '[' and 'fields' not in by_key:
+            key = tokens[schema.key_index]
+            edits.append((key.start, key.end, 'fields' if key.kind == 'ident' else f"{key.text[0]}fields{key.text[0]}"))
+            stats['schema'] += 1
+
+        options = by_key.get('options')
+        field_type = by_key.get('type')
+        if not options or not field_type or tokens[options.value_index].text != '{':
+            continue
+        type_token = tokens[field_type.value_index]
+        if type_token.kind != 'string' or 'name' not in by_key:
+            continue
+        if not flatten_all and _unquote(type_token) != 'relation':
+            continue
+        options_open = options.value_index
+        options_close = matches[options_open]
+        if _skip_trivia(tokens, options_close + 1) != options.end_index:
+            continue  # options is an expression like `{...} as X`, leave it
+        edits.append(_flatten_options(src, tokens, options, options_open, options_close))
+        stats['options'] += 1
+
+    if not edits:
+        return src, stats
+    edits.sort()
+    out = []
+    pos = 0
+    for start, end, replacement in edits:
+        if start < pos:
+            continue  # nested inside an edit already applied
+        out.append(src[pos:start])
+        out.append(replacement)
+        pos = end
+    out.append(src[pos:])
+    return ''.join(out), stats
+
+
+class FileResult(NamedTuple):
+    path: str
+    changed: bool
+    stats: Dict[str, int]
+    error: Optional[str]
+
+
+def migrate_file(path: str, check: bool = False, flatten_all: bool = False) -> FileResult:
+    try:
+        src = Path(path).read_text(encoding='utf-8')
+        new, stats = migrate_source(src, flatten_all)
+    except (OSError, UnicodeDecodeError, TokenizeError) as e:
+        return FileResult(path, False, {}, str(e))
+    changed = new != src
+    if changed and not check:
+        Path(path).write_text(new, encoding='utf-8')
+    return FileResult(path, changed, stats, None)
+
+
+def migrate_files(paths: Sequence[str], check: bool = False, flatten_all: bool = False,
+                  workers: Optional[int] = None) -> List[FileResult]:
+    """Migrate files, in parallel worker processes when there is more than one."""
+    paths = [str(p) for p in paths]
+    if len(paths) <= 1 or workers == 1:
+        return [migrate_file(p, check, flatten_all) for p in paths]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(migrate_file, paths, [check] * len(paths), [flatten_all] * len(paths),
+                             chunksize=max(1, len(paths) // 32)))
+
+
+def main(argv: Optional[Sequence[str]] = None, prog: Optional[str] = None):
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog=prog,
+        description='Migrate TypeScript Pocketbase collection scripts to the 0.23+ field format',
+        epilog="""
+Examples:
+  python %(prog)s                                   # Rewrite scripts/create-all-collections.ts
+  python %(prog)s --check scripts/*.ts              # Exit 1 if any file needs migrating
+  python %(prog)s --all-fields scripts/create-*.ts  # Also flatten text/number field options
+        """,
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('files', nargs='*', help='TypeScript files (default: scripts/create-all-collections.ts)')
+    parser.add_argument('--check', action='store_true', help='Report files that would change; write nothing')
+    parser.add_argument('--all-fields', action='store_true',
+                        help="Flatten 'options' of every field, not just relation fields")
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count)')
+    args = parser.parse_args(argv)
+
+    results = migrate_files(args.files or DEFAULT_FILES, args.check, args.all_fields, args.workers)
+    changed = [r for r in results if r.changed]
+    errors = [r for r in results if r.error]
+
+    for result in results:
+        if result.error:
+            print(f"❌ {result.path}: {result.error}")
+        elif result.changed:
+            verb = 'would fix' if args.check else 'fixed'
+            print(f"{'📝' if args.check else '✓'} {result.path} ({verb}: "
+                  f"{result.stats['schema']} schema → fields, {result.stats['options']} options flattened)")
+
+    print()
+    if errors:
+        print(f"❌ {len(errors)} of {len(results)} files could not be parsed")
+    elif args.check:
+        print(f"{len(changed)} of {len(results)} files need migrating" if changed
+              else f"✅ {len(results)} files already migrated")
+    else:
+        print(f"✅ {len(changed)} of {len(results)} files rewritten")
+    if errors or (args.check and changed):
+        sys.exit(1)
@@ -0,0 +1,98 @@
+"""Tests for the TypeScript collection script rewriter."""
+
+import time
+
+import pytest
+
+from saf_pb.ts_migrate import TokenizeError, main, migrate_files, migrate_source
+
+SOURCE = """#!/usr/bin/env tsx
+// schema: [ { options: { } } ] in a comment is left alone
+const note = 'schema: [ { type: "relation", options: { maxSelect: 1 } } ]'
+const re = /[{]options: \\{/g
+
+await pb.collections.create({
+  name: 'teams',
+  type: 'base',
+  schema: [
+    { name: 'name', type: 'text', required: true, options: { max: 100 } },
+    { name: 'org', type: 'relation', options: { collectionId: ids[`org_${kind}`], maxSelect: 1 } },
+    {
+      name: 'members',
+      type: 'relation',
+      options: {
+        collectionId: lookup({ name: 'users' }).id, // nested braces
+        maxSelect: null
+      },
+    },
+  ],
+})
+"""
+
+
+def test_relation_options_are_flattened_and_the_rest_preserved():
+    new, stats = migrate_source(SOURCE)
+    assert stats == {'schema': 1, 'options': 2}
+    assert "  fields: [\n" in new
+    assert "{ name: 'org', type: 'relation', collectionId: ids[`org_${kind}`], maxSelect: 1 }," in new
+    assert ("      type: 'relation',\n"
+            "      collectionId: lookup({ name: 'users' }).id, // nested braces\n"
+            "      maxSelect: null,\n"
+            "    },\n") in new
+    # text field options, comments, strings and regex literals are untouched
+    assert "options: { max: 100 }" in new
+    for line in SOURCE.splitlines()[:4]:
+        assert line in new
+
+
+def test_all_fields_and_trailing_comments():
+    src = """const c = { fields: [
+    { name: 'file', type: 'file', options: { // upload
+      maxSize: 5, // 5 bytes
+    } },
+    { name: 'size', type: 'number', options: {} },
+] }
+"""
+    new, stats = migrate_source(src, flatten_all=True)
+    assert stats == {'schema': 0, 'options': 2}
+    assert "{ name: 'file', type: 'file', // upload\n      maxSize: 5, // 5 bytes\n    }," in new
+    assert "{ name: 'size', type: 'number' }," in new
+    assert migrate_source(new, flatten_all=True) == (new, {'schema': 0, 'options': 0})
+
+
+def test_rewrite_is_idempotent():
+    new, _ = migrate_source(SOURCE, flatten_all=True)
+    assert migrate_source(new, flatten_all=True)[0] == new
+
+
+def test_unbalanced_source_is_rejected():
+    with pytest.raises(TokenizeError):
+        migrate_source("const x = { schema: [ }")
+
+
+def test_check_and_parallel_files(tmp_path, capsys):
+    paths = []
+    for i in range(4):
+        path = tmp_path / f'c{i}.ts'
+        path.write_text(SOURCE if i % 2 else 'export {}\n', encoding='utf-8')
+        paths.append(str(path))
+
+    with pytest.raises(SystemExit) as exc:
+        main(['--check', *paths])
+    assert exc.value.code == 1
+    assert (tmp_path / 'c1.ts').read_text(encoding='utf-8') == SOURCE
+
+    results = migrate_files(paths, workers=2)
+    assert [r.changed for r in results] == [False, True, False, True]
+    main(['--check', *paths])
+    assert '4 files already migrated' in capsys.readouterr().out
+
+
+def test_large_input_is_linear():
+    field = "    { name: 'f', type: 'relation', options: { collectionId: 'x', maxSelect: 1 } },\n"
+    src = "const c = {\n  schema: [\n" + field * 20000 + "  ],\n}\n"
+    start = time.perf_counter()
+    new, stats = migrate_source(src)
+    assert stats['options'] == 20000
+    assert time.perf_counter() - start < 5
+    assert "options" not in new
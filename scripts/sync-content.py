@@ -0,0 +1,20 @@
+#!/usr/bin/env python3
+"""
+Incrementally sync content/data YAML into Pocketbase.
+
+Only records whose content hash changed are written and only records whose
+YAML entity was removed are deleted, all through the batch API. Collections
+whose YAML is unchanged since the last sync to the same server are skipped
+without any request (use --full to rescan everything).
+
+Usage:
+  python scripts/sync-content.py --dry-run          # Show what would change
+  python scripts/sync-content.py                    # Apply changes
+  python scripts/sync-content.py --only profiles    # Sync one collection
+  python scripts/sync-content.py --full             # Ignore local sync state
+"""
+
+from saf_pb.sync import main
+
+if __name__ == '__main__':
+    main()
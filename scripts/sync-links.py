@@ -0,0 +1,19 @@
+#!/usr/bin/env python3
+"""
+Sync the profiles_tags, hardening_profiles_tags and validation_to_hardening
+join collections from the tags / hardeningProfiles lists in content/data.
+
+Links are compared as sets against the existing join rows (read once per
+collection) and only added or removed links are written, in batches. Run
+after sync-content.py so the linked records exist.
+
+Usage:
+  python scripts/sync-links.py --dry-run                # Show what would change
+  python scripts/sync-links.py                          # Apply changes
+  python scripts/sync-links.py --only profiles_tags     # Sync one join collection
+"""
+
+from saf_pb.links import main
+
+if __name__ == '__main__':
+    main()
@@ -1,23 +1,18 @@
 #!/usr/bin/env python3
-import requests
+"""
+Detect what the Pocketbase server supports and test the admin credentials.
 
-endpoints = [
-    "/api/admins/auth-with-password",
-    "/api/collections/_superusers/auth-with-password",
-    "/api/_/auth-with-password"
-]
+The capability probe (auth endpoint, API version, flat or nested field
+options, batch API) runs once and is cached per server URL in
+.cache/saf/pb-capabilities.json; other tools read it instead of guessing.
 
-for endpoint in endpoints:
-    url = f"http://127.0.0.1:8090{endpoint}"
-    print(f"Testing: {url}")
-    try:
-        response = requests.post(url, json={"identity": "admin@localhost.com", "password": "test1234567"})
-        print(f"  Status: {response.status_code}")
-        if response.status_code == 200:
-            print(f"  ✓ SUCCESS: {endpoint}")
-            break
-        else:
-            print(f"  Response: {response.text[:100]}")
-    except Exception as e:
-        print(f"  Error: {e}")
-    print()
+Usage:
+  python scripts/test-auth.py                   # Probe (or use the cache) and authenticate
+  python scripts/test-auth.py --refresh         # Probe again, ignoring the cache
+  python scripts/test-auth.py --no-auth         # Only show the capabilities
+"""
+
+from saf_pb.probe import main
+
+if __name__ == '__main__':
+    main()
@@ -4,16 +4,16 @@ Test Pocketbase FK relations and dropdown UX
 Creates organizations and profiles with a relation field
 """
 
-from pocketbase import PocketBase
+from saf_pb.client import connect
+from saf_pb.http import ApiError
 
-client = PocketBase('http://127.0.0.1:8090')
-admin = client.admins.auth_with_password('admin@localhost.com', 'test1234567')
+pb = connect()
 print("✓ Authenticated\n")
 
 # Step 1: Create organizations collection
 print("Creating organizations collection...")
 try:
-    org_collection = client.collections.create({
+    org_collection = pb.collections.create({
         "name": "organizations",
         "type": "base",
         "schema": [
@@ -29,19 +29,18 @@ try:
             }
         ]
     })
-    org_id = org_collection.id
+    org_id = org_collection['id']
     print(f"  ✓ Created (ID: {org_id})\n")
-except Exception as e:
+except ApiError as e:
     print(f"  ❌ Error: {e}\n")
     # If already exists, get it
-    org_collection = client.collections.get_first_list_item('name="organizations"')
-    org_id = org_collection.id
+    org_id = pb.collections.get("organizations")['id']
     print(f"  → Using existing (ID: {org_id})\n")
 
 # Step 2: Create profiles collection with relation to organizations
 print("Creating profiles collection with organization relation...")
 try:
-    profiles_collection = client.collections.create({
+    pb.collections.create({
         "name": "profiles",
         "type": "base",
         "schema": [
@@ -64,7 +63,7 @@ try:
         ]
     })
     print(f"  ✓ Created with relation to organizations\n")
-except Exception as e:
+except ApiError as e:
     print(f"  ❌ Error: {e}\n")
     exit(1)
 
@@ -78,29 +77,31 @@ orgs = [
 
 for org_data in orgs:
     try:
-        org = client.collection("organizations").create(org_data)
+        pb.collection("organizations").create(org_data)
         print(f"  ✓ Created: {org_data['name']}")
-    except Exception as e:
+    except ApiError as e:
         print(f"  ⚠️  {org_data['name']}: {e}")
 
 # Step 4: Create a test profile
 print("\nCreating test profile...")
 try:
     # Get first organization ID
-    first_org = client.collection("organizations").get_list(1, 1).items[0]
+    first_org = pb.collection("organizations").first()
+    if first_org is None:
+        raise ApiError(404, "No organizations found")
 
-    profile = client.collection("profiles").create({
+    pb.collection("profiles").create({
         "name": "RHEL 8 STIG",
-        "organization": first_org.id
+        "organization": first_org['id']
     })
-    print(f"  ✓ Created profile linked to {first_org.name}")
-except Exception as e:
+    print(f"  ✓ Created profile linked to {first_org['name']}")
+except ApiError as e:
     print(f"  ❌ Error: {e}")
 
 print("\n" + "="*60)
 print("✅ Test setup complete!")
 print("="*60)
-print("\nNow go to http://localhost:8090/_/ and:")
+print(f"\nNow go to {pb.url}/_/ and:")
 print("1. Open the 'profiles' collection")
 print("2. Click 'New record'")
 print("3. Check the 'organization' field - is it a nice dropdown?")